@@ -4,1346 +4,41 @@ rdd.py
 Main wrapper script for RDD framework (Python version)
 Provides domain-based routing to all utility scripts
 Drop-in compatible with rdd.sh
+
+Startup is kept cheap: this entry script only parses the command line and
+looks the domain up in DOMAINS; the domain module (rdd_branch, rdd_git, ...)
+is imported on first use. `--version` and `--help` import neither
+rdd_utils nor subprocess and never run git.
+
+`rdd.py --json <domain> <action> ...` prints one JSON document instead of
+text: {"command", "ok", "exitCode", "data", "messages"[, "output"]}.
 """
 
 import sys
 import os
-import subprocess
-import shutil
-import json
-from pathlib import Path
 from typing import List, Optional
 
-# Add the script directory to the path to import rdd_utils
-SCRIPT_DIR = Path(__file__).parent.absolute()
-sys.path.insert(0, str(SCRIPT_DIR))
-
-# Import all functions from rdd_utils
-from rdd_utils import (
-    # Output functions
-    print_success, print_error, print_warning, print_info, print_step, print_banner,
-    # Validation functions
-    validate_name, validate_branch_name, validate_file_exists, validate_dir_exists,
-    # Git functions
-    check_git_repo, get_current_branch, get_default_branch, get_branch_type, 
-    is_enh_or_fix_branch, is_valid_work_branch, get_git_user,
-    check_uncommitted_changes, get_repo_root,
-    stash_changes, restore_stashed_changes, pull_default_branch, merge_default_branch_into_current,
-    update_from_default_branch,
-    # String functions
-    normalize_to_kebab_case,
-    # Utility functions
-    ensure_dir, get_timestamp, get_timestamp_filename, confirm_action,
-    exit_with_error, debug_print, is_debug_mode,
-    # Config functions
-    find_change_config, get_config, set_config,
-    get_rdd_config_path, get_rdd_config, set_rdd_config, is_local_only_mode,
-    # Prompt functions
-    mark_prompt_completed, list_prompts, validate_prompt_status,
-    # Help functions
-    help_section, help_command, help_option,
-    Colors
-)
-
-# Constants
-WORKSPACE_DIR = ".rdd-docs/workspace"
-ARCHIVE_BASE_DIR = ".rdd-docs/archive"
-TEMPLATES_DIR = ".rdd/templates"
-
-# Feature flags / hidden options
-# Enhancement selection exists but is hidden from the interactive menu by default.
-SHOW_ENH_IN_MENU_DEFAULT = False
-
-
-# ============================================================================
-# INTERACTIVE UI HELPERS
-# ============================================================================
-
-def _simple_menu(title: str, items: list) -> int:
-    """
-    Simple numbered menu. Returns selected index.
-    Returns -1 if user cancels (enters 'q' or invalid input).
-    """
-    print()
-    print("=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
-    print()
-    
-    for idx, label in enumerate(items, start=1):
-        print(f"  {idx}. {label}")
-    
-    print()
-    print("Enter number to select (or 'q' to cancel): ", end="")
-    
-    try:
-        choice = input().strip().lower()
-        
-        if choice == 'q' or choice == '':
-            return -1
-        
-        try:
-            selected = int(choice)
-            if 1 <= selected <= len(items):
-                return selected - 1
-            else:
-                print_warning(f"Invalid choice. Please enter a number between 1 and {len(items)}")
-                return -1
-        except ValueError:
-            print_warning("Invalid input. Please enter a number.")
-            return -1
-            
-    except (KeyboardInterrupt, EOFError):
-        print()
-        return -1
-
-
-def _simple_text_input(title: str, prompt: str, default: str = "") -> Optional[str]:
-    """
-    Simple text input dialog.
-    Returns user input or None if cancelled.
-    """
-    print()
-    print("=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
-    print()
-    print(prompt)
-    if default:
-        print(f"(Press Enter for default: {default})")
-    print()
-    print("Enter value (or 'q' to cancel): ", end="")
-    
-    try:
-        user_input = input().strip()
-        
-        if user_input.lower() == 'q':
-            return None
-        
-        if not user_input and default:
-            return default
-        
-        return user_input if user_input else None
-            
-    except (KeyboardInterrupt, EOFError):
-        print()
-        return None
-
-
-def _simple_confirmation(title: str, message: str) -> bool:
-    """
-    Simple yes/no confirmation dialog.
-    Returns True if confirmed, False otherwise.
-    """
-    print()
-    print("=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
-    print()
-    print(message)
-    print()
-    print("Confirm? (y/n): ", end="")
-    
-    try:
-        response = input().strip().lower()
-        return response in ['y', 'yes']
-    except (KeyboardInterrupt, EOFError):
-        print()
-        return False
-
-
-def select_change_type_interactive(reveal_enh: bool = SHOW_ENH_IN_MENU_DEFAULT) -> Optional[str]:
-    """
-    Show an interactive menu to select change type.
-    By default, only 'Fix' is shown. 'Enhancement' can be revealed via flag/env.
-    Returns: 'fix' or 'enh' or None if cancelled.
-    """
-    # Build visible options
-    visible_options = [("Stand Alone Prompts", "fix")]
-    if reveal_enh:
-        visible_options.append(("Enhancement", "enh"))
-
-    labels = [label for (label, _code) in visible_options]
-
-    # Use simple numeric menu
-    selected_idx = _simple_menu("Select change type", labels)
-    if selected_idx is None or selected_idx < 0:
-        return None
-    return visible_options[selected_idx][1]
-
-
-def select_default_branch_interactive() -> Optional[str]:
-    """
-    Show an interactive menu to select the default branch.
-    Options: main, dev, or custom entry
-    Returns: selected branch name or None if cancelled.
-    """
-    # Build menu options
-    menu_options = [
-        ("main", "main"),
-        ("dev", "dev"),
-        ("Enter custom branch name", "custom")
-    ]
-    
-    labels = [label for (label, _code) in menu_options]
-    
-    # Use simple numeric menu
-    selected_idx = _simple_menu("Select default branch for RDD framework", labels)
-    if selected_idx is None or selected_idx < 0:
-        return None
-    
-    code = menu_options[selected_idx][1]
-    
-    # If custom, prompt for input
-    if code == "custom":
-        branch_name = _simple_text_input(
-            "Custom Branch Name",
-            "Enter branch name:",
-            default="main"
-        )
-        
-        if not branch_name:
-            print_warning("No branch name entered. Defaulting to 'main'.")
-            return "main"
-        
-        # Validate branch name format
-        if not validate_branch_name(branch_name):
-            print_error(f"Invalid branch name: {branch_name}")
-            return None
-        
-        return branch_name
-    
-    return code
-
-
-# ============================================================================
-# GIT OPERATIONS
-# ============================================================================
-
-def fetch_default_branch() -> bool:
-    """Fetch latest changes from remote default branch. Returns True on success."""
-    default_branch = get_default_branch()
-    print_step(f"Fetching latest from origin/{default_branch}...")
-    
-    result = subprocess.run(
-        ['git', 'fetch', 'origin', default_branch, '--quiet'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode == 0:
-        debug_print(f"Successfully fetched origin/{default_branch}")
-        return True
-    else:
-        print_warning(f"Failed to fetch from origin/{default_branch}")
-        return False
-
-
-def push_to_remote(branch_name: Optional[str] = None) -> bool:
-    """Push current branch to remote with upstream tracking."""
-    if not branch_name:
-        branch_name = get_current_branch()
-    
-    if not branch_name:
-        print_error("No branch name provided and could not determine current branch")
-        return False
-    
-    print_info(f"Pushing branch '{branch_name}' to remote...")
-    
-    result = subprocess.run(
-        ['git', 'push', '-u', 'origin', branch_name],
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode == 0:
-        print_success("Branch pushed to remote with upstream tracking")
-        return True
-    else:
-        print_error("Failed to push branch to remote")
-        if result.stderr:
-            print(result.stderr)
-        return False
-
-
-def auto_commit(message: str) -> int:
-    """
-    Auto-commit all changes with a message.
-    Returns: 0 on success, 1 on failure, 2 if no changes to commit.
-    """
-    if not message:
-        print_error("Commit message is required")
-        return 1
-    
-    print_info("Staging changes...")
-    subprocess.run(['git', 'add', '-A'])
-    
-    # Check if there are changes to commit
-    result = subprocess.run(
-        ['git', 'diff', '--cached', '--quiet'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode == 0:
-        print_warning("No changes to commit")
-        return 2
-    
-    print_info("Committing changes...")
-    result = subprocess.run(
-        ['git', 'commit', '-m', message],
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode == 0:
-        print_success(f"Changes committed: {message}")
-        return 0
-    else:
-        print_error("Failed to commit changes")
-        if result.stderr:
-            print(result.stderr)
-        return 1
-
-
-def compare_with_default_branch() -> bool:
-    """Compare current branch with default branch."""
-    fetch_default_branch()
-    
-    default_branch = get_default_branch()
-    current_branch = get_current_branch()
-    
-    print()
-    print("━" * 50)
-    print(f"  COMPARISON: {current_branch} vs {default_branch}")
-    print("━" * 50)
-    print()
-    
-    # Show commit differences
-    print_step("Commit differences:")
-    result = subprocess.run(
-        ['git', 'rev-list', '--count', f'origin/{default_branch}..HEAD'],
-        capture_output=True,
-        text=True
-    )
-    commit_count = result.stdout.strip() if result.returncode == 0 else "0"
-    print(f"  This branch is {commit_count} commit(s) ahead of {default_branch}")
-    print()
-    
-    if commit_count != "0":
-        subprocess.run([
-            'git', 'log', '--oneline', '--graph', '--max-count=10',
-            f'origin/{default_branch}..HEAD'
-        ])
-        print()
-    
-    # Show file changes
-    print_step("File changes:")
-    get_modified_files()
-    print()
-    
-    print("━" * 50)
-    return True
-
-
-def get_modified_files() -> bool:
-    """Get list of modified files compared to main branch."""
-    default_branch = get_default_branch()
-    current_branch = get_current_branch()
-    
-    print_info(f"Comparing {current_branch} with {default_branch}...")
-    print()
-    
-    result = subprocess.run(
-        ['git', 'diff', '--name-only', f'origin/{default_branch}...HEAD'],
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode != 0 or not result.stdout.strip():
-        print_warning(f"No files modified compared to {default_branch}")
-        return True
-    
-    print("Modified files:")
-    for file in result.stdout.strip().split('\n'):
-        if file:
-            # Get file status
-            status_result = subprocess.run(
-                ['git', 'diff', '--name-status', f'origin/{default_branch}...HEAD'],
-                capture_output=True,
-                text=True
-            )
-            
-            status = 'M'
-            for line in status_result.stdout.split('\n'):
-                if file in line:
-                    status = line.split()[0]
-                    break
-            
-            if status.startswith('A'):
-                print(f"  {Colors.GREEN}+{Colors.NC} {file} (added)")
-            elif status.startswith('M'):
-                print(f"  {Colors.YELLOW}~{Colors.NC} {file} (modified)")
-            elif status.startswith('D'):
-                print(f"  {Colors.RED}-{Colors.NC} {file} (deleted)")
-            elif status.startswith('R'):
-                print(f"  {Colors.CYAN}→{Colors.NC} {file} (renamed)")
-            else:
-                print(f"  {Colors.BLUE}?{Colors.NC} {file}")
-    
-    print()
-    file_count = len([f for f in result.stdout.strip().split('\n') if f])
-    print_success(f"Found {file_count} modified file(s)")
-    return True
-
-
-# ============================================================================
-# BRANCH OPERATIONS
-# ============================================================================
-
-def create_branch(branch_type: str, branch_name: str) -> bool:
-    """Create a new branch with format validation."""
-    if not branch_type or not branch_name:
-        print_error("Branch type and name are required")
-        print("Usage: create_branch <enh|fix> <branch_name>")
-        return False
-    
-    # Validate branch type
-    if branch_type not in ['enh', 'fix']:
-        print_error(f"Invalid branch type: {branch_type}")
-        print_info("Valid types: enh, fix")
-        return False
-    
-    # Validate branch name format (kebab-case only, no prefix added)
-    if not validate_branch_name(branch_name):
-        return False
-    
-    # Use the branch_name as-is (no automatic prefix or timestamp)
-    full_branch_name = branch_name
-    
-    # Check if branch already exists
-    result = subprocess.run(
-        ['git', 'show-ref', '--verify', '--quiet', f'refs/heads/{full_branch_name}'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode == 0:
-        print_error(f"Branch '{full_branch_name}' already exists")
-        return False
-    
-    default_branch = get_default_branch()
-    
-    print_step(f"Creating new branch: {full_branch_name}")
-    
-    # Switch to default branch and pull latest
-    print_info(f"Switching to '{default_branch}' and pulling latest changes...")
-    result = subprocess.run(
-        ['git', 'checkout', default_branch],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode != 0:
-        print_error(f"Failed to checkout '{default_branch}'")
-        return False
-    
-    result = subprocess.run(
-        ['git', 'pull', 'origin', default_branch],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode != 0:
-        print_warning("Failed to pull from origin (continuing anyway)")
-    
-    # Create and checkout new branch
-    print_info(f"Creating branch '{full_branch_name}'...")
-    result = subprocess.run(
-        ['git', 'checkout', '-b', full_branch_name],
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode == 0:
-        print_success(f"Created and checked out branch: {full_branch_name}")
-        print()
-        print_info("Branch details:")
-        print(f"  Type: {branch_type}")
-        print(f"  Branch: {full_branch_name}")
-        return True
-    else:
-        print_error("Failed to create branch")
-        return False
-
-
-def delete_branch(branch_name: str, force: bool = False) -> bool:
-    """Delete a branch locally and remotely with safety checks."""
-    if not branch_name:
-        # Delete current branch
-        branch_name = get_current_branch()
-    
-    if not branch_name:
-        print_error("Branch name is required")
-        return False
-    
-    check_git_repo()
-    
-    # Check for uncommitted changes
-    print_info("Checking for uncommitted changes...")
-    if not check_uncommitted_changes():
-        print_error("Please commit or stash changes before deleting branch")
-        return False
-    print()
-    
-    # Check if branch exists locally
-    result = subprocess.run(
-        ['git', 'show-ref', '--verify', '--quiet', f'refs/heads/{branch_name}'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode != 0:
-        print_error(f"Local branch '{branch_name}' does not exist")
-        return False
-    
-    # Get default branch to switch to
-    default_branch = get_default_branch()
-    
-    # Switch to default branch
-    print_info(f"Switching to branch '{default_branch}'...")
-    result = subprocess.run(
-        ['git', 'checkout', default_branch],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode != 0:
-        print_error(f"Failed to checkout '{default_branch}'")
-        return False
-    print()
-    
-    # Delete local branch
-    print_info(f"Deleting local branch '{branch_name}'...")
-    flag = '-D' if force else '-d'
-    result = subprocess.run(
-        ['git', 'branch', flag, branch_name],
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode == 0:
-        print_success("Local branch deleted" if not force else "Local branch force-deleted")
-    else:
-        print_error("Failed to delete local branch")
-        return False
-    print()
-    
-    # Check if remote branch exists and delete
-    result = subprocess.run(
-        ['git', 'ls-remote', '--heads', 'origin', branch_name],
-        capture_output=True,
-        text=True
-    )
-    
-    if result.stdout.strip():
-        print_info(f"Deleting remote branch 'origin/{branch_name}'...")
-        result = subprocess.run(
-            ['git', 'push', 'origin', '--delete', branch_name],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            print_success("Remote branch deleted")
-        else:
-            print_warning("Failed to delete remote branch (it may not exist)")
-    
-    return True
-
-
-def list_branches(filter_str: Optional[str] = None) -> bool:
-    """List branches with optional filter."""
-    print_step("Listing branches...")
-    print()
-    
-    args = ['git', 'branch', '-a']
-    result = subprocess.run(args, capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        print_error("Failed to list branches")
-        return False
-    
-    branches = result.stdout.strip().split('\n')
-    
-    for branch in branches:
-        branch = branch.strip()
-        if branch:
-            if filter_str and filter_str not in branch:
-                continue
-            
-            if branch.startswith('*'):
-                print(f"{Colors.GREEN}* {branch[2:]}{Colors.NC}")
-            else:
-                print(f"  {branch}")
-    
-    return True
-
-
-def cleanup_after_merge(branch_name: str = None) -> bool:
-    """
-    Clean up after a branch has been merged.
-    Switches to default branch, fetches and pulls latest, deletes the specified merged branch.
-    
-    Args:
-        branch_name: Branch to delete (optional, will prompt if not provided)
-    
-    Returns:
-        True on success, False on failure
-    """
-
-    from rdd_utils import interactive_branch_cleanup
-
-    check_git_repo()
-    
-    print_banner("POST-MERGE CLEANUP")
-    print()
-    
-    # Get default branch and current branch
-    default_branch = get_default_branch()
-    current_branch = get_current_branch()
-    
-    # If no branch name provided, prompt for it or use current branch
-    # if not branch_name:
-    #     # If we're not on the default branch, offer to delete current branch
-    #     if current_branch != default_branch:
-    #         print_info(f"Current branch: {current_branch}")
-    #         if confirm_action("Delete current branch after cleanup?"):
-    #             branch_name = current_branch
-    #         else:
-    #             try:
-    #                 branch_name = input("Enter branch name to delete (or press Enter to skip): ").strip()
-    #             except (KeyboardInterrupt, EOFError):
-    #                 print()
-    #                 print_info("Operation cancelled")
-    #                 return False
-                
-    #             if not branch_name:
-    #                 print_info("No branch specified for deletion")
-    #     else:
-    #         try:
-    #             branch_name = input("Enter branch name to delete (or press Enter to skip): ").strip()
-    #         except (KeyboardInterrupt, EOFError):
-    #             print()
-    #             print_info("Operation cancelled")
-    #             return False
-            
-    #         if not branch_name:
-    #             print_info("No branch specified for deletion")
-    
-    # Switch to default branch
-    print_step(f"1. Switching to '{default_branch}' branch")
-    if current_branch != default_branch:
-        result = subprocess.run(
-            ['git', 'checkout', default_branch],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        
-        if result.returncode != 0:
-            print_error(f"Failed to checkout '{default_branch}'")
-            return False
-        print_success(f"Switched to '{default_branch}'")
-    else:
-        print_info(f"Already on '{default_branch}'")
-    print()
-    
-    # Fetch latest changes
-    # print_step("2. Fetching latest changes from remote")
-    result = subprocess.run(
-        ['git', 'fetch', 'origin'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode != 0:
-        print_warning("Failed to fetch from remote")
-    # else:
-    #     print_success("Fetched latest changes")
-    print()
-    
-    # Pull latest changes for default branch
-    # print_step(f"3. Pulling latest changes for '{default_branch}'")
-    result = subprocess.run(
-        ['git', 'pull', 'origin', default_branch],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode != 0:
-        print_warning("Failed to pull latest changes")
-    # else:
-    #     print_success("Pulled latest changes")
-    # print()
-
-
-    interactive_branch_cleanup(default_branch)
-    
-    # Delete the branch if specified
-    # if branch_name:
-    #     print_step(f"4. Deleting branch '{branch_name}'")
-        
-    #     # Check if branch exists locally
-    #     result = subprocess.run(
-    #         ['git', 'show-ref', '--verify', '--quiet', f'refs/heads/{branch_name}'],
-    #         stdout=subprocess.DEVNULL,
-    #         stderr=subprocess.DEVNULL
-    #     )
-        
-    #     if result.returncode == 0:
-    #         # Try to delete local branch
-    #         result = subprocess.run(
-    #             ['git', 'branch', '-d', branch_name],
-    #             capture_output=True,
-    #             text=True
-    #         )
-            
-    #         if result.returncode == 0:
-    #             print_success("Local branch deleted")
-    #         else:
-    #             print_warning("Branch not fully merged, use --force if needed")
-    #             if confirm_action("Force delete local branch?"):
-    #                 result = subprocess.run(
-    #                     ['git', 'branch', '-D', branch_name],
-    #                     capture_output=True,
-    #                     text=True
-    #                 )
-                    
-    #                 if result.returncode == 0:
-    #                     print_success("Local branch force-deleted")
-    #                 else:
-    #                     print_error("Failed to delete local branch")
-    #     else:
-    #         print_info("Local branch does not exist (already deleted)")
-        
-    #     # Check and delete remote branch
-    #     result = subprocess.run(
-    #         ['git', 'ls-remote', '--heads', 'origin', branch_name],
-    #         capture_output=True,
-    #         text=True
-    #     )
-        
-    #     if result.stdout.strip():
-    #         print_info(f"Deleting remote branch 'origin/{branch_name}'...")
-    #         result = subprocess.run(
-    #             ['git', 'push', 'origin', '--delete', branch_name],
-    #             capture_output=True,
-    #             text=True
-    #         )
-            
-    #         if result.returncode == 0:
-    #             print_success("Remote branch deleted")
-    #         else:
-    #             print_error("Failed to delete remote branch")
-    #     else:
-    #         print_info("Remote branch does not exist (already deleted)")
-        
-    #     print()
-    
-    # Display completion summary
-    print_banner("CLEANUP COMPLETE")
-    print_success("Post-merge cleanup completed successfully!")
-    print()
-    print_info("Summary:")
-    print(f"  • Switched to '{default_branch}' branch")
-    print("  • Fetched and pulled latest changes")
-    if branch_name:
-        print(f"  • Deleted branch '{branch_name}' (local and remote)")
-    print()
-    
-    return True
-
-
-# ============================================================================
-# WORKSPACE OPERATIONS
-# ============================================================================
-
-
-def init_workspace(workspace_type: str = "change") -> bool:
-    """Initialize workspace with templates based on type (change or fix)."""
-    if workspace_type not in ['change', 'fix']:
-        print_error(f"Invalid workspace type: {workspace_type}")
-        print_info("Valid types: change, fix")
-        return False
-    
-    print_step(f"Initializing workspace for type: {workspace_type}...")
-    
-    # Ensure workspace directory exists
-    ensure_dir(WORKSPACE_DIR)
-    
-    # Copy main template based on type
-    if workspace_type == 'fix':
-        copy_template("fix.md", os.path.join(WORKSPACE_DIR, "fix.md"))
-    
-    # Copy work-iteration-prompts.md template to .rdd-docs/ (not workspace subfolder)
-    template_path = os.path.join(TEMPLATES_DIR, "work-iteration-prompts.md")
-    dest_path = ".rdd-docs/work-iteration-prompts.md"
-    
-    if os.path.isfile(template_path):
-        shutil.copy2(template_path, dest_path)
-        print_success(f"Copied work-iteration-prompts.md to .rdd-docs/")
-    else:
-        print_warning(f"Template not found: {template_path}")
-    
-    print_success(f"Workspace initialized successfully for {workspace_type}")
-    return True
-
-
-def copy_template(template_name: str, destination: str) -> bool:
-    """Copy template file to destination with validation."""
-    if not template_name or not destination:
-        print_error("Template name and destination are required")
-        return False
-    
-    template_path = os.path.join(TEMPLATES_DIR, template_name)
-    
-    # Validate template exists
-    if not os.path.isfile(template_path):
-        print_error(f"Template not found: {template_path}")
-        return False
-    
-    # Create destination directory if needed
-    dest_dir = os.path.dirname(destination)
-    ensure_dir(dest_dir)
-    
-    # Check if destination already exists
-    if os.path.isfile(destination):
-        print_warning(f"Destination file already exists: {destination}")
-        if not confirm_action("Overwrite existing file?"):
-            print_info("Copy cancelled by user")
-            return False
-    
-    # Copy template
-    shutil.copy2(template_path, destination)
-    print_success(f"Copied template {template_name} to {destination}")
-    return True
-
-
-def archive_workspace(branch_name: str, keep_workspace: bool = False) -> bool:
-    """Archive workspace to branch-specific folder."""
-    if not branch_name:
-        print_error("Branch name is required")
-        return False
-    
-    # Check if workspace exists and has content
-    if not os.path.isdir(WORKSPACE_DIR):
-        print_error(f"Workspace directory does not exist: {WORKSPACE_DIR}")
-        return False
-    
-    if not os.listdir(WORKSPACE_DIR):
-        print_error(f"Workspace directory is empty: {WORKSPACE_DIR}")
-        return False
-    
-    # Create archive directory named after the branch
-    safe_branch_name = branch_name.replace('/', '-')
-    archive_dir = os.path.join(ARCHIVE_BASE_DIR, safe_branch_name)
-    
-    # Check if archive already exists
-    if os.path.isdir(archive_dir):
-        print_warning(f"Archive directory already exists: {archive_dir}")
-        if not confirm_action("Overwrite existing archive?"):
-            print_info("Archive cancelled by user")
-            return False
-        shutil.rmtree(archive_dir)
-    
-    # Create archive directory
-    os.makedirs(archive_dir, exist_ok=True)
-    
-    # Copy all files from workspace to archive
-    for item in os.listdir(WORKSPACE_DIR):
-        src = os.path.join(WORKSPACE_DIR, item)
-        dst = os.path.join(archive_dir, item)
-        if os.path.isdir(src):
-            shutil.copytree(src, dst)
-        else:
-            shutil.copy2(src, dst)
-    
-    # Create metadata file
-    git_user = get_git_user()
-    result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True)
-    last_commit = result.stdout.strip() if result.returncode == 0 else ""
-    
-    result = subprocess.run(
-        ['git', 'log', '-1', '--pretty=%B'],
-        capture_output=True,
-        text=True
-    )
-    last_message = result.stdout.strip().split('\n')[0] if result.returncode == 0 else ""
-    
-    metadata = {
-        "archivedAt": get_timestamp(),
-        "branch": branch_name,
-        "archivedBy": git_user,
-        "lastCommit": last_commit,
-        "lastCommitMessage": last_message
-    }
-    
-    with open(os.path.join(archive_dir, ".archive-metadata"), 'w') as f:
-        json.dump(metadata, f, indent=2)
-    
-    print_success(f"Workspace archived to: {archive_dir}")
-    
-    # Clean up workspace unless keep_workspace is true
-    if not keep_workspace:
-        clear_workspace_forced()
-        print_info("Workspace directory cleared")
-    else:
-        print_info("Workspace directory kept as requested")
-    
-    return True
-
-
-def clear_workspace() -> bool:
-    """Clear workspace with safety confirmation."""
-    print_warning("This will clear all workspace files.")
-    
-    if os.path.isdir(WORKSPACE_DIR) and os.listdir(WORKSPACE_DIR):
-        print_info("Current workspace contains:")
-        for item in os.listdir(WORKSPACE_DIR):
-            print(f"  - {item}")
-        print()
-    
-    if not confirm_action("Are you sure you want to clear the workspace?"):
-        print_info("Operation cancelled")
-        return False
-    
-    clear_workspace_forced()
-    return True
-
-
-def clear_workspace_forced() -> None:
-    """Clear workspace without confirmation (internal use)."""
-    if not os.path.isdir(WORKSPACE_DIR):
-        debug_print("Workspace directory does not exist")
-        return
-    
-    # Remove all files and subdirectories in workspace
-    for item in os.listdir(WORKSPACE_DIR):
-        item_path = os.path.join(WORKSPACE_DIR, item)
-        if os.path.isdir(item_path):
-            shutil.rmtree(item_path)
-        else:
-            os.remove(item_path)
-    
-    debug_print(f"Removed all contents from {WORKSPACE_DIR}")
-    print_success("Workspace cleared")
-
-
-# ============================================================================
-# ITERATION OPERATIONS (Simplified Workflow)
-# ============================================================================
-
-def complete_iteration() -> bool:
-    """
-    Complete current iteration workflow.
-    Simplified version that archives workspace, commits, and returns to default branch.
-    Returns True on success, False on failure.
-    """
-    current_branch = get_current_branch()
-    default_branch = get_default_branch()
-    
-    if not current_branch:
-        print_error("Could not determine current branch")
-        return False
-    
-    print_banner("Complete Current Iteration")
-    print()
-    
-    # Safety check 1: Not on default branch
-    if current_branch == default_branch:
-        print_error(f"Cannot complete iteration on the default branch ({default_branch})")
-        print_warning("The default branch is not supposed to be committed to directly")
-        print()
-        print_info("Please create a feature branch first using 'Create new iteration'")
-        return False
-    
-    # Safety check 2: Workspace not empty
-    if not os.path.isdir(WORKSPACE_DIR) or not os.listdir(WORKSPACE_DIR):
-        print_error("Workspace directory is empty")
-        print_warning("There is no work to complete")
-        print()
-        print_info("Use 'Create new iteration' to start working on a feature")
-        return False
-    
-    print_info(f"Current branch: {current_branch}")
-    print_info(f"Workspace: {WORKSPACE_DIR}")
-    print()
-    
-    # Step 0: Backup and reset work-iteration-prompts.md and user-story.md
-    print_step("Backing up and resetting iteration files...")
-    
-    # Backup and reset work-iteration-prompts.md
-    prompts_file = ".rdd-docs/work-iteration-prompts.md"
-    prompts_backup = os.path.join(WORKSPACE_DIR, "work-iteration-prompts.md")
-    template_prompts = os.path.join(TEMPLATES_DIR, "work-iteration-prompts.md")
-    
-    # Copy current prompts file to workspace (backup)
-    if os.path.isfile(prompts_file):
-        shutil.copy2(prompts_file, prompts_backup)
-        print_success(f"Backed up prompts file to workspace")
-    else:
-        print_warning(f"Prompts file not found: {prompts_file}")
-    
-    # Reset prompts file from template
-    if os.path.isfile(template_prompts):
-        shutil.copy2(template_prompts, prompts_file)
-        print_success(f"Reset prompts file from template")
-    else:
-        print_warning(f"Template not found: {template_prompts}")
-    
-    # Backup and reset user-story.md
-    user_story_file = ".rdd-docs/user-story.md"
-    user_story_backup = os.path.join(WORKSPACE_DIR, "user-story.md")
-    template_user_story = os.path.join(TEMPLATES_DIR, "user-story.md")
-    
-    # Copy current user story file to workspace (backup)
-    if os.path.isfile(user_story_file):
-        shutil.copy2(user_story_file, user_story_backup)
-        print_success(f"Backed up user story file to workspace")
-    else:
-        print_warning(f"User story file not found: {user_story_file}")
-    
-    # Reset user story file from template
-    if os.path.isfile(template_user_story):
-        shutil.copy2(template_user_story, user_story_file)
-        print_success(f"Reset user story file from template")
-    else:
-        print_warning(f"Template not found: {template_user_story}")
-    print()
-    
-    # Step 1: Archive workspace
-    print_step("1/4 Archiving workspace...")
-    if not archive_workspace(current_branch, keep_workspace=False):
-        print_error("Failed to archive workspace")
-        return False
-    print()
-    
-    # Step 2: Commit changes
-    print_step("2/4 Committing changes...")
-    commit_msg = f"Completing work on {current_branch}"
-    result = auto_commit(commit_msg)
-    
-    if result == 2:
-        print_info("No uncommitted changes to commit")
-    elif result != 0:
-        print_error("Failed to commit changes")
-        return False
-    print()
-    
-    # Step 3: Push to remote (if not local-only)
-    if not is_local_only_mode():
-        print_step("3/4 Push to remote...")
-        if confirm_action("Do you want to push this branch to remote?"):
-            if push_to_remote(current_branch):
-                print()
-                print_success("Branch pushed to remote")
-                print_info("Don't forget to create a pull request on GitHub!")
-            else:
-                print_warning("Failed to push to remote, but continuing...")
-        else:
-            print_info("Skipping push to remote")
-    else:
-        print_info("3/4 Local-only mode: Skipping push to remote")
-    print()
-    
-    # Step 4: Checkout to default branch
-    print_step(f"4/4 Switching to {default_branch} branch...")
-    result = subprocess.run(
-        ['git', 'checkout', default_branch],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode == 0:
-        print_success(f"Switched to {default_branch} branch")
-    else:
-        print_error(f"Failed to checkout {default_branch}")
-        return False
-    
-    print()
-    print_banner("Iteration Complete!")
-    print_success(f"Successfully completed work on: {current_branch}")
-    print()
-    print_info("Summary:")
-    print(f"  • Workspace archived to: .rdd-docs/archive/{current_branch.replace('/', '-')}/")
-    print(f"  • Changes committed: {commit_msg}")
-    print(f"  • Now on branch: {default_branch}")
-    if not is_local_only_mode():
-        print()
-        print_info("Next steps:")
-        print("  1. Create a pull request on GitHub if you pushed")
-        print("  2. Request code review")
-        print("  3. Merge after approval")
-    
-    return True
-
-
-def create_iteration() -> bool:
-    """
-    Create new iteration workflow.
-    Simplified version that creates branch and initializes workspace.
-    Returns True on success, False on failure.
-    """
-    current_branch = get_current_branch()
-    default_branch = get_default_branch()
-    
-    if not current_branch:
-        print_error("Could not determine current branch")
-        return False
-    
-    print_banner("Create New Iteration")
-    print()
-    
-    # Safety check: Must be on default branch
-    if current_branch != default_branch:
-        print_error(f"Must be on {default_branch} branch to create new iteration")
-        print_warning(f"Current branch: {current_branch}")
-        print()
-        print_info(f"Please checkout to {default_branch} first:")
-        print(f"  git checkout {default_branch}")
-        return False
-    
-    # Safety check: Workspace must be empty
-    if os.path.isdir(WORKSPACE_DIR) and os.listdir(WORKSPACE_DIR):
-        print_error("Workspace directory is not empty")
-        print_warning(f"Workspace path: {WORKSPACE_DIR}")
-        print()
-        print("Please complete or clear the current iteration first:")
-        print("  • Use 'Complete current iteration' to finish current work")
-        print("  • Or manually clear workspace if needed")
-        return False
-    
-    
-    # Get branch name from user
-    normalized_name = None
-    while not normalized_name:
-        print("Enter branch name (will be normalized):")
-        print("Examples: 'feature-20251109-1355-improve-installation', 'fix-20251109-1237-bug-123'")
-        try:
-            branch_name = input("> ").strip()
-        except (KeyboardInterrupt, EOFError):
-            print()
-            print_error("Operation cancelled")
-            return False
-        
-        if not branch_name:
-            print_error("Branch name cannot be empty")
-            continue
-        
-        # Normalize the name
-        normalized_name = normalize_to_kebab_case(branch_name)
-        
-        if not normalized_name:
-            print_error(f"Unable to normalize name: {branch_name}")
-            print("Please try a different name (use only letters, numbers, spaces, hyphens, slashes)")
-            continue
-        
-        # Validate normalized name
-        if not validate_branch_name(normalized_name):
-            print_warning(f"Normalized name '{normalized_name}' doesn't meet requirements")
-            print("Requirements: no spaces, use hyphens instead of underscores, avoid special characters")
-            print()
-            normalized_name = None
-            continue
-        
-        # Show normalized name and confirm
-        print_success(f"Branch name: {normalized_name}")
-        try:
-            confirm = input("Use this name? (y/n): ").strip().lower()
-        except (KeyboardInterrupt, EOFError):
-            print()
-            print_error("Operation cancelled")
-            return False
-        
-        if confirm not in ['y', 'yes']:
-            print("Let's try again...")
-            print()
-            normalized_name = None
-    
-    print()
-    
-    # Step 1: Create branch
-    
-    # Check if branch already exists
-    result = subprocess.run(
-        ['git', 'show-ref', '--verify', '--quiet', f'refs/heads/{normalized_name}'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode == 0:
-        print_error(f"Branch '{normalized_name}' already exists")
-        return False
-    
-    # Pull latest from default branch
-    if not is_local_only_mode():
-        print_info(f"Pulling latest from {default_branch}...")
-        result = subprocess.run(
-            ['git', 'pull', 'origin', default_branch],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        
-        if result.returncode != 0:
-            print_warning("Failed to pull latest (continuing anyway)")
-    
-    # Create and checkout new branch
-    result = subprocess.run(
-        ['git', 'checkout', '-b', normalized_name],
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode != 0:
-        print_error("Failed to create branch")
-        return False
-    
-   
-    # Step 2: Initialize workspace
-    
-    # Ensure workspace directory exists
-    ensure_dir(WORKSPACE_DIR)
-    
-    # Copy work-iteration-prompts.md template to .rdd-docs/ (not workspace subfolder)
-    template_path = os.path.join(TEMPLATES_DIR, "work-iteration-prompts.md")
-    dest_path = ".rdd-docs/work-iteration-prompts.md"
-    
-    if not os.path.isfile(template_path):
-        print_error(f"Template not found: {template_path}")
-        return False
-    
-    shutil.copy2(template_path, dest_path)
-    
-    # Copy user-story.md template to .rdd-docs/
-    user_story_template = os.path.join(TEMPLATES_DIR, "user-story.md")
-    user_story_dest = ".rdd-docs/user-story.md"
-    
-    if not os.path.isfile(user_story_template):
-        print_warning(f"User story template not found: {user_story_template}")
-    else:
-        shutil.copy2(user_story_template, user_story_dest)
-
-    
-    # Step 3: Summary
+# Add the script directory to the path to import the domain modules
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
 
-    print_success(f"Ready to work on: {normalized_name}")
-    print()
-    print_info("Summary:")
-    print(f"  • You are working on branch: {normalized_name}")
-    print(f"  • Your files are in Workspace: {WORKSPACE_DIR}")
-    print()
-    print_info("Next steps:")
-    print("  1. Define your prompts in workspace file work-iteration-prompts.md")
-    print("  2. Use execution prompt in .github/prompts to run prompts")
-    print("  3. If meanwhile other developers have updated the default branch, execute 'Update from default' to sync")    
-    print("  4. When done with changes - use document prompt to update docs")
-    print("  5. Run option 'Complete current iteration' to finish and merge to default branch")
+# .rdd/about.json, next to the scripts folder
+ABOUT_FILE = os.path.join(os.path.dirname(SCRIPT_DIR), "about.json")
 
-    return True
-
-
-# ============================================================================
-# CHANGE OPERATIONS (Legacy - kept for CLI compatibility)
-# ============================================================================
-
-def create_change(normalized_name: str, change_type: str = "enh") -> bool:
-    """Create a new change with branch and workspace setup."""
-    # Create the branch
-    if not create_branch(change_type, normalized_name):
-        return False
-    
-    print()
-    
-    # Initialize the workspace
-    workspace_type = "fix" if change_type == "fix" else "change"
-    if not init_workspace(workspace_type):
-        print_error("Failed to initialize workspace")
-        return False
-    
-    print()
-    print_success("Change created successfully!")
-    print_info(f"Branch: {change_type} - {normalized_name}")
-    print_info(f"Workspace initialized in: {WORKSPACE_DIR}")
-    
-    return True
-
-
-def wrap_up_change() -> bool:
-    """Complete the current change workflow."""
-    current_branch = get_current_branch()
-    
-    if not current_branch:
-        print_error("Could not determine current branch")
-        return False
-    
-    # Validate that we're not on a protected branch
-    if not is_valid_work_branch(current_branch):
-        default_branch = get_default_branch()
-        print_error(f"Cannot wrap up: currently on a protected branch")
-        print_warning(f"Current branch: {current_branch}")
-        print()
-        print_info("Wrap-up cannot be performed on protected branches:")
-        print(f"  • {default_branch} (default branch)")
-        print("  • main")
-        print("  • master")
-        print()
-        print_info("Please switch to a feature/fix branch first")
-        print("Valid branch examples:")
-        print("  • my-enhancement")
-        print("  • fix/my-bugfix")
-        print("  • 20241101-1234-my-feature")
-        return False
-    
-    print_banner("Wrap Up Change")
-    print()
-    
-    # Archive workspace
-    print_step("Archiving workspace...")
-    if not archive_workspace(current_branch, keep_workspace=False):
-        print_error("Failed to archive workspace")
-        return False
-    
-    print()
-    
-    # Commit changes (including any uncommitted changes)
-    print_step("Committing changes...")
-    commit_msg = f"wrap up {current_branch}"
-    result = auto_commit(commit_msg)
-    
-    if result == 2:
-        print_info("No uncommitted changes to commit")
-    elif result != 0:
-        print_error("Failed to commit changes")
-        return False
-    
-    print()
-    
-    # Push to remote
-    print_step("Pushing to remote...")
-    if not push_to_remote(current_branch):
-        print_error("Failed to push to remote")
-        return False
-    
-    print()
-    print_banner("Wrap Up Complete")
-    print_success("Change wrapped up successfully!")
-    print()
-    print_info("Next steps:")
-    print("  1. Create a pull request on GitHub")
-    print("  2. Request code review")
-    print("  3. Merge after approval")
-    
-    return True
+# Domain registry: name -> (module, router function, help description).
+# Domains without a description are routed but not listed in the main help.
+DOMAINS = {
+    'branch': ('rdd_branch', 'route_branch', "Branch management operations"),
+    'iteration': ('rdd_iteration', 'route_iteration', "Iterations, including parallel iterations in git worktrees"),
+    'workspace': ('rdd_workspace', 'route_workspace', "Workspace initialization and management"),
+    'change': ('rdd_change', 'route_change', "Change workflow management (legacy)"),
+    'fix': ('rdd_change', 'route_fix', None),
+    'git': ('rdd_git', 'route_git', "Git operations and comparisons"),
+    'prompt': ('rdd_prompt', 'route_prompt', "Stand-alone prompt management"),
+    'config': ('rdd_config', 'route_config', "Configuration management"),
+    'batch': ('rdd_batch', 'route_batch', "Run many commands in one process, one JSON result each"),
+    'serve': ('rdd_daemon', 'route_serve', "Opt-in daemon that answers commands from warm state"),
+}
 
 
 # ============================================================================
@@ -1351,22 +46,13 @@ def wrap_up_change() -> bool:
 # ============================================================================
 
 def get_framework_version() -> str:
-    """Get framework version from .rdd/about.json"""
-    # Get repo root
+    """Get framework version from .rdd/about.json (relative to this script, no git)."""
     try:
-        repo_root = Path(get_repo_root())
-        about_path = repo_root / ".rdd" / "about.json"
-        
-        if about_path.is_file():
-            try:
-                with open(about_path, 'r') as f:
-                    about = json.load(f)
-                    return about.get("version", "unknown")
-            except Exception:
-                pass
+        import json
+        with open(ABOUT_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get("version", "unknown")
     except Exception:
-        pass
-    return "unknown"
+        return "unknown"
 
 
 def show_version() -> None:
@@ -1377,6 +63,7 @@ def show_version() -> None:
 
 def show_main_help() -> None:
     """Show main help message."""
+    from rdd_utils import print_banner
     print_banner("RDD Framework - Requirements-Driven Development")
     print()
     print("Usage:")
@@ -1398,761 +85,32 @@ def show_main_help() -> None:
     print("CLI MODE (Advanced)")
     print()
     print("Available domains for command-line usage:")
-    print("  branch        Branch management operations")
-    print("  workspace     Workspace initialization and management")
-    print("  change        Change workflow management (legacy)")
-    print("  git           Git operations and comparisons")
-    print("  prompt        Stand-alone prompt management")
-    print("  config        Configuration management")
+    for name, (_, _, description) in DOMAINS.items():
+        if description:
+            print(f"  {name:<13} {description}")
     print()
     print("Options:")
     print("  --help, -h    Show this help message")
     print("  --version, -v Show version information")
+    print("  --json        Print the command's result as one JSON document (before the domain)")
+    print("  --profile[=FILE]  Trace every subprocess: summary table on stderr,")
+    print("                    optional Chrome trace JSON (also RDD_TRACE=1, RDD_TRACE_FILE)")
     print()
     print("For domain-specific help, use: python .rdd/scripts/rdd.py <domain> --help")
     print()
     print("Examples:")
     print("  python .rdd/scripts/rdd.py branch delete my-branch")
+    print("  python .rdd/scripts/rdd.py iteration create my-iteration --worktree")
     print("  python .rdd/scripts/rdd.py git compare")
     print("  python .rdd/scripts/rdd.py prompt mark-completed P01")
     print("  python .rdd/scripts/rdd.py config show")
+    print("  python .rdd/scripts/rdd.py --json prompt list")
     print()
     print("━" * 60)
     print()
     print("RECOMMENDATION: Use the interactive menu for simplicity!")
 
 
-def show_branch_help() -> None:
-    """Show branch management help."""
-    print_banner("Branch Management")
-    print()
-    print("Usage: rdd.py branch <action> [options]")
-    print()
-    print("Actions:")
-    print("  create <type> <name>    Create new branch (type: enh|fix)")
-    print("  delete [name] [--force] Delete branch (current if name omitted)")
-    print("  cleanup [name]          Post-merge cleanup: fetch default branch, pull, delete branch")
-    print("  list [filter]           List branches (optional filter)")
-    print()
-    print("Examples:")
-    print("  rdd.py branch create enh my-enhancement")
-    print("  rdd.py branch create fix fix/20251107-my-bugfix")
-    print("  rdd.py branch delete my-old-branch")
-    print("  rdd.py branch cleanup my-enhancement")
-    print("  rdd.py branch list")
-
-
-def show_workspace_help() -> None:
-    """Show workspace management help."""
-    print_banner("Workspace Management")
-    print()
-    print("Usage: rdd.py workspace <action> [options]")
-    print()
-    print("Actions:")
-    print("  init <type>        Initialize workspace (type: change|fix)")
-    print("  archive [--keep]   Archive current workspace")
-    print("  clear              Clear workspace with confirmation")
-    print()
-    print("Examples:")
-    print("  rdd.py workspace init change")
-    print("  rdd.py workspace archive --keep")
-    print("  rdd.py workspace clear")
-
-
-def show_change_help() -> None:
-    """Show change workflow help."""
-    print_banner("Change Workflow")
-    print()
-    print("Usage: rdd.py change <action> [options]")
-    print()
-    print("Actions:")
-    print("  create [type]         Create new change (interactive)")
-    print("                        Optional type: enh (default) | fix")
-    print("  wrap-up               Complete change workflow")
-    print()
-    print("Examples:")
-    print("  rdd.py change create")
-    print("  rdd.py change create fix")
-    print("  rdd.py change wrap-up")
-
-
-def show_git_help() -> None:
-    """Show git operations help."""
-    print_banner("Git Operations")
-    print()
-    print("Usage: rdd.py git <action> [options]")
-    print()
-    print("Actions:")
-    print("  compare                      Compare current branch with default branch")
-    print("  modified-files               List modified files")
-    print("  push                         Push current branch to remote")
-    print("  update-from-default-branch   Update current branch from default branch")
-    print()
-    print("Examples:")
-    print("  rdd.py git compare")
-    print("  rdd.py git modified-files")
-    print("  rdd.py git push")
-    print("  rdd.py git update-from-default-branch")
-
-
-def show_prompt_help() -> None:
-    """Show prompt management help."""
-    print_banner("Prompt Management")
-    print()
-    print("Usage: rdd.py prompt <action> [options]")
-    print()
-    print("Actions:")
-    print("  mark-completed <id>          Mark prompt as completed")
-    print("  list [--status=unchecked]    List prompts")
-    print()
-    print("Examples:")
-    print("  rdd.py prompt mark-completed P01")
-    print("  rdd.py prompt list --status=unchecked")
-
-
-# ============================================================================
-# DOMAIN ROUTING
-# ============================================================================
-
-def route_branch(args: List[str]) -> int:
-    """Route branch domain commands."""
-    if not args or args[0] in ['--help', '-h']:
-        show_branch_help()
-        return 0
-    
-    action = args[0]
-    
-    if action == 'create':
-        if len(args) < 3:
-            print_error("Branch type and name required")
-            print("Usage: rdd.py branch create <type> <name>")
-            return 1
-        return 0 if create_branch(args[1], args[2]) else 1
-    
-    elif action == 'delete':
-        force = '--force' in args
-        branch_name = args[1] if len(args) > 1 and args[1] != '--force' else None
-        if branch_name:
-            return 0 if delete_branch(branch_name, force) else 1
-        else:
-            return 0 if delete_branch(get_current_branch(), force) else 1
-    
-    elif action == 'cleanup':
-        branch_name = args[1] if len(args) > 1 else None
-        return 0 if cleanup_after_merge(branch_name) else 1
-    
-    elif action == 'list':
-        filter_str = args[1] if len(args) > 1 else None
-        return 0 if list_branches(filter_str) else 1
-    
-    else:
-        print_error(f"Unknown branch action: {action}")
-        print("Use 'rdd.py branch --help' for usage information")
-        return 1
-
-
-def route_workspace(args: List[str]) -> int:
-    """Route workspace domain commands."""
-    if not args or args[0] in ['--help', '-h']:
-        show_workspace_help()
-        return 0
-    
-    action = args[0]
-    
-    if action == 'init':
-        if len(args) < 2:
-            print_error("Workspace type required (change|fix)")
-            print("Usage: rdd.py workspace init <type>")
-            return 1
-        return 0 if init_workspace(args[1]) else 1
-    
-    elif action == 'archive':
-        keep = '--keep' in args
-        branch_name = get_current_branch()
-        return 0 if archive_workspace(branch_name, keep) else 1
-    
-    elif action == 'clear':
-        return 0 if clear_workspace() else 1
-    
-    else:
-        print_error(f"Unknown workspace action: {action}")
-        print("Use 'rdd.py workspace --help' for usage information")
-        return 1
-
-
-def route_change(args: List[str]) -> int:
-    """Route change domain commands."""
-    if not args or args[0] in ['--help', '-h']:
-        show_change_help()
-        return 0
-    
-    action = args[0]
-    
-    if action == 'create':
-        # Safety checks
-        current_branch = get_current_branch()
-        default_branch = get_default_branch()
-        
-        if current_branch != default_branch:
-            print_error("Cannot create change: not on default branch")
-            print_warning(f"Current branch: {current_branch}")
-            print_warning(f"Expected branch: {default_branch}")
-            print()
-            print(f"Please switch to the {default_branch} branch before creating a new change:")
-            print(f"  git checkout {default_branch}")
-            return 1
-        
-        # Check if workspace folder is empty
-        if os.path.isdir(WORKSPACE_DIR) and os.listdir(WORKSPACE_DIR):
-            print_error("Cannot create change: workspace directory is not empty")
-            print_warning(f"Workspace path: {WORKSPACE_DIR}")
-            print()
-            print("The workspace directory must be empty before creating a new change.")
-            print()
-            print("Options:")
-            print("  1. Complete current change: rdd.py change wrap-up")
-            print("  2. Archive current workspace: rdd.py workspace archive")
-            print("  3. Clear workspace (WARNING: data loss): rdd.py workspace clear")
-            return 1
-        
-        # Display banner
-        print()
-        print("╔══════════════════════════════════════════════════════════════╗")
-        print("║                      RDD-COPILOT                             ║")
-        print("╠══════════════════════════════════════════════════════════════╣")
-        print("║  Prompt: Create Change                                       ║")
-        print("║                                                              ║")
-        print("║  Description:                                                ║")
-        print("║    • Create a new Change with user-controlled branch name    ║")
-        print("║    • Initialize workspace with necessary files               ║")
-        print("║    • Set up branch for development                           ║")
-        print("║                                                              ║")
-        print("║  User Action:                                                ║")
-        print("║    → Provide a name for the change (full branch name)        ║")
-        print("╚══════════════════════════════════════════════════════════════╝")
-        print()
-        
-        # Prompt for name with normalization loop
-        normalized_name = None
-        while not normalized_name:
-            print("Please provide a branch name for the change (will be normalized to kebab-case):")
-            print("(e.g., 'fix/my-bugfix', 'my-feature', '20251107-update-readme')")
-            try:
-                change_name = input("> ").strip()
-            except (KeyboardInterrupt, EOFError):
-                print()
-                print_error("Operation cancelled")
-                return 1
-            
-            if not change_name:
-                print_error("Branch name cannot be empty")
-                continue
-            
-            # Normalize the name
-            normalized_name = normalize_to_kebab_case(change_name)
-            
-            if not normalized_name:
-                print_error(f"Unable to normalize name: {change_name}")
-                print("Please try a different name (use only letters, numbers, spaces, hyphens, slashes)")
-                continue
-            
-            # Validate normalized name
-            if not validate_branch_name(normalized_name):
-                print_warning(f"Normalized name '{normalized_name}' doesn't meet requirements")
-                print("Requirements: kebab-case, lowercase, hyphens/slashes only")
-                print()
-                normalized_name = None
-                continue
-            
-            # Show normalized name and confirm
-            print_success(f"Normalized branch name: {normalized_name}")
-            try:
-                confirm = input("Use this name? (y/n): ").strip().lower()
-            except (KeyboardInterrupt, EOFError):
-                print()
-                print_error("Operation cancelled")
-                return 1
-            
-            if confirm not in ['y', 'yes']:
-                print("Let's try again...")
-                print()
-                normalized_name = None
-        
-        # Determine change type
-        # Hidden reveal flag for enhancement option in the interactive menu
-        reveal_enh = False
-        # Allow env override to reveal enhancement in menu
-        if os.environ.get("RDD_REVEAL_ENH", "0") in ("1", "true", "True"):
-            reveal_enh = True
-        # Allow hidden CLI flag (will be ignored by help) and strip it from args
-        if "--reveal-enh" in args:
-            reveal_enh = True
-            args = [a for a in args if a != "--reveal-enh"]
-
-        # If user passed type explicitly, honor it (keeps non-interactive, script-param capability)
-        if len(args) > 1 and args[1] in ("enh", "fix"):
-            change_type = args[1]
-        else:
-            # Interactive selection (menu shows only Fix by default)
-            print()
-            print_step("Select change type")
-            selected = select_change_type_interactive(reveal_enh=reveal_enh)
-            if not selected:
-                print_info("Operation cancelled")
-                return 1
-            change_type = selected
-        
-        # Create the change
-        return 0 if create_change(normalized_name, change_type) else 1
-    
-    elif action == 'wrap-up':
-        return 0 if wrap_up_change() else 1
-    
-    else:
-        print_error(f"Unknown change action: {action}")
-        print("Use 'rdd.py change --help' for usage information")
-        sys.exit(1)
-
-
-def route_fix(args: List[str]) -> int:
-    """Route fix domain commands (similar to change but for fixes)."""
-    if not args or args[0] in ['--help', '-h']:
-        print_banner("Fix Workflow")
-        print()
-        print("Usage: rdd.py fix <action> [options]")
-        print()
-        print("Actions:")
-        print("  init <name>    Initialize fix workflow")
-        print("  wrap-up        Complete fix workflow")
-        print()
-        print("Examples:")
-        print("  rdd.py fix init my-bugfix")
-        print("  rdd.py fix wrap-up")
-        return 0
-    
-    action = args[0]
-    
-    if action == 'init':
-        if len(args) < 2:
-            print_error("Fix name required")
-            print("Usage: rdd.py fix init <name>")
-            return 1
-        
-        # Similar safety checks as change create
-        current_branch = get_current_branch()
-        default_branch = get_default_branch()
-        
-        if current_branch != default_branch:
-            print_error("Cannot create fix: not on default branch")
-            return 1
-        
-        if os.path.isdir(WORKSPACE_DIR) and os.listdir(WORKSPACE_DIR):
-            print_error("Cannot create fix: workspace directory is not empty")
-            return 1
-        
-        return 0 if create_change(args[1], "fix") else 1
-    
-    elif action == 'wrap-up':
-        return 0 if wrap_up_change() else 1
-    
-    else:
-        print_error(f"Unknown fix action: {action}")
-        return 1
-
-
-def route_git(args: List[str]) -> int:
-    """Route git domain commands."""
-    if not args or args[0] in ['--help', '-h']:
-        show_git_help()
-        return 0
-    
-    action = args[0]
-    
-    if action == 'compare':
-        return 0 if compare_with_default_branch() else 1
-    
-    elif action == 'modified-files':
-        return 0 if get_modified_files() else 1
-    
-    elif action == 'push':
-        return 0 if push_to_remote() else 1
-    
-    elif action == 'update-from-default-branch':
-        return 0 if update_from_default_branch() else 1
-    
-    else:
-        print_error(f"Unknown git action: {action}")
-        print("Use 'rdd.py git --help' for usage information")
-        return 1
-
-
-def route_prompt(args: List[str]) -> int:
-    """Route prompt domain commands."""
-    if not args or args[0] in ['--help', '-h']:
-        show_prompt_help()
-        return 0
-    
-    action = args[0]
-    
-    if action == 'mark-completed':
-        if len(args) < 2:
-            print_error("Prompt ID required")
-            print("Usage: rdd.py prompt mark-completed <id>")
-            return 1
-        journal_file = ".rdd-docs/work-iteration-prompts.md"
-        return 0 if mark_prompt_completed(args[1], journal_file) else 1
-    
-    elif action == 'list':
-        status = "all"
-        if len(args) > 1:
-            if args[1] == "--status=unchecked":
-                status = "unchecked"
-            elif args[1] == "--status=checked":
-                status = "checked"
-        journal_file = ".rdd-docs/work-iteration-prompts.md"
-        return 0 if list_prompts(status, journal_file) else 1
-    
-    else:
-        print_error(f"Unknown prompt action: {action}")
-        print("Use 'rdd.py prompt --help' for usage information")
-        return 1
-
-
-def route_config(args: List[str]) -> int:
-    """Route config domain commands."""
-    if not args or args[0] in ['--help', '-h']:
-        show_config_help()
-        return 0
-    
-    action = args[0]
-    
-    if action == 'show':
-        config_path = get_rdd_config_path()
-        if not os.path.isfile(config_path):
-            print_warning("No RDD config file found at .rdd-docs/config.json")
-            print_info("Run 'rdd.py change create' to initialize the configuration")
-            return 1
-        try:
-            with open(config_path, 'r') as f:
-                content = f.read()
-            print(content)
-            return 0
-        except Exception as e:
-            print_error(f"Failed to read config: {e}")
-            return 1
-    
-    elif action == 'get':
-        if len(args) < 2:
-            print_error("Config key required")
-            print_info("Usage: rdd.py config get <key>")
-            return 1
-        key = args[1]
-        value = get_rdd_config(key)
-        if value is not None:
-            print(f"{key}: {value}")
-            return 0
-        else:
-            print_warning(f"Config key '{key}' not found")
-            return 1
-    
-    elif action == 'set':
-        if len(args) < 3:
-            print_error("Config key and value required")
-            print_info("Usage: rdd.py config set <key> <value>")
-            return 1
-        key = args[1]
-        value = args[2]
-        
-        if set_rdd_config(key, value):
-            print_success(f"Configuration updated: {key} = {value}")
-            return 0
-        else:
-            return 1
-    
-    else:
-        print_error(f"Unknown config action: {action}")
-        print()
-        show_config_help()
-        return 1
-
-
-def show_config_help() -> None:
-    """Show config management help."""
-    print_banner("Configuration Management")
-    print()
-    print("Usage: rdd.py config <action> [options]")
-    print()
-    print("Actions:")
-    print("  show              Display entire configuration file")
-    print("  get <key>         Get specific configuration value")
-    print("  set <key> <val>   Set configuration value")
-    print()
-    print("Configuration file location: .rdd-docs/config.json")
-    print()
-    print("Available keys:")
-    print("  defaultBranch     The default branch for creating changes")
-    print()
-    print("Examples:")
-    print("  rdd.py config show")
-    print("  rdd.py config get defaultBranch")
-    print("  rdd.py config set defaultBranch dev")
-    print()
-
-
-# ============================================================================
-# MAIN ENTRY POINT
-# ============================================================================
-
-
-# ============================================================================
-# CONFIGURATION MANAGEMENT
-# ============================================================================
-
-def update_version_part(version: str, part: str) -> str:
-    """Update version by incrementing major, minor, or patch."""
-    parts = version.split('.')
-    if len(parts) != 3 or not all(p.isdigit() for p in parts):
-        print_error("Invalid version format. Should be MAJOR.MINOR.PATCH")
-        return version
-    
-    major, minor, patch = map(int, parts)
-    
-    if part == 'major':
-        major += 1
-        minor = 0
-        patch = 0
-    elif part == 'minor':
-        minor += 1
-        patch = 0
-    elif part == 'patch':
-        patch += 1
-    else:
-        print_error(f"Invalid version part: {part}")
-        return version
-    
-    return f"{major}.{minor}.{patch}"
-
-
-def get_git_branches_list() -> list:
-    """Get list of git branches."""
-    try:
-        result = subprocess.run(
-            ['git', 'branch', '--format=%(refname:short)'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True,
-            text=True
-        )
-        branches = [b.strip() for b in result.stdout.splitlines() if b.strip()]
-        return branches
-    except Exception as e:
-        print_error(f"Error getting git branches: {e}")
-        return []
-
-
-def interactive_config_menu() -> None:
-    """Interactive configuration management menu."""
-    print_banner("Configuration Management")
-    
-    # Read current config
-    config_path = get_rdd_config_path()
-    if not os.path.isfile(config_path):
-        print_error("Configuration file not found at .rdd-docs/config.json")
-        print_info("Initialize RDD first by creating an iteration")
-        return
-    
-    try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-    except Exception as e:
-        print_error(f"Failed to read configuration: {e}")
-        return
-    
-    # Display current configuration
-    print()
-    print_info("Current Configuration:")
-    print(f"  Version: {config.get('version', 'N/A')}")
-    print(f"  Default Branch: {config.get('defaultBranch', 'N/A')}")
-    print(f"  Local Only: {config.get('localOnly', False)}")
-    print()
-    
-    # Configuration menu
-    menu_items = [
-        "Update version (major)",
-        "Update version (minor)",
-        "Update version (patch)",
-        "Change default branch",
-        "Toggle local-only mode",
-        "Back to main menu"
-    ]
-    
-    selected = _simple_menu("What would you like to change?", menu_items)
-    
-    if selected == -1 or selected == 5:  # Back
-        return
-    
-    modified = False
-    
-    if selected == 0:  # Major version
-        old_version = config.get('version', '0.0.0')
-        new_version = update_version_part(old_version, 'major')
-        if new_version != old_version:
-            config['version'] = new_version
-            print_success(f"Version updated: {old_version} → {new_version}")
-            modified = True
-    
-    elif selected == 1:  # Minor version
-        old_version = config.get('version', '0.0.0')
-        new_version = update_version_part(old_version, 'minor')
-        if new_version != old_version:
-            config['version'] = new_version
-            print_success(f"Version updated: {old_version} → {new_version}")
-            modified = True
-    
-    elif selected == 2:  # Patch version
-        old_version = config.get('version', '0.0.0')
-        new_version = update_version_part(old_version, 'patch')
-        if new_version != old_version:
-            config['version'] = new_version
-            print_success(f"Version updated: {old_version} → {new_version}")
-            modified = True
-    
-    elif selected == 3:  # Default branch
-        branches = get_git_branches_list()
-        if not branches:
-            print_error("No branches found")
-            return
-        
-        print()
-        print_info("Available branches:")
-        for idx, branch in enumerate(branches, 1):
-            current = " (current)" if branch == config.get('defaultBranch') else ""
-            print(f"  {idx}. {branch}{current}")
-        print()
-        
-        try:
-            choice = input("Select branch number (or 'q' to cancel): ").strip()
-            if choice.lower() == 'q':
-                return
-            
-            sel_idx = int(choice) - 1
-            if 0 <= sel_idx < len(branches):
-                old_branch = config.get('defaultBranch', 'N/A')
-                config['defaultBranch'] = branches[sel_idx]
-                print_success(f"Default branch updated: {old_branch} → {branches[sel_idx]}")
-                modified = True
-            else:
-                print_error("Invalid selection")
-        except (ValueError, KeyboardInterrupt, EOFError):
-            print()
-            print_info("Operation cancelled")
-            return
-    
-    elif selected == 4:  # Toggle local-only mode
-        current = config.get('localOnly', False)
-        config['localOnly'] = not current
-        new_value = "enabled" if config['localOnly'] else "disabled"
-        print_success(f"Local-only mode {new_value}")
-        modified = True
-    
-    # Save changes if modified
-    if modified:
-        try:
-            # Update lastModified timestamp
-            from datetime import datetime, timezone
-            now = datetime.now(timezone.utc).astimezone()
-            config['lastModified'] = now.isoformat()
-            
-            with open(config_path, 'w') as f:
-                json.dump(config, f, indent=2)
-                f.write('\n')
-            
-            print()
-            print_success("Configuration saved successfully")
-        except Exception as e:
-            print_error(f"Failed to save configuration: {e}")
-
-
-# ============================================================================
-# MAIN MENU SYSTEM
-# ============================================================================
-
-def main_menu_loop() -> None:
-    """Main interactive menu loop - Simplified 4-option menu."""
-    # Show banner
-    print()
-    print("╔" + "═" * 62 + "╗")
-    print("║" + " " * 62 + "║")
-    print("║" + "            RDD Framework            ".center(62) + "║")
-    print("║" + "    Requirements-Driven Development   ".center(62) + "║")
-    print("║" + " " * 62 + "║")
-    print("╚" + "═" * 62 + "╝")
-    print()
-    print(f"Version: {get_framework_version()}")
-    print()
-    input("Press Enter to continue...")
-
-    while True:
-        # Get current context
-        current_branch = get_current_branch() or "unknown"
-        default_branch = get_default_branch()
-        
-        print()
-        print(f"Current branch: {current_branch}")
-        print(f"Default branch: {default_branch}")
-        
-        items = [
-            "Create new iteration",
-            "Update from default",
-            "Complete current iteration",
-            "Delete merged branches",
-            "Configuration",
-            "(Reserved)",
-            "(Reserved)",
-            "(Reserved)",
-            "Exit"
-        ]
-        
-        selected = _simple_menu("RDD Framework - Main Menu", items)
-
-        if selected == -1 or selected == 8:  # Exit
-            print_success("Thank you for using RDD Framework!")
-            return
-        
-        # Skip reserved options
-        if selected in [5, 6, 7]:
-            print_warning("This option is reserved for future use")
-            input("\nPress Enter to continue...")
-            continue
-
-        try:
-            if selected == 0:  # Create new iteration
-                create_iteration()
-                input("\nPress Enter to continue...")
-                
-            elif selected == 1:  # Update from default
-                update_from_default_branch()
-                input("\nPress Enter to continue...")
-                
-            elif selected == 2:  # Complete current iteration
-                complete_iteration()
-                input("\nPress Enter to continue...")
-                
-            elif selected == 3:  # Delete merged branches
-                cleanup_after_merge()
-                input("\nPress Enter to continue...")
-            
-            elif selected == 4:  # Configuration
-                interactive_config_menu()
-                input("\nPress Enter to continue...")
-                
-        except Exception as e:
-            print_error(f"Error: {e}")
-            if is_debug_mode():
-                import traceback
-                traceback.print_exc()
-            input("\nPress Enter to continue...")
-
 # ============================================================================
 # MAIN ENTRY POINT
 # ============================================================================
@@ -2162,54 +120,112 @@ def main() -> int:
     Main entry point for the RDD framework.
     Returns exit code (0 for success, non-zero for error).
     Can be called directly by tests or through CLI.
-    """
+    `--profile[=trace.json]` (anywhere) or RDD_TRACE=1 traces every subprocess.
+    """
+    args = sys.argv[1:]
+    # rdd_trace is only imported when tracing may be wanted
+    if 'RDD_TRACE' not in os.environ and not any(a.split('=', 1)[0] == '--profile' for a in args):
+        code = _run_via_daemon(args)
+        return code if code is not None else _run(args)
+    from rdd_trace import extract_profile_args, tracing_requested, enable_tracing, finish_tracing
+    args, profile, trace_file = extract_profile_args(args)
+    if not (profile or tracing_requested()):
+        return _run(args)
+    enable_tracing()
     try:
-        if len(sys.argv) == 1:
+        return _run(args)
+    finally:
+        finish_tracing(trace_file)
+
+
+def _run_via_daemon(args: List[str]) -> Optional[int]:
+    """Hand the command to a running `rdd.py serve` daemon; None means run it here."""
+    if len(args) < 2 or args[0].startswith('-') or os.name == 'nt':
+        return None
+    import rdd_daemon
+    return rdd_daemon.run_via_daemon(args)
+
+
+def _run(args: List[str]) -> int:
+    """Run the interactive menu (no arguments) or one CLI command."""
+    if args and args[0] in ['--version', '-v']:
+        show_version()
+        return 0
+    if args and args[0] == '--json':
+        return _run_json(args[1:])
+    from rdd_utils import (
+        print_error, print_warning, repo_context, configure_colors, colors_wanted,
+        EXIT_SUCCESS, EXIT_FAILURE, EXIT_CANCELLED
+    )
+    configure_colors(colors_wanted(sys.stdout))
+    try:
+        if not args:
             # No arguments - launch interactive menu
-            main_menu_loop()
-            return 0
+            import rdd_menu
+            rdd_menu.main_menu_loop(get_framework_version())
+            return EXIT_SUCCESS
         else:
             # CLI mode for scriptable use
-            args = sys.argv[1:]
-            if args[0] in ['--version', '-v']:
-                show_version()
-                return 0
             if args[0] in ['--help', '-h']:
                 show_main_help()
-                return 0
-            domain = args[0]
-            domain_args = args[1:]
-            if domain == 'branch':
-                return route_branch(domain_args)
-            elif domain == 'workspace':
-                return route_workspace(domain_args)
-            elif domain == 'change':
-                return route_change(domain_args)
-            elif domain == 'fix':
-                return route_fix(domain_args)
-            elif domain == 'git':
-                return route_git(domain_args)
-            elif domain == 'prompt':
-                return route_prompt(domain_args)
-            elif domain == 'config':
-                return route_config(domain_args)
-            else:
-                print_error(f"Unknown domain: {domain}")
-                print()
-                print("Available domains: branch, workspace, change, fix, git, prompt, config")
-                print()
-                print("Use 'rdd.py --help' for more information")
-                return 1
+                return EXIT_SUCCESS
+            # One repository snapshot per CLI command
+            with repo_context():
+                return dispatch_command(args)
     except KeyboardInterrupt:
         print()
         print_warning("Operation cancelled by user")
-        return 130
+        return EXIT_CANCELLED
     except Exception as e:
         print_error(f"Unexpected error: {e}")
         if os.environ.get('DEBUG') == '1':
             import traceback
             traceback.print_exc()
+        return EXIT_FAILURE
+
+
+def _run_json(args: List[str]) -> int:
+    """
+    Run one CLI command without colors, banners or interactive input and print
+    its result as a single JSON document. The exit code is the command's own.
+    """
+    import json
+    from rdd_utils import json_output, EXIT_FAILURE, EXIT_CANCELLED
+    from rdd_batch import run_captured, EXCLUDED_DOMAINS
+
+    with json_output(args) as result:
+        output = ''
+        if not args or args[0].startswith('-') or args[0] in EXCLUDED_DOMAINS:
+            result.add_message('error', "--json needs a command: rdd.py --json <domain> <action> [options]")
+            code = EXIT_FAILURE
+        else:
+            try:
+                captured = run_captured(args)
+                code = captured['exitCode']
+                output = captured['stdout'] + captured['stderr']
+            except KeyboardInterrupt:
+                result.add_message('warning', "Operation cancelled by user")
+                code = EXIT_CANCELLED
+        document = result.to_dict(code, output)
+    print(json.dumps(document, indent=2, ensure_ascii=False))
+    return code
+
+
+def dispatch_command(args: List[str]) -> int:
+    """Route a CLI command (domain followed by its arguments) to its handler."""
+    domain = args[0]
+    entry = DOMAINS.get(domain)
+    if entry is None:
+        from rdd_utils import print_error
+        print_error(f"Unknown domain: {domain}")
+        print()
+        print(f"Available domains: {', '.join(DOMAINS)}")
+        print()
+        print("Use 'rdd.py --help' for more information")
         return 1
+    module_name, router, _ = entry
+    module = __import__(module_name)
+    return getattr(module, router)(args[1:])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+rdd_api.py
+Importable API of the RDD framework for in-process automation.
+
+Functions and Repository methods return typed results (BranchInfo,
+WorkingTreeStatus, PromptEntry, ArchiveRecord) and raise RddError subclasses;
+they never print, prompt or exit. The CLI domains render these results.
+
+Repository methods run git with cwd set to the worktree root and share no
+process-wide state, so threads can drive many repositories at once. The
+exceptions are branches() and create_branch(): they still reuse the CLI
+helpers through Repository.session(), a temporary shim that changes the
+working directory and redirects stdout/stderr under a process-wide lock.
+
+    import sys; sys.path.insert(0, "<repo>/.rdd/scripts")
+    from rdd_api import Repository
+    repo = Repository("/path/to/worktree")
+    pending = [p for p in repo.prompts() if not p.completed]
+    repo.complete_prompt(pending[0].id)
+"""
+
+import io
+import os
+import re
+import json
+import shutil
+import subprocess
+import threading
+from contextlib import contextmanager, redirect_stdout, redirect_stderr
+from typing import List, Optional, Dict, Any
+
+from rdd_utils import (
+    BranchRef, WorkingTreeStatus, RepoContext, repo_context, json_output,
+    get_branch_dashboard, validate_branch_name, local_branch_exists,
+    create_branch_from_default, parse_porcelain_v2, get_config_store, get_timestamp
+)
+from rdd_refs import open_ref_reader, RefReadError
+
+# A branch as shown by the branch dashboard (name, upstream, ahead/behind, ...)
+BranchInfo = BranchRef
+
+# Workspace locations, relative to the worktree root
+WORKSPACE_DIR = ".rdd-docs/workspace"
+ARCHIVE_BASE_DIR = ".rdd-docs/archive"
+PROMPTS_JOURNAL = ".rdd-docs/work-iteration-prompts.md"
+ARCHIVE_METADATA_FILE = ".archive-metadata"
+
+PROMPT_STATUSES = ('unchecked', 'checked', 'all')
+
+# "- [ ] [P01] Title" / "- [x] [P01] Title"
+_PROMPT_RE = re.compile(r'^\s*-\s*\[(\s*|x)\]\s*\[(P[0-9]+)\]\s*(.*)$')
+
+# Repository.session() chdirs into the worktree, which is process-wide
+_session_lock = threading.RLock()
+
+
+# ============================================================================
+# EXCEPTIONS
+# ============================================================================
+
+class RddError(Exception):
+    """Base class of all errors raised by the API."""
+
+
+class NotAGitRepository(RddError):
+    """The path is not inside a git worktree."""
+
+
+class GitError(RddError):
+    """A git command failed."""
+
+
+class InvalidArgument(RddError, ValueError):
+    """An argument (branch name, status filter, regex, ...) is not valid."""
+
+
+class BranchError(RddError):
+    """A branch does not exist, already exists or cannot be changed."""
+
+
+class PromptNotFound(RddError):
+    """No prompt with the given ID in the prompts journal."""
+
+
+class WorkspaceError(RddError):
+    """The workspace or prompts journal is missing, empty or unreadable."""
+
+
+class ArchiveExists(WorkspaceError):
+    """The branch already has an archive (pass overwrite=True to replace it)."""
+
+    def __init__(self, archive_dir: str) -> None:
+        super().__init__(f"Archive directory already exists: {archive_dir}")
+        self.archive_dir = archive_dir
+
+
+# ============================================================================
+# RESULT TYPES
+# ============================================================================
+
+class PromptEntry:
+    """One prompt of the work-iteration prompts journal."""
+
+    def __init__(self, prompt_id: str, title: str, completed: bool, line: int = 0) -> None:
+        self.id = prompt_id
+        self.title = title
+        self.completed = completed
+        self.line = line
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id, 'title': self.title, 'completed': self.completed, 'line': self.line}
+
+
+class ArchiveRecord:
+    """An archived workspace (.rdd-docs/archive/<branch>) and its metadata."""
+
+    def __init__(self, archive_dir: str, branch: str, archived_at: str = "", archived_by: str = "",
+                 last_commit: str = "", last_commit_message: str = "") -> None:
+        self.archive_dir = archive_dir
+        self.branch = branch
+        self.archived_at = archived_at
+        self.archived_by = archived_by
+        self.last_commit = last_commit
+        self.last_commit_message = last_commit_message
+
+    @classmethod
+    def from_metadata(cls, archive_dir: str, metadata: Dict[str, Any]) -> 'ArchiveRecord':
+        return cls(archive_dir, metadata.get('branch', os.path.basename(archive_dir)),
+                   metadata.get('archivedAt', ""), metadata.get('archivedBy', ""),
+                   metadata.get('lastCommit', ""), metadata.get('lastCommitMessage', ""))
+
+    def metadata(self) -> Dict[str, Any]:
+        """Content of the .archive-metadata file."""
+        return {
+            "archivedAt": self.archived_at,
+            "branch": self.branch,
+            "archivedBy": self.archived_by,
+            "lastCommit": self.last_commit,
+            "lastCommitMessage": self.last_commit_message
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'archiveDir': self.archive_dir, **self.metadata()}
+
+
+# ============================================================================
+# PROMPTS
+# ============================================================================
+
+def read_prompts(journal_file: str = PROMPTS_JOURNAL, status: str = "all") -> List[PromptEntry]:
+    """
+    Parse the prompts journal. `status` filters: 'unchecked', 'checked' or 'all'.
+    Raises InvalidArgument or WorkspaceError.
+    """
+    if status not in PROMPT_STATUSES:
+        raise InvalidArgument(f"Invalid status filter: '{status}'")
+    if not os.path.isfile(journal_file):
+        raise WorkspaceError(f"work-iteration-prompts.md not found at: {journal_file}")
+    try:
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except OSError as e:
+        raise WorkspaceError(f"Failed to read file: {e}") from e
+
+    prompts = []
+    for number, line in enumerate(lines, start=1):
+        match = _PROMPT_RE.match(line)
+        if not match:
+            continue
+        completed = match.group(1) == 'x'
+        if status == 'all' or completed == (status == 'checked'):
+            prompts.append(PromptEntry(match.group(2), match.group(3).strip(), completed, number))
+    return prompts
+
+
+def complete_prompt(prompt_id: str, journal_file: str = PROMPTS_JOURNAL) -> bool:
+    """
+    Mark a prompt as completed ("- [ ]" becomes "- [x]").
+    Returns True when the journal changed, False when it was already completed.
+    Raises InvalidArgument, PromptNotFound or WorkspaceError.
+    """
+    if not prompt_id:
+        raise InvalidArgument("Prompt ID is required")
+    if not os.path.isfile(journal_file):
+        raise WorkspaceError(f"work-iteration-prompts.md not found at: {journal_file}")
+    try:
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except OSError as e:
+        raise WorkspaceError(f"Failed to read file: {e}") from e
+
+    escaped = re.escape(prompt_id)
+    if not re.search(rf'^\s*-\s*\[\s*\]\s*\[{escaped}\]', content, re.MULTILINE):
+        if re.search(rf'^\s*-\s*\[x\]\s*\[{escaped}\]', content, re.MULTILINE):
+            return False
+        raise PromptNotFound(f"Prompt {prompt_id} not found in work-iteration-prompts.md")
+
+    new_content = re.sub(rf'(^\s*-\s*)\[\s*\](\s*\[{escaped}\])', r'\1[x]\2', content, flags=re.MULTILINE)
+    try:
+        with open(journal_file, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+    except OSError as e:
+        raise WorkspaceError(f"Failed to mark prompt {prompt_id} as completed: {e}") from e
+    return True
+
+
+# ============================================================================
+# WORKTREE QUERIES
+# ============================================================================
+# Each query takes the worktree root (None: current directory) and runs git
+# there with cwd=, so queries on different repositories can run in parallel.
+
+def _git(root: Optional[str], args: List[str]) -> subprocess.CompletedProcess:
+    """Run one git command in `root` with captured text output."""
+    return subprocess.run(['git'] + list(args), cwd=root, capture_output=True, text=True,
+                          encoding='utf-8', errors='replace')
+
+
+def _ref_reader(root: Optional[str]):
+    """Fork-free ref reader of `root`, or None when refs must be read through git."""
+    try:
+        return open_ref_reader(root)
+    except (RefReadError, OSError):
+        return None
+
+
+def read_current_branch(root: Optional[str] = None) -> str:
+    """Checked-out branch of `root` ("" when HEAD is detached)."""
+    reader = _ref_reader(root)
+    if reader is not None:
+        try:
+            return reader.current_branch()
+        except RefReadError:
+            pass
+    result = _git(root, ['branch', '--show-current'])
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+def branch_exists(branch_name: str, root: Optional[str] = None) -> bool:
+    """Check whether local branch `branch_name` exists in `root`."""
+    if not branch_name:
+        return False
+    ref = f'refs/heads/{branch_name}'
+    reader = _ref_reader(root)
+    if reader is not None:
+        try:
+            return reader.ref_exists(ref)
+        except RefReadError:
+            pass
+    return _git(root, ['show-ref', '--verify', '--quiet', ref]).returncode == 0
+
+
+def read_config(key: str, default: Any = None, root: Optional[str] = None) -> Any:
+    """Value from .rdd-docs/config.json of `root` (cached by the shared ConfigStore)."""
+    return get_config_store(_in_root(root, os.path.join(".rdd-docs", "config.json"))).get(key, default)
+
+
+def read_default_branch(root: Optional[str] = None) -> str:
+    """Default branch of `root`: configured defaultBranch if it exists, then main, then master."""
+    configured = read_config('defaultBranch', root=root)
+    if configured and branch_exists(configured, root):
+        return configured
+    for candidate in ('main', 'master'):
+        if branch_exists(candidate, root):
+            return candidate
+    return 'main'
+
+
+def read_status(root: Optional[str] = None) -> WorkingTreeStatus:
+    """Working tree status of `root` (one `git status --porcelain=v2`). Raises GitError."""
+    result = _git(root, ['status', '--porcelain=v2', '-z', '--branch'])
+    if result.returncode != 0:
+        raise GitError(result.stderr.strip() or f"git status failed in {root or os.getcwd()}")
+    return parse_porcelain_v2(result.stdout)
+
+
+def read_git_user(root: Optional[str] = None) -> str:
+    """Configured git user of `root` as 'Name <email>'."""
+    name = _git(root, ['config', 'user.name']).stdout.strip()
+    email = _git(root, ['config', 'user.email']).stdout.strip()
+    return f"{name} <{email}>"
+
+
+# ============================================================================
+# WORKSPACE ARCHIVES
+# ============================================================================
+
+def _in_root(root: Optional[str], path: str) -> str:
+    """`path` inside worktree `root` (None: relative to the current directory)."""
+    return os.path.join(root, path) if root else path
+
+
+def get_archive_dir(branch_name: str, root: Optional[str] = None) -> str:
+    """Archive folder of a branch (slashes become dashes)."""
+    return os.path.join(_in_root(root, ARCHIVE_BASE_DIR), branch_name.replace('/', '-'))
+
+
+def clear_workspace_dir(root: Optional[str] = None) -> List[str]:
+    """Remove everything inside the workspace folder. Returns the removed names."""
+    workspace = _in_root(root, WORKSPACE_DIR)
+    if not os.path.isdir(workspace):
+        return []
+    items = os.listdir(workspace)
+    for item in items:
+        item_path = os.path.join(workspace, item)
+        if os.path.isdir(item_path):
+            shutil.rmtree(item_path)
+        else:
+            os.remove(item_path)
+    return items
+
+
+def archive_workspace(branch_name: str, keep_workspace: bool = False,
+                      overwrite: bool = False, root: Optional[str] = None) -> ArchiveRecord:
+    """
+    Copy the workspace of worktree `root` (default: current directory) to the
+    branch's archive folder and write its metadata; the workspace is cleared
+    unless keep_workspace is set.
+    Raises InvalidArgument, WorkspaceError or ArchiveExists.
+    """
+    if not branch_name:
+        raise InvalidArgument("Branch name is required")
+    workspace = _in_root(root, WORKSPACE_DIR)
+    if not os.path.isdir(workspace):
+        raise WorkspaceError(f"Workspace directory does not exist: {WORKSPACE_DIR}")
+    if not os.listdir(workspace):
+        raise WorkspaceError(f"Workspace directory is empty: {WORKSPACE_DIR}")
+
+    archive_dir = get_archive_dir(branch_name, root)
+    if os.path.isdir(archive_dir):
+        if not overwrite:
+            raise ArchiveExists(archive_dir)
+        shutil.rmtree(archive_dir)
+    os.makedirs(archive_dir, exist_ok=True)
+
+    for item in os.listdir(workspace):
+        src = os.path.join(workspace, item)
+        dst = os.path.join(archive_dir, item)
+        if os.path.isdir(src):
+            shutil.copytree(src, dst)
+        else:
+            shutil.copy2(src, dst)
+
+    # Last commit id and subject in one git call
+    result = _git(root, ['log', '-1', '--pretty=%H%n%B'])
+    lines = result.stdout.strip().split('\n') if result.returncode == 0 else []
+    last_commit = lines[0] if lines else ""
+    last_message = lines[1] if len(lines) > 1 else ""
+    record = ArchiveRecord(archive_dir, branch_name, get_timestamp(), read_git_user(root),
+                           last_commit, last_message)
+    with open(os.path.join(archive_dir, ARCHIVE_METADATA_FILE), 'w') as f:
+        json.dump(record.metadata(), f, indent=2)
+
+    if not keep_workspace:
+        clear_workspace_dir(root)
+    return record
+
+
+def list_archives(root: Optional[str] = None) -> List[ArchiveRecord]:
+    """Archived workspaces that have metadata, newest first."""
+    base_dir = _in_root(root, ARCHIVE_BASE_DIR)
+    if not os.path.isdir(base_dir):
+        return []
+    records = []
+    for name in sorted(os.listdir(base_dir)):
+        archive_dir = os.path.join(base_dir, name)
+        try:
+            with open(os.path.join(archive_dir, ARCHIVE_METADATA_FILE), 'r') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if isinstance(metadata, dict):
+            records.append(ArchiveRecord.from_metadata(archive_dir, metadata))
+    records.sort(key=lambda r: r.archived_at, reverse=True)
+    return records
+
+
+# ============================================================================
+# REPOSITORY
+# ============================================================================
+
+class Repository:
+    """
+    One git worktree driven in-process. Queries and changes run git with the
+    worktree root as cwd and return results; failures become exceptions.
+    branches() and create_branch() still go through session() (see below).
+    """
+
+    def __init__(self, path: str = ".") -> None:
+        path = os.path.abspath(path)
+        result = _git(path, ['rev-parse', '--show-toplevel']) if os.path.isdir(path) else None
+        if result is None or result.returncode != 0:
+            raise NotAGitRepository(f"Not a git repository: {path}")
+        self.root = result.stdout.strip()
+
+    def __repr__(self) -> str:
+        return f"Repository({self.root!r})"
+
+    @contextmanager
+    def session(self):
+        """
+        Temporary shim for CLI helpers that work on the current directory and
+        print: runs them from the worktree root with a fresh RepoContext and
+        discarded output. This changes process-wide state, so sessions are
+        serialized. Yields the CommandResult that collects their messages
+        (see error()).
+        """
+        with _session_lock:
+            try:
+                previous = os.getcwd()
+            except OSError:
+                previous = None
+            os.chdir(self.root)
+            sink = io.StringIO()
+            try:
+                with redirect_stdout(sink), redirect_stderr(sink), \
+                        repo_context(RepoContext()), json_output(['api']) as result:
+                    yield result
+            finally:
+                if previous is not None and os.path.isdir(previous):
+                    os.chdir(previous)
+
+    @staticmethod
+    def error(result, default: str) -> str:
+        """First error message a helper reported in a session, or `default`."""
+        errors = [m['text'] for m in result.messages if m['level'] == 'error']
+        return errors[0] if errors else default
+
+    # ------------------------------------------------------------------ branches
+
+    def current_branch(self) -> Optional[str]:
+        """Checked-out branch, None when HEAD is detached."""
+        return read_current_branch(self.root) or None
+
+    def default_branch(self) -> str:
+        return read_default_branch(self.root)
+
+    def status(self) -> WorkingTreeStatus:
+        """Working tree status (one `git status --porcelain=v2` run). Raises GitError."""
+        return read_status(self.root)
+
+    def branches(self, pattern: Optional[str] = None, regex: Optional[str] = None,
+                 sort: str = 'recent', limit: Optional[int] = None, skip: int = 0,
+                 include_remotes: bool = False) -> List[BranchInfo]:
+        """Branch dashboard page (see `rdd.py branch list`). Raises InvalidArgument."""
+        with self.session():
+            try:
+                branches, _ = get_branch_dashboard(pattern, regex, sort, limit, skip, include_remotes)
+            except re.error as e:
+                raise InvalidArgument(f"Invalid regex: {e}") from e
+        return branches
+
+    def create_branch(self, branch_name: str) -> BranchInfo:
+        """
+        Create and check out a branch from the up-to-date default branch.
+        Raises InvalidArgument, BranchError or GitError.
+        """
+        with self.session() as result:
+            if not validate_branch_name(branch_name):
+                raise InvalidArgument(self.error(result, f"Invalid branch name: '{branch_name}'"))
+            if local_branch_exists(branch_name):
+                raise BranchError(f"Branch '{branch_name}' already exists")
+            if not create_branch_from_default(branch_name):
+                raise GitError(self.error(result, f"Failed to create branch '{branch_name}'"))
+        return BranchInfo(branch_name, current=True)
+
+    def delete_branch(self, branch_name: str, force: bool = False) -> None:
+        """
+        Delete a local branch (`git branch -d`, or -D with force). The remote
+        branch is left alone. Raises BranchError.
+        """
+        if not branch_exists(branch_name, self.root):
+            raise BranchError(f"Local branch '{branch_name}' does not exist")
+        if read_current_branch(self.root) == branch_name:
+            raise BranchError(f"Branch '{branch_name}' is checked out")
+        result = _git(self.root, ['branch', '-D' if force else '-d', branch_name])
+        if result.returncode != 0:
+            raise BranchError(result.stderr.strip() or f"Failed to delete branch '{branch_name}'")
+
+    # ------------------------------------------------------------------ prompts and workspace
+
+    def prompts(self, status: str = "all") -> List[PromptEntry]:
+        """Prompts of the journal. Raises InvalidArgument or WorkspaceError."""
+        return read_prompts(os.path.join(self.root, PROMPTS_JOURNAL), status)
+
+    def complete_prompt(self, prompt_id: str) -> bool:
+        """Mark a prompt completed; False if it already was. Raises PromptNotFound, WorkspaceError."""
+        return complete_prompt(prompt_id, os.path.join(self.root, PROMPTS_JOURNAL))
+
+    def archive_workspace(self, keep_workspace: bool = False, overwrite: bool = False) -> ArchiveRecord:
+        """Archive the workspace for the current branch. Raises WorkspaceError, ArchiveExists."""
+        return archive_workspace(read_current_branch(self.root), keep_workspace, overwrite, self.root)
+
+    def archives(self) -> List[ArchiveRecord]:
+        return list_archives(self.root)
+
+    def config(self, key: str, default: Any = None) -> Any:
+        """Value from .rdd-docs/config.json."""
+        return read_config(key, default, self.root)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+rdd_batch.py
+Batch domain of the RDD CLI (`rdd.py batch ...`)
+Runs many commands in one process: they share the interpreter, one RepoContext
+and the git executor, and each produces one JSON result line on stdout.
+
+Input (stdin or a file), one command per line:
+  prompt mark-completed P01                          plain command line (shell quoting)
+  ["config", "get", "defaultBranch"]                 JSON array
+  {"id": "q1", "argv": ["branch", "list", "--json"]} JSON object; `id` is echoed back
+Blank lines and lines starting with # are skipped.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shlex
+import builtins
+import tempfile
+from contextlib import redirect_stdout, redirect_stderr
+from typing import List, Optional, Dict, Any, Tuple
+
+from rdd_utils import (
+    print_error, print_banner, get_repo_context, repo_context, RepoContext,
+    colors_enabled, configure_colors
+)
+
+# Domains that cannot run inside a batch (they own the process or read stdin)
+EXCLUDED_DOMAINS = ('batch', 'serve')
+
+# Exit code of a line that could not be parsed into a command
+EXIT_INVALID_LINE = 2
+
+
+def _no_input(prompt: str = '') -> str:
+    raise EOFError("commands run without interactive input here")
+
+
+def _capture_fd(fd: int):
+    """
+    Point file descriptor `fd` at a temp file. Returns (temp file, saved fd,
+    text stream): Python writes to the stream land in the same file, at the
+    same offset, as the output of child processes writing to `fd`, so both
+    stay in write order.
+    """
+    capture = tempfile.TemporaryFile()
+    saved_fd = os.dup(fd)
+    os.dup2(capture.fileno(), fd)
+    stream = io.TextIOWrapper(io.FileIO(os.dup(capture.fileno()), 'w'),
+                              encoding='utf-8', errors='replace', write_through=True)
+    return capture, saved_fd, stream
+
+
+def _release_fd(fd: int, capture, saved_fd: int, stream) -> str:
+    """Restore `fd` and return everything written to the capture."""
+    stream.close()
+    os.dup2(saved_fd, fd)
+    os.close(saved_fd)
+    with capture:
+        capture.seek(0)
+        return capture.read().decode('utf-8', errors='replace')
+
+
+def run_captured(argv: List[str], context: Optional[RepoContext] = None,
+                 color: bool = False) -> Dict[str, Any]:
+    """
+    Run one CLI command in-process with captured output and no interactive input.
+    `context` is the RepoContext shared with other commands (new one if omitted);
+    `color` keeps ANSI colors in the captured text.
+    Child processes writing straight to file descriptors 1 and 2 are captured
+    too, interleaved with the command's own output in write order.
+    Returns {"exitCode", "stdout", "stderr"}.
+    """
+    import rdd
+
+    original_input = builtins.input
+    original_color = colors_enabled()
+    builtins.input = _no_input
+    configure_colors(color)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    out_capture = _capture_fd(1)
+    err_capture = _capture_fd(2)
+    try:
+        with redirect_stdout(out_capture[2]), redirect_stderr(err_capture[2]):
+            try:
+                with repo_context(context):
+                    code = rdd.dispatch_command(argv)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                print_error(f"Unexpected error: {e}")
+                code = 1
+    finally:
+        stdout = _release_fd(1, *out_capture)
+        stderr = _release_fd(2, *err_capture)
+        builtins.input = original_input
+        configure_colors(original_color)
+    return {'exitCode': code, 'stdout': stdout, 'stderr': stderr}
+
+
+def parse_batch_line(line: str) -> Tuple[Optional[Any], Optional[List[str]]]:
+    """
+    Turn one input line into (id, argv). Returns (None, None) for blank and
+    comment lines. Raises ValueError for lines that are not a valid command.
+    """
+    text = line.strip()
+    if not text or text.startswith('#'):
+        return None, None
+    request_id = None
+    if text[0] in '[{':
+        data = json.loads(text)
+        if isinstance(data, dict):
+            request_id = data.get('id')
+            data = data.get('argv')
+        argv = data
+    else:
+        argv = shlex.split(text)
+        # Accept lines copied from docs: "python .rdd/scripts/rdd.py prompt list"
+        for i, token in enumerate(argv[:2]):
+            if token.endswith('rdd.py'):
+                argv = argv[i + 1:]
+                break
+    if not isinstance(argv, list) or not argv or not all(isinstance(a, str) for a in argv):
+        raise ValueError("expected a command (non-empty list of strings)")
+    if argv[0] in EXCLUDED_DOMAINS:
+        raise ValueError(f"'{argv[0]}' cannot run inside a batch")
+    return request_id, argv
+
+
+def run_batch(lines, out=None, stop_on_error: bool = False) -> int:
+    """
+    Run every command in `lines` sequentially, writing one JSON result per
+    command to `out` (default: stdout) as soon as it finishes.
+    Returns 0 when all commands succeeded, otherwise 1.
+    """
+    out = out or sys.stdout
+    # Share the snapshot opened for the batch command itself
+    context = get_repo_context() or RepoContext()
+    failed = False
+    for number, line in enumerate(lines, start=1):
+        started = time.perf_counter()
+        try:
+            request_id, argv = parse_batch_line(line)
+        except ValueError as e:
+            result = {'exitCode': EXIT_INVALID_LINE, 'stdout': '', 'stderr': '', 'error': f"Invalid line: {e}"}
+            request_id, argv = None, None
+        else:
+            if argv is None:
+                continue
+            result = run_captured(argv, context)
+        record = {'line': number}
+        if request_id is not None:
+            record['id'] = request_id
+        record['argv'] = argv
+        record.update(result)
+        record['durationMs'] = round((time.perf_counter() - started) * 1000, 3)
+        out.write(json.dumps(record) + '\n')
+        out.flush()
+        if record['exitCode'] != 0:
+            failed = True
+            if stop_on_error:
+                break
+    return 1 if failed else 0
+
+
+# ============================================================================
+# HELP
+# ============================================================================
+
+def show_batch_help() -> None:
+    """Show batch mode help."""
+    print_banner("Batch Mode")
+    print()
+    print("Usage: rdd.py batch [FILE|-] [--stop-on-error]")
+    print()
+    print("Reads one command per line from FILE or stdin and runs them in one process")
+    print("(shared repository snapshot and git executor). Each command prints one JSON")
+    print("line: {\"line\", \"id\", \"argv\", \"exitCode\", \"stdout\", \"stderr\", \"durationMs\"}.")
+    print()
+    print("Line formats:")
+    print("  prompt mark-completed P01                           Plain command line")
+    print("  [\"config\", \"get\", \"defaultBranch\"]                  JSON array")
+    print("  {\"id\": \"q1\", \"argv\": [\"branch\", \"list\", \"--json\"]}  JSON object (id echoed)")
+    print()
+    print("Commands get no interactive input. Exit code: 0 if every command succeeded, else 1.")
+    print("--stop-on-error stops after the first failing command.")
+    print()
+    print("Examples:")
+    print("  printf 'prompt mark-completed P01\\nprompt list\\n' | rdd.py batch")
+    print("  rdd.py batch commands.txt --stop-on-error")
+
+
+# ============================================================================
+# DOMAIN ROUTING
+# ============================================================================
+
+def route_batch(args: List[str]) -> int:
+    """Route batch domain commands."""
+    if args and args[0] in ['--help', '-h']:
+        show_batch_help()
+        return 0
+
+    stop_on_error = False
+    source = None
+    for arg in args:
+        if arg == '--stop-on-error':
+            stop_on_error = True
+        elif arg.startswith('-') and arg != '-':
+            print_error(f"Unknown option: {arg}")
+            print("Use 'rdd.py batch --help' for usage information")
+            return 1
+        elif source is None:
+            source = arg
+        else:
+            print_error("Only one input file can be given")
+            return 1
+
+    if source in (None, '-'):
+        return run_batch(sys.stdin, stop_on_error=stop_on_error)
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            return run_batch(f, stop_on_error=stop_on_error)
+    except OSError as e:
+        print_error(f"Cannot read batch file: {e}")
+        return 1
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+rdd_branch.py
+Branch domain of the RDD CLI (`rdd.py branch ...`)
+Branch creation, deletion, the branch dashboard and post-merge cleanup.
+"""
+
+import subprocess
+import json
+import re
+from typing import List, Optional
+
+from rdd_utils import (
+    print_success, print_error, print_warning, print_info, print_step, print_banner,
+    validate_branch_name, check_git_repo, get_current_branch, get_default_branch,
+    check_uncommitted_changes, invalidate_repo_context, run_git, run_remote, fetch_from_remote,
+    pull_from_remote, local_branch_exists, get_branch_dashboard, BRANCH_SORT_KEYS,
+    create_branch_from_default, remote_branch_exists, record_remote_update, Colors,
+    json_output_enabled, record_result
+)
+
+
+# ============================================================================
+# BRANCH OPERATIONS
+# ============================================================================
+
+def create_branch(branch_type: str, branch_name: str) -> bool:
+    """Create a new branch with format validation."""
+    if not branch_type or not branch_name:
+        print_error("Branch type and name are required")
+        print("Usage: create_branch <enh|fix> <branch_name>")
+        return False
+    
+    # Validate branch type
+    if branch_type not in ['enh', 'fix']:
+        print_error(f"Invalid branch type: {branch_type}")
+        print_info("Valid types: enh, fix")
+        return False
+    
+    # Validate branch name format (kebab-case only, no prefix added)
+    if not validate_branch_name(branch_name):
+        return False
+    
+    # Use the branch_name as-is (no automatic prefix or timestamp)
+    full_branch_name = branch_name
+    
+    # Check if branch already exists
+    if local_branch_exists(full_branch_name):
+        print_error(f"Branch '{full_branch_name}' already exists")
+        return False
+    
+    default_branch = get_default_branch()
+    
+    print_step(f"Creating new branch: {full_branch_name}")
+    
+    # Update the default branch ref and branch off it without a separate checkout
+    print_info(f"Updating '{default_branch}' and creating branch '{full_branch_name}'...")
+    
+    if create_branch_from_default(full_branch_name, default_branch):
+        record_result(branch=full_branch_name, type=branch_type, base=default_branch)
+        print_success(f"Created and checked out branch: {full_branch_name}")
+        print()
+        print_info("Branch details:")
+        print(f"  Type: {branch_type}")
+        print(f"  Branch: {full_branch_name}")
+        return True
+    else:
+        print_error("Failed to create branch")
+        return False
+
+
+def delete_branch(branch_name: str, force: bool = False) -> bool:
+    """Delete a branch locally and remotely with safety checks."""
+    if not branch_name:
+        # Delete current branch
+        branch_name = get_current_branch()
+    
+    if not branch_name:
+        print_error("Branch name is required")
+        return False
+    
+    check_git_repo()
+    
+    # Check for uncommitted changes
+    print_info("Checking for uncommitted changes...")
+    if not check_uncommitted_changes():
+        print_error("Please commit or stash changes before deleting branch")
+        return False
+    print()
+    
+    # Check if branch exists locally
+    if not local_branch_exists(branch_name):
+        print_error(f"Local branch '{branch_name}' does not exist")
+        return False
+    
+    # Get default branch to switch to
+    default_branch = get_default_branch()
+    
+    # Switch to default branch
+    print_info(f"Switching to branch '{default_branch}'...")
+    result = run_git(
+        ['checkout', default_branch],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    invalidate_repo_context('current_branch')
+    
+    if result.returncode != 0:
+        print_error(f"Failed to checkout '{default_branch}'")
+        return False
+    print()
+    
+    # Delete local branch
+    print_info(f"Deleting local branch '{branch_name}'...")
+    flag = '-D' if force else '-d'
+    result = run_git(
+        ['branch', flag, branch_name],
+        capture_output=True,
+        text=True
+    )
+    invalidate_repo_context('refs')
+    
+    if result.returncode == 0:
+        record_result(branch=branch_name, forced=force, remoteDeleted=False)
+        print_success("Local branch deleted" if not force else "Local branch force-deleted")
+    else:
+        print_error("Failed to delete local branch")
+        return False
+    print()
+    
+    # Check if remote branch exists (remote-ref cache) and delete
+    if remote_branch_exists(branch_name, 'origin'):
+        print_info(f"Deleting remote branch 'origin/{branch_name}'...")
+        result = run_remote('push', ['push', 'origin', '--delete', branch_name])
+        
+        if result.returncode == 0:
+            record_remote_update(branch_name, None, 'origin')
+            record_result(remoteDeleted=True)
+            print_success("Remote branch deleted")
+        else:
+            print_warning("Failed to delete remote branch (it may not exist)")
+    
+    return True
+
+
+def list_branches(filter_str: Optional[str] = None, regex: Optional[str] = None,
+                  sort: str = 'recent', limit: Optional[int] = None, skip: int = 0,
+                  include_remotes: bool = False, as_json: bool = False) -> bool:
+    """
+    Show the branch dashboard: branches sorted by recency (or name/ahead/behind)
+    with ahead/behind counts relative to the default branch.
+    filter_str is a glob or substring, regex a regular expression.
+    """
+    try:
+        branches, total = get_branch_dashboard(filter_str, regex, sort, limit, skip, include_remotes)
+    except re.error as e:
+        print_error(f"Invalid regex: {e}")
+        return False
+    
+    if as_json or json_output_enabled():
+        document = {
+            'base': get_default_branch(),
+            'total': total,
+            'skip': skip,
+            'limit': limit,
+            'branches': [b.to_dict() for b in branches]
+        }
+        if json_output_enabled():
+            record_result(**document)
+        else:
+            print(json.dumps(document, indent=2))
+        return True
+    
+    print_step(f"Branches (ahead/behind {get_default_branch()}):")
+    print()
+    
+    if not branches:
+        print_info("No matching branches")
+        return True
+    
+    width = max(len(b.name) for b in branches)
+    for branch in branches:
+        counts = "" if branch.ahead is None else f"+{branch.ahead}/-{branch.behind}"
+        upstream = f"{branch.upstream} {branch.track}".strip()
+        line = f"{branch.name:<{width}}  {branch.committer_date:<10}  {counts:>11}  {upstream}".rstrip()
+        if branch.current:
+            print(f"{Colors.GREEN}* {line}{Colors.NC}")
+        else:
+            print(f"  {line}")
+    
+    if len(branches) < total:
+        print()
+        print_info(f"Showing {skip + 1}-{skip + len(branches)} of {total} branches (use --limit/--skip to page)")
+    
+    return True
+
+
+def cleanup_after_merge(branch_name: str = None) -> bool:
+    """
+    Clean up after a branch has been merged.
+    Switches to default branch, fetches and pulls latest, deletes the specified merged branch.
+    
+    Args:
+        branch_name: Branch to delete (optional, will prompt if not provided)
+    
+    Returns:
+        True on success, False on failure
+    """
+
+    from rdd_utils import interactive_branch_cleanup
+
+    check_git_repo()
+    
+    print_banner("POST-MERGE CLEANUP")
+    print()
+    
+    # Get default branch and current branch
+    default_branch = get_default_branch()
+    current_branch = get_current_branch()
+    
+    # If no branch name provided, prompt for it or use current branch
+    # if not branch_name:
+    #     # If we're not on the default branch, offer to delete current branch
+    #     if current_branch != default_branch:
+    #         print_info(f"Current branch: {current_branch}")
+    #         if confirm_action("Delete current branch after cleanup?"):
+    #             branch_name = current_branch
+    #         else:
+    #             try:
+    #                 branch_name = input("Enter branch name to delete (or press Enter to skip): ").strip()
+    #             except (KeyboardInterrupt, EOFError):
+    #                 print()
+    #                 print_info("Operation cancelled")
+    #                 return False
+                
+    #             if not branch_name:
+    #                 print_info("No branch specified for deletion")
+    #     else:
+    #         try:
+    #             branch_name = input("Enter branch name to delete (or press Enter to skip): ").strip()
+    #         except (KeyboardInterrupt, EOFError):
+    #             print()
+    #             print_info("Operation cancelled")
+    #             return False
+            
+    #         if not branch_name:
+    #             print_info("No branch specified for deletion")
+    
+    # Switch to default branch
+    print_step(f"1. Switching to '{default_branch}' branch")
+    if current_branch != default_branch:
+        result = subprocess.run(
+            ['git', 'checkout', default_branch],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        invalidate_repo_context('current_branch')
+        
+        if result.returncode != 0:
+            print_error(f"Failed to checkout '{default_branch}'")
+            return False
+        print_success(f"Switched to '{default_branch}'")
+    else:
+        print_info(f"Already on '{default_branch}'")
+    print()
+    
+    # Fetch latest changes
+    # print_step("2. Fetching latest changes from remote")
+    result = fetch_from_remote([])
+    
+    if result.returncode != 0:
+        print_warning("Failed to fetch from remote")
+    # else:
+    #     print_success("Fetched latest changes")
+    print()
+    
+    # Pull latest changes for default branch
+    # print_step(f"3. Pulling latest changes for '{default_branch}'")
+    result = pull_from_remote(default_branch)
+    
+    if result.returncode != 0:
+        print_warning("Failed to pull latest changes")
+    # else:
+    #     print_success("Pulled latest changes")
+    # print()
+
+
+    interactive_branch_cleanup(default_branch)
+    
+    # Delete the branch if specified
+    # if branch_name:
+    #     print_step(f"4. Deleting branch '{branch_name}'")
+        
+    #     # Check if branch exists locally
+    #     result = subprocess.run(
+    #         ['git', 'show-ref', '--verify', '--quiet', f'refs/heads/{branch_name}'],
+    #         stdout=subprocess.DEVNULL,
+    #         stderr=subprocess.DEVNULL
+    #     )
+        
+    #     if result.returncode == 0:
+    #         # Try to delete local branch
+    #         result = subprocess.run(
+    #             ['git', 'branch', '-d', branch_name],
+    #             capture_output=True,
+    #             text=True
+    #         )
+            
+    #         if result.returncode == 0:
+    #             print_success("Local branch deleted")
+    #         else:
+    #             print_warning("Branch not fully merged, use --force if needed")
+    #             if confirm_action("Force delete local branch?"):
+    #                 result = subprocess.run(
+    #                     ['git', 'branch', '-D', branch_name],
+    #                     capture_output=True,
+    #                     text=True
+    #                 )
+                    
+    #                 if result.returncode == 0:
+    #                     print_success("Local branch force-deleted")
+    #                 else:
+    #                     print_error("Failed to delete local branch")
+    #     else:
+    #         print_info("Local branch does not exist (already deleted)")
+        
+    #     # Check and delete remote branch
+    #     result = subprocess.run(
+    #         ['git', 'ls-remote', '--heads', 'origin', branch_name],
+    #         capture_output=True,
+    #         text=True
+    #     )
+        
+    #     if result.stdout.strip():
+    #         print_info(f"Deleting remote branch 'origin/{branch_name}'...")
+    #         result = subprocess.run(
+    #             ['git', 'push', 'origin', '--delete', branch_name],
+    #             capture_output=True,
+    #             text=True
+    #         )
+            
+    #         if result.returncode == 0:
+    #             print_success("Remote branch deleted")
+    #         else:
+    #             print_error("Failed to delete remote branch")
+    #     else:
+    #         print_info("Remote branch does not exist (already deleted)")
+        
+    #     print()
+    
+    # Display completion summary
+    print_banner("CLEANUP COMPLETE")
+    print_success("Post-merge cleanup completed successfully!")
+    print()
+    print_info("Summary:")
+    print(f"  • Switched to '{default_branch}' branch")
+    print("  • Fetched and pulled latest changes")
+    if branch_name:
+        print(f"  • Deleted branch '{branch_name}' (local and remote)")
+    print()
+    
+    return True
+
+
+# ============================================================================
+# HELP
+# ============================================================================
+
+def show_branch_help() -> None:
+    """Show branch management help."""
+    print_banner("Branch Management")
+    print()
+    print("Usage: rdd.py branch <action> [options]")
+    print()
+    print("Actions:")
+    print("  create <type> <name>    Create new branch (type: enh|fix)")
+    print("  delete [name] [--force] Delete branch (current if name omitted)")
+    print("  cleanup [name]          Post-merge cleanup: fetch default branch, pull, delete branch")
+    print("  list [pattern] [opts]   Branch dashboard: recency, ahead/behind default branch")
+    print("                          --regex RE, --sort recent|name|ahead|behind,")
+    print("                          --limit N, --skip N, --all (remotes), --json")
+    print()
+    print("Examples:")
+    print("  rdd.py branch create enh my-enhancement")
+    print("  rdd.py branch create fix fix/20251107-my-bugfix")
+    print("  rdd.py branch delete my-old-branch")
+    print("  rdd.py branch cleanup my-enhancement")
+    print("  rdd.py branch list")
+    print("  rdd.py branch list 'enh/*' --limit 20")
+
+
+# ============================================================================
+# DOMAIN ROUTING
+# ============================================================================
+
+def route_branch(args: List[str]) -> int:
+    """Route branch domain commands."""
+    if not args or args[0] in ['--help', '-h']:
+        show_branch_help()
+        return 0
+    
+    action = args[0]
+    
+    if action == 'create':
+        if len(args) < 3:
+            print_error("Branch type and name required")
+            print("Usage: rdd.py branch create <type> <name>")
+            return 1
+        return 0 if create_branch(args[1], args[2]) else 1
+    
+    elif action == 'delete':
+        force = '--force' in args
+        branch_name = args[1] if len(args) > 1 and args[1] != '--force' else None
+        if branch_name:
+            return 0 if delete_branch(branch_name, force) else 1
+        else:
+            return 0 if delete_branch(get_current_branch(), force) else 1
+    
+    elif action == 'cleanup':
+        branch_name = args[1] if len(args) > 1 else None
+        return 0 if cleanup_after_merge(branch_name) else 1
+    
+    elif action == 'list':
+        options = {'filter_str': None, 'regex': None, 'sort': 'recent', 'limit': None,
+                   'skip': 0, 'include_remotes': False, 'as_json': False}
+        rest = args[1:]
+        try:
+            while rest:
+                arg = rest.pop(0)
+                if arg in ['--all', '-a']:
+                    options['include_remotes'] = True
+                elif arg == '--json':
+                    options['as_json'] = True
+                elif arg == '--regex':
+                    options['regex'] = rest.pop(0)
+                elif arg == '--sort':
+                    options['sort'] = rest.pop(0)
+                    if options['sort'] not in BRANCH_SORT_KEYS:
+                        print_error(f"Unknown sort order: {options['sort']}")
+                        print_info(f"Valid values: {', '.join(BRANCH_SORT_KEYS)}")
+                        return 1
+                elif arg in ['--limit', '--skip']:
+                    value = int(rest.pop(0))
+                    if value < 0:
+                        raise ValueError(arg)
+                    options[arg[2:]] = value
+                else:
+                    options['filter_str'] = arg
+        except (IndexError, ValueError):
+            print_error("Invalid list options")
+            print("Usage: rdd.py branch list [pattern] [--regex RE] [--sort recent|name|ahead|behind] [--limit N] [--skip N] [--all] [--json]")
+            return 1
+        return 0 if list_branches(**options) else 1
+    
+    else:
+        print_error(f"Unknown branch action: {action}")
+        print("Use 'rdd.py branch --help' for usage information")
+        return 1
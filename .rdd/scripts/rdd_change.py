@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+rdd_change.py
+Change and fix domains of the RDD CLI (`rdd.py change ...`, legacy)
+Change creation and wrap-up on top of the branch and workspace domains.
+"""
+
+import sys
+import os
+from typing import List
+
+from rdd_utils import (
+    print_success, print_error, print_warning, print_info, print_step, print_banner,
+    validate_branch_name, get_current_branch, get_default_branch, is_valid_work_branch,
+    normalize_to_kebab_case
+)
+from rdd_ui import select_change_type_interactive
+from rdd_git import push_to_remote, auto_commit
+from rdd_branch import create_branch
+from rdd_workspace import WORKSPACE_DIR, init_workspace, archive_workspace
+
+
+# ============================================================================
+# CHANGE OPERATIONS
+# ============================================================================
+
+def create_change(normalized_name: str, change_type: str = "enh") -> bool:
+    """Create a new change with branch and workspace setup."""
+    # Create the branch
+    if not create_branch(change_type, normalized_name):
+        return False
+    
+    print()
+    
+    # Initialize the workspace
+    workspace_type = "fix" if change_type == "fix" else "change"
+    if not init_workspace(workspace_type):
+        print_error("Failed to initialize workspace")
+        return False
+    
+    print()
+    print_success("Change created successfully!")
+    print_info(f"Branch: {change_type} - {normalized_name}")
+    print_info(f"Workspace initialized in: {WORKSPACE_DIR}")
+    
+    return True
+
+
+def wrap_up_change() -> bool:
+    """Complete the current change workflow."""
+    current_branch = get_current_branch()
+    
+    if not current_branch:
+        print_error("Could not determine current branch")
+        return False
+    
+    # Validate that we're not on a protected branch
+    if not is_valid_work_branch(current_branch):
+        default_branch = get_default_branch()
+        print_error(f"Cannot wrap up: currently on a protected branch")
+        print_warning(f"Current branch: {current_branch}")
+        print()
+        print_info("Wrap-up cannot be performed on protected branches:")
+        print(f"  • {default_branch} (default branch)")
+        print("  • main")
+        print("  • master")
+        print()
+        print_info("Please switch to a feature/fix branch first")
+        print("Valid branch examples:")
+        print("  • my-enhancement")
+        print("  • fix/my-bugfix")
+        print("  • 20241101-1234-my-feature")
+        return False
+    
+    print_banner("Wrap Up Change")
+    print()
+    
+    # Archive workspace
+    print_step("Archiving workspace...")
+    if not archive_workspace(current_branch, keep_workspace=False):
+        print_error("Failed to archive workspace")
+        return False
+    
+    print()
+    
+    # Commit changes (including any uncommitted changes)
+    print_step("Committing changes...")
+    commit_msg = f"wrap up {current_branch}"
+    result = auto_commit(commit_msg)
+    
+    if result == 2:
+        print_info("No uncommitted changes to commit")
+    elif result != 0:
+        print_error("Failed to commit changes")
+        return False
+    
+    print()
+    
+    # Push to remote
+    print_step("Pushing to remote...")
+    if not push_to_remote(current_branch):
+        print_error("Failed to push to remote")
+        return False
+    
+    print()
+    print_banner("Wrap Up Complete")
+    print_success("Change wrapped up successfully!")
+    print()
+    print_info("Next steps:")
+    print("  1. Create a pull request on GitHub")
+    print("  2. Request code review")
+    print("  3. Merge after approval")
+    
+    return True
+
+
+# ============================================================================
+# HELP
+# ============================================================================
+
+def show_change_help() -> None:
+    """Show change workflow help."""
+    print_banner("Change Workflow")
+    print()
+    print("Usage: rdd.py change <action> [options]")
+    print()
+    print("Actions:")
+    print("  create [type]         Create new change (interactive)")
+    print("                        Optional type: enh (default) | fix")
+    print("  wrap-up               Complete change workflow")
+    print()
+    print("Examples:")
+    print("  rdd.py change create")
+    print("  rdd.py change create fix")
+    print("  rdd.py change wrap-up")
+
+
+# ============================================================================
+# DOMAIN ROUTING
+# ============================================================================
+
+def route_change(args: List[str]) -> int:
+    """Route change domain commands."""
+    if not args or args[0] in ['--help', '-h']:
+        show_change_help()
+        return 0
+    
+    action = args[0]
+    
+    if action == 'create':
+        # Safety checks
+        current_branch = get_current_branch()
+        default_branch = get_default_branch()
+        
+        if current_branch != default_branch:
+            print_error("Cannot create change: not on default branch")
+            print_warning(f"Current branch: {current_branch}")
+            print_warning(f"Expected branch: {default_branch}")
+            print()
+            print(f"Please switch to the {default_branch} branch before creating a new change:")
+            print(f"  git checkout {default_branch}")
+            return 1
+        
+        # Check if workspace folder is empty
+        if os.path.isdir(WORKSPACE_DIR) and os.listdir(WORKSPACE_DIR):
+            print_error("Cannot create change: workspace directory is not empty")
+            print_warning(f"Workspace path: {WORKSPACE_DIR}")
+            print()
+            print("The workspace directory must be empty before creating a new change.")
+            print()
+            print("Options:")
+            print("  1. Complete current change: rdd.py change wrap-up")
+            print("  2. Archive current workspace: rdd.py workspace archive")
+            print("  3. Clear workspace (WARNING: data loss): rdd.py workspace clear")
+            return 1
+        
+        # Display banner
+        print()
+        print("╔══════════════════════════════════════════════════════════════╗")
+        print("║                      RDD-COPILOT                             ║")
+        print("╠══════════════════════════════════════════════════════════════╣")
+        print("║  Prompt: Create Change                                       ║")
+        print("║                                                              ║")
+        print("║  Description:                                                ║")
+        print("║    • Create a new Change with user-controlled branch name    ║")
+        print("║    • Initialize workspace with necessary files               ║")
+        print("║    • Set up branch for development                           ║")
+        print("║                                                              ║")
+        print("║  User Action:                                                ║")
+        print("║    → Provide a name for the change (full branch name)        ║")
+        print("╚══════════════════════════════════════════════════════════════╝")
+        print()
+        
+        # Prompt for name with normalization loop
+        normalized_name = None
+        while not normalized_name:
+            print("Please provide a branch name for the change (will be normalized to kebab-case):")
+            print("(e.g., 'fix/my-bugfix', 'my-feature', '20251107-update-readme')")
+            try:
+                change_name = input("> ").strip()
+            except (KeyboardInterrupt, EOFError):
+                print()
+                print_error("Operation cancelled")
+                return 1
+            
+            if not change_name:
+                print_error("Branch name cannot be empty")
+                continue
+            
+            # Normalize the name
+            normalized_name = normalize_to_kebab_case(change_name)
+            
+            if not normalized_name:
+                print_error(f"Unable to normalize name: {change_name}")
+                print("Please try a different name (use only letters, numbers, spaces, hyphens, slashes)")
+                continue
+            
+            # Validate normalized name
+            if not validate_branch_name(normalized_name):
+                print_warning(f"Normalized name '{normalized_name}' doesn't meet requirements")
+                print("Requirements: kebab-case, lowercase, hyphens/slashes only")
+                print()
+                normalized_name = None
+                continue
+            
+            # Show normalized name and confirm
+            print_success(f"Normalized branch name: {normalized_name}")
+            try:
+                confirm = input("Use this name? (y/n): ").strip().lower()
+            except (KeyboardInterrupt, EOFError):
+                print()
+                print_error("Operation cancelled")
+                return 1
+            
+            if confirm not in ['y', 'yes']:
+                print("Let's try again...")
+                print()
+                normalized_name = None
+        
+        # Determine change type
+        # Hidden reveal flag for enhancement option in the interactive menu
+        reveal_enh = False
+        # Allow env override to reveal enhancement in menu
+        if os.environ.get("RDD_REVEAL_ENH", "0") in ("1", "true", "True"):
+            reveal_enh = True
+        # Allow hidden CLI flag (will be ignored by help) and strip it from args
+        if "--reveal-enh" in args:
+            reveal_enh = True
+            args = [a for a in args if a != "--reveal-enh"]
+
+        # If user passed type explicitly, honor it (keeps non-interactive, script-param capability)
+        if len(args) > 1 and args[1] in ("enh", "fix"):
+            change_type = args[1]
+        else:
+            # Interactive selection (menu shows only Fix by default)
+            print()
+            print_step("Select change type")
+            selected = select_change_type_interactive(reveal_enh=reveal_enh)
+            if not selected:
+                print_info("Operation cancelled")
+                return 1
+            change_type = selected
+        
+        # Create the change
+        return 0 if create_change(normalized_name, change_type) else 1
+    
+    elif action == 'wrap-up':
+        return 0 if wrap_up_change() else 1
+    
+    else:
+        print_error(f"Unknown change action: {action}")
+        print("Use 'rdd.py change --help' for usage information")
+        sys.exit(1)
+
+
+def route_fix(args: List[str]) -> int:
+    """Route fix domain commands (similar to change but for fixes)."""
+    if not args or args[0] in ['--help', '-h']:
+        print_banner("Fix Workflow")
+        print()
+        print("Usage: rdd.py fix <action> [options]")
+        print()
+        print("Actions:")
+        print("  init <name>    Initialize fix workflow")
+        print("  wrap-up        Complete fix workflow")
+        print()
+        print("Examples:")
+        print("  rdd.py fix init my-bugfix")
+        print("  rdd.py fix wrap-up")
+        return 0
+    
+    action = args[0]
+    
+    if action == 'init':
+        if len(args) < 2:
+            print_error("Fix name required")
+            print("Usage: rdd.py fix init <name>")
+            return 1
+        
+        # Similar safety checks as change create
+        current_branch = get_current_branch()
+        default_branch = get_default_branch()
+        
+        if current_branch != default_branch:
+            print_error("Cannot create fix: not on default branch")
+            return 1
+        
+        if os.path.isdir(WORKSPACE_DIR) and os.listdir(WORKSPACE_DIR):
+            print_error("Cannot create fix: workspace directory is not empty")
+            return 1
+        
+        return 0 if create_change(args[1], "fix") else 1
+    
+    elif action == 'wrap-up':
+        return 0 if wrap_up_change() else 1
+    
+    else:
+        print_error(f"Unknown fix action: {action}")
+        return 1
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+rdd_config.py
+Config domain of the RDD CLI (`rdd.py config ...`)
+Reading and writing .rdd-docs/config.json and the interactive configuration menu.
+"""
+
+import subprocess
+from typing import List, Dict, Optional
+
+from rdd_utils import (
+    print_success, print_error, print_warning, print_info, print_banner,
+    get_config_store, get_rdd_config, set_rdd_config_values, is_large_repo_mode,
+    apply_large_repo_settings, UPDATE_STRATEGIES, DEFAULT_UPDATE_STRATEGY,
+    json_output_enabled, record_result
+)
+from rdd_ui import simple_menu
+
+
+# ============================================================================
+# DOMAIN ROUTING
+# ============================================================================
+
+def route_config(args: List[str]) -> int:
+    """Route config domain commands."""
+    if not args or args[0] in ['--help', '-h']:
+        show_config_help()
+        return 0
+    
+    action = args[0]
+    
+    if action == 'show':
+        store = get_config_store()
+        if not store.exists():
+            print_warning("No RDD config file found at .rdd-docs/config.json")
+            print_info("Run 'rdd.py change create' to initialize the configuration")
+            return 1
+        try:
+            if json_output_enabled():
+                record_result(path=store.path, config=store.load())
+                return 0
+            with open(store.path, 'r') as f:
+                content = f.read()
+            print(content)
+            return 0
+        except Exception as e:
+            print_error(f"Failed to read config: {e}")
+            return 1
+    
+    elif action == 'get':
+        if len(args) < 2:
+            print_error("Config key required")
+            print_info("Usage: rdd.py config get <key>")
+            return 1
+        key = args[1]
+        value = get_rdd_config(key)
+        if value is not None:
+            record_result(key=key, value=value)
+            if json_output_enabled():
+                return 0
+            print(f"{key}: {value}")
+            return 0
+        else:
+            print_warning(f"Config key '{key}' not found")
+            return 1
+    
+    elif action == 'set':
+        values = parse_config_assignments(args[1:])
+        if values is None:
+            print_error("Config key and value required")
+            print_info("Usage: rdd.py config set <key> <value> | <key>=<value> ...")
+            return 1
+        
+        strategy = values.get('updateStrategy')
+        if strategy is not None and strategy not in UPDATE_STRATEGIES:
+            print_error(f"Invalid updateStrategy: {strategy}")
+            print_info(f"Valid values: {', '.join(UPDATE_STRATEGIES)}")
+            return 1
+        
+        # All keys are written in one transaction
+        if set_rdd_config_values(values):
+            if len(values) == 1:
+                key, value = next(iter(values.items()))
+                record_result(key=key, value=value)
+            else:
+                record_result(values=values)
+            for key, value in values.items():
+                print_success(f"Configuration updated: {key} = {value}")
+            if 'largeRepo' in values and is_large_repo_mode():
+                apply_large_repo_settings()
+            return 0
+        else:
+            return 1
+    
+    else:
+        print_error(f"Unknown config action: {action}")
+        print()
+        show_config_help()
+        return 1
+
+
+def show_config_help() -> None:
+    """Show config management help."""
+    print_banner("Configuration Management")
+    print()
+    print("Usage: rdd.py config <action> [options]")
+    print()
+    print("Actions:")
+    print("  show              Display entire configuration file")
+    print("  get <key>         Get specific configuration value")
+    print("  set <key> <val>   Set configuration value")
+    print("  set <k>=<v> ...   Set several values in one atomic write")
+    print()
+    print("Configuration file location: .rdd-docs/config.json")
+    print()
+    print("Available keys:")
+    print("  defaultBranch     The default branch for creating changes")
+    print("  localOnly         true to skip all remote operations")
+    print("  largeRepo         true to enable untracked cache, fsmonitor and split index")
+    print("  updateStrategy    'stash' (default) or 'merge-tree' to update without stashing")
+    print("  remoteCacheTtl    Seconds remote branch state is cached (default 300)")
+    print("  remoteTimeout     Seconds before fetch/push/ls-remote give up (default 120;")
+    print("                    fetchTimeout, pushTimeout, lsRemoteTimeout override per operation;")
+    print("                    pulls run as fetches and use fetchTimeout)")
+    print("  remoteRetries     Retries after timeouts or network errors (default 2)")
+    print("  fetchFilter       Partial-clone filter for fetches, e.g. blob:none")
+    print("  fetchDepth        Shallow fetch depth (fetchShallowSince: date limit)")
+    print("  fetchNoTags       true to fetch without tags")
+    print("  fetchNegotiationTips  Comma-separated refs offered as negotiation tips")
+    print("  worktreeRoot      Folder for iteration worktrees (default ../<repo>.worktrees)")
+    print("  sparseProfiles    Named sparse-checkout path sets for 'iteration create --sparse'")
+    print()
+    print("Examples:")
+    print("  rdd.py config show")
+    print("  rdd.py config get defaultBranch")
+    print("  rdd.py config set defaultBranch dev")
+    print("  rdd.py config set localOnly=true updateStrategy=merge-tree")
+    print()
+
+
+# ============================================================================
+# CONFIGURATION MANAGEMENT
+# ============================================================================
+
+def parse_config_assignments(args: List[str]) -> Optional[Dict[str, str]]:
+    """
+    Parse `config set` arguments: "<key> <value>" or one or more "<key>=<value>".
+    Returns {key: value} in argument order, or None when the arguments are invalid.
+    """
+    if len(args) == 2 and '=' not in args[0]:
+        return {args[0]: args[1]}
+    values = {}
+    for arg in args:
+        key, sep, value = arg.partition('=')
+        if not sep or not key:
+            return None
+        values[key] = value
+    return values or None
+
+
+def update_version_part(version: str, part: str) -> str:
+    """Update version by incrementing major, minor, or patch."""
+    parts = version.split('.')
+    if len(parts) != 3 or not all(p.isdigit() for p in parts):
+        print_error("Invalid version format. Should be MAJOR.MINOR.PATCH")
+        return version
+    
+    major, minor, patch = map(int, parts)
+    
+    if part == 'major':
+        major += 1
+        minor = 0
+        patch = 0
+    elif part == 'minor':
+        minor += 1
+        patch = 0
+    elif part == 'patch':
+        patch += 1
+    else:
+        print_error(f"Invalid version part: {part}")
+        return version
+    
+    return f"{major}.{minor}.{patch}"
+
+
+def get_git_branches_list() -> list:
+    """Get list of git branches."""
+    try:
+        result = subprocess.run(
+            ['git', 'branch', '--format=%(refname:short)'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+            text=True
+        )
+        branches = [b.strip() for b in result.stdout.splitlines() if b.strip()]
+        return branches
+    except Exception as e:
+        print_error(f"Error getting git branches: {e}")
+        return []
+
+
+def interactive_config_menu() -> None:
+    """Interactive configuration management menu."""
+    print_banner("Configuration Management")
+    
+    # Read current config (a copy: only the changed keys are written back)
+    store = get_config_store()
+    if not store.exists():
+        print_error("Configuration file not found at .rdd-docs/config.json")
+        print_info("Initialize RDD first by creating an iteration")
+        return
+    
+    original = store.load()
+    config = dict(original)
+    
+    # Display current configuration
+    print()
+    print_info("Current Configuration:")
+    print(f"  Version: {config.get('version', 'N/A')}")
+    print(f"  Default Branch: {config.get('defaultBranch', 'N/A')}")
+    print(f"  Local Only: {config.get('localOnly', False)}")
+    print(f"  Large Repo: {config.get('largeRepo', False)}")
+    print(f"  Update Strategy: {config.get('updateStrategy', DEFAULT_UPDATE_STRATEGY)}")
+    print()
+    
+    # Configuration menu
+    menu_items = [
+        "Update version (major)",
+        "Update version (minor)",
+        "Update version (patch)",
+        "Change default branch",
+        "Toggle local-only mode",
+        "Toggle large-repo mode",
+        "Change update strategy",
+        "Back to main menu"
+    ]
+    
+    selected = simple_menu("What would you like to change?", menu_items)
+    
+    if selected == -1 or selected == 7:  # Back
+        return
+    
+    modified = False
+    
+    if selected == 0:  # Major version
+        old_version = config.get('version', '0.0.0')
+        new_version = update_version_part(old_version, 'major')
+        if new_version != old_version:
+            config['version'] = new_version
+            print_success(f"Version updated: {old_version} → {new_version}")
+            modified = True
+    
+    elif selected == 1:  # Minor version
+        old_version = config.get('version', '0.0.0')
+        new_version = update_version_part(old_version, 'minor')
+        if new_version != old_version:
+            config['version'] = new_version
+            print_success(f"Version updated: {old_version} → {new_version}")
+            modified = True
+    
+    elif selected == 2:  # Patch version
+        old_version = config.get('version', '0.0.0')
+        new_version = update_version_part(old_version, 'patch')
+        if new_version != old_version:
+            config['version'] = new_version
+            print_success(f"Version updated: {old_version} → {new_version}")
+            modified = True
+    
+    elif selected == 3:  # Default branch
+        branches = get_git_branches_list()
+        if not branches:
+            print_error("No branches found")
+            return
+        
+        print()
+        print_info("Available branches:")
+        for idx, branch in enumerate(branches, 1):
+            current = " (current)" if branch == config.get('defaultBranch') else ""
+            print(f"  {idx}. {branch}{current}")
+        print()
+        
+        try:
+            choice = input("Select branch number (or 'q' to cancel): ").strip()
+            if choice.lower() == 'q':
+                return
+            
+            sel_idx = int(choice) - 1
+            if 0 <= sel_idx < len(branches):
+                old_branch = config.get('defaultBranch', 'N/A')
+                config['defaultBranch'] = branches[sel_idx]
+                print_success(f"Default branch updated: {old_branch} → {branches[sel_idx]}")
+                modified = True
+            else:
+                print_error("Invalid selection")
+        except (ValueError, KeyboardInterrupt, EOFError):
+            print()
+            print_info("Operation cancelled")
+            return
+    
+    elif selected == 4:  # Toggle local-only mode
+        current = config.get('localOnly', False)
+        config['localOnly'] = not current
+        new_value = "enabled" if config['localOnly'] else "disabled"
+        print_success(f"Local-only mode {new_value}")
+        modified = True
+    
+    elif selected == 5:  # Toggle large-repo mode
+        current = str(config.get('largeRepo', False)).lower() in ['true', '1', 'yes']
+        config['largeRepo'] = not current
+        new_value = "enabled" if config['largeRepo'] else "disabled"
+        print_success(f"Large-repo mode {new_value}")
+        modified = True
+    
+    elif selected == 6:  # Change update strategy
+        choice = simple_menu("Select update strategy:", list(UPDATE_STRATEGIES))
+        if choice != -1 and UPDATE_STRATEGIES[choice] != config.get('updateStrategy', DEFAULT_UPDATE_STRATEGY):
+            config['updateStrategy'] = UPDATE_STRATEGIES[choice]
+            print_success(f"Update strategy set to {config['updateStrategy']}")
+            modified = True
+    
+    # Save changes if modified; keys changed meanwhile by others are kept
+    if modified:
+        changes = {key: value for key, value in config.items() if original.get(key) != value}
+        if set_rdd_config_values(changes):
+            print()
+            print_success("Configuration saved successfully")
+            if selected == 5 and config['largeRepo']:
+                apply_large_repo_settings()
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+rdd_daemon.py
+Opt-in RDD daemon (`rdd.py serve`) and its thin client
+The daemon runs in one repository (worktree), answers JSON-RPC 2.0 requests
+over a Unix domain socket and keeps the interpreter, imports, RepoContext
+(repo root, branches, parsed config, remotes) and the git coprocess warm.
+rdd.py forwards the non-interactive commands in DAEMON_COMMANDS to it when it
+is running and falls back to running them locally otherwise.
+
+Protocol: one JSON object per line. Methods:
+  run       {"argv": [...], "cwd": "...", "root": "..."} -> {"exitCode", "stdout", "stderr"}
+  ping      {} -> {"pid", "root", "requests", "startedAt"}
+  shutdown  {} -> {"stopping": true}
+"""
+
+import os
+import sys
+import json
+import time
+from typing import List, Optional, Dict, Any, Tuple
+
+# Commands the daemon answers: (domain, action) pairs that never prompt
+DAEMON_COMMANDS = {
+    ('prompt', 'list'), ('prompt', 'mark-completed'),
+    ('config', 'get'), ('config', 'show'),
+    ('branch', 'list'), ('iteration', 'list'),
+    ('git', 'modified-files'), ('git', 'compare'),
+}
+
+# RDD_DAEMON=0 disables the client (commands always run locally)
+DAEMON_ENV_VAR = 'RDD_DAEMON'
+DEFAULT_IDLE_TIMEOUT = 1800  # seconds without requests before the daemon exits
+CONNECT_TIMEOUT = 1.0
+RESPONSE_TIMEOUT = 600.0
+
+# JSON-RPC error codes (-32000 and up are daemon-specific)
+ERROR_PARSE = -32700
+ERROR_INVALID_REQUEST = -32600
+ERROR_METHOD_NOT_FOUND = -32601
+ERROR_INVALID_PARAMS = -32602
+ERROR_WRONG_REPOSITORY = -32001
+ERROR_STALE_CODE = -32002
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# ============================================================================
+# SOCKET LOCATION
+# ============================================================================
+
+def find_worktree_root(start: Optional[str] = None) -> Optional[str]:
+    """Top directory of the worktree containing `start` (no git call), or None."""
+    current = os.path.abspath(start or os.getcwd())
+    while True:
+        if os.path.exists(os.path.join(current, '.git')):
+            return os.path.realpath(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def get_socket_dir() -> str:
+    """Per-user socket folder in the temp dir (short paths; AF_UNIX limits them to ~100 bytes)."""
+    base = os.environ.get('TMPDIR') or '/tmp'
+    return os.path.join(base, f"rdd-{os.getuid()}")
+
+
+def get_socket_path(root: str) -> str:
+    """Socket of the daemon for a worktree root."""
+    import hashlib
+    digest = hashlib.sha1(root.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(get_socket_dir(), f"{digest}.sock")
+
+
+def _socket_dir_is_private(path: str) -> bool:
+    """Only trust a socket folder owned by this user and closed to others."""
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    return info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+def daemon_supported() -> bool:
+    import socket
+    return hasattr(socket, 'AF_UNIX') and hasattr(os, 'getuid')
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+class DaemonUnavailable(Exception):
+    """No daemon answered; the caller should run the command itself."""
+
+
+def call(socket_path: str, method: str, params: Optional[Dict[str, Any]] = None,
+         timeout: float = RESPONSE_TIMEOUT) -> Dict[str, Any]:
+    """
+    Send one JSON-RPC request and return the response object.
+    Raises DaemonUnavailable when nothing accepts the connection.
+    """
+    import socket
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(socket_path)
+        except OSError as e:
+            raise DaemonUnavailable(str(e))
+        sock.settimeout(timeout)
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}}
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise ConnectionError("daemon closed the connection without answering")
+    return json.loads(line.decode('utf-8'))
+
+
+def _client_wants_color() -> bool:
+    """Same decision as rdd_utils.colors_wanted(), without importing rdd_utils."""
+    setting = os.environ.get('RDD_COLOR', '').strip().lower()
+    if setting in ('always', 'never'):
+        return setting == 'always'
+    return not os.environ.get('NO_COLOR') and sys.stdout.isatty()
+
+
+def run_via_daemon(args: List[str]) -> Optional[int]:
+    """
+    Run a CLI command in the repository's daemon when one is running.
+    Returns the exit code, or None when the command must run locally
+    (no daemon, not an eligible command, daemon refused the request).
+    """
+    if tuple(args[:2]) not in DAEMON_COMMANDS or os.environ.get(DAEMON_ENV_VAR, '1') == '0':
+        return None
+    if not hasattr(os, 'getuid') or not _socket_dir_is_private(get_socket_dir()):
+        return None
+    root = find_worktree_root()
+    if root is None:
+        return None
+    socket_path = get_socket_path(root)
+    if not os.path.exists(socket_path):
+        return None
+    try:
+        response = call(socket_path, 'run', {'argv': args, 'cwd': os.getcwd(), 'root': root,
+                                             'color': _client_wants_color()})
+    except DaemonUnavailable:
+        return None
+    except (OSError, ValueError) as e:
+        # The request may have been executed; do not run it a second time
+        print(f"✗ RDD daemon did not answer: {e}", file=sys.stderr)
+        return 1
+    if 'error' in response:
+        return None
+    result = response['result']
+    sys.stdout.write(result.get('stdout', ''))
+    sys.stdout.flush()
+    sys.stderr.write(result.get('stderr', ''))
+    return int(result.get('exitCode', 1))
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+def _code_stamp() -> Dict[str, Optional[Tuple[int, int]]]:
+    """Stamps of the framework scripts; a change means the daemon runs old code."""
+    names = sorted(n for n in os.listdir(SCRIPT_DIR) if n.endswith('.py'))
+    return {name: _file_stamp(os.path.join(SCRIPT_DIR, name)) for name in names}
+
+
+class DaemonServer:
+    """Sequential JSON-RPC server with a warm RepoContext for one worktree."""
+
+    def __init__(self, root: str, socket_path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        import rdd_utils
+        from rdd_refs import discover_git_dirs, RefReadError
+        self.root = root
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.requests = 0
+        self.started_at = time.time()
+        self.last_activity = time.monotonic()
+        self.stopping = False
+        self.context = rdd_utils.RepoContext()
+        try:
+            git_dirs = discover_git_dirs(root)
+        except RefReadError:
+            git_dirs = None
+        git_dir, common_dir = git_dirs or (os.path.join(root, '.git'),) * 2
+        # Files whose change makes cached repository facts stale
+        self.watched = [
+            os.path.join(git_dir, 'HEAD'),
+            os.path.join(common_dir, 'config'),
+            os.path.join(common_dir, 'packed-refs'),
+            os.path.join(common_dir, 'refs', 'remotes', 'origin', 'HEAD'),
+            os.path.join(root, '.rdd-docs', 'config.json'),
+        ]
+        self.state_stamp = self._state_stamp()
+        self.code_stamp = _code_stamp()
+
+    def _state_stamp(self) -> List[Optional[Tuple[int, int]]]:
+        return [_file_stamp(path) for path in self.watched]
+
+    def refresh(self) -> bool:
+        """Drop cached repository facts when watched files changed. Returns True if stale."""
+        import rdd_utils
+        stamp = self._state_stamp()
+        if stamp == self.state_stamp:
+            return False
+        self.state_stamp = stamp
+        self.context.invalidate()
+        rdd_utils.close_git_executor()
+        return True
+
+    # ------------------------------------------------------------------ requests
+
+    def handle_request(self, request: Any) -> Dict[str, Any]:
+        """Answer one decoded JSON-RPC request."""
+        if not isinstance(request, dict) or not isinstance(request.get('method'), str):
+            return _error(None, ERROR_INVALID_REQUEST, "Invalid request")
+        request_id = request.get('id')
+        params = request.get('params') or {}
+        method = request['method']
+        self.last_activity = time.monotonic()
+        if method == 'ping':
+            return _result(request_id, {
+                'pid': os.getpid(), 'root': self.root, 'requests': self.requests,
+                'startedAt': self.started_at,
+            })
+        if method == 'shutdown':
+            self.stopping = True
+            return _result(request_id, {'stopping': True})
+        if method != 'run':
+            return _error(request_id, ERROR_METHOD_NOT_FOUND, f"Method not found: {method}")
+
+        argv = params.get('argv')
+        if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv) \
+                or tuple(argv[:2]) not in DAEMON_COMMANDS:
+            return _error(request_id, ERROR_INVALID_PARAMS, "argv must be a supported rdd.py command")
+        cwd = params.get('cwd') or self.root
+        if params.get('root', self.root) != self.root or not os.path.isdir(cwd):
+            return _error(request_id, ERROR_WRONG_REPOSITORY, f"Daemon serves {self.root}")
+        if _code_stamp() != self.code_stamp:
+            self.stopping = True
+            return _error(request_id, ERROR_STALE_CODE, "Framework scripts changed; daemon is stopping")
+        self.requests += 1
+        return _result(request_id, self.run_command(argv, cwd, color=params.get('color') is True))
+
+    def run_command(self, argv: List[str], cwd: str, color: bool = False) -> Dict[str, Any]:
+        """Run one CLI command in-process against the warm context, capturing its output."""
+        from rdd_batch import run_captured
+
+        self.refresh()
+        try:
+            os.chdir(cwd)
+            result = run_captured(argv, self.context, color=color)
+        finally:
+            os.chdir(self.root)
+        # Commands that write files (mark-completed) must not leave stale facts behind
+        self.refresh()
+        return result
+
+    # ------------------------------------------------------------------ socket loop
+
+    def handle_connection(self, conn) -> None:
+        """Answer requests on one connection until the client closes it."""
+        with conn, conn.makefile('rb') as reader:
+            for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    response = _error(None, ERROR_PARSE, "Parse error")
+                else:
+                    response = self.handle_request(request)
+                conn.sendall(json.dumps(response).encode('utf-8') + b'\n')
+                if self.stopping:
+                    return
+
+    def serve_forever(self) -> None:
+        import socket
+        import signal
+        socket_dir = os.path.dirname(self.socket_path)
+        os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+        if not _socket_dir_is_private(socket_dir):
+            raise PermissionError(f"{socket_dir} must be owned by you and not accessible to others")
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        listener.listen(8)
+        listener.settimeout(1.0)
+
+        def stop(signum, frame):
+            self.stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        os.chdir(self.root)
+        try:
+            while not self.stopping:
+                if time.monotonic() - self.last_activity > self.idle_timeout:
+                    break
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    continue
+                conn.settimeout(None)
+                try:
+                    self.handle_connection(conn)
+                except OSError:
+                    pass
+        finally:
+            listener.close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            import rdd_utils
+            rdd_utils.close_git_executor()
+
+
+def _result(request_id: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+    return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+# ============================================================================
+# HELP
+# ============================================================================
+
+def show_serve_help() -> None:
+    """Show daemon help."""
+    from rdd_utils import print_banner
+    print_banner("RDD Daemon")
+    print()
+    print("Usage: rdd.py serve [action] [options]")
+    print()
+    print("Actions:")
+    print("  (none) [--idle-timeout S]   Run the daemon for this worktree in the foreground")
+    print(f"                              (exits after S idle seconds, default {DEFAULT_IDLE_TIMEOUT})")
+    print("  status [--json]             Show whether a daemon serves this worktree")
+    print("  stop                        Stop the daemon of this worktree")
+    print()
+    print("While the daemon runs, these commands are answered by it (same output,")
+    print("no interpreter start, warm repository state); all others run locally:")
+    for domain, action in sorted(DAEMON_COMMANDS):
+        print(f"  {domain} {action}")
+    print()
+    print(f"Set {DAEMON_ENV_VAR}=0 to bypass a running daemon.")
+    print()
+    print("Examples:")
+    print("  rdd.py serve &")
+    print("  rdd.py serve status")
+    print("  rdd.py serve stop")
+
+
+# ============================================================================
+# DOMAIN ROUTING
+# ============================================================================
+
+def route_serve(args: List[str]) -> int:
+    """Route serve domain commands."""
+    from rdd_utils import print_success, print_error, print_info
+
+    if args and args[0] in ['--help', '-h']:
+        show_serve_help()
+        return 0
+    if not daemon_supported():
+        print_error("The RDD daemon needs Unix domain sockets (not available on this platform)")
+        return 1
+    root = find_worktree_root()
+    if root is None:
+        print_error("Not inside a git repository")
+        return 1
+    socket_path = get_socket_path(root)
+
+    def ping() -> Optional[Dict[str, Any]]:
+        if not os.path.exists(socket_path):
+            return None
+        try:
+            return call(socket_path, 'ping', timeout=5).get('result')
+        except (DaemonUnavailable, OSError, ValueError):
+            return None
+
+    action = args[0] if args and not args[0].startswith('-') else None
+
+    if action == 'status':
+        info = ping()
+        if '--json' in args[1:]:
+            print(json.dumps({'running': info is not None, 'socket': socket_path, 'root': root,
+                              **(info or {})}, indent=2))
+        elif info:
+            print_success(f"Daemon running (pid {info['pid']}, {info['requests']} requests served)")
+            print_info(f"Socket: {socket_path}")
+        else:
+            print_info("No daemon is running for this worktree")
+        return 0
+
+    if action == 'stop':
+        if ping() is None:
+            print_info("No daemon is running for this worktree")
+            return 0
+        call(socket_path, 'shutdown', timeout=5)
+        print_success("Daemon stopped")
+        return 0
+
+    if action is not None:
+        print_error(f"Unknown serve action: {action}")
+        print("Use 'rdd.py serve --help' for usage information")
+        return 1
+
+    idle_timeout = DEFAULT_IDLE_TIMEOUT
+    options = args
+    if options[:1] == ['--idle-timeout'] and len(options) == 2:
+        options = [f"--idle-timeout={options[1]}"]
+    for option in options:
+        if option.startswith('--idle-timeout='):
+            try:
+                idle_timeout = float(option.split('=', 1)[1])
+            except ValueError:
+                print_error("--idle-timeout expects a number of seconds")
+                return 1
+        else:
+            print_error(f"Unknown option: {option}")
+            return 1
+
+    info = ping()
+    if info is not None:
+        print_error(f"A daemon already serves this worktree (pid {info['pid']})")
+        return 1
+    server = DaemonServer(root, socket_path, idle_timeout)
+    print_success(f"RDD daemon serving {root} (pid {os.getpid()})")
+    print_info(f"Socket: {socket_path}")
+    sys.stdout.flush()
+    server.serve_forever()
+    print_info(f"Daemon stopped after {server.requests} requests")
+    return 0
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+rdd_git.py
+Git domain of the RDD CLI (`rdd.py git ...`)
+Comparisons with the default branch, push, auto-commit, doctor and fetch plans.
+"""
+
+import sys
+import subprocess
+import json
+from typing import List, Optional
+
+from rdd_utils import (
+    print_success, print_error, print_warning, print_info, print_step, print_banner,
+    get_current_branch, get_default_branch, get_working_tree_status, invalidate_repo_context,
+    run_remote, fetch_from_remote, get_fetch_plan, get_git_executor, git_ref_exists,
+    iter_diff_name_status, update_from_default_branch, record_remote_update, debug_print,
+    apply_large_repo_settings, get_large_repo_report, Colors, json_output_enabled, record_result,
+    colors_enabled
+)
+
+
+# ============================================================================
+# GIT OPERATIONS
+# ============================================================================
+
+def fetch_default_branch() -> bool:
+    """Fetch latest changes from remote default branch. Returns True on success."""
+    default_branch = get_default_branch()
+    print_step(f"Fetching latest from origin/{default_branch}...")
+    
+    result = fetch_from_remote([default_branch])
+    
+    if result.returncode == 0:
+        debug_print(f"Successfully fetched origin/{default_branch}")
+        return True
+    else:
+        print_warning(f"Failed to fetch from origin/{default_branch}")
+        return False
+
+
+def push_to_remote(branch_name: Optional[str] = None) -> bool:
+    """Push current branch to remote with upstream tracking."""
+    if not branch_name:
+        branch_name = get_current_branch()
+    
+    if not branch_name:
+        print_error("No branch name provided and could not determine current branch")
+        return False
+    
+    print_info(f"Pushing branch '{branch_name}' to remote...")
+    
+    result = run_remote('push', ['push', '-u', 'origin', branch_name])
+    
+    if result.returncode == 0:
+        record_remote_update(branch_name, get_git_executor().rev_parse(branch_name), 'origin')
+        record_result(branch=branch_name, remote='origin')
+        print_success("Branch pushed to remote with upstream tracking")
+        return True
+    else:
+        print_error("Failed to push branch to remote")
+        if result.stderr:
+            print(result.stderr)
+        return False
+
+
+def auto_commit(message: str) -> int:
+    """
+    Auto-commit all changes with a message.
+    Returns: 0 on success, 1 on failure, 2 if no changes to commit.
+    """
+    if not message:
+        print_error("Commit message is required")
+        return 1
+    
+    # Check if there are changes to commit (one working tree scan)
+    status = get_working_tree_status()
+    if status is not None and status.is_clean:
+        print_warning("No changes to commit")
+        return 2
+    
+    print_info("Staging changes...")
+    subprocess.run(['git', 'add', '-A'])
+    
+    print_info("Committing changes...")
+    result = subprocess.run(
+        ['git', 'commit', '-m', message],
+        capture_output=True,
+        text=True
+    )
+    invalidate_repo_context('default_branch')
+    
+    if result.returncode == 0:
+        print_success(f"Changes committed: {message}")
+        return 0
+    elif 'nothing to commit' in result.stdout:
+        print_warning("No changes to commit")
+        return 2
+    else:
+        print_error("Failed to commit changes")
+        if result.stderr:
+            print(result.stderr)
+        return 1
+
+
+def compare_with_default_branch() -> bool:
+    """Compare current branch with default branch."""
+    fetch_default_branch()
+    
+    default_branch = get_default_branch()
+    current_branch = get_current_branch()
+    
+    result = subprocess.run(
+        ['git', 'rev-list', '--count', f'origin/{default_branch}..HEAD'],
+        capture_output=True,
+        text=True
+    )
+    commit_count = result.stdout.strip() if result.returncode == 0 else "0"
+    
+    if json_output_enabled():
+        record_result(branch=current_branch, defaultBranch=default_branch, ahead=int(commit_count))
+        return get_modified_files()
+    
+    print()
+    print("━" * 50)
+    print(f"  COMPARISON: {current_branch} vs {default_branch}")
+    print("━" * 50)
+    print()
+    
+    # Show commit differences
+    print_step("Commit differences:")
+    print(f"  This branch is {commit_count} commit(s) ahead of {default_branch}")
+    print()
+    
+    if commit_count != "0":
+        # Printed through sys.stdout so the graph stays in place when the
+        # output is piped or captured
+        result = subprocess.run([
+            'git', 'log', '--oneline', '--graph', '--max-count=10',
+            '--color=always' if colors_enabled() else '--no-color',
+            f'origin/{default_branch}..HEAD'
+        ], capture_output=True, text=True)
+        sys.stdout.write(result.stdout)
+        print()
+    
+    # Show file changes
+    print_step("File changes:")
+    get_modified_files()
+    print()
+    
+    print("━" * 50)
+    return True
+
+
+# Human-readable rendering of diff status letters: (symbol, Colors attribute,
+# label); the color is looked up when printing so it follows configure_colors()
+DIFF_STATUS_DISPLAY = {
+    'A': ('+', 'GREEN', 'added'),
+    'M': ('~', 'YELLOW', 'modified'),
+    'D': ('-', 'RED', 'deleted'),
+    'R': ('→', 'CYAN', 'renamed'),
+    'C': ('⧉', 'CYAN', 'copied'),
+    'T': ('~', 'YELLOW', 'type changed'),
+    'U': ('!', 'RED', 'unmerged'),
+}
+
+
+def get_modified_files(output_format: str = "text") -> bool:
+    """
+    List files modified compared to the default branch.
+    Streams a single `git diff -z --name-status -M` and prints entries as they
+    are parsed. output_format: 'text' (colored), 'porcelain' (tab-separated,
+    like git --name-status) or 'json' (one JSON document).
+    """
+    if output_format not in ['text', 'porcelain', 'json']:
+        print_error(f"Invalid output format: '{output_format}'")
+        print("Valid options: text, porcelain, json")
+        return False
+    # `rdd.py --json`: the file list becomes part of the command result
+    files = [] if json_output_enabled() else None
+    if files is not None:
+        output_format = 'record'
+    
+    default_branch = get_default_branch()
+    current_branch = get_current_branch()
+    
+    # Compare against the remote-tracking branch when there is one (local-only
+    # repositories have no origin)
+    base = f'origin/{default_branch}'
+    if not git_ref_exists(f'refs/remotes/{base}'):
+        base = default_branch
+    revision_range = f'{base}...HEAD'
+    
+    if output_format == 'text':
+        print_info(f"Comparing {current_branch} with {default_branch}...")
+        print()
+    elif output_format == 'json':
+        sys.stdout.write('{"base": %s, "head": %s, "files": [' % (
+            json.dumps(base), json.dumps(current_branch)))
+    
+    file_count = 0
+    failed = False
+    try:
+        for entry in iter_diff_name_status(revision_range):
+            if output_format == 'porcelain':
+                if entry.old_path is not None:
+                    print(f"{entry.status}{entry.score or ''}\t{entry.old_path}\t{entry.path}")
+                else:
+                    print(f"{entry.status}\t{entry.path}")
+            elif output_format == 'json':
+                sys.stdout.write((', ' if file_count else '') + json.dumps(entry.to_dict()))
+            elif output_format == 'record':
+                files.append(entry.to_dict())
+            else:
+                if file_count == 0:
+                    print("Modified files:")
+                symbol, color, label = DIFF_STATUS_DISPLAY.get(entry.status, ('?', 'BLUE', 'unknown'))
+                shown = f"{entry.old_path} → {entry.path}" if entry.old_path is not None else entry.path
+                print(f"  {getattr(Colors, color)}{symbol}{Colors.NC} {shown} ({label})")
+            file_count += 1
+    except subprocess.CalledProcessError:
+        failed = True
+    
+    # Machine-readable output must not report a failed diff as "no changes"
+    if failed and output_format != 'text':
+        print_error(f"git diff {revision_range} failed")
+    if output_format == 'json':
+        sys.stdout.write('], "count": %d%s}\n' % (
+            file_count, ', "error": "git diff failed"' if failed else ''))
+        return not failed
+    if output_format == 'record':
+        record_result(base=base, head=current_branch, files=files, count=file_count)
+        return not failed
+    if output_format == 'porcelain':
+        return not failed
+    
+    if file_count == 0:
+        if failed:
+            debug_print(f"git diff {revision_range} failed")
+        print_warning(f"No files modified compared to {default_branch}")
+        return True
+    
+    print()
+    print_success(f"Found {file_count} modified file(s)")
+    return True
+
+
+def git_doctor(fix: bool = False) -> bool:
+    """
+    Report large-repository optimizations (untracked cache, fsmonitor,
+    split index) and measured working tree scan latency.
+    With fix=True, applies the optimizations first.
+    """
+    print_banner("Git Doctor", "Large-repository diagnostics")
+    
+    if fix:
+        apply_large_repo_settings()
+        print()
+    
+    report = get_large_repo_report()
+    settings = report["settings"]
+    record_result(**report)
+    if json_output_enabled():
+        return True
+    
+    def _state(value: Optional[str]) -> str:
+        return value if value is not None else "not set"
+    
+    print_info(f"Git version: {report['gitVersion']}")
+    print_info(f"largeRepo (config.json): {report['largeRepo']}")
+    print()
+    print_step("Git settings:")
+    print(f"  core.untrackedCache  {_state(settings['core.untrackedCache'])}")
+    print(f"  core.splitIndex      {_state(settings['core.splitIndex'])}"
+          f"{' (shared index present)' if report['sharedIndexPresent'] else ''}")
+    if report["fsmonitorSupported"]:
+        running = "daemon running" if report["fsmonitorRunning"] else "daemon not running"
+        print(f"  core.fsmonitor       {_state(settings['core.fsmonitor'])} ({running})")
+    else:
+        print("  core.fsmonitor       unsupported on this platform/git build")
+    print()
+    
+    latencies = report["statusLatencyMs"]
+    print_step("Working tree scan (git status --porcelain=v2):")
+    print(f"  first run: {latencies[0]:.1f} ms, second run: {latencies[-1]:.1f} ms")
+    print()
+    
+    enabled = settings['core.untrackedCache'] == 'true' and settings['core.splitIndex'] == 'true'
+    if report["largeRepo"] and not enabled:
+        print_warning("largeRepo is enabled but git settings are missing")
+        print_info("Run 'rdd.py git doctor --fix' to apply them")
+    elif not report["largeRepo"] and not enabled:
+        print_info("Large-repository mode is off. Enable with: rdd.py config set largeRepo true")
+    else:
+        print_success("Large-repository optimizations are active")
+    return True
+
+
+# Human-readable meaning of get_fetch_plan() transfer states
+FETCH_PLAN_TRANSFER = {
+    'up-to-date': "nothing to transfer",
+    'refs-only': "objects already present, only refs would move",
+    'objects': "new commits and objects would be downloaded",
+    'missing': "branch does not exist on the remote",
+    'unknown': "remote unreachable, transfer unknown",
+}
+
+
+def show_fetch_plan(branch: Optional[str] = None, as_json: bool = False) -> bool:
+    """
+    Dry run of the configured fetch: show the command, fetch options and
+    what would be transferred, without downloading anything.
+    """
+    plan = get_fetch_plan(branch)
+    if json_output_enabled():
+        record_result(**plan)
+        return plan['transfer'] != 'unknown'
+    if as_json:
+        print(json.dumps(plan, indent=2))
+        return plan['transfer'] != 'unknown'
+    
+    print_banner("Fetch Plan", f"{plan['remote']}/{plan['branch']}")
+    print()
+    print_info(f"Command: {' '.join(plan['command'])}")
+    print_info(f"Options: {' '.join(plan['options']) or 'none (full fetch)'}")
+    print()
+    print(f"  remote head:    {plan['remoteOid'] or '-'}")
+    print(f"  tracking ref:   {plan['trackingOid'] or '-'}")
+    print(f"  shallow repo:   {'yes' if plan['shallow'] else 'no'}")
+    print(f"  partial clone:  {plan['partialCloneFilter'] or 'no'}")
+    print()
+    if plan['transfer'] == 'unknown':
+        print_warning(FETCH_PLAN_TRANSFER['unknown'])
+        return False
+    print_success(f"Transfer: {FETCH_PLAN_TRANSFER[plan['transfer']]}")
+    return True
+
+
+# ============================================================================
+# HELP
+# ============================================================================
+
+def show_git_help() -> None:
+    """Show git operations help."""
+    print_banner("Git Operations")
+    print()
+    print("Usage: rdd.py git <action> [options]")
+    print()
+    print("Actions:")
+    print("  compare                      Compare current branch with default branch")
+    print("  modified-files [--json|--porcelain]")
+    print("                               List files modified compared to default branch")
+    print("  push                         Push current branch to remote")
+    print("  update-from-default-branch   Update current branch from default branch")
+    print("  doctor [--fix]               Report large-repo optimizations and scan latency")
+    print("  fetch-plan [branch] [--json] Dry run: show what the configured fetch would transfer")
+    print()
+    print("Examples:")
+    print("  rdd.py git compare")
+    print("  rdd.py git modified-files")
+    print("  rdd.py git modified-files --json")
+    print("  rdd.py git push")
+    print("  rdd.py git update-from-default-branch")
+    print("  rdd.py git doctor --fix")
+    print("  rdd.py git fetch-plan --json")
+
+
+# ============================================================================
+# DOMAIN ROUTING
+# ============================================================================
+
+def route_git(args: List[str]) -> int:
+    """Route git domain commands."""
+    if not args or args[0] in ['--help', '-h']:
+        show_git_help()
+        return 0
+    
+    action = args[0]
+    
+    if action == 'compare':
+        return 0 if compare_with_default_branch() else 1
+    
+    elif action == 'modified-files':
+        output_format = "text"
+        if '--json' in args:
+            output_format = "json"
+        elif '--porcelain' in args:
+            output_format = "porcelain"
+        return 0 if get_modified_files(output_format) else 1
+    
+    elif action == 'push':
+        return 0 if push_to_remote() else 1
+    
+    elif action == 'update-from-default-branch':
+        return 0 if update_from_default_branch() else 1
+    
+    elif action == 'doctor':
+        return 0 if git_doctor(fix='--fix' in args) else 1
+    
+    elif action == 'fetch-plan':
+        branch = next((arg for arg in args[1:] if not arg.startswith('--')), None)
+        return 0 if show_fetch_plan(branch, as_json='--json' in args) else 1
+    
+    else:
+        print_error(f"Unknown git action: {action}")
+        print("Use 'rdd.py git --help' for usage information")
+        return 1
@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+"""
+rdd_iteration.py
+Iteration domain of the RDD CLI (`rdd.py iteration ...`)
+Creating and completing iterations, including parallel iterations in git worktrees.
+"""
+
+import sys
+import os
+import shutil
+import json
+from typing import List, Optional
+
+from rdd_utils import (
+    print_success, print_error, print_warning, print_info, print_step, print_banner,
+    validate_branch_name, get_current_branch, get_default_branch, get_repo_root,
+    invalidate_repo_context, run_git, local_branch_exists, create_branch_from_default,
+    return_to_default_branch, list_worktrees, find_worktree, add_iteration_worktree,
+    remove_worktree, in_worktree, resolve_sparse_paths, apply_sparse_checkout,
+    is_sparse_checkout, disable_sparse_checkout, normalize_to_kebab_case, ensure_dir, confirm_action,
+    is_local_only_mode, ensure_large_repo_mode, json_output_enabled, record_result
+)
+from rdd_git import push_to_remote, auto_commit
+from rdd_workspace import WORKSPACE_DIR, TEMPLATES_DIR, archive_workspace
+
+
+# ============================================================================
+# ITERATION OPERATIONS (Simplified Workflow)
+# ============================================================================
+
+def complete_iteration(switch_to_default: bool = True) -> bool:
+    """
+    Complete current iteration workflow.
+    Simplified version that archives workspace, commits, and returns to default branch.
+    `switch_to_default=False` stays on the branch (iteration worktrees).
+    Returns True on success, False on failure.
+    """
+    current_branch = get_current_branch()
+    default_branch = get_default_branch()
+    
+    if not current_branch:
+        print_error("Could not determine current branch")
+        return False
+    
+    print_banner("Complete Current Iteration")
+    print()
+    
+    # Safety check 1: Not on default branch
+    if current_branch == default_branch:
+        print_error(f"Cannot complete iteration on the default branch ({default_branch})")
+        print_warning("The default branch is not supposed to be committed to directly")
+        print()
+        print_info("Please create a feature branch first using 'Create new iteration'")
+        return False
+    
+    # Safety check 2: Workspace not empty
+    if not os.path.isdir(WORKSPACE_DIR) or not os.listdir(WORKSPACE_DIR):
+        print_error("Workspace directory is empty")
+        print_warning("There is no work to complete")
+        print()
+        print_info("Use 'Create new iteration' to start working on a feature")
+        return False
+    
+    print_info(f"Current branch: {current_branch}")
+    print_info(f"Workspace: {WORKSPACE_DIR}")
+    print()
+    
+    ensure_large_repo_mode()
+    
+    # Step 0: Backup and reset work-iteration-prompts.md and user-story.md
+    print_step("Backing up and resetting iteration files...")
+    
+    # Backup and reset work-iteration-prompts.md
+    prompts_file = ".rdd-docs/work-iteration-prompts.md"
+    prompts_backup = os.path.join(WORKSPACE_DIR, "work-iteration-prompts.md")
+    template_prompts = os.path.join(TEMPLATES_DIR, "work-iteration-prompts.md")
+    
+    # Copy current prompts file to workspace (backup)
+    if os.path.isfile(prompts_file):
+        shutil.copy2(prompts_file, prompts_backup)
+        print_success(f"Backed up prompts file to workspace")
+    else:
+        print_warning(f"Prompts file not found: {prompts_file}")
+    
+    # Reset prompts file from template
+    if os.path.isfile(template_prompts):
+        shutil.copy2(template_prompts, prompts_file)
+        print_success(f"Reset prompts file from template")
+    else:
+        print_warning(f"Template not found: {template_prompts}")
+    
+    # Backup and reset user-story.md
+    user_story_file = ".rdd-docs/user-story.md"
+    user_story_backup = os.path.join(WORKSPACE_DIR, "user-story.md")
+    template_user_story = os.path.join(TEMPLATES_DIR, "user-story.md")
+    
+    # Copy current user story file to workspace (backup)
+    if os.path.isfile(user_story_file):
+        shutil.copy2(user_story_file, user_story_backup)
+        print_success(f"Backed up user story file to workspace")
+    else:
+        print_warning(f"User story file not found: {user_story_file}")
+    
+    # Reset user story file from template
+    if os.path.isfile(template_user_story):
+        shutil.copy2(template_user_story, user_story_file)
+        print_success(f"Reset user story file from template")
+    else:
+        print_warning(f"Template not found: {template_user_story}")
+    print()
+    
+    # Step 1: Archive workspace
+    print_step("1/4 Archiving workspace...")
+    if not archive_workspace(current_branch, keep_workspace=False):
+        print_error("Failed to archive workspace")
+        return False
+    print()
+    
+    # Step 2: Commit changes
+    print_step("2/4 Committing changes...")
+    commit_msg = f"Completing work on {current_branch}"
+    result = auto_commit(commit_msg)
+    
+    if result == 2:
+        print_info("No uncommitted changes to commit")
+    elif result != 0:
+        print_error("Failed to commit changes")
+        return False
+    print()
+    
+    # Step 3: Push to remote (if not local-only)
+    if not is_local_only_mode():
+        print_step("3/4 Push to remote...")
+        if confirm_action("Do you want to push this branch to remote?"):
+            if push_to_remote(current_branch):
+                print()
+                print_success("Branch pushed to remote")
+                print_info("Don't forget to create a pull request on GitHub!")
+            else:
+                print_warning("Failed to push to remote, but continuing...")
+        else:
+            print_info("Skipping push to remote")
+    else:
+        print_info("3/4 Local-only mode: Skipping push to remote")
+    print()
+    
+    # Step 4: Fast-forward and switch to default branch
+    if switch_to_default:
+        print_step(f"4/4 Switching to {default_branch} branch...")
+        if return_to_default_branch(default_branch):
+            print_success(f"Switched to {default_branch} branch")
+        else:
+            print_error(f"Failed to checkout {default_branch}")
+            return False
+        # A sparse iteration must not leave the default branch sparse
+        if is_sparse_checkout() and disable_sparse_checkout():
+            print_info("Restored the full checkout")
+    else:
+        print_info(f"4/4 Staying on {current_branch}")
+        if is_sparse_checkout():
+            print_info("Sparse checkout is still active (full checkout: git sparse-checkout disable)")
+    
+    print()
+    print_banner("Iteration Complete!")
+    print_success(f"Successfully completed work on: {current_branch}")
+    print()
+    print_info("Summary:")
+    print(f"  • Workspace archived to: .rdd-docs/archive/{current_branch.replace('/', '-')}/")
+    print(f"  • Changes committed: {commit_msg}")
+    print(f"  • Now on branch: {default_branch if switch_to_default else current_branch}")
+    if not is_local_only_mode():
+        print()
+        print_info("Next steps:")
+        print("  1. Create a pull request on GitHub if you pushed")
+        print("  2. Request code review")
+        print("  3. Merge after approval")
+    
+    return True
+
+
+def _prompt_iteration_name() -> Optional[str]:
+    """Ask for an iteration branch name until a valid one is confirmed."""
+    normalized_name = None
+    while not normalized_name:
+        print("Enter branch name (will be normalized):")
+        print("Examples: 'feature-20251109-1355-improve-installation', 'fix-20251109-1237-bug-123'")
+        try:
+            branch_name = input("> ").strip()
+        except (KeyboardInterrupt, EOFError):
+            print()
+            print_error("Operation cancelled")
+            return None
+        
+        if not branch_name:
+            print_error("Branch name cannot be empty")
+            continue
+        
+        # Normalize the name
+        normalized_name = normalize_to_kebab_case(branch_name)
+        
+        if not normalized_name:
+            print_error(f"Unable to normalize name: {branch_name}")
+            print("Please try a different name (use only letters, numbers, spaces, hyphens, slashes)")
+            continue
+        
+        # Validate normalized name
+        if not validate_branch_name(normalized_name):
+            print_warning(f"Normalized name '{normalized_name}' doesn't meet requirements")
+            print("Requirements: no spaces, use hyphens instead of underscores, avoid special characters")
+            print()
+            normalized_name = None
+            continue
+        
+        # Show normalized name and confirm
+        print_success(f"Branch name: {normalized_name}")
+        try:
+            confirm = input("Use this name? (y/n): ").strip().lower()
+        except (KeyboardInterrupt, EOFError):
+            print()
+            print_error("Operation cancelled")
+            return None
+        
+        if confirm not in ['y', 'yes']:
+            print("Let's try again...")
+            print()
+            normalized_name = None
+    return normalized_name
+
+
+def initialize_iteration_files(root: str = ".") -> bool:
+    """
+    Create the workspace and copy the iteration templates into `root`
+    (the current worktree or an iteration worktree).
+    Returns True on success, False on failure.
+    """
+    # Ensure workspace directory exists
+    ensure_dir(os.path.join(root, WORKSPACE_DIR))
+    
+    # Copy work-iteration-prompts.md template to .rdd-docs/ (not workspace subfolder)
+    template_path = os.path.join(root, TEMPLATES_DIR, "work-iteration-prompts.md")
+    dest_path = os.path.join(root, ".rdd-docs", "work-iteration-prompts.md")
+    
+    if not os.path.isfile(template_path):
+        print_error(f"Template not found: {template_path}")
+        return False
+    
+    shutil.copy2(template_path, dest_path)
+    
+    # Copy user-story.md template to .rdd-docs/
+    user_story_template = os.path.join(root, TEMPLATES_DIR, "user-story.md")
+    user_story_dest = os.path.join(root, ".rdd-docs", "user-story.md")
+    
+    if not os.path.isfile(user_story_template):
+        print_warning(f"User story template not found: {user_story_template}")
+    else:
+        shutil.copy2(user_story_template, user_story_dest)
+    return True
+
+
+def create_iteration(branch_name: Optional[str] = None, use_worktree: bool = False,
+                     sparse: Optional[str] = None) -> bool:
+    """
+    Create new iteration workflow.
+    Simplified version that creates branch and initializes workspace.
+    With `use_worktree` the branch gets its own git worktree (and workspace)
+    and the current working tree is left untouched. `sparse` (a sparseProfiles
+    name or comma-separated paths) limits the checkout with cone-mode sparse checkout.
+    Returns True on success, False on failure.
+    """
+    current_branch = get_current_branch()
+    default_branch = get_default_branch()
+    
+    if not current_branch and not use_worktree:
+        print_error("Could not determine current branch")
+        return False
+    
+    print_banner("Create New Iteration")
+    print()
+    
+    sparse_paths = None
+    if sparse:
+        sparse_paths = resolve_sparse_paths(sparse)
+        if not sparse_paths:
+            return False
+    
+    # Safety checks apply to the current working tree only
+    if not use_worktree:
+        # Safety check: Must be on default branch
+        if current_branch != default_branch:
+            print_error(f"Must be on {default_branch} branch to create new iteration")
+            print_warning(f"Current branch: {current_branch}")
+            print()
+            print_info(f"Please checkout to {default_branch} first:")
+            print(f"  git checkout {default_branch}")
+            print_info("Or create the iteration in its own worktree:")
+            print("  python .rdd/scripts/rdd.py iteration create <name> --worktree")
+            return False
+        
+        # Safety check: Workspace must be empty
+        if os.path.isdir(WORKSPACE_DIR) and os.listdir(WORKSPACE_DIR):
+            print_error("Workspace directory is not empty")
+            print_warning(f"Workspace path: {WORKSPACE_DIR}")
+            print()
+            print("Please complete or clear the current iteration first:")
+            print("  • Use 'Complete current iteration' to finish current work")
+            print("  • Or manually clear workspace if needed")
+            print("  • Or use 'rdd.py iteration create <name> --worktree' to work in parallel")
+            return False
+    
+    # Get branch name from argument or from user
+    if branch_name:
+        normalized_name = normalize_to_kebab_case(branch_name)
+        if not normalized_name or not validate_branch_name(normalized_name):
+            print_error(f"Invalid branch name: {branch_name}")
+            return False
+    else:
+        normalized_name = _prompt_iteration_name()
+        if not normalized_name:
+            return False
+    
+    print()
+    
+    # Step 1: Create branch
+    
+    # Check if branch already exists
+    if local_branch_exists(normalized_name):
+        print_error(f"Branch '{normalized_name}' already exists")
+        return False
+    
+    # Update default branch and create the new branch from it (one checkout)
+    if not is_local_only_mode():
+        print_info(f"Fetching latest {default_branch}...")
+    worktree_path = None
+    if use_worktree:
+        worktree_path = add_iteration_worktree(normalized_name, default_branch, sparse_paths)
+        if not worktree_path:
+            return False
+    else:
+        # Narrow the checkout first so the branch switch only writes the cone
+        narrowed = False
+        if sparse_paths:
+            print_info(f"Sparse checkout: {', '.join(sparse_paths)}")
+            narrowed = apply_sparse_checkout(sparse_paths)
+        if not create_branch_from_default(normalized_name, default_branch):
+            print_error("Failed to create branch")
+            # The default branch stays checked out; give it back its full tree
+            if narrowed:
+                disable_sparse_checkout()
+            return False
+    
+   
+    # Step 2: Initialize workspace
+    if not initialize_iteration_files(worktree_path or "."):
+        return False
+
+    
+    # Step 3: Summary
+
+    print_success(f"Ready to work on: {normalized_name}")
+    print()
+    print_info("Summary:")
+    if worktree_path:
+        print(f"  • Branch {normalized_name} is checked out in worktree: {worktree_path}")
+        print(f"  • Your files are in Workspace: {os.path.join(worktree_path, WORKSPACE_DIR)}")
+        if sparse_paths:
+            print(f"  • Sparse checkout: {', '.join(sparse_paths)}")
+        print()
+        print_info("Next steps:")
+        print(f"  1. cd {worktree_path}")
+        print("  2. Define your prompts in workspace file work-iteration-prompts.md")
+        print("  3. Use execution prompt in .github/prompts to run prompts")
+        print(f"  4. Run 'rdd.py iteration complete {normalized_name}' to finish and remove the worktree")
+        return True
+    print(f"  • You are working on branch: {normalized_name}")
+    print(f"  • Your files are in Workspace: {WORKSPACE_DIR}")
+    if sparse_paths:
+        print(f"  • Sparse checkout: {', '.join(sparse_paths)} (full checkout: git sparse-checkout disable)")
+    print()
+    print_info("Next steps:")
+    print("  1. Define your prompts in workspace file work-iteration-prompts.md")
+    print("  2. Use execution prompt in .github/prompts to run prompts")
+    print("  3. If meanwhile other developers have updated the default branch, execute 'Update from default' to sync")    
+    print("  4. When done with changes - use document prompt to update docs")
+    print("  5. Run option 'Complete current iteration' to finish and merge to default branch")
+
+    return True
+
+
+def list_iterations(as_json: bool = False) -> bool:
+    """
+    List iteration worktrees: branch, workspace size and path.
+    Returns True on success, False on failure.
+    """
+    worktrees = [wt for wt in list_worktrees() if not wt.bare]
+    if not worktrees:
+        print_error("Could not list worktrees")
+        return False
+    
+    current_root = os.path.normpath(get_repo_root())
+    if as_json or json_output_enabled():
+        entries = []
+        for wt in worktrees:
+            entry = wt.to_dict()
+            entry['current'] = wt.path == current_root
+            entries.append(entry)
+        if json_output_enabled():
+            record_result(worktrees=entries)
+        else:
+            print(json.dumps({'worktrees': entries}, indent=2))
+        return True
+    
+    print_banner("Iterations")
+    print()
+    width = max(len(wt.branch or '(detached)') for wt in worktrees)
+    for wt in worktrees:
+        marker = '*' if wt.path == current_root else ' '
+        name = wt.branch or '(detached)'
+        files = wt.workspace_files()
+        workspace = f"{files} workspace file{'s' if files != 1 else ''}"
+        suffix = ' (main)' if wt.is_main else ''
+        if wt.prunable:
+            suffix += ' (missing, run git worktree prune)'
+        print(f"{marker} {name:<{width}}  {workspace:<20} {wt.path}{suffix}")
+    return True
+
+
+def switch_iteration(name: str) -> bool:
+    """
+    Switch to iteration `name`. A worktree iteration cannot change the
+    caller's directory, so its path is printed (use: cd "$(rdd.py iteration switch <name>)");
+    a plain branch iteration is checked out in the current working tree.
+    Returns True on success, False on failure.
+    """
+    worktree = find_worktree(name)
+    if worktree:
+        if sys.stdout.isatty():
+            print_info(f"Iteration '{worktree.branch or name}' lives in its own worktree. Change directory with:")
+            print(f"  cd {worktree.path}")
+        else:
+            print(worktree.path)
+        return True
+    
+    if not local_branch_exists(name):
+        print_error(f"No iteration named '{name}'")
+        return False
+    
+    result = run_git(['switch', name], capture_output=True, text=True)
+    invalidate_repo_context('current_branch')
+    if result.returncode != 0:
+        print_error(f"Failed to switch to '{name}'")
+        if result.stderr:
+            print(result.stderr.strip())
+        return False
+    print_success(f"Switched to branch: {name}")
+    return True
+
+
+def complete_iteration_worktree(name: str) -> bool:
+    """
+    Complete the iteration checked out in a linked worktree (archive, commit,
+    optional push) and remove the worktree; the branch is kept.
+    Returns True on success, False on failure.
+    """
+    worktree = find_worktree(name)
+    if not worktree:
+        print_error(f"No worktree found for iteration '{name}'")
+        return False
+    if worktree.is_main:
+        print_error("The main worktree cannot be removed; use 'rdd.py iteration complete' without a name")
+        return False
+    
+    with in_worktree(worktree.path):
+        if not complete_iteration(switch_to_default=False):
+            return False
+    
+    # Leave the worktree before removing it
+    main_path = list_worktrees()[0].path
+    cwd = os.path.normpath(os.getcwd())
+    if cwd == worktree.path or cwd.startswith(worktree.path + os.sep):
+        os.chdir(main_path)
+    
+    print()
+    print_step(f"Removing worktree {worktree.path}...")
+    with in_worktree(main_path):
+        if not remove_worktree(worktree.path):
+            print_warning("Worktree not removed (it has uncommitted or untracked files)")
+            print(f"  git worktree remove --force {worktree.path}")
+            return True
+    print_success(f"Worktree removed; branch {worktree.branch} is kept")
+    return True
+
+
+# ============================================================================
+# HELP
+# ============================================================================
+
+def show_iteration_help() -> None:
+    """Show iteration management help."""
+    print_banner("Iteration Management")
+    print()
+    print("Usage: rdd.py iteration <action> [options]")
+    print()
+    print("Actions:")
+    print("  create [name] [--worktree] [--sparse <profile|paths>]")
+    print("                              Create new iteration (prompts for name if omitted)")
+    print("                              --worktree: own git worktree and workspace,")
+    print("                              current checkout untouched (parallel iterations)")
+    print("                              --sparse: check out only a sparseProfiles entry or")
+    print("                              comma-separated directories (plus .rdd, .rdd-docs,")
+    print("                              .github/prompts)")
+    print("  list [--json]               List iteration worktrees and their workspaces")
+    print("  switch <name>               Print the worktree path of an iteration,")
+    print("                              or check out a branch iteration")
+    print("  complete [name]             Archive, commit, optionally push; removes the")
+    print("                              iteration worktree (current iteration if omitted)")
+    print()
+    print("Configuration:")
+    print("  worktreeRoot                Worktree folder, relative to the main worktree")
+    print("                              (default: ../<repo>.worktrees)")
+    print("  sparseProfiles              Named path sets, e.g. {\"api\": [\"services/api\"]}")
+    print()
+    print("Examples:")
+    print("  rdd.py iteration create fix-20251109-1237-bug-123 --worktree")
+    print("  rdd.py iteration create enh-api-paging --worktree --sparse api")
+    print("  rdd.py iteration list")
+    print('  cd "$(rdd.py iteration switch fix-20251109-1237-bug-123)"')
+    print("  rdd.py iteration complete fix-20251109-1237-bug-123")
+
+
+# ============================================================================
+# DOMAIN ROUTING
+# ============================================================================
+
+def route_iteration(args: List[str]) -> int:
+    """Route iteration domain commands."""
+    if not args or args[0] in ['--help', '-h']:
+        show_iteration_help()
+        return 0
+    
+    action = args[0]
+    options = [a for a in args[1:] if a.startswith('--')]
+    positional = [a for a in args[1:] if not a.startswith('--')]
+    
+    if action == 'create':
+        name = None
+        use_worktree = False
+        sparse = None
+        i = 1
+        while i < len(args):
+            arg = args[i]
+            if arg == '--worktree':
+                use_worktree = True
+            elif arg == '--sparse' or arg.startswith('--sparse='):
+                if '=' in arg:
+                    sparse = arg.split('=', 1)[1]
+                elif i + 1 < len(args):
+                    i += 1
+                    sparse = args[i]
+                if not sparse:
+                    print_error("--sparse requires a profile name or comma-separated paths")
+                    return 1
+            elif arg.startswith('--'):
+                print_error(f"Unknown option: {arg}")
+                return 1
+            elif name is None:
+                name = arg
+            else:
+                print_error(f"Unexpected argument: {arg}")
+                return 1
+            i += 1
+        return 0 if create_iteration(name, use_worktree=use_worktree, sparse=sparse) else 1
+    
+    elif action == 'list':
+        return 0 if list_iterations(as_json='--json' in options) else 1
+    
+    elif action == 'switch':
+        if not positional:
+            print_error("Iteration name required")
+            print("Usage: rdd.py iteration switch <name>")
+            return 1
+        return 0 if switch_iteration(positional[0]) else 1
+    
+    elif action == 'complete':
+        if positional:
+            worktree = find_worktree(positional[0])
+            if worktree and not worktree.is_main:
+                return 0 if complete_iteration_worktree(positional[0]) else 1
+            if positional[0] != get_current_branch():
+                print_error(f"Iteration '{positional[0]}' is neither a worktree nor the current branch")
+                return 1
+        else:
+            worktree = find_worktree(get_repo_root())
+            if worktree and not worktree.is_main and worktree.branch:
+                return 0 if complete_iteration_worktree(worktree.branch) else 1
+        return 0 if complete_iteration() else 1
+    
+    else:
+        print_error(f"Unknown iteration action: {action}")
+        print("Use 'rdd.py iteration --help' for usage information")
+        return 1
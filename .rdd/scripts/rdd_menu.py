@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+rdd_menu.py
+Interactive main menu of the RDD framework (`rdd.py` without arguments)
+Runs each menu action against a fresh repository snapshot.
+"""
+
+from rdd_utils import (
+    print_success, print_error, print_warning, get_current_branch, get_default_branch,
+    repo_context, update_from_default_branch, is_debug_mode
+)
+from rdd_ui import simple_menu
+from rdd_branch import cleanup_after_merge
+from rdd_iteration import complete_iteration, create_iteration
+from rdd_config import interactive_config_menu
+
+
+# ============================================================================
+# MAIN MENU SYSTEM
+# ============================================================================
+
+def main_menu_loop(version: str = "unknown") -> None:
+    """Main interactive menu loop - Simplified 4-option menu."""
+    # Show banner
+    print()
+    print("╔" + "═" * 62 + "╗")
+    print("║" + " " * 62 + "║")
+    print("║" + "            RDD Framework            ".center(62) + "║")
+    print("║" + "    Requirements-Driven Development   ".center(62) + "║")
+    print("║" + " " * 62 + "║")
+    print("╚" + "═" * 62 + "╝")
+    print()
+    print(f"Version: {version}")
+    print()
+    input("Press Enter to continue...")
+
+    while True:
+        # Each menu action runs against a fresh repository snapshot
+        with repo_context():
+            if not _main_menu_iteration():
+                return
+
+
+def _main_menu_iteration() -> bool:
+    """
+    Run one pass of the main menu: show branch info and dispatch the selection.
+    Returns False when the user chooses to exit.
+    """
+    current_branch = get_current_branch() or "unknown"
+    default_branch = get_default_branch()
+    
+    print()
+    print(f"Current branch: {current_branch}")
+    print(f"Default branch: {default_branch}")
+    
+    items = [
+        "Create new iteration",
+        "Update from default",
+        "Complete current iteration",
+        "Delete merged branches",
+        "Configuration",
+        "(Reserved)",
+        "(Reserved)",
+        "(Reserved)",
+        "Exit"
+    ]
+    
+    selected = simple_menu("RDD Framework - Main Menu", items)
+
+    if selected == -1 or selected == 8:  # Exit
+        print_success("Thank you for using RDD Framework!")
+        return False
+    
+    # Skip reserved options
+    if selected in [5, 6, 7]:
+        print_warning("This option is reserved for future use")
+        input("\nPress Enter to continue...")
+        return True
+
+    try:
+        if selected == 0:  # Create new iteration
+            create_iteration()
+            input("\nPress Enter to continue...")
+            
+        elif selected == 1:  # Update from default
+            update_from_default_branch()
+            input("\nPress Enter to continue...")
+            
+        elif selected == 2:  # Complete current iteration
+            complete_iteration()
+            input("\nPress Enter to continue...")
+            
+        elif selected == 3:  # Delete merged branches
+            cleanup_after_merge()
+            input("\nPress Enter to continue...")
+        
+        elif selected == 4:  # Configuration
+            interactive_config_menu()
+            input("\nPress Enter to continue...")
+            
+    except Exception as e:
+        print_error(f"Error: {e}")
+        if is_debug_mode():
+            import traceback
+            traceback.print_exc()
+        input("\nPress Enter to continue...")
+    
+    return True
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+rdd_prompt.py
+Prompt domain of the RDD CLI (`rdd.py prompt ...`)
+Marks and lists prompts in the work-iteration prompts journal.
+"""
+
+from typing import List
+
+from rdd_utils import (
+    print_error, print_banner, mark_prompt_completed, list_prompts
+)
+
+
+# ============================================================================
+# HELP
+# ============================================================================
+
+def show_prompt_help() -> None:
+    """Show prompt management help."""
+    print_banner("Prompt Management")
+    print()
+    print("Usage: rdd.py prompt <action> [options]")
+    print()
+    print("Actions:")
+    print("  mark-completed <id>          Mark prompt as completed")
+    print("  list [--status=unchecked]    List prompts")
+    print()
+    print("Examples:")
+    print("  rdd.py prompt mark-completed P01")
+    print("  rdd.py prompt list --status=unchecked")
+
+
+# ============================================================================
+# DOMAIN ROUTING
+# ============================================================================
+
+def route_prompt(args: List[str]) -> int:
+    """Route prompt domain commands."""
+    if not args or args[0] in ['--help', '-h']:
+        show_prompt_help()
+        return 0
+    
+    action = args[0]
+    
+    if action == 'mark-completed':
+        if len(args) < 2:
+            print_error("Prompt ID required")
+            print("Usage: rdd.py prompt mark-completed <id>")
+            return 1
+        journal_file = ".rdd-docs/work-iteration-prompts.md"
+        return 0 if mark_prompt_completed(args[1], journal_file) else 1
+    
+    elif action == 'list':
+        status = "all"
+        if len(args) > 1:
+            if args[1] == "--status=unchecked":
+                status = "unchecked"
+            elif args[1] == "--status=checked":
+                status = "checked"
+        journal_file = ".rdd-docs/work-iteration-prompts.md"
+        return 0 if list_prompts(status, journal_file) else 1
+    
+    else:
+        print_error(f"Unknown prompt action: {action}")
+        print("Use 'rdd.py prompt --help' for usage information")
+        return 1
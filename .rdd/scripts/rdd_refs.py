@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+rdd_refs.py
+Fork-free reader for git HEAD and refs used by RDD framework scripts
+Reads .git/HEAD, loose refs and packed-refs directly (following worktree and
+submodule `gitdir:` indirection). Layouts it does not understand (reftable,
+GIT_DIR overrides, malformed files) are reported so callers can fall back to git.
+"""
+
+import os
+import re
+from typing import Optional, Tuple, Dict
+
+
+# Environment variables that change how git locates the repository or its refs
+_OVERRIDE_ENV_VARS = ('GIT_DIR', 'GIT_COMMON_DIR', 'GIT_WORK_TREE', 'GIT_NAMESPACE')
+
+# Refs stored per worktree (in the worktree git dir, not the common dir)
+_PER_WORKTREE_PREFIXES = ('refs/bisect/', 'refs/worktree/', 'refs/rewritten/')
+
+# Maximum symbolic ref chain followed before giving up
+_MAX_SYMREF_DEPTH = 5
+
+# Matches `refStorage = ...` in the [extensions] section of .git/config
+_REF_STORAGE_RE = re.compile(r'^\s*refstorage\s*=', re.IGNORECASE | re.MULTILINE)
+
+# packed-refs cache: path -> ((mtime_ns, size), {refname: oid})
+_packed_refs_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, str]]] = {}
+
+
+class RefReadError(Exception):
+    """Raised when refs cannot be read directly and git must be asked instead."""
+
+
+# ============================================================================
+# REPOSITORY DISCOVERY
+# ============================================================================
+
+def _read_text(path: str) -> Optional[str]:
+    """Read a small text file, returning None if it does not exist."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except NotADirectoryError:
+        return None
+    except IsADirectoryError:
+        return None
+    except (OSError, UnicodeDecodeError) as e:
+        raise RefReadError(f"Cannot read {path}: {e}")
+
+
+def _resolve_gitdir_file(dot_git_file: str) -> str:
+    """Follow a `.git` file containing `gitdir: <path>` (worktrees, submodules)."""
+    content = _read_text(dot_git_file) or ""
+    first_line = content.splitlines()[0] if content else ""
+    if not first_line.startswith('gitdir:'):
+        raise RefReadError(f"Unrecognized .git file: {dot_git_file}")
+    target = first_line[len('gitdir:'):].strip()
+    if not os.path.isabs(target):
+        target = os.path.join(os.path.dirname(dot_git_file), target)
+    return os.path.normpath(target)
+
+
+def discover_git_dirs(start: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """
+    Locate the git directory for `start` (default: cwd) the way git does.
+    Returns (git_dir, common_dir), or None when not inside a repository.
+    Raises RefReadError for layouts that must be handled by git itself.
+    """
+    for var in _OVERRIDE_ENV_VARS:
+        if os.environ.get(var):
+            raise RefReadError(f"{var} is set")
+
+    current = os.path.abspath(start or os.getcwd())
+    while True:
+        candidate = os.path.join(current, '.git')
+        if os.path.isdir(candidate):
+            git_dir = candidate
+            break
+        if os.path.isfile(candidate):
+            git_dir = _resolve_gitdir_file(candidate)
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+    if not os.path.isfile(os.path.join(git_dir, 'HEAD')):
+        raise RefReadError(f"No HEAD in {git_dir}")
+
+    # Linked worktrees keep shared refs in the common dir
+    common_dir = git_dir
+    commondir_ref = _read_text(os.path.join(git_dir, 'commondir'))
+    if commondir_ref:
+        common_dir = commondir_ref.strip()
+        if not os.path.isabs(common_dir):
+            common_dir = os.path.join(git_dir, common_dir)
+        common_dir = os.path.normpath(common_dir)
+
+    # Alternate ref storage backends are left to git
+    if os.path.isdir(os.path.join(common_dir, 'reftable')):
+        raise RefReadError("reftable ref storage")
+    config = _read_text(os.path.join(common_dir, 'config')) or ""
+    if _REF_STORAGE_RE.search(config):
+        raise RefReadError("extensions.refStorage is configured")
+
+    return git_dir, common_dir
+
+
+# ============================================================================
+# REF READER
+# ============================================================================
+
+def _read_packed_refs(path: str) -> Dict[str, str]:
+    """Parse packed-refs, cached by (mtime, size) of the file."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        _packed_refs_cache.pop(path, None)
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _packed_refs_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    refs: Dict[str, str] = {}
+    content = _read_text(path) or ""
+    for line in content.splitlines():
+        if not line or line.startswith('#') or line.startswith('^'):
+            continue
+        parts = line.split(' ', 1)
+        if len(parts) != 2:
+            raise RefReadError(f"Malformed packed-refs line: {line!r}")
+        refs[parts[1]] = parts[0]
+
+    _packed_refs_cache[path] = (key, refs)
+    return refs
+
+
+def invalidate_ref_cache() -> None:
+    """Forget parsed packed-refs files (after this process created or deleted refs)."""
+    _packed_refs_cache.clear()
+
+
+class RefReader:
+    """Reads HEAD and refs of one repository (or linked worktree) from disk."""
+
+    def __init__(self, git_dir: str, common_dir: str) -> None:
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+
+    def _ref_dir(self, ref: str) -> str:
+        """Directory that stores `ref` (worktree-private vs shared refs)."""
+        if ref == 'HEAD' or ref.startswith(_PER_WORKTREE_PREFIXES):
+            return self.git_dir
+        return self.common_dir
+
+    def _read_loose(self, ref: str) -> Optional[str]:
+        """Return the raw content of a loose ref, or None if not present."""
+        if '..' in ref or ref.startswith('/'):
+            raise RefReadError(f"Unsupported ref name: {ref}")
+        content = _read_text(os.path.join(self._ref_dir(ref), *ref.split('/')))
+        return content.strip() if content is not None else None
+
+    def read_symbolic(self, ref: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Read one level of `ref`.
+        Returns (symbolic target, None) for symrefs or (None, oid) otherwise;
+        (None, None) when the ref does not exist.
+        """
+        raw = self._read_loose(ref)
+        if raw is not None:
+            if raw.startswith('ref:'):
+                return raw[len('ref:'):].strip(), None
+            if not raw:
+                raise RefReadError(f"Empty loose ref: {ref}")
+            return None, raw
+        if ref == 'HEAD':
+            raise RefReadError("HEAD is missing")
+        return None, _read_packed_refs(os.path.join(self.common_dir, 'packed-refs')).get(ref)
+
+    def resolve(self, ref: str) -> Optional[str]:
+        """Resolve a fully qualified ref (or HEAD) to an object id, or None."""
+        for _ in range(_MAX_SYMREF_DEPTH):
+            target, oid = self.read_symbolic(ref)
+            if target is None:
+                return oid
+            ref = target
+        raise RefReadError(f"Symbolic ref chain too deep at {ref}")
+
+    def ref_exists(self, ref: str) -> bool:
+        """Check whether a fully qualified ref exists."""
+        return self.resolve(ref) is not None
+
+    def current_branch(self) -> str:
+        """
+        Current branch name, matching `git branch --show-current`
+        (empty string when HEAD is detached).
+        """
+        target, _oid = self.read_symbolic('HEAD')
+        if target and target.startswith('refs/heads/'):
+            return target[len('refs/heads/'):]
+        return ""
+
+    def list_refs(self, prefix: str = 'refs/heads/') -> Dict[str, str]:
+        """Return {refname: oid} for all refs under `prefix` (loose override packed)."""
+        packed = _read_packed_refs(os.path.join(self.common_dir, 'packed-refs'))
+        refs = {name: oid for name, oid in packed.items() if name.startswith(prefix)}
+        base = os.path.join(self._ref_dir(prefix), *prefix.rstrip('/').split('/'))
+        for root, _dirs, files in os.walk(base):
+            for name in files:
+                if name.endswith('.lock'):
+                    continue
+                rel = os.path.relpath(os.path.join(root, name), self._ref_dir(prefix))
+                refname = rel.replace(os.sep, '/')
+                oid = self.resolve(refname)
+                if oid:
+                    refs[refname] = oid
+        return refs
+
+
+def open_ref_reader(start: Optional[str] = None) -> Optional[RefReader]:
+    """
+    Build a RefReader for the repository containing `start` (default: cwd).
+    Returns None outside a repository; raises RefReadError for layouts that
+    need git.
+    """
+    dirs = discover_git_dirs(start)
+    if dirs is None:
+        return None
+    return RefReader(*dirs)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+rdd_trace.py
+Subprocess tracing for RDD framework scripts
+When enabled (`rdd.py --profile` or RDD_TRACE=1) every child process started
+through the subprocess module - subprocess.run, Popen streams, the cat-file
+coprocess, remote operations - is recorded with argv, cwd, duration, exit code
+and bytes of captured output. The run ends with a summary table on stderr and,
+optionally, a Chrome trace-event JSON file (chrome://tracing, Perfetto).
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+from typing import Optional, List, Dict, Any, Tuple
+
+# Environment switches (the CLI flag is `--profile[=trace.json]`)
+TRACE_ENV_VAR = 'RDD_TRACE'
+TRACE_FILE_ENV_VAR = 'RDD_TRACE_FILE'
+
+# Rows shown in the summary table
+SUMMARY_LIMIT = 15
+
+# git options that take a separate value before the subcommand
+_GIT_OPTIONS_WITH_VALUE = ('-C', '-c', '--git-dir', '--work-tree', '--namespace')
+
+_original_popen = subprocess.Popen
+_events: List['TraceEvent'] = []
+_events_lock = threading.Lock()
+_enabled = False
+_started_at = 0.0
+
+
+class TraceEvent:
+    """One traced child process."""
+
+    def __init__(self, argv: List[str], cwd: Optional[str], start: float, pid: Optional[int] = None):
+        self.argv = argv
+        self.cwd = cwd
+        self.start = start
+        self.pid = pid
+        self.end: Optional[float] = None
+        self.returncode: Optional[int] = None
+        self.output_bytes: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return command_name(self.argv)
+
+    @property
+    def duration(self) -> float:
+        """Seconds the process ran (until now if it has not been reaped)."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'argv': self.argv,
+            'cwd': self.cwd,
+            'pid': self.pid,
+            'durationMs': round(self.duration * 1000, 3),
+            'returncode': self.returncode,
+            'outputBytes': self.output_bytes,
+        }
+
+
+def command_name(argv: List[str]) -> str:
+    """Short label for a command: program plus git subcommand (`git rev-parse`)."""
+    if not argv:
+        return '?'
+    program = os.path.basename(str(argv[0]))
+    if program.lower().endswith('.exe'):
+        program = program[:-4]
+    if program != 'git':
+        return program
+    i = 1
+    while i < len(argv):
+        arg = str(argv[i])
+        if arg in _GIT_OPTIONS_WITH_VALUE:
+            i += 2
+            continue
+        if arg.startswith('-'):
+            i += 1
+            continue
+        return f'git {arg}'
+    return 'git'
+
+
+def _current_dir() -> Optional[str]:
+    try:
+        return os.getcwd()
+    except OSError:
+        return None
+
+
+def _output_size(data) -> int:
+    if not data:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode('utf-8', errors='replace'))
+    return len(data)
+
+
+class TracedPopen(_original_popen):
+    """Popen that records itself; installed as subprocess.Popen while tracing."""
+
+    def __init__(self, args, *popenargs, **kwargs):
+        if isinstance(args, (str, bytes)):
+            argv = [args if isinstance(args, str) else args.decode('utf-8', errors='replace')]
+        else:
+            argv = [str(a) for a in args]
+        cwd = kwargs.get('cwd')
+        self._trace = TraceEvent(argv, str(cwd) if cwd is not None else _current_dir(), time.perf_counter())
+        with _events_lock:
+            _events.append(self._trace)
+        super().__init__(args, *popenargs, **kwargs)
+        self._trace.pid = self.pid
+
+    def _trace_finish(self) -> None:
+        if self.returncode is not None and self._trace.end is None:
+            self._trace.end = time.perf_counter()
+            self._trace.returncode = self.returncode
+
+    def communicate(self, *args, **kwargs):
+        stdout, stderr = super().communicate(*args, **kwargs)
+        self._trace.output_bytes = _output_size(stdout) + _output_size(stderr)
+        self._trace_finish()
+        return stdout, stderr
+
+    def wait(self, *args, **kwargs):
+        result = super().wait(*args, **kwargs)
+        self._trace_finish()
+        return result
+
+    def poll(self):
+        result = super().poll()
+        self._trace_finish()
+        return result
+
+
+# ============================================================================
+# ENABLE / DISABLE
+# ============================================================================
+
+def tracing_requested() -> bool:
+    """Check whether RDD_TRACE asks for tracing."""
+    return os.environ.get(TRACE_ENV_VAR, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def is_tracing_enabled() -> bool:
+    return _enabled
+
+
+def enable_tracing() -> None:
+    """Start recording child processes (clears earlier events)."""
+    global _enabled, _started_at
+    with _events_lock:
+        _events.clear()
+    _started_at = time.perf_counter()
+    subprocess.Popen = TracedPopen
+    _enabled = True
+
+
+def disable_tracing() -> None:
+    """Stop recording; events stay available until the next enable."""
+    global _enabled
+    subprocess.Popen = _original_popen
+    _enabled = False
+
+
+def get_trace_events() -> List[TraceEvent]:
+    with _events_lock:
+        return list(_events)
+
+
+def extract_profile_args(args: List[str]) -> Tuple[List[str], bool, Optional[str]]:
+    """
+    Remove `--profile` / `--profile=<trace.json>` from CLI arguments.
+    Returns (remaining args, profile requested, trace file or None).
+    """
+    remaining = []
+    profile = False
+    trace_file = None
+    for arg in args:
+        if arg == '--profile':
+            profile = True
+        elif arg.startswith('--profile='):
+            profile = True
+            trace_file = arg.split('=', 1)[1] or None
+        else:
+            remaining.append(arg)
+    return remaining, profile, trace_file
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def summarize(events: List[TraceEvent]) -> List[Dict[str, Any]]:
+    """Aggregate events per command, slowest total first."""
+    groups: Dict[str, Dict[str, Any]] = {}
+    for event in events:
+        group = groups.setdefault(event.name, {
+            'command': event.name, 'count': 0, 'totalMs': 0.0, 'maxMs': 0.0,
+            'failures': 0, 'outputBytes': 0,
+        })
+        duration_ms = event.duration * 1000
+        group['count'] += 1
+        group['totalMs'] += duration_ms
+        group['maxMs'] = max(group['maxMs'], duration_ms)
+        if event.returncode not in (0, None):
+            group['failures'] += 1
+        group['outputBytes'] += event.output_bytes or 0
+    return sorted(groups.values(), key=lambda g: g['totalMs'], reverse=True)
+
+
+def format_summary(events: List[TraceEvent], wall_time: float, limit: int = SUMMARY_LIMIT) -> str:
+    """Render the per-command summary table."""
+    rows = summarize(events)
+    total_ms = sum(event.duration for event in events) * 1000
+    lines = [
+        f"rdd profile: {len(events)} subprocesses, {total_ms:.1f} ms in subprocesses, "
+        f"{wall_time * 1000:.1f} ms wall time",
+    ]
+    if not rows:
+        return lines[0]
+    width = max(len('command'), max(len(row['command']) for row in rows[:limit]))
+    lines.append(f"  {'command':<{width}}  {'calls':>5}  {'total ms':>9}  {'max ms':>8}  {'failed':>6}  {'out bytes':>9}")
+    for row in rows[:limit]:
+        lines.append(
+            f"  {row['command']:<{width}}  {row['count']:>5}  {row['totalMs']:>9.1f}  "
+            f"{row['maxMs']:>8.1f}  {row['failures']:>6}  {row['outputBytes']:>9}"
+        )
+    if len(rows) > limit:
+        lines.append(f"  ... {len(rows) - limit} more commands")
+    return '\n'.join(lines)
+
+
+def to_chrome_trace(events: List[TraceEvent], origin: float) -> Dict[str, Any]:
+    """
+    Build a Chrome trace-event document: one complete ("X") event per process,
+    overlapping processes on separate lanes (tid).
+    """
+    lane_ends: List[float] = []
+    trace_events = []
+    pid = os.getpid()
+    for event in sorted(events, key=lambda e: e.start):
+        lane = next((i for i, end in enumerate(lane_ends) if end <= event.start), len(lane_ends))
+        end = event.start + event.duration
+        if lane == len(lane_ends):
+            lane_ends.append(end)
+        else:
+            lane_ends[lane] = end
+        trace_events.append({
+            'name': event.name,
+            'cat': 'subprocess',
+            'ph': 'X',
+            'ts': round((event.start - origin) * 1e6, 1),
+            'dur': round(event.duration * 1e6, 1),
+            'pid': pid,
+            'tid': lane,
+            'args': event.to_dict(),
+        })
+    return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+
+def finish_tracing(trace_file: Optional[str] = None, stream=None) -> None:
+    """
+    Stop tracing, print the summary table (stderr by default) and write the
+    Chrome trace to `trace_file` or RDD_TRACE_FILE when set.
+    """
+    wall_time = time.perf_counter() - _started_at
+    disable_tracing()
+    events = get_trace_events()
+    stream = stream or sys.stderr
+    print(format_summary(events, wall_time), file=stream)
+
+    trace_file = trace_file or os.environ.get(TRACE_FILE_ENV_VAR)
+    if trace_file:
+        try:
+            with open(trace_file, 'w', encoding='utf-8') as f:
+                json.dump(to_chrome_trace(events, _started_at), f, indent=1)
+            print(f"rdd profile: trace written to {trace_file}", file=stream)
+        except OSError as e:
+            print(f"rdd profile: could not write {trace_file}: {e}", file=stream)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+rdd_ui.py
+Interactive prompts shared by the RDD CLI domains
+Numbered menus, text input and confirmations that work in any terminal.
+"""
+
+from typing import Optional
+
+from rdd_utils import (
+    print_error, print_warning, validate_branch_name
+)
+
+
+# ============================================================================
+# INTERACTIVE UI HELPERS
+# ============================================================================
+
+# Feature flags / hidden options
+# Enhancement selection exists but is hidden from the interactive menu by default.
+SHOW_ENH_IN_MENU_DEFAULT = False
+
+
+def simple_menu(title: str, items: list) -> int:
+    """
+    Simple numbered menu. Returns selected index.
+    Returns -1 if user cancels (enters 'q' or invalid input).
+    """
+    print()
+    print("=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+    print()
+    
+    for idx, label in enumerate(items, start=1):
+        print(f"  {idx}. {label}")
+    
+    print()
+    print("Enter number to select (or 'q' to cancel): ", end="")
+    
+    try:
+        choice = input().strip().lower()
+        
+        if choice == 'q' or choice == '':
+            return -1
+        
+        try:
+            selected = int(choice)
+            if 1 <= selected <= len(items):
+                return selected - 1
+            else:
+                print_warning(f"Invalid choice. Please enter a number between 1 and {len(items)}")
+                return -1
+        except ValueError:
+            print_warning("Invalid input. Please enter a number.")
+            return -1
+            
+    except (KeyboardInterrupt, EOFError):
+        print()
+        return -1
+
+
+def simple_text_input(title: str, prompt: str, default: str = "") -> Optional[str]:
+    """
+    Simple text input dialog.
+    Returns user input or None if cancelled.
+    """
+    print()
+    print("=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+    print()
+    print(prompt)
+    if default:
+        print(f"(Press Enter for default: {default})")
+    print()
+    print("Enter value (or 'q' to cancel): ", end="")
+    
+    try:
+        user_input = input().strip()
+        
+        if user_input.lower() == 'q':
+            return None
+        
+        if not user_input and default:
+            return default
+        
+        return user_input if user_input else None
+            
+    except (KeyboardInterrupt, EOFError):
+        print()
+        return None
+
+
+def simple_confirmation(title: str, message: str) -> bool:
+    """
+    Simple yes/no confirmation dialog.
+    Returns True if confirmed, False otherwise.
+    """
+    print()
+    print("=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+    print()
+    print(message)
+    print()
+    print("Confirm? (y/n): ", end="")
+    
+    try:
+        response = input().strip().lower()
+        return response in ['y', 'yes']
+    except (KeyboardInterrupt, EOFError):
+        print()
+        return False
+
+
+def select_change_type_interactive(reveal_enh: bool = SHOW_ENH_IN_MENU_DEFAULT) -> Optional[str]:
+    """
+    Show an interactive menu to select change type.
+    By default, only 'Fix' is shown. 'Enhancement' can be revealed via flag/env.
+    Returns: 'fix' or 'enh' or None if cancelled.
+    """
+    # Build visible options
+    visible_options = [("Stand Alone Prompts", "fix")]
+    if reveal_enh:
+        visible_options.append(("Enhancement", "enh"))
+
+    labels = [label for (label, _code) in visible_options]
+
+    # Use simple numeric menu
+    selected_idx = simple_menu("Select change type", labels)
+    if selected_idx is None or selected_idx < 0:
+        return None
+    return visible_options[selected_idx][1]
+
+
+def select_default_branch_interactive() -> Optional[str]:
+    """
+    Show an interactive menu to select the default branch.
+    Options: main, dev, or custom entry
+    Returns: selected branch name or None if cancelled.
+    """
+    # Build menu options
+    menu_options = [
+        ("main", "main"),
+        ("dev", "dev"),
+        ("Enter custom branch name", "custom")
+    ]
+    
+    labels = [label for (label, _code) in menu_options]
+    
+    # Use simple numeric menu
+    selected_idx = simple_menu("Select default branch for RDD framework", labels)
+    if selected_idx is None or selected_idx < 0:
+        return None
+    
+    code = menu_options[selected_idx][1]
+    
+    # If custom, prompt for input
+    if code == "custom":
+        branch_name = simple_text_input(
+            "Custom Branch Name",
+            "Enter branch name:",
+            default="main"
+        )
+        
+        if not branch_name:
+            print_warning("No branch name entered. Defaulting to 'main'.")
+            return "main"
+        
+        # Validate branch name format
+        if not validate_branch_name(branch_name):
+            print_error(f"Invalid branch name: {branch_name}")
+            return None
+        
+        return branch_name
+    
+    return code
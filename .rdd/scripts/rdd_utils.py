@@ -11,8 +11,15 @@ import re
 import subprocess
 import shutil
 import json
+import random
+import signal
+import atexit
+import fnmatch
+import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, Any, Iterator
 from pathlib import Path
 
 
@@ -31,6 +38,17 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+# ANSI codes by Colors attribute, so colors can be switched off and on again
+_ANSI_CODES = {name: value for name, value in vars(Colors).items() if name.isupper()}
+
+# Matches ANSI escape sequences (for text captured into JSON output)
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Exit codes of rdd.py commands; identical in text and --json output
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+EXIT_CANCELLED = 130
+
 # Global debug flag
 DEBUG = os.environ.get('DEBUG', '0') == '1'
 
@@ -41,31 +59,48 @@ DEBUG = os.environ.get('DEBUG', '0') == '1'
 
 def print_success(message: str) -> None:
     """Print success message with green checkmark."""
+    if _json_result is not None:
+        _json_result.add_message('success', message)
+        return
     print(f"{Colors.GREEN}✓ {message}{Colors.NC}")
 
 
 def print_error(message: str) -> None:
     """Print error message with red X to stderr."""
+    if _json_result is not None:
+        _json_result.add_message('error', message)
+        return
     print(f"{Colors.RED}✗ {message}{Colors.NC}", file=sys.stderr)
 
 
 def print_warning(message: str) -> None:
     """Print warning message with yellow warning symbol."""
+    if _json_result is not None:
+        _json_result.add_message('warning', message)
+        return
     print(f"{Colors.YELLOW}⚠ {message}{Colors.NC}")
 
 
 def print_info(message: str) -> None:
     """Print info message with blue info symbol."""
+    if _json_result is not None:
+        _json_result.add_message('info', message)
+        return
     print(f"{Colors.BLUE}ℹ {message}{Colors.NC}")
 
 
 def print_step(message: str) -> None:
     """Print step message with cyan arrow."""
+    if _json_result is not None:
+        _json_result.add_message('step', message)
+        return
     print(f"{Colors.CYAN}▶{Colors.NC} {message}")
 
 
 def print_banner(title: str, subtitle: str = "") -> None:
     """Print a formatted banner with custom title and optional subtitle."""
+    if _json_result is not None:
+        return
     total_width = 60
     
     print(f"{Colors.CYAN}{Colors.BOLD}")
@@ -91,6 +126,98 @@ def print_banner(title: str, subtitle: str = "") -> None:
     print(f"{Colors.NC}")
 
 
+# ============================================================================
+# OUTPUT MODE (colors, --json)
+# ============================================================================
+
+def colors_wanted(stream=None) -> bool:
+    """
+    Decide whether to emit ANSI colors: only when `stream` (default stdout) is a
+    terminal, unless NO_COLOR is set or RDD_COLOR=always|never overrides it.
+    """
+    setting = os.environ.get('RDD_COLOR', '').strip().lower()
+    if setting in ('always', 'never'):
+        return setting == 'always'
+    if os.environ.get('NO_COLOR'):
+        return False
+    stream = stream or sys.stdout
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def configure_colors(enabled: bool) -> None:
+    """Switch the ANSI codes in Colors on or off for all later output."""
+    for name, code in _ANSI_CODES.items():
+        setattr(Colors, name, code if enabled else '')
+
+
+def colors_enabled() -> bool:
+    return Colors.NC != ''
+
+
+def strip_ansi(text: str) -> str:
+    return _ANSI_RE.sub('', text)
+
+
+class CommandResult:
+    """
+    Structured outcome of one CLI command, rendered as a single JSON document
+    with `rdd.py --json`. While it is active, print_success/error/warning/info/step
+    become messages, banners are dropped and commands add data via record_result().
+    """
+    
+    def __init__(self, command: List[str]) -> None:
+        self.command = list(command)
+        self.data: Dict[str, Any] = {}
+        self.messages: List[Dict[str, str]] = []
+    
+    def add_message(self, level: str, text: str) -> None:
+        self.messages.append({'level': level, 'text': text})
+    
+    def to_dict(self, exit_code: int, output: str = "") -> Dict[str, Any]:
+        document = {
+            'command': self.command,
+            'ok': exit_code == EXIT_SUCCESS,
+            'exitCode': exit_code,
+            'data': self.data,
+            'messages': self.messages,
+        }
+        output = strip_ansi(output).strip('\n')
+        if output:
+            # Plain text a command printed outside the structured result
+            document['output'] = output
+        return document
+
+
+# The result collecting the current command's output (None: print normally)
+_json_result: Optional[CommandResult] = None
+
+
+@contextmanager
+def json_output(command: List[str]):
+    """Collect messages and data of one command instead of printing them."""
+    global _json_result
+    previous = _json_result
+    _json_result = CommandResult(command)
+    try:
+        yield _json_result
+    finally:
+        _json_result = previous
+
+
+def json_output_enabled() -> bool:
+    """True while a command runs with `rdd.py --json`."""
+    return _json_result is not None
+
+
+def record_result(**data: Any) -> None:
+    """Add fields to the structured result of the current command (no-op in text mode)."""
+    if _json_result is not None:
+        _json_result.data.update(data)
+
+
 # ============================================================================
 # DEBUG FUNCTIONS
 # ============================================================================
@@ -246,6 +373,576 @@ def get_timestamp_filename() -> str:
     return datetime.now().strftime('%Y%m%d-%H%M')
 
 
+# ============================================================================
+# GIT EXECUTOR
+# ============================================================================
+
+# Matches a `git cat-file --batch-check` answer: "<oid> <type> <size>"
+_BATCH_CHECK_RE = re.compile(r'^([0-9a-f]{40,64}) (commit|tree|blob|tag) \d+$')
+
+
+class GitExecutor:
+    """
+    Runs git commands for a single working directory.
+    
+    Ref lookups, object existence checks and rev-parse style queries are served
+    by one long-lived `git cat-file --batch-check` coprocess, so a whole command
+    (or menu session) shares it instead of spawning git for every probe.
+    Porcelain commands go through run(), which spawns a one-shot subprocess.
+    If the coprocess cannot be started or dies, queries fall back to one-shot
+    `git rev-parse` calls.
+    """
+    
+    def __init__(self, cwd: Optional[str] = None) -> None:
+        self.cwd = cwd
+        self._batch: Optional[subprocess.Popen] = None
+        self._batch_disabled = False
+    
+    def run(self, args: List[str], **kwargs) -> subprocess.CompletedProcess:
+        """Run a one-shot git command (args exclude the leading 'git')."""
+        return subprocess.run(['git'] + list(args), **kwargs)
+    
+    def popen(self, args: List[str], **kwargs) -> subprocess.Popen:
+        """Start a git command whose output is consumed as a stream."""
+        return subprocess.Popen(['git'] + list(args), **kwargs)
+    
+    def _batch_process(self) -> Optional[subprocess.Popen]:
+        """Return the running cat-file coprocess, starting it if needed."""
+        if self._batch is not None and self._batch.poll() is None:
+            return self._batch
+        if self._batch_disabled:
+            return None
+        try:
+            self._batch = subprocess.Popen(
+                ['git', 'cat-file', '--batch-check'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.cwd,
+                universal_newlines=True,
+                bufsize=1
+            )
+            debug_print("Started git cat-file coprocess")
+        except OSError as e:
+            debug_print(f"Could not start git cat-file coprocess: {e}")
+            self._batch = None
+            self._batch_disabled = True
+        return self._batch
+    
+    def _batch_query(self, name: str) -> Optional[str]:
+        """Send one name to the coprocess. Returns the answer line or None on failure."""
+        proc = self._batch_process()
+        if proc is None:
+            return None
+        try:
+            proc.stdin.write(name + '\n')
+            proc.stdin.flush()
+            line = proc.stdout.readline()
+        except (OSError, ValueError):
+            line = ''
+        if not line:
+            # Coprocess died; use one-shot commands from now on
+            self.close()
+            self._batch_disabled = True
+            return None
+        return line.rstrip('\n')
+    
+    def object_info(self, name: str) -> Optional[Tuple[str, str]]:
+        """
+        Resolve a revision, ref or object name.
+        Returns (object id, object type) or None if it does not resolve.
+        """
+        if not name or '\n' in name:
+            return None
+        
+        answer = self._batch_query(name)
+        if answer is not None:
+            match = _BATCH_CHECK_RE.match(answer)
+            return (match.group(1), match.group(2)) if match else None
+        
+        # One-shot fallback
+        result = self.run(
+            ['rev-parse', '--verify', '--quiet', f'{name}^{{object}}'],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            return None
+        oid = result.stdout.strip()
+        result = self.run(['cat-file', '-t', oid], capture_output=True, text=True)
+        return (oid, result.stdout.strip()) if result.returncode == 0 else None
+    
+    def rev_parse(self, name: str) -> Optional[str]:
+        """Resolve a name to an object id, or None if it does not resolve."""
+        info = self.object_info(name)
+        return info[0] if info else None
+    
+    def object_exists(self, name: str) -> bool:
+        """Check whether a name resolves to an existing object."""
+        return self.object_info(name) is not None
+    
+    def ref_exists(self, ref: str) -> bool:
+        """Check whether a fully qualified ref (e.g. refs/heads/main) exists."""
+        return self.object_info(ref) is not None
+    
+    def close(self) -> None:
+        """Stop the coprocess (if running)."""
+        proc, self._batch = self._batch, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+        finally:
+            if proc.stdout:
+                proc.stdout.close()
+
+
+# Process-wide executor, bound to the working directory it was created in
+_git_executor: Optional[GitExecutor] = None
+
+
+def get_git_executor() -> GitExecutor:
+    """
+    Return the shared GitExecutor for the current working directory.
+    A new executor is created (and the old one closed) when the cwd changes.
+    """
+    global _git_executor
+    try:
+        cwd = os.getcwd()
+    except OSError:
+        cwd = None
+    if _git_executor is None or _git_executor.cwd != cwd:
+        close_git_executor()
+        _git_executor = GitExecutor(cwd)
+    return _git_executor
+
+
+def close_git_executor() -> None:
+    """Shut down the shared GitExecutor and its coprocesses."""
+    global _git_executor
+    if _git_executor is not None:
+        _git_executor.close()
+        _git_executor = None
+
+
+atexit.register(close_git_executor)
+
+
+def run_git(args: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """Run a one-shot git command through the shared executor."""
+    return get_git_executor().run(args, **kwargs)
+
+
+def git_ref_exists(ref: str) -> bool:
+    """Check whether a fully qualified ref exists (served by the coprocess)."""
+    return get_git_executor().ref_exists(ref)
+
+
+def local_branch_exists(branch_name: str) -> bool:
+    """
+    Check whether a local branch exists.
+    Reads refs from disk when possible, otherwise asks the git executor.
+    """
+    if not branch_name:
+        return False
+    ref = f'refs/heads/{branch_name}'
+    
+    from rdd_refs import RefReadError
+    reader = get_ref_reader()
+    if reader is not None:
+        try:
+            return reader.ref_exists(ref)
+        except RefReadError as e:
+            debug_print(f"Falling back to git for {ref}: {e}")
+    return git_ref_exists(ref)
+
+
+# ============================================================================
+# REMOTE OPERATIONS
+# ============================================================================
+
+# Defaults for remote git operations (overridable in config.json)
+DEFAULT_REMOTE_TIMEOUT = 120
+DEFAULT_REMOTE_RETRIES = 2
+DEFAULT_REMOTE_BACKOFF = 1.0
+MAX_REMOTE_BACKOFF = 30.0
+
+# stderr fragments that indicate a transient network failure worth retrying
+_TRANSIENT_REMOTE_ERRORS = (
+    'could not resolve host', 'connection timed out', 'connection reset',
+    'connection refused', 'operation timed out', 'early eof',
+    'connection closed', 'the remote end hung up', 'rpc failed',
+    'unable to access', 'ssh: connect to host', 'temporary failure',
+)
+
+
+class RemoteAttempt:
+    """Outcome and timing of one attempt of a remote git operation."""
+
+    def __init__(self, number: int, returncode: int, duration: float,
+                 timed_out: bool = False, cancelled: bool = False, error: str = "") -> None:
+        self.number = number
+        self.returncode = returncode
+        self.duration = duration
+        self.timed_out = timed_out
+        self.cancelled = cancelled
+        self.error = error
+
+    def describe(self) -> str:
+        if self.cancelled:
+            outcome = "cancelled"
+        elif self.timed_out:
+            outcome = "timed out"
+        elif self.returncode == 0:
+            outcome = "ok"
+        else:
+            outcome = self.error or f"exit {self.returncode}"
+        return f"attempt {self.number}: {outcome} ({self.duration:.1f}s)"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'attempt': self.number,
+            'returncode': self.returncode,
+            'durationMs': round(self.duration * 1000),
+            'timedOut': self.timed_out,
+            'cancelled': self.cancelled,
+            'error': self.error,
+        }
+
+
+class RemoteResult:
+    """Result of a remote git operation; quacks like subprocess.CompletedProcess."""
+
+    def __init__(self, operation: str, args: List[str]) -> None:
+        self.operation = operation
+        self.args = args
+        self.attempts: List[RemoteAttempt] = []
+        self.returncode = -1
+        self.stdout = ""
+        self.stderr = ""
+        self.cancelled = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'operation': self.operation,
+            'args': self.args,
+            'returncode': self.returncode,
+            'cancelled': self.cancelled,
+            'attempts': [a.to_dict() for a in self.attempts],
+        }
+
+
+def get_remote_timeout(operation: str) -> float:
+    """
+    Timeout in seconds for `operation` (e.g. fetchTimeout or lsRemoteTimeout,
+    then remoteTimeout). 0 disables the timeout.
+    """
+    first, *rest = operation.split('-')
+    key = first + ''.join(part.capitalize() for part in rest) + 'Timeout'
+    return get_rdd_config_int(key,
+                              get_rdd_config_int('remoteTimeout', DEFAULT_REMOTE_TIMEOUT))
+
+
+def _is_transient_remote_error(stderr: str) -> bool:
+    lowered = stderr.lower()
+    return any(fragment in lowered for fragment in _TRANSIENT_REMOTE_ERRORS)
+
+
+def _backoff_delay(attempt: int, base: float) -> float:
+    """Jittered exponential backoff before retry number `attempt` (1-based)."""
+    delay = min(MAX_REMOTE_BACKOFF, base * (2 ** (attempt - 1)))
+    return delay * random.uniform(0.5, 1.5)
+
+
+def _popen_process_group(args: List[str], **kwargs) -> subprocess.Popen:
+    """Start `args` in its own process group so it can be killed as a whole."""
+    if os.name == 'nt':
+        kwargs['creationflags'] = kwargs.get('creationflags', 0) | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    return subprocess.Popen(args, **kwargs)
+
+
+def _kill_process_group(proc: subprocess.Popen, grace: float = 2.0) -> None:
+    """Terminate a child started by _popen_process_group and everything it spawned."""
+    if proc.poll() is not None:
+        return
+    try:
+        if os.name == 'nt':
+            proc.send_signal(signal.CTRL_BREAK_EVENT)
+        else:
+            os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=grace)
+    except (OSError, subprocess.TimeoutExpired):
+        try:
+            if os.name == 'nt':
+                proc.kill()
+            else:
+                os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        proc.wait()
+
+
+def run_remote(operation: str, args: List[str], timeout: Optional[float] = None,
+               retries: Optional[int] = None) -> RemoteResult:
+    """
+    Run a network git command (args exclude 'git') with a timeout, bounded
+    retries with jittered exponential backoff on timeouts and transient
+    network errors, and Ctrl-C cancellation that kills the child's process
+    group. Every failed attempt is reported; a cancelled operation returns a
+    failed result instead of raising.
+    """
+    if timeout is None:
+        timeout = get_remote_timeout(operation)
+    if retries is None:
+        retries = get_rdd_config_int('remoteRetries', DEFAULT_REMOTE_RETRIES)
+    backoff = DEFAULT_REMOTE_BACKOFF
+    
+    result = RemoteResult(operation, list(args))
+    for number in range(1, retries + 2):
+        start = time.monotonic()
+        proc = _popen_process_group(
+            ['git'] + list(args),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        timed_out = False
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout or None)
+        except subprocess.TimeoutExpired:
+            _kill_process_group(proc)
+            stdout, stderr = proc.communicate()
+            timed_out = True
+        except KeyboardInterrupt:
+            _kill_process_group(proc)
+            proc.communicate()
+            result.attempts.append(RemoteAttempt(number, 130, time.monotonic() - start, cancelled=True))
+            result.returncode = 130
+            result.cancelled = True
+            print()
+            print_warning(f"git {operation} cancelled")
+            return result
+        
+        error_lines = (stderr or "").strip().splitlines()
+        attempt = RemoteAttempt(
+            number,
+            proc.returncode,
+            time.monotonic() - start,
+            timed_out=timed_out,
+            error=f"timed out after {timeout}s" if timed_out else (error_lines[-1] if error_lines else "")
+        )
+        result.attempts.append(attempt)
+        result.returncode = 124 if timed_out else proc.returncode
+        result.stdout, result.stderr = stdout or "", stderr or ""
+        debug_print(f"git {operation} {attempt.describe()}")
+        
+        if result.ok:
+            if number > 1:
+                print_info(f"git {operation} succeeded on {attempt.describe()}")
+            break
+        if number > retries or not (timed_out or _is_transient_remote_error(result.stderr)):
+            break
+        delay = _backoff_delay(number, backoff)
+        print_warning(f"git {operation} {attempt.describe()}; retrying in {delay:.1f}s")
+        try:
+            time.sleep(delay)
+        except KeyboardInterrupt:
+            result.returncode = 130
+            result.cancelled = True
+            print()
+            print_warning(f"git {operation} cancelled")
+            return result
+    
+    if not result.ok and len(result.attempts) > 1:
+        print_warning(f"git {operation} failed after {len(result.attempts)} attempts")
+    return result
+
+
+# ============================================================================
+# FETCH STRATEGY
+# ============================================================================
+
+def is_shallow_repository() -> bool:
+    """Check whether the repository is a shallow clone (fork-free when possible)."""
+    reader = get_ref_reader()
+    if reader is not None:
+        return os.path.isfile(os.path.join(reader.common_dir, 'shallow'))
+    result = run_git(['rev-parse', '--is-shallow-repository'], capture_output=True, text=True)
+    return result.stdout.strip() == 'true'
+
+
+def get_fetch_options() -> List[str]:
+    """
+    Build git fetch options from config.json: fetchFilter (e.g. "blob:none"),
+    fetchDepth, fetchShallowSince, fetchNoTags and fetchNegotiationTips
+    (list or comma-separated refs/globs).
+    Depth limits only apply to shallow clones; in a full clone they would cut
+    the fetched tip off from local history.
+    """
+    options = []
+    fetch_filter = get_rdd_config('fetchFilter')
+    if fetch_filter:
+        options.append(f'--filter={fetch_filter}')
+    depth = get_rdd_config_int('fetchDepth', 0)
+    shallow_since = get_rdd_config('fetchShallowSince')
+    if (depth or shallow_since) and not is_shallow_repository():
+        debug_print("Full clone: ignoring fetchDepth/fetchShallowSince")
+    else:
+        if depth:
+            options.append(f'--depth={depth}')
+        if shallow_since:
+            options.append(f'--shallow-since={shallow_since}')
+    if get_rdd_config_bool('fetchNoTags'):
+        options.append('--no-tags')
+    tips = get_rdd_config('fetchNegotiationTips') or []
+    if isinstance(tips, str):
+        tips = [tip.strip() for tip in tips.split(',')]
+    options.extend(f'--negotiation-tip={tip}' for tip in tips if tip)
+    return options
+
+
+def build_fetch_args(refspecs: List[str], remote: str = "origin",
+                     extra: Optional[List[str]] = None) -> List[str]:
+    """Return the git arguments (without 'git') of a configured fetch."""
+    return ['fetch'] + get_fetch_options() + list(extra or []) + [remote] + list(refspecs)
+
+
+def fetch_from_remote(refspecs: List[str], remote: str = "origin",
+                      extra: Optional[List[str]] = None) -> RemoteResult:
+    """Fetch `refspecs` from `remote` honoring the configured fetch options."""
+    return run_remote('fetch', build_fetch_args(refspecs, remote, ['--quiet'] + list(extra or [])))
+
+
+def pull_from_remote(branch: str, remote: str = "origin"):
+    """
+    Pull `branch` into the current branch: configured fetch, then a
+    fast-forward-only merge of the fetched commit.
+    Returns the failing step's result (or the merge result on success).
+    """
+    result = fetch_from_remote([branch], remote)
+    if not result.ok:
+        return result
+    return run_git(['merge', '--ff-only', '--quiet', 'FETCH_HEAD'], capture_output=True, text=True)
+
+
+def get_fetch_plan(branch: Optional[str] = None, remote: str = "origin") -> Dict[str, Any]:
+    """
+    Describe what fetching `branch` (default branch if omitted) would do,
+    without transferring objects: the effective command, remote vs local
+    heads (one ls-remote) and the shallow/partial-clone state of the repo.
+    """
+    branch = branch or get_default_branch()
+    executor = get_git_executor()
+    heads = get_remote_heads(remote, refresh=True)
+    remote_oid = heads.get(branch) if heads is not None else None
+    tracking_oid = executor.rev_parse(f'refs/remotes/{remote}/{branch}')
+    
+    if remote_oid is None:
+        transfer = 'unknown' if heads is None else 'missing'
+    elif remote_oid == tracking_oid:
+        transfer = 'up-to-date'
+    elif executor.object_exists(remote_oid):
+        transfer = 'refs-only'
+    else:
+        transfer = 'objects'
+    
+    partial = run_git(['config', '--get', f'remote.{remote}.partialclonefilter'], capture_output=True, text=True)
+    return {
+        'remote': remote,
+        'branch': branch,
+        'command': ['git'] + build_fetch_args([branch], remote),
+        'options': get_fetch_options(),
+        'remoteOid': remote_oid,
+        'trackingOid': tracking_oid,
+        'transfer': transfer,
+        'shallow': is_shallow_repository(),
+        'partialCloneFilter': partial.stdout.strip() or None,
+    }
+
+
+# ============================================================================
+# DIFF STREAMING
+# ============================================================================
+
+class DiffEntry:
+    """One entry of `git diff --name-status`: status letter(s), path and source path."""
+    
+    __slots__ = ('status', 'path', 'old_path', 'score')
+    
+    def __init__(self, status: str, path: str, old_path: Optional[str] = None) -> None:
+        self.status = status[:1]
+        self.score = int(status[1:]) if status[1:].isdigit() else None
+        self.path = path
+        self.old_path = old_path
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"status": self.status, "path": self.path}
+        if self.old_path is not None:
+            data["oldPath"] = self.old_path
+        if self.score is not None:
+            data["score"] = self.score
+        return data
+
+
+def _iter_nul_fields(stream, chunk_size: int = 65536) -> Iterator[str]:
+    """Yield NUL-terminated fields from a binary stream as they arrive."""
+    pending = b''
+    while True:
+        chunk = stream.read1(chunk_size) if hasattr(stream, 'read1') else stream.read(chunk_size)
+        if not chunk:
+            break
+        pending += chunk
+        *fields, pending = pending.split(b'\0')
+        for field in fields:
+            yield field.decode('utf-8', errors='replace')
+    if pending:
+        yield pending.decode('utf-8', errors='replace')
+
+
+def iter_diff_name_status(revision_range: str) -> Iterator[DiffEntry]:
+    """
+    Stream changed files for a revision range from a single
+    `git diff -z --name-status -M` process, parsing entries as they arrive.
+    Rename and copy entries carry the source path in old_path.
+    Raises subprocess.CalledProcessError if git fails.
+    """
+    proc = get_git_executor().popen(
+        ['diff', '-z', '--name-status', '-M', revision_range],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        fields = _iter_nul_fields(proc.stdout)
+        for status in fields:
+            if not status:
+                continue
+            path = next(fields, None)
+            if path is None:
+                break
+            if status[0] in ('R', 'C'):
+                new_path = next(fields, None)
+                if new_path is None:
+                    break
+                yield DiffEntry(status, new_path, old_path=path)
+            else:
+                yield DiffEntry(status, path)
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, proc.args)
+
+
 # ============================================================================
 # GIT REPOSITORY CHECKS
 # ============================================================================
@@ -282,8 +979,8 @@ def check_git_repo(repo_path: str = None, exit_on_error: bool = True) -> bool:
     return True
 
 
-def get_repo_root() -> str:
-    """Get repository root directory."""
+def _read_repo_root() -> str:
+    """Resolve repository root directory through git (no caching)."""
     result = subprocess.run(
         ['git', 'rev-parse', '--show-toplevel'],
         capture_output=True,
@@ -295,12 +992,150 @@ def get_repo_root() -> str:
     return os.getcwd()
 
 
+def get_repo_root() -> str:
+    """Get repository root directory."""
+    ctx = get_repo_context()
+    if ctx is not None:
+        return ctx.repo_root
+    return _read_repo_root()
+
+
+# ============================================================================
+# REPOSITORY CONTEXT
+# ============================================================================
+
+class RepoContext:
+    """
+    Per-command snapshot of repository facts (repo root, HEAD branch,
+    default branch, parsed config, remotes and local refs).
+    
+    Each value is resolved on first access and reused until invalidated, so a
+    single command does not spawn git repeatedly for the same answer.
+    Mutating operations (checkout, commit, branch creation/deletion, config
+    writes) must call invalidate() for the keys they affect.
+    """
+    
+    KEYS = ('repo_root', 'current_branch', 'default_branch', 'config', 'remotes', 'refs')
+    
+    def __init__(self) -> None:
+        self._values: Dict[str, Any] = {}
+    
+    def _get(self, key: str, loader):
+        if key not in self._values:
+            self._values[key] = loader()
+            debug_print(f"RepoContext: resolved {key}")
+        return self._values[key]
+    
+    @property
+    def repo_root(self) -> str:
+        return self._get('repo_root', _read_repo_root)
+    
+    @property
+    def current_branch(self) -> str:
+        return self._get('current_branch', _read_current_branch)
+    
+    @property
+    def default_branch(self) -> str:
+        return self._get('default_branch', _detect_default_branch)
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        store = self._get('config', lambda: get_config_store(
+            os.path.join(self.repo_root, ".rdd-docs", "config.json")))
+        return store.load()
+    
+    @property
+    def remotes(self) -> List[str]:
+        return self._get('remotes', _read_remotes)
+    
+    def invalidate(self, *keys: str) -> None:
+        """
+        Drop cached values. With no arguments, drops everything.
+        'refs' drops the parsed packed-refs used for branch lookups.
+        """
+        if not keys or 'refs' in keys:
+            from rdd_refs import invalidate_ref_cache
+            invalidate_ref_cache()
+        if not keys:
+            self._values.clear()
+            return
+        for key in keys:
+            self._values.pop(key, None)
+
+
+# The context active for the current command (None outside of a command)
+_active_context: Optional[RepoContext] = None
+
+
+def get_repo_context() -> Optional[RepoContext]:
+    """Return the active RepoContext, or None when no command scope is open."""
+    return _active_context
+
+
+def begin_repo_context() -> RepoContext:
+    """Open a fresh RepoContext for a command, replacing any previous one."""
+    global _active_context
+    _active_context = RepoContext()
+    return _active_context
+
+
+def end_repo_context() -> None:
+    """Close the active RepoContext."""
+    global _active_context
+    _active_context = None
+
+
+@contextmanager
+def repo_context(context: Optional[RepoContext] = None):
+    """
+    Scope a RepoContext to a block (one CLI command or menu action).
+    Pass `context` to reuse an existing snapshot (the daemon keeps one warm).
+    """
+    global _active_context
+    previous = _active_context
+    _active_context = context if context is not None else RepoContext()
+    try:
+        yield _active_context
+    finally:
+        _active_context = previous
+
+
+def invalidate_repo_context(*keys: str) -> None:
+    """
+    Invalidate cached repository facts after a mutating operation.
+    No-op when no context is active.
+    """
+    if _active_context is not None:
+        _active_context.invalidate(*keys)
+
+
 # ============================================================================
 # GIT BRANCH OPERATIONS
 # ============================================================================
 
-def get_current_branch() -> str:
-    """Get current branch name."""
+def get_ref_reader():
+    """
+    Return a fork-free RefReader for the current repository, or None when
+    refs must be read through git (unusual layouts, not in a repository).
+    """
+    from rdd_refs import open_ref_reader, RefReadError
+    try:
+        return open_ref_reader()
+    except (RefReadError, OSError) as e:
+        debug_print(f"Direct ref reading unavailable: {e}")
+        return None
+
+
+def _read_current_branch() -> str:
+    """Read current branch name (no caching), from .git/HEAD when possible."""
+    from rdd_refs import RefReadError
+    reader = get_ref_reader()
+    if reader is not None:
+        try:
+            return reader.current_branch()
+        except RefReadError as e:
+            debug_print(f"Falling back to git for current branch: {e}")
+    
     result = subprocess.run(
         ['git', 'branch', '--show-current'],
         capture_output=True,
@@ -309,6 +1144,168 @@ def get_current_branch() -> str:
     return result.stdout.strip()
 
 
+def get_current_branch() -> str:
+    """Get current branch name."""
+    ctx = get_repo_context()
+    if ctx is not None:
+        return ctx.current_branch
+    return _read_current_branch()
+
+
+def _read_remotes() -> List[str]:
+    """List configured git remotes (no caching)."""
+    result = subprocess.run(
+        ['git', 'remote'],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return []
+    return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+
+def get_remotes() -> List[str]:
+    """Get names of configured git remotes."""
+    ctx = get_repo_context()
+    if ctx is not None:
+        return ctx.remotes
+    return _read_remotes()
+
+
+# Protected branches that should never be deleted by cleanup
+PROTECTED_BRANCHES = ("dev", "main", "master")
+
+# for-each-ref fields for merged-branch listing, NUL separated
+_MERGED_BRANCH_FORMAT = '%00'.join([
+    '%(refname:short)', '%(committerdate:short)', '%(upstream:short)', '%(upstream:track)'
+])
+
+
+class BranchRef:
+    """A branch as listed by `git for-each-ref`."""
+
+    def __init__(self, name: str, committer_date: str = "", upstream: str = "",
+                 track: str = "", timestamp: int = 0, current: bool = False,
+                 remote: bool = False, ahead: Optional[int] = None,
+                 behind: Optional[int] = None) -> None:
+        self.name = name
+        self.committer_date = committer_date
+        self.upstream = upstream
+        self.track = track
+        self.timestamp = timestamp
+        self.current = current
+        self.remote = remote
+        self.ahead = ahead
+        self.behind = behind
+
+    def describe(self) -> str:
+        """Short one-line detail: date, upstream and tracking status."""
+        details = [self.committer_date or "unknown date"]
+        if self.upstream:
+            details.append(f"{self.upstream} {self.track}".strip())
+        return ", ".join(details)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'current': self.current,
+            'remote': self.remote,
+            'committerDate': self.committer_date,
+            'timestamp': self.timestamp,
+            'upstream': self.upstream,
+            'track': self.track,
+            'ahead': self.ahead,
+            'behind': self.behind,
+        }
+
+
+def list_merged_branches(base_branch: str) -> List[BranchRef]:
+    """
+    List local branches fully merged into `base_branch` (one for-each-ref call),
+    excluding the base branch and protected branches.
+    """
+    result = run_git(
+        ['for-each-ref', f'--merged={base_branch}', f'--format={_MERGED_BRANCH_FORMAT}', 'refs/heads/'],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        print_error(f"Failed to list branches merged into {base_branch}")
+        return []
+    
+    protected = {base_branch, *PROTECTED_BRANCHES}
+    branches = []
+    for line in result.stdout.splitlines():
+        fields = line.split('\0')
+        if len(fields) != 4 or not fields[0] or fields[0] in protected:
+            continue
+        branches.append(BranchRef(*fields))
+    return branches
+
+
+def delete_local_branches(branches: List[str]) -> Dict[str, bool]:
+    """
+    Delete merged local branches with one `git branch -d`.
+    Returns {branch: deleted}.
+    """
+    if not branches:
+        return {}
+    result = run_git(['branch', '-d', '--'] + list(branches), capture_output=True, text=True)
+    invalidate_repo_context('refs')
+    if result.returncode != 0 and result.stderr:
+        print(result.stderr.strip(), file=sys.stderr)
+    return {branch: not local_branch_exists(branch) for branch in branches}
+
+
+def parse_push_porcelain(output: str) -> Dict[str, Tuple[bool, str]]:
+    """
+    Parse `git push --porcelain` output into {ref: (ok, summary)}.
+    Keys are destination refs with refs/heads/ stripped.
+    """
+    results: Dict[str, Tuple[bool, str]] = {}
+    for line in output.splitlines():
+        parts = line.split('\t')
+        if len(parts) < 3 or len(parts[0]) != 1 or ':' not in parts[1]:
+            continue
+        flag, refspec, summary = parts[0], parts[1], parts[2]
+        dst = refspec.split(':', 1)[1]
+        if dst.startswith('refs/heads/'):
+            dst = dst[len('refs/heads/'):]
+        results[dst] = (flag != '!', summary)
+    return results
+
+
+def delete_remote_branches(branches: List[str], remote: str = "origin") -> Dict[str, Tuple[bool, str]]:
+    """
+    Delete branches from `remote` with one `git push --delete`.
+    Branches missing from the remote are reported as not deleted instead of
+    being pushed (one missing ref would make git reject the whole push); a
+    branch missing from the remote-ref cache is first checked with a fresh
+    `git ls-remote`. Returns {branch: (ok, summary)}.
+    """
+    report: Dict[str, Tuple[bool, str]] = {}
+    heads = get_remote_heads(remote)
+    if heads is not None and any(branch not in heads for branch in branches):
+        heads = get_remote_heads(remote, refresh=True)
+    existing = []
+    for branch in branches:
+        if heads is not None and branch not in heads:
+            report[branch] = (False, f"[not on {remote}]")
+        else:
+            existing.append(branch)
+    if not existing:
+        return report
+    
+    result = run_remote('push', ['push', '--porcelain', remote, '--delete'] + existing)
+    pushed = parse_push_porcelain(result.stdout)
+    failure = (result.stderr.strip().splitlines() or ["push failed"])[-1]
+    for branch in existing:
+        report[branch] = pushed.get(branch, (False, failure))
+        if report[branch][0]:
+            record_remote_update(branch, None, remote)
+    return report
+
+
 def interactive_branch_cleanup(base_branch: str = None) -> None:
     """
     Show an interactive menu listing all branches merged into the base branch.
@@ -327,7 +1324,9 @@ def interactive_branch_cleanup(base_branch: str = None) -> None:
     
     # Fetch from remote only if not in local-only mode
     if not is_local_only_mode():
-        subprocess.run(["git", "fetch", "origin", "--quiet"])
+        result = fetch_from_remote([], extra=["--prune"])
+        if result.ok:
+            snapshot_remote_from_tracking_refs("origin")
     else:
         print_info("Local-only mode: Skipping remote fetch")
     
@@ -338,36 +1337,24 @@ def interactive_branch_cleanup(base_branch: str = None) -> None:
         text=True
     )
     
+    invalidate_repo_context('current_branch')
+    
     if result.returncode != 0:
         print_error(f"Failed to checkout {base_branch}")
         if result.stderr:
             print(result.stderr)
         return
 
-    # Get merged branches
-    result = subprocess.run(
-        ["git", "branch", "--merged", base_branch],
-        capture_output=True, text=True
-    )
-    
-    # Protected branches that should never be deleted
-    protected_branches = {base_branch, "dev", "main", "master"}
-    
-    merged_branches = []
-    for b in result.stdout.splitlines():
-        # Remove leading/trailing whitespace and the asterisk marker
-        branch_name = b.strip().lstrip("* ").strip()
-        # Only include if non-empty and not protected
-        if branch_name and branch_name not in protected_branches:
-            merged_branches.append(branch_name)
+    merged = list_merged_branches(base_branch)
+    merged_branches = [b.name for b in merged]
 
     if not merged_branches:
         print_info("No merged branches to clean up.")
         return
 
     print_info("The following branches are fully merged:")
-    for i, branch in enumerate(merged_branches, start=1):
-        print(f"  {i}. {branch}")
+    for i, branch in enumerate(merged, start=1):
+        print(f"  {i}. {branch.name}  ({branch.describe()})")
 
     print("")
     selected = input(f"{Colors.YELLOW}Enter numbers to delete (comma-sep or 'all' to delete all, ENTER to cancel): {Colors.NC}").strip()
@@ -399,16 +1386,25 @@ def interactive_branch_cleanup(base_branch: str = None) -> None:
         print_info("Cleanup aborted.")
         return
 
-    for b in to_delete:
-        subprocess.run(["git", "branch", "-d", b])
-    print_success("Selected merged branches deleted locally.")
+    deleted = delete_local_branches(to_delete)
+    deleted_count = sum(1 for ok in deleted.values() if ok)
+    if deleted_count == len(to_delete):
+        print_success("Selected merged branches deleted locally.")
+    else:
+        print_warning(f"Deleted {deleted_count} of {len(to_delete)} branch(es) locally.")
 
     # Only ask about remote deletion if not in local-only mode
     if not is_local_only_mode():
         if confirm_action("Also delete them from origin (remote)?"):
-            for b in to_delete:
-                subprocess.run(["git", "push", "origin", "--delete", b])
-            print_success("Deleted selected branches from remote as well.")
+            report = delete_remote_branches(to_delete)
+            for branch in to_delete:
+                ok, summary = report[branch]
+                if ok:
+                    print_success(f"{branch}: {summary}")
+                else:
+                    print_error(f"{branch}: {summary}")
+            if all(ok for ok, _summary in report.values()):
+                print_success("Deleted selected branches from remote as well.")
     else:
         print_info("Local-only mode: Skipping remote branch deletion")
 
@@ -421,38 +1417,29 @@ def get_default_branch() -> str:
     2. Local branch detection (main, then master)
     3. Fallback to "main"
     """
+    ctx = get_repo_context()
+    if ctx is not None:
+        return ctx.default_branch
+    return _detect_default_branch()
+
+
+def _detect_default_branch() -> str:
+    """Detect the default branch (see get_default_branch) without caching."""
     # 1. Check config file first (user configuration)
     config_branch = get_rdd_config("defaultBranch")
     if config_branch:
         # Verify branch actually exists
-        result = subprocess.run(
-            ['git', 'show-ref', '--verify', '--quiet', f'refs/heads/{config_branch}'],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        if result.returncode == 0:
+        if local_branch_exists(config_branch):
             return config_branch
         else:
             debug_print(f"Configured default branch '{config_branch}' not found, using auto-detection")
     
     # 2. Check if main branch exists
-    result = subprocess.run(
-        ['git', 'show-ref', '--verify', '--quiet', 'refs/heads/main'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode == 0:
+    if local_branch_exists("main"):
         return "main"
     
     # 3. Check if master branch exists
-    result = subprocess.run(
-        ['git', 'show-ref', '--verify', '--quiet', 'refs/heads/master'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode == 0:
+    if local_branch_exists("master"):
         return "master"
     
     # 4. Final fallback
@@ -536,43 +1523,149 @@ def get_git_user() -> str:
     return f"{name} <{email}>"
 
 
-def check_uncommitted_changes() -> bool:
+# ============================================================================
+# WORKING TREE STATUS
+# ============================================================================
+
+class WorkingTreeStatus:
     """
-    Check for uncommitted changes (modified, staged, or untracked files).
-    Returns True if no changes, False if changes exist.
+    Parsed result of one `git status --porcelain=v2 -z --branch` run.
+    
+    Attributes:
+        branch: Current branch name (None when detached)
+        oid: HEAD commit id (None before the first commit)
+        upstream: Upstream branch (None if not tracking)
+        ahead / behind: Commit counts relative to upstream (0 without upstream)
+        staged: Paths with changes in the index
+        unstaged: Tracked paths with changes in the working tree
+        untracked: Untracked (non-ignored) paths
+        conflicted: Paths with unresolved merge conflicts
+        entries: (XY status code, path) pairs in git order, for display
     """
-    # Check for modified or staged files
-    result = subprocess.run(
-        ['git', 'diff-index', '--quiet', 'HEAD', '--'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    has_changes = result.returncode != 0
     
-    # Check for untracked files
+    def __init__(self) -> None:
+        self.branch: Optional[str] = None
+        self.oid: Optional[str] = None
+        self.upstream: Optional[str] = None
+        self.ahead = 0
+        self.behind = 0
+        self.staged: List[str] = []
+        self.unstaged: List[str] = []
+        self.untracked: List[str] = []
+        self.conflicted: List[str] = []
+        self.entries: List[Tuple[str, str]] = []
+    
+    @property
+    def is_clean(self) -> bool:
+        """True when there are no staged, unstaged, untracked or conflicted paths."""
+        return not (self.staged or self.unstaged or self.untracked or self.conflicted)
+    
+    @property
+    def has_tracked_changes(self) -> bool:
+        """True when tracked files differ from HEAD (index or working tree)."""
+        return bool(self.staged or self.unstaged or self.conflicted)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "branch": self.branch,
+            "oid": self.oid,
+            "upstream": self.upstream,
+            "ahead": self.ahead,
+            "behind": self.behind,
+            "staged": list(self.staged),
+            "unstaged": list(self.unstaged),
+            "untracked": list(self.untracked),
+            "conflicted": list(self.conflicted),
+            "clean": self.is_clean,
+        }
+
+
+def parse_porcelain_v2(output: str) -> WorkingTreeStatus:
+    """Parse NUL-separated `git status --porcelain=v2 -z --branch` output."""
+    status = WorkingTreeStatus()
+    fields = iter(output.split('\0'))
+    for record in fields:
+        if not record:
+            continue
+        kind = record[0]
+        if kind == '#':
+            parts = record.split(' ')
+            header = parts[1] if len(parts) > 1 else ''
+            value = ' '.join(parts[2:])
+            if header == 'branch.oid':
+                status.oid = None if value == '(initial)' else value
+            elif header == 'branch.head':
+                status.branch = None if value == '(detached)' else value
+            elif header == 'branch.upstream':
+                status.upstream = value
+            elif header == 'branch.ab' and len(parts) >= 4:
+                status.ahead = int(parts[2].lstrip('+'))
+                status.behind = int(parts[3].lstrip('-'))
+        elif kind in ('1', '2'):
+            # "1 XY sub mH mI mW hH hI path" / "2 ... Xscore path" NUL origPath
+            parts = record.split(' ', 9 if kind == '2' else 8)
+            xy, path = parts[1], parts[-1]
+            if kind == '2':
+                next(fields, None)
+            if xy[0] != '.':
+                status.staged.append(path)
+            if xy[1] != '.':
+                status.unstaged.append(path)
+            status.entries.append((xy.replace('.', ' '), path))
+        elif kind == 'u':
+            parts = record.split(' ', 10)
+            status.conflicted.append(parts[-1])
+            status.entries.append((parts[1], parts[-1]))
+        elif kind == '?':
+            status.untracked.append(record[2:])
+            status.entries.append(('??', record[2:]))
+    return status
+
+
+def get_working_tree_status() -> Optional[WorkingTreeStatus]:
+    """
+    Probe the working tree once with `git status --porcelain=v2 -z --branch`.
+    Returns the parsed WorkingTreeStatus, or None if git status failed.
+    """
     result = subprocess.run(
-        ['git', 'ls-files', '--others', '--exclude-standard'],
+        ['git', 'status', '--porcelain=v2', '-z', '--branch'],
         capture_output=True,
-        text=True
+        text=True,
+        encoding='utf-8',
+        errors='replace'
     )
-    if result.stdout.strip():
-        has_changes = True
+    if result.returncode != 0:
+        debug_print(f"git status failed: {result.stderr.strip()}")
+        return None
+    return parse_porcelain_v2(result.stdout)
+
+
+def check_uncommitted_changes(status: Optional[WorkingTreeStatus] = None) -> bool:
+    """
+    Check for uncommitted changes (modified, staged, or untracked files).
+    An already computed status can be passed to avoid another scan.
+    Returns True if no changes, False if changes exist.
+    """
+    if status is None:
+        status = get_working_tree_status()
     
-    if has_changes:
+    if status is None or not status.is_clean:
         print_error("There are uncommitted changes in the repository.")
         print_error("Please commit or stash your changes before proceeding.")
         print("")
         print_info("Uncommitted changes:")
-        subprocess.run(['git', 'status', '--short'])
+        for code, path in (status.entries if status else []):
+            print(f"{code} {path}")
         return False
     
     debug_print("No uncommitted changes found")
     return True
 
 
-def stash_changes() -> bool:
+def stash_changes(status: Optional[WorkingTreeStatus] = None) -> bool:
     """
     Stash uncommitted changes with timestamp.
+    An already computed status can be passed to avoid another scan.
     Returns True on success, False on failure.
     """
     from datetime import datetime
@@ -580,22 +1673,10 @@ def stash_changes() -> bool:
     print_step("Stashing uncommitted changes...")
     
     # Check if there are any changes to stash
-    result = subprocess.run(
-        ['git', 'diff-index', '--quiet', 'HEAD', '--'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    has_modified = result.returncode != 0
-    
-    # Check for untracked files
-    result = subprocess.run(
-        ['git', 'ls-files', '--others', '--exclude-standard'],
-        capture_output=True,
-        text=True
-    )
-    has_untracked = bool(result.stdout.strip())
+    if status is None:
+        status = get_working_tree_status()
     
-    if not has_modified and not has_untracked:
+    if status is not None and status.is_clean:
         print_info("No uncommitted changes to stash")
         return True
     
@@ -688,30 +1769,21 @@ def pull_default_branch() -> bool:
     print_step(f"Pulling latest changes from origin/{default_branch}...")
     
     # First fetch from origin
-    result = subprocess.run(
-        ['git', 'fetch', 'origin', default_branch, '--quiet'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
+    result = fetch_from_remote([default_branch])
     
     if result.returncode != 0:
         print_error(f"Failed to fetch from origin/{default_branch}")
         return False
     
     # Check if local default branch exists
-    result = subprocess.run(
-        ['git', 'show-ref', '--verify', '--quiet', f'refs/heads/{default_branch}'],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    
-    if result.returncode != 0:
+    if not local_branch_exists(default_branch):
         # Local branch doesn't exist, create it from origin
         result = subprocess.run(
             ['git', 'branch', default_branch, f'origin/{default_branch}'],
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL
         )
+        invalidate_repo_context('default_branch')
         
         if result.returncode == 0:
             print_success(f"Created local {default_branch} branch from origin")
@@ -724,11 +1796,7 @@ def pull_default_branch() -> bool:
     current_branch = get_current_branch()
     if current_branch != default_branch:
         # We're not on main, try to fast-forward the local main branch
-        result = subprocess.run(
-            ['git', 'fetch', 'origin', f'{default_branch}:{default_branch}'],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
+        result = fetch_from_remote([f'{default_branch}:{default_branch}'])
         
         if result.returncode == 0:
             print_success(f"Updated local {default_branch} branch")
@@ -741,11 +1809,7 @@ def pull_default_branch() -> bool:
             return True
     else:
         # We're on main, do a regular pull
-        result = subprocess.run(
-            ['git', 'pull', 'origin', default_branch],
-            capture_output=True,
-            text=True
-        )
+        result = pull_from_remote(default_branch)
         
         if result.returncode == 0:
             print_success(f"Successfully pulled latest {default_branch}")
@@ -757,6 +1821,386 @@ def pull_default_branch() -> bool:
             return False
 
 
+def is_ancestor(ancestor: str, descendant: str) -> bool:
+    """Check whether commit `ancestor` is reachable from `descendant`."""
+    result = run_git(['merge-base', '--is-ancestor', ancestor, descendant],
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return result.returncode == 0
+
+
+def fast_forward_branch_ref(branch: str, target: str) -> bool:
+    """
+    Move refs/heads/<branch> to `target` without a checkout, only if it is a
+    fast-forward and the branch is not checked out. Returns True if moved.
+    """
+    if branch == get_current_branch():
+        return False
+    executor = get_git_executor()
+    if branch in checked_out_branches():
+        return False
+    old_oid = executor.rev_parse(f'refs/heads/{branch}')
+    new_oid = executor.rev_parse(target)
+    if not old_oid or not new_oid or old_oid == new_oid or not is_ancestor(old_oid, new_oid):
+        return False
+    result = run_git(
+        ['update-ref', '-m', f'rdd: fast-forward to {target}', f'refs/heads/{branch}', new_oid, old_oid],
+        capture_output=True,
+        text=True
+    )
+    return result.returncode == 0
+
+
+def sync_default_branch_ref(default_branch: str) -> str:
+    """
+    Bring the default branch up to date without touching the working tree
+    and return the start point for a new branch.
+    Fast-forwards the local ref with `fetch origin <b>:<b>` when it is not
+    checked out; otherwise fetches into origin/<b> and returns that ref if the
+    local branch has no commits of its own.
+    """
+    if is_local_only_mode():
+        return default_branch
+    
+    if get_current_branch() != default_branch:
+        if fetch_from_remote([f'{default_branch}:{default_branch}']).ok:
+            return default_branch
+        debug_print(f"Could not fast-forward local {default_branch}, fetching origin/{default_branch}")
+    
+    if not fetch_from_remote([default_branch]).ok:
+        print_warning(f"Failed to fetch origin/{default_branch} (continuing from local {default_branch})")
+        return default_branch
+    
+    remote_ref = f'origin/{default_branch}'
+    if is_ancestor(default_branch, remote_ref):
+        return remote_ref
+    print_warning(f"Local {default_branch} has commits not on origin; branching from local {default_branch}")
+    return default_branch
+
+
+def create_branch_from_default(branch_name: str, default_branch: Optional[str] = None) -> bool:
+    """
+    Create and switch to `branch_name` from the up-to-date default branch,
+    rewriting the working tree at most once (`git switch -c`).
+    Returns True on success, False on failure.
+    """
+    default_branch = default_branch or get_default_branch()
+    start_point = sync_default_branch_ref(default_branch)
+    
+    result = run_git(
+        ['switch', '--no-track', '-c', branch_name, start_point],
+        capture_output=True,
+        text=True
+    )
+    invalidate_repo_context('current_branch', 'default_branch')
+    if result.returncode != 0:
+        print_error(f"Failed to create branch '{branch_name}' from {start_point}")
+        if result.stderr:
+            print(result.stderr.strip())
+        return False
+    
+    # The default branch was checked out before; catch its ref up now
+    if start_point != default_branch:
+        fast_forward_branch_ref(default_branch, start_point)
+    return True
+
+
+def return_to_default_branch(default_branch: Optional[str] = None) -> bool:
+    """
+    Fast-forward the default branch ref (no checkout) and switch to it,
+    touching the working tree once.
+    """
+    default_branch = default_branch or get_default_branch()
+    if not is_local_only_mode() and get_current_branch() != default_branch:
+        if not fetch_from_remote([f'{default_branch}:{default_branch}']).ok:
+            debug_print(f"Could not fast-forward local {default_branch}")
+    
+    result = run_git(['switch', default_branch], capture_output=True, text=True)
+    invalidate_repo_context('current_branch')
+    if result.returncode != 0:
+        if result.stderr:
+            print(result.stderr.strip())
+        return False
+    return True
+
+
+# ============================================================================
+# ITERATION WORKTREES
+# ============================================================================
+
+WORKTREE_ROOT_DEFAULT_SUFFIX = ".worktrees"
+WORKTREE_WORKSPACE_DIR = os.path.join(".rdd-docs", "workspace")
+
+
+class WorktreeInfo:
+    """One entry of `git worktree list --porcelain`."""
+    
+    def __init__(self, path: str, head: Optional[str] = None, branch: Optional[str] = None,
+                 detached: bool = False, bare: bool = False, locked: bool = False,
+                 prunable: bool = False, is_main: bool = False):
+        self.path = path
+        self.head = head
+        self.branch = branch
+        self.detached = detached
+        self.bare = bare
+        self.locked = locked
+        self.prunable = prunable
+        self.is_main = is_main
+    
+    @property
+    def workspace_dir(self) -> str:
+        return os.path.join(self.path, WORKTREE_WORKSPACE_DIR)
+    
+    def workspace_files(self) -> int:
+        """Number of files in this worktree's .rdd-docs/workspace."""
+        count = 0
+        for _, _, files in os.walk(self.workspace_dir):
+            count += len(files)
+        return count
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'branch': self.branch,
+            'head': self.head,
+            'main': self.is_main,
+            'detached': self.detached,
+            'locked': self.locked,
+            'prunable': self.prunable,
+            'workspaceFiles': self.workspace_files() if not self.bare else 0,
+        }
+
+
+def parse_worktree_porcelain(output: str) -> List[WorktreeInfo]:
+    """Parse `git worktree list --porcelain` output (first entry is the main worktree)."""
+    worktrees: List[WorktreeInfo] = []
+    current: Optional[WorktreeInfo] = None
+    for line in output.splitlines():
+        if not line:
+            current = None
+            continue
+        key, _, value = line.partition(' ')
+        if key == 'worktree':
+            current = WorktreeInfo(os.path.normpath(value), is_main=not worktrees)
+            worktrees.append(current)
+        elif current is None:
+            continue
+        elif key == 'HEAD':
+            current.head = value
+        elif key == 'branch':
+            current.branch = value[len('refs/heads/'):] if value.startswith('refs/heads/') else value
+        elif key == 'detached':
+            current.detached = True
+        elif key == 'bare':
+            current.bare = True
+        elif key == 'locked':
+            current.locked = True
+        elif key == 'prunable':
+            current.prunable = True
+    return worktrees
+
+
+def list_worktrees() -> List[WorktreeInfo]:
+    """List all worktrees of the repository, main worktree first."""
+    result = run_git(['worktree', 'list', '--porcelain'], capture_output=True, text=True)
+    if result.returncode != 0:
+        return []
+    return parse_worktree_porcelain(result.stdout)
+
+
+def checked_out_branches() -> List[str]:
+    """Branches checked out in any worktree of the repository."""
+    return [wt.branch for wt in list_worktrees() if wt.branch]
+
+
+def find_worktree(name: str) -> Optional[WorktreeInfo]:
+    """Find a worktree by branch name, directory name or path."""
+    worktrees = list_worktrees()
+    for wt in worktrees:
+        if wt.branch == name:
+            return wt
+    path = os.path.normpath(os.path.abspath(name))
+    for wt in worktrees:
+        if wt.path == path or (not wt.is_main and os.path.basename(wt.path) == name):
+            return wt
+    return None
+
+
+def get_worktree_root() -> str:
+    """
+    Directory holding iteration worktrees: `worktreeRoot` from config
+    (relative to the main worktree), default `../<repo>.worktrees`.
+    """
+    worktrees = list_worktrees()
+    main_root = worktrees[0].path if worktrees else get_repo_root()
+    configured = get_rdd_config('worktreeRoot')
+    if configured:
+        return os.path.normpath(os.path.join(main_root, configured))
+    parent, repo_name = os.path.split(main_root)
+    return os.path.join(parent, repo_name + WORKTREE_ROOT_DEFAULT_SUFFIX)
+
+
+def get_iteration_worktree_path(branch_name: str) -> str:
+    """Path of the worktree for iteration branch `branch_name`."""
+    return os.path.join(get_worktree_root(), branch_name.replace('/', '-'))
+
+
+def add_iteration_worktree(branch_name: str, default_branch: Optional[str] = None,
+                           sparse_paths: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Create `branch_name` from the up-to-date default branch in a new worktree,
+    leaving the current working tree untouched. With `sparse_paths` only those
+    directories are checked out. Returns the worktree path, or None on failure.
+    """
+    default_branch = default_branch or get_default_branch()
+    path = get_iteration_worktree_path(branch_name)
+    if os.path.exists(path):
+        print_error(f"Worktree path already exists: {path}")
+        return None
+    
+    start_point = sync_default_branch_ref(default_branch)
+    ensure_dir(os.path.dirname(path))
+    no_checkout = ['--no-checkout'] if sparse_paths else []
+    result = run_git(
+        ['worktree', 'add', '--no-track'] + no_checkout + ['-b', branch_name, path, start_point],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        print_error(f"Failed to create worktree for '{branch_name}' from {start_point}")
+        if result.stderr:
+            print(result.stderr.strip())
+        return None
+    
+    if sparse_paths:
+        # Set the cone before the first checkout so excluded paths are never written
+        apply_sparse_checkout(sparse_paths, path)
+        result = run_git(['-C', path, 'read-tree', '-m', '-u', 'HEAD'], capture_output=True, text=True)
+        if result.returncode != 0:
+            print_error(f"Failed to check out worktree: {path}")
+            if result.stderr:
+                print(result.stderr.strip())
+            return None
+    
+    if start_point != default_branch:
+        fast_forward_branch_ref(default_branch, start_point)
+    return path
+
+
+def remove_worktree(path: str, force: bool = False) -> bool:
+    """Remove a linked worktree (the branch is kept). Returns True on success."""
+    args = ['worktree', 'remove']
+    if force:
+        args.append('--force')
+    result = run_git(args + [path], capture_output=True, text=True)
+    if result.returncode != 0:
+        if result.stderr:
+            print(result.stderr.strip())
+        return False
+    return True
+
+
+@contextmanager
+def in_worktree(path: str):
+    """Run a block inside another worktree with its own RepoContext."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        with repo_context() as ctx:
+            yield ctx
+    finally:
+        os.chdir(previous)
+
+
+# ============================================================================
+# SPARSE CHECKOUT
+# ============================================================================
+
+# Always part of an iteration's sparse checkout (cone mode also keeps root files)
+SPARSE_ALWAYS_INCLUDE = ('.rdd', '.rdd-docs', '.github/prompts')
+SPARSE_CONE_MIN_GIT_VERSION = (2, 27)
+
+
+def supports_sparse_cone() -> bool:
+    """Check whether git supports `git sparse-checkout set --cone`."""
+    return get_git_version() >= SPARSE_CONE_MIN_GIT_VERSION
+
+
+def resolve_sparse_paths(spec) -> Optional[List[str]]:
+    """
+    Resolve a sparse-checkout spec to cone directories: the name of a profile
+    in config.json `sparseProfiles`, or paths (list or comma-separated string).
+    The framework folders are always included. Returns None for invalid paths.
+    """
+    profiles = get_rdd_config('sparseProfiles') or {}
+    if isinstance(spec, str):
+        if isinstance(profiles, dict) and spec in profiles:
+            spec = profiles[spec]
+        if isinstance(spec, str):
+            spec = spec.split(',')
+    
+    paths = []
+    for raw in list(spec or []) + list(SPARSE_ALWAYS_INCLUDE):
+        path = str(raw).replace('\\', '/').strip().strip('/')
+        if not path:
+            continue
+        if path.startswith('-') or os.path.isabs(path) or '..' in path.split('/'):
+            print_error(f"Invalid sparse-checkout path: {raw}")
+            return None
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def is_sparse_checkout(path: str = '.') -> bool:
+    """Check whether the worktree at `path` uses sparse checkout."""
+    result = run_git(['-C', path, 'config', '--bool', 'core.sparseCheckout'],
+                     capture_output=True, text=True)
+    return result.stdout.strip() == 'true'
+
+
+def get_sparse_paths(path: str = '.') -> List[str]:
+    """Cone directories of the worktree at `path` (empty when not sparse)."""
+    if not is_sparse_checkout(path):
+        return []
+    result = run_git(['-C', path, 'sparse-checkout', 'list'], capture_output=True, text=True)
+    if result.returncode != 0:
+        return []
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def apply_sparse_checkout(paths: List[str], path: str = '.') -> bool:
+    """
+    Restrict the worktree at `path` to `paths` with cone-mode sparse checkout
+    (per-worktree settings in linked worktrees). Returns True on success;
+    on failure the checkout stays complete.
+    """
+    if not supports_sparse_cone():
+        print_warning("Sparse checkout needs git 2.27 or newer; using a full checkout")
+        return False
+    result = run_git(['-C', path, 'sparse-checkout', 'set', '--cone'] + list(paths),
+                     capture_output=True, text=True)
+    if result.returncode != 0:
+        print_warning("Failed to set up sparse checkout; using a full checkout")
+        if result.stderr:
+            print(result.stderr.strip())
+        return False
+    return True
+
+
+def disable_sparse_checkout(path: str = '.') -> bool:
+    """
+    Restore the full checkout of the worktree at `path`
+    (`git sparse-checkout disable`). Returns True on success.
+    """
+    result = run_git(['-C', path, 'sparse-checkout', 'disable'], capture_output=True, text=True)
+    if result.returncode != 0:
+        print_warning("Failed to restore the full checkout (run: git sparse-checkout disable)")
+        if result.stderr:
+            print(result.stderr.strip())
+        return False
+    return True
+
+
 def merge_default_branch_into_current() -> bool:
     """
     Merge default branch into current branch.
@@ -821,43 +2265,252 @@ def merge_default_branch_into_current() -> bool:
             return False
 
 
-def update_from_default_branch() -> bool:
+# ============================================================================
+# MERGE PREFLIGHT
+# ============================================================================
+
+class MergePreflight:
+    """Predicted outcome of merging a branch into HEAD, computed without touching the working tree."""
+
+    UP_TO_DATE = 'up-to-date'
+    FAST_FORWARD = 'fast-forward'
+    CLEAN = 'clean'
+    CONFLICT = 'conflict'
+    UNAVAILABLE = 'unavailable'
+
+    def __init__(self, outcome: str, conflicts: Optional[List[str]] = None,
+                 tree: Optional[str] = None) -> None:
+        self.outcome = outcome
+        self.conflicts = conflicts or []
+        self.tree = tree
+
+    @property
+    def can_merge(self) -> bool:
+        """True when the merge is known (or assumed, if unpredictable) to succeed."""
+        return self.outcome != self.CONFLICT
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'outcome': self.outcome, 'conflicts': self.conflicts, 'tree': self.tree}
+
+
+def preflight_merge(branch: str) -> MergePreflight:
     """
-    Update current branch from default branch (full workflow).
-    Stashes changes, pulls default branch, merges, and restores stash.
+    Predict merging `branch` into HEAD.
+    Uses ahead/behind counts for the trivial cases and an in-memory
+    `git merge-tree --write-tree` otherwise (git 2.38+). Returns an
+    UNAVAILABLE result when the outcome cannot be predicted.
+    """
+    result = run_git(
+        ['rev-list', '--left-right', '--count', f'HEAD...{branch}'],
+        capture_output=True,
+        text=True
+    )
+    counts = result.stdout.split()
+    if result.returncode != 0 or len(counts) != 2:
+        debug_print(f"Cannot compare HEAD with {branch}: {result.stderr.strip()}")
+        return MergePreflight(MergePreflight.UNAVAILABLE)
+    ahead, behind = int(counts[0]), int(counts[1])
+    if behind == 0:
+        return MergePreflight(MergePreflight.UP_TO_DATE)
+    if ahead == 0:
+        return MergePreflight(MergePreflight.FAST_FORWARD)
+
+    # Exit code 0 = clean, 1 = conflicts, anything else = unsupported/error
+    result = run_git(
+        ['merge-tree', '--write-tree', '--name-only', '--no-messages', '-z', 'HEAD', branch],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode not in (0, 1):
+        debug_print(f"git merge-tree unavailable: {result.stderr.strip()}")
+        return MergePreflight(MergePreflight.UNAVAILABLE)
+
+    fields = result.stdout.split('\0')
+    tree = fields[0].strip() or None
+    if result.returncode == 0:
+        return MergePreflight(MergePreflight.CLEAN, tree=tree)
+
+    conflicts: List[str] = []
+    for path in fields[1:]:
+        if path and path not in conflicts:
+            conflicts.append(path)
+    return MergePreflight(MergePreflight.CONFLICT, conflicts, tree)
+
+
+# ============================================================================
+# STASH-FREE UPDATE
+# ============================================================================
+
+# Values accepted for the updateStrategy config key
+UPDATE_STRATEGIES = ('stash', 'merge-tree')
+DEFAULT_UPDATE_STRATEGY = 'stash'
+
+
+def _build_merge_in_worktree(branch: str, base: str, message: str) -> Optional[str]:
+    """Merge `branch` into `base` in a throwaway detached worktree; return the merge commit."""
+    tmp_dir = tempfile.mkdtemp(prefix='rdd-merge-')
+    worktree = os.path.join(tmp_dir, 'worktree')
+    try:
+        result = run_git(
+            ['worktree', 'add', '--detach', '--quiet', worktree, base],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            debug_print(f"Cannot create temporary worktree: {result.stderr.strip()}")
+            return None
+        result = run_git(
+            ['-C', worktree, 'merge', '--no-edit', '-m', message, branch],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            debug_print(f"Merge in temporary worktree failed: {result.stdout.strip()}")
+            return None
+        result = run_git(['-C', worktree, 'rev-parse', 'HEAD'], capture_output=True, text=True)
+        return result.stdout.strip() or None
+    finally:
+        run_git(['worktree', 'remove', '--force', worktree], capture_output=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def build_merge_commit(branch: str, base: str, preflight: MergePreflight) -> Optional[str]:
+    """
+    Create the commit the current branch should move to after merging `branch`
+    into commit `base`, without touching the working tree or index.
+    Uses commit-tree on the preflight tree, or a temporary worktree when
+    merge-tree is unavailable. Returns None if no commit could be built.
+    """
+    if preflight.outcome == MergePreflight.FAST_FORWARD:
+        return get_git_executor().rev_parse(branch)
+    
+    message = f"Merge branch '{branch}' into {get_current_branch()}"
+    if preflight.outcome == MergePreflight.CLEAN and preflight.tree:
+        result = run_git(
+            ['commit-tree', preflight.tree, '-p', base, '-p', branch, '-m', message],
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            print_error(f"Failed to create merge commit: {result.stderr.strip()}")
+            return None
+        return result.stdout.strip()
+    if preflight.outcome == MergePreflight.UNAVAILABLE:
+        return _build_merge_in_worktree(branch, base, message)
+    return None
+
+
+def update_without_stash(branch: str, preflight: MergePreflight) -> bool:
+    """
+    Merge `branch` into the current branch without stashing.
+    Builds the merge commit out of place, checks out only the paths that
+    differ from HEAD (refusing if any of them has local changes), then moves
+    the branch ref. Uncommitted and untracked files are left untouched.
     Returns True on success, False on failure.
     """
-    default_branch = get_default_branch()
     current_branch = get_current_branch()
+    if not current_branch:
+        print_error("Cannot update a detached HEAD")
+        return False
     
-    print_banner(f"Update Branch from {default_branch}")
-    print("")
-    print_info(f"Current branch: {current_branch}")
-    print_info(f"Target: {default_branch}")
-    print("")
+    old_head = get_git_executor().rev_parse('HEAD')
+    new_head = build_merge_commit(branch, old_head, preflight) if old_head else None
+    if not new_head:
+        print_error(f"Could not build merge with {branch}")
+        return False
     
-    # Safety check: don't run on default branch
-    if current_branch == default_branch:
+    print_step(f"Merging {branch} into {current_branch} (no stash)...")
+    
+    # Two-tree read-tree rewrites only paths that changed between the commits
+    result = run_git(['read-tree', '-m', '-u', old_head, new_head], capture_output=True, text=True)
+    if result.returncode != 0:
+        print_error("Local changes would be overwritten by the update:")
+        print(result.stderr.strip())
+        print_info("Commit or move those files, or set updateStrategy to 'stash'")
+        return False
+    
+    result = run_git(
+        ['update-ref', '-m', f'rdd update: {preflight.outcome} from {branch}',
+         f'refs/heads/{current_branch}', new_head, old_head],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        print_error(f"Failed to move {current_branch}: {result.stderr.strip()}")
+        run_git(['read-tree', '-m', '-u', new_head, old_head], capture_output=True)
+        return False
+    
+    print_success(f"Successfully merged {branch} into {current_branch}")
+    return True
+
+
+def update_from_default_branch() -> bool:
+    """
+    Update current branch from default branch (full workflow).
+    Pulls default branch, predicts the merge in memory, then stashes changes,
+    merges, and restores stash. Aborts before stashing if the merge would conflict.
+    With updateStrategy 'merge-tree' the merge is built out of place instead
+    and no stash is used.
+    Returns True on success, False on failure.
+    """
+    default_branch = get_default_branch()
+    current_branch = get_current_branch()
+    
+    print_banner(f"Update Branch from {default_branch}")
+    print("")
+    print_info(f"Current branch: {current_branch}")
+    print_info(f"Target: {default_branch}")
+    print("")
+    
+    # Safety check: don't run on default branch
+    if current_branch == default_branch:
         print_error(f"Cannot update {default_branch} from itself")
         print_info(f"This command is meant to update feature branches with latest {default_branch}")
         return False
     
-    # Step 1: Stash changes
-    if not stash_changes():
-        print_error("Failed to stash changes. Aborting.")
-        return False
+    ensure_large_repo_mode()
     
-    # Step 2: Pull latest default branch
+    # Step 1: Pull latest default branch (does not touch the working tree)
     if not pull_default_branch():
         print_error(f"Failed to pull latest {default_branch}. Aborting.")
-        # Try to restore stash
-        restore_result = restore_stashed_changes()
-        if restore_result != 0:
-            print_error("Also failed to restore stashed changes")
-            print_warning("Your changes are safely in the stash. Run 'git stash list' to see them.")
         return False
     
-    # Step 3: Merge default branch into current branch
+    # Step 2: Predict the merge before touching the working tree
+    preflight = preflight_merge(default_branch)
+    if preflight.outcome == MergePreflight.UP_TO_DATE:
+        print("")
+        print_banner("Update Complete")
+        print_success(f"Branch is already up to date with {default_branch}")
+        return True
+    if preflight.outcome == MergePreflight.CONFLICT:
+        print_error(f"Merging {default_branch} would conflict. Nothing was changed.")
+        print("")
+        print_warning("Conflicts predicted in:")
+        for file in preflight.conflicts:
+            print(f"  - {file}")
+        print("")
+        print_info(f"Resolve manually with: git merge {default_branch}")
+        return False
+    if preflight.outcome == MergePreflight.UNAVAILABLE:
+        debug_print("Merge preflight unavailable, merging directly")
+    else:
+        print_info(f"Preflight: {preflight.outcome} merge")
+    
+    if get_update_strategy() == 'merge-tree':
+        if not update_without_stash(default_branch, preflight):
+            return False
+        print("")
+        print_banner("Update Complete")
+        print_success(f"Branch updated from {default_branch}")
+        print_info("Uncommitted changes were left in place")
+        return True
+    
+    # Step 3: Stash changes
+    if not stash_changes():
+        print_error("Failed to stash changes. Aborting.")
+        return False
+    
+    # Step 4: Merge default branch into current branch
     if not merge_default_branch_into_current():
         print_error("Merge failed. Please resolve conflicts manually.")
         print_warning("Your changes are still stashed. After resolving conflicts:")
@@ -865,7 +2518,7 @@ def update_from_default_branch() -> bool:
         print("  2. Restore your changes: git stash pop")
         return False
     
-    # Step 4: Restore stashed changes
+    # Step 5: Restore stashed changes
     restore_result = restore_stashed_changes()
     
     if restore_result == 0:
@@ -888,6 +2541,138 @@ def update_from_default_branch() -> bool:
         return False
 
 
+# ============================================================================
+# BRANCH DASHBOARD
+# ============================================================================
+
+# for-each-ref fields for the branch dashboard, NUL separated
+_BRANCH_LIST_FIELDS = [
+    '%(HEAD)', '%(refname)', '%(refname:short)', '%(committerdate:unix)',
+    '%(committerdate:short)', '%(upstream:short)', '%(upstream:track)'
+]
+
+# Concurrent rev-list processes used when for-each-ref lacks %(ahead-behind)
+_AHEAD_BEHIND_BATCH_SIZE = 8
+
+# Dashboard sort orders: key function and whether to reverse
+BRANCH_SORT_KEYS = {
+    'recent': (lambda b: b.timestamp, True),
+    'name': (lambda b: b.name, False),
+    'ahead': (lambda b: b.ahead if b.ahead is not None else -1, True),
+    'behind': (lambda b: b.behind if b.behind is not None else -1, True),
+}
+
+
+def _for_each_ref_branches(refs: List[str], base: str, with_ahead_behind: bool) -> Optional[str]:
+    """Run the dashboard for-each-ref; returns stdout or None if the format is unsupported."""
+    fields = list(_BRANCH_LIST_FIELDS)
+    if with_ahead_behind:
+        fields.append(f'%(ahead-behind:{base})')
+    result = run_git(
+        ['for-each-ref', '--format=' + '%00'.join(fields)] + refs,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        debug_print(f"for-each-ref failed: {result.stderr.strip()}")
+        return None
+    return result.stdout
+
+
+def list_branch_refs(base: str, include_remotes: bool = False) -> List[BranchRef]:
+    """
+    List branches with date, upstream and ahead/behind counts relative to
+    `base` in one `git for-each-ref` call (git 2.41+ `%(ahead-behind)`).
+    On older git the counts are left as None for fill_ahead_behind().
+    """
+    refs = ['refs/heads/'] + (['refs/remotes/'] if include_remotes else [])
+    output = _for_each_ref_branches(refs, base, with_ahead_behind=True)
+    if output is None:
+        output = _for_each_ref_branches(refs, base, with_ahead_behind=False)
+    if output is None:
+        return []
+    
+    branches = []
+    for line in output.splitlines():
+        fields = line.split('\0')
+        if len(fields) < len(_BRANCH_LIST_FIELDS):
+            continue
+        head, refname, name, timestamp, date, upstream, track = fields[:len(_BRANCH_LIST_FIELDS)]
+        remote = refname.startswith('refs/remotes/')
+        if remote and refname.endswith('/HEAD'):
+            continue
+        branch = BranchRef(name, date, upstream, track, int(timestamp or 0), head == '*', remote)
+        if len(fields) > len(_BRANCH_LIST_FIELDS):
+            counts = fields[-1].split()
+            if len(counts) == 2:
+                branch.ahead, branch.behind = int(counts[0]), int(counts[1])
+        branches.append(branch)
+    return branches
+
+
+def fill_ahead_behind(branches: List[BranchRef], base: str) -> None:
+    """
+    Compute missing ahead/behind counts with `git rev-list --left-right --count`,
+    running up to _AHEAD_BEHIND_BATCH_SIZE processes at a time.
+    """
+    pending = [b for b in branches if b.ahead is None]
+    executor = get_git_executor()
+    for i in range(0, len(pending), _AHEAD_BEHIND_BATCH_SIZE):
+        batch = pending[i:i + _AHEAD_BEHIND_BATCH_SIZE]
+        procs = [
+            executor.popen(
+                ['rev-list', '--left-right', '--count', f'{b.name}...{base}', '--'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+            for b in batch
+        ]
+        for branch, proc in zip(batch, procs):
+            out, _ = proc.communicate()
+            counts = out.split()
+            if proc.returncode == 0 and len(counts) == 2:
+                branch.ahead, branch.behind = int(counts[0]), int(counts[1])
+
+
+def filter_branches(branches: List[BranchRef], pattern: Optional[str] = None,
+                    regex: Optional[str] = None) -> List[BranchRef]:
+    """
+    Filter branches by name. `pattern` is a glob when it contains wildcards,
+    otherwise a substring; `regex` is matched with re.search.
+    Raises re.error for an invalid regex.
+    """
+    if pattern:
+        if any(c in pattern for c in '*?['):
+            branches = [b for b in branches if fnmatch.fnmatchcase(b.name, pattern)]
+        else:
+            branches = [b for b in branches if pattern in b.name]
+    if regex:
+        compiled = re.compile(regex)
+        branches = [b for b in branches if compiled.search(b.name)]
+    return branches
+
+
+def get_branch_dashboard(pattern: Optional[str] = None, regex: Optional[str] = None,
+                         sort: str = 'recent', limit: Optional[int] = None, skip: int = 0,
+                         include_remotes: bool = False) -> Tuple[List[BranchRef], int]:
+    """
+    Build one page of the branch dashboard.
+    Returns (branches on the page, total matching branches). Ahead/behind
+    fallbacks only run for branches on the page.
+    """
+    base = get_default_branch()
+    branches = filter_branches(list_branch_refs(base, include_remotes), pattern, regex)
+    key, reverse = BRANCH_SORT_KEYS.get(sort, BRANCH_SORT_KEYS['recent'])
+    if sort in ('ahead', 'behind'):
+        fill_ahead_behind(branches, base)
+    branches.sort(key=key, reverse=reverse)
+    total = len(branches)
+    page = branches[skip:skip + limit] if limit is not None else branches[skip:]
+    fill_ahead_behind(page, base)
+    return page, total
+
+
 # ============================================================================
 # USER INTERACTION
 # ============================================================================
@@ -990,24 +2775,20 @@ def set_config(key: str, value: str, config_file: Optional[str] = None) -> bool:
             print_error("No change config file found")
             return False
     
-    # Create config file if it doesn't exist
-    if not os.path.isfile(config_file):
-        with open(config_file, 'w') as f:
-            json.dump({}, f)
-    
     try:
         if config_file.endswith('.json'):
-            # Read existing data or create empty dict
-            if os.path.isfile(config_file) and os.path.getsize(config_file) > 0:
-                with open(config_file, 'r') as f:
-                    data = json.load(f)
-            else:
-                data = {}
-            
-            data[key] = value
-            
-            with open(config_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Read, change and replace under one lock so parallel writers
+            # never overwrite each other's keys
+            with locked_directory(os.path.dirname(os.path.abspath(config_file))):
+                # Read existing data or create empty dict
+                if os.path.isfile(config_file) and os.path.getsize(config_file) > 0:
+                    with open(config_file, 'r') as f:
+                        data = json.load(f)
+                else:
+                    data = {}
+                
+                data[key] = value
+                write_json_atomic(config_file, data)
             
             return True
         else:
@@ -1018,12 +2799,154 @@ def set_config(key: str, value: str, config_file: Optional[str] = None) -> bool:
         return False
 
 
+# ============================================================================
+# CONFIG STORE
+# ============================================================================
+
+@contextmanager
+def locked_directory(path: str):
+    """
+    Hold an exclusive lock on a directory (fcntl.flock on its descriptor) so
+    parallel processes serialize read-modify-write cycles of files in it.
+    The directory itself is locked, so no lock file appears in the worktree.
+    Without fcntl (Windows) the block runs unlocked.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    fd = os.open(path or '.', os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """
+    Write JSON to a temp file next to `path` and rename it over `path`, so
+    readers see the old or the new file, never a partial one.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                     prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.write('\n')
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class ConfigStore:
+    """
+    A JSON config file (.rdd-docs/config.json) parsed once and re-read only
+    when its (mtime, size) changes. Writes are transactions: the folder is
+    locked, the file is re-read, changed and atomically replaced.
+    """
+    
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._data: Dict[str, Any] = {}
+    
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            info = os.stat(self.path)
+        except OSError:
+            return None
+        return info.st_mtime_ns, info.st_size
+    
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+    
+    def load(self) -> Dict[str, Any]:
+        """
+        Parsed config (empty if missing or invalid). The dict is shared by all
+        readers; do not modify it.
+        """
+        stamp = self._file_stamp()
+        if stamp is None:
+            self._stamp, self._data = None, {}
+        elif stamp != self._stamp:
+            self._data = self._read()
+            self._stamp = stamp
+            debug_print(f"ConfigStore: parsed {self.path}")
+        return self._data
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.load().get(key, default)
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Yield the current config for modification under the folder lock; it is
+        written back atomically when the block ends without an exception.
+        """
+        folder = os.path.dirname(self.path)
+        os.makedirs(folder, exist_ok=True)
+        with locked_directory(folder):
+            data = self._read()
+            yield data
+            write_json_atomic(self.path, data)
+        self._data = data
+        self._stamp = self._file_stamp()
+    
+    def update(self, values: Dict[str, Any]) -> None:
+        """Set several keys in one transaction."""
+        with self.transaction() as data:
+            data.update(values)
+
+
+# Stores by config file path, kept for the life of the process
+_config_stores: Dict[str, ConfigStore] = {}
+
+# Config file path by working directory, for lookups outside a RepoContext
+_config_paths: Dict[str, str] = {}
+
+
+def get_config_store(path: Optional[str] = None) -> ConfigStore:
+    """Return the shared ConfigStore of `path` (default: the repository's config.json)."""
+    path = os.path.abspath(path or get_rdd_config_path())
+    store = _config_stores.get(path)
+    if store is None:
+        store = _config_stores[path] = ConfigStore(path)
+    return store
+
+
 def get_rdd_config_path() -> str:
     """
     Get the path to the RDD configuration file.
     Returns: Path to .rdd-docs/config.json
     """
-    return os.path.join(get_repo_root(), ".rdd-docs", "config.json")
+    ctx = get_repo_context()
+    if ctx is not None:
+        return os.path.join(ctx.repo_root, ".rdd-docs", "config.json")
+    # Outside a command, resolve the repository root once per directory
+    cwd = os.getcwd()
+    path = _config_paths.get(cwd)
+    if path is None:
+        path = _config_paths[cwd] = os.path.join(_read_repo_root(), ".rdd-docs", "config.json")
+    return path
 
 
 def get_rdd_config(key: str, default: Optional[str] = None) -> Optional[str]:
@@ -1031,17 +2954,9 @@ def get_rdd_config(key: str, default: Optional[str] = None) -> Optional[str]:
     Get value from global RDD config file (.rdd-docs/config.json).
     Returns value or default if not found.
     """
-    config_path = get_rdd_config_path()
-    
-    if not os.path.isfile(config_path):
-        return default
-    
-    try:
-        with open(config_path, 'r') as f:
-            data = json.load(f)
-            return data.get(key, default)
-    except Exception:
-        return default
+    ctx = get_repo_context()
+    data = ctx.config if ctx is not None else get_config_store().load()
+    return data.get(key, default)
 
 
 def set_rdd_config(key: str, value: str) -> bool:
@@ -1050,44 +2965,51 @@ def set_rdd_config(key: str, value: str) -> bool:
     Creates file if it doesn't exist.
     Returns True if successful, False otherwise.
     """
-    config_path = get_rdd_config_path()
-    
-    # Create .rdd-docs directory if needed
-    rdd_docs_dir = os.path.dirname(config_path)
-    if not os.path.isdir(rdd_docs_dir):
-        try:
-            os.makedirs(rdd_docs_dir, exist_ok=True)
-        except Exception as e:
-            print_error(f"Failed to create .rdd-docs directory: {e}")
-            return False
-    
-    # Load existing config or create new
-    if os.path.isfile(config_path):
-        try:
-            with open(config_path, 'r') as f:
-                data = json.load(f)
-        except Exception:
-            data = {}
-    else:
-        from datetime import datetime, timezone
-        data = {
-            "version": "1.0.0",
-            "created": datetime.now(timezone.utc).isoformat()
-        }
-    
-    # Update value and timestamp
-    from datetime import datetime, timezone
-    data[key] = value
-    data["lastModified"] = datetime.now(timezone.utc).isoformat()
-    
-    # Write back
+    return set_rdd_config_values({key: value})
+
+
+def set_rdd_config_values(values: Dict[str, Any]) -> bool:
+    """
+    Set several keys of the RDD config file in one locked, atomic write.
+    Creates the file if it doesn't exist. Returns True if successful.
+    """
+    store = get_config_store()
+    now = datetime.now(timezone.utc).isoformat()
     try:
-        with open(config_path, 'w') as f:
-            json.dump(data, f, indent=2)
-        return True
-    except Exception as e:
+        with store.transaction() as data:
+            if not data and not store.exists():
+                data.update({"version": "1.0.0", "created": now})
+            data.update(values)
+            data["lastModified"] = now
+    except (OSError, TypeError, ValueError) as e:
         print_error(f"Failed to write config: {e}")
         return False
+    invalidate_repo_context('config', 'default_branch')
+    return True
+
+
+def get_rdd_config_bool(key: str, default: bool = False) -> bool:
+    """
+    Get a boolean flag from the RDD config file.
+    Accepts JSON booleans as well as "true"/"1"/"yes" strings.
+    """
+    value = get_rdd_config(key, None)
+    if value is None:
+        return default
+    # Handle both string and boolean values
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ['true', '1', 'yes']
+
+
+def get_rdd_config_int(key: str, default: int) -> int:
+    """Get a non-negative integer from the RDD config file (JSON number or numeric string)."""
+    value = get_rdd_config(key, None)
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number >= 0 else default
 
 
 def is_local_only_mode() -> bool:
@@ -1095,11 +3017,327 @@ def is_local_only_mode() -> bool:
     Check if the repository is configured for local-only mode (no GitHub remote).
     Returns True if localOnly is set to true in config.json, False otherwise.
     """
-    local_only = get_rdd_config("localOnly", "false")
-    # Handle both string and boolean values
-    if isinstance(local_only, bool):
-        return local_only
-    return str(local_only).lower() in ['true', '1', 'yes']
+    return get_rdd_config_bool("localOnly")
+
+
+def get_update_strategy() -> str:
+    """
+    Get the configured update strategy ('stash' or 'merge-tree').
+    Unknown values fall back to 'stash'.
+    """
+    strategy = str(get_rdd_config('updateStrategy', DEFAULT_UPDATE_STRATEGY)).lower()
+    if strategy not in UPDATE_STRATEGIES:
+        print_warning(f"Unknown updateStrategy '{strategy}', using '{DEFAULT_UPDATE_STRATEGY}'")
+        return DEFAULT_UPDATE_STRATEGY
+    return strategy
+
+
+def is_large_repo_mode() -> bool:
+    """
+    Check if large-repository mode is enabled (largeRepo in config.json).
+    Enables git's untracked cache, fsmonitor and split index for faster scans.
+    """
+    return get_rdd_config_bool("largeRepo")
+
+
+# ============================================================================
+# LARGE REPOSITORY MODE
+# ============================================================================
+
+# git config keys managed by large-repo mode and the values RDD sets
+LARGE_REPO_GIT_SETTINGS = {
+    'core.untrackedCache': 'true',
+    'core.splitIndex': 'true',
+    'core.fsmonitor': 'true',
+}
+
+
+def get_git_version() -> Tuple[int, ...]:
+    """Return the installed git version as a tuple (e.g. (2, 39, 5)), or () if unknown."""
+    result = subprocess.run(['git', 'version'], capture_output=True, text=True)
+    match = re.search(r'(\d+)\.(\d+)(?:\.(\d+))?', result.stdout)
+    if result.returncode != 0 or not match:
+        return ()
+    return tuple(int(part) for part in match.groups() if part is not None)
+
+
+def has_builtin_fsmonitor() -> bool:
+    """Check whether this git build ships the built-in fsmonitor daemon."""
+    result = subprocess.run(['git', 'version', '--build-options'], capture_output=True, text=True)
+    return result.returncode == 0 and 'fsmonitor--daemon' in result.stdout
+
+
+def get_large_repo_git_settings() -> Dict[str, Optional[str]]:
+    """Read the current values of the large-repo git settings in one git call."""
+    result = subprocess.run(
+        ['git', 'config', '--get-regexp', r'^core\.(untrackedcache|splitindex|fsmonitor)$'],
+        capture_output=True,
+        text=True
+    )
+    current = {key.lower(): None for key in LARGE_REPO_GIT_SETTINGS}
+    for line in result.stdout.splitlines():
+        key, _sep, value = line.partition(' ')
+        current[key.lower()] = value.strip()
+    return {key: current[key.lower()] for key in LARGE_REPO_GIT_SETTINGS}
+
+
+def apply_large_repo_settings(warm: bool = True) -> bool:
+    """
+    Turn on untracked cache, split index and (where supported) the built-in
+    fsmonitor for this repository, then warm them with one status scan.
+    Returns True if all supported settings were applied.
+    """
+    print_step("Enabling large-repository optimizations...")
+    ok = True
+    settings = dict(LARGE_REPO_GIT_SETTINGS)
+    if not has_builtin_fsmonitor():
+        print_info("Built-in fsmonitor not available on this platform/git build - skipping")
+        settings.pop('core.fsmonitor')
+    
+    for key, value in settings.items():
+        result = subprocess.run(['git', 'config', key, value], capture_output=True, text=True)
+        if result.returncode != 0:
+            print_warning(f"Failed to set {key}: {result.stderr.strip()}")
+            ok = False
+    
+    # Rewrite the index with the untracked cache and split index extensions
+    result = subprocess.run(
+        ['git', 'update-index', '--untracked-cache', '--split-index'],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        print_warning(f"Failed to update index: {result.stderr.strip()}")
+        ok = False
+    
+    if 'core.fsmonitor' in settings:
+        subprocess.run(['git', 'fsmonitor--daemon', 'start'], capture_output=True, text=True)
+    
+    if warm:
+        # The first scan populates the untracked cache and fsmonitor token
+        get_working_tree_status()
+    
+    if ok:
+        print_success("Large-repository optimizations enabled")
+    return ok
+
+
+def ensure_large_repo_mode() -> None:
+    """
+    Apply large-repo git settings if largeRepo is enabled but they are missing.
+    Costs one git call when largeRepo is enabled and nothing otherwise.
+    """
+    if not is_large_repo_mode():
+        return
+    current = get_large_repo_git_settings()
+    missing = [key for key in ('core.untrackedCache', 'core.splitIndex') if current[key] != 'true']
+    if missing:
+        debug_print(f"Large-repo settings missing: {', '.join(missing)}")
+        apply_large_repo_settings()
+
+
+def measure_status_latency(runs: int = 2) -> List[float]:
+    """Time the working tree probe `runs` times. Returns durations in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        get_working_tree_status()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def get_large_repo_report() -> Dict[str, Any]:
+    """Collect the large-repo status used by `rdd.py git doctor`."""
+    git_dir = subprocess.run(
+        ['git', 'rev-parse', '--git-common-dir'],
+        capture_output=True,
+        text=True
+    ).stdout.strip()
+    shared_index = False
+    if git_dir and os.path.isdir(git_dir):
+        shared_index = any(name.startswith('sharedindex.') for name in os.listdir(git_dir))
+    
+    fsmonitor_supported = has_builtin_fsmonitor()
+    fsmonitor_running = False
+    if fsmonitor_supported:
+        result = subprocess.run(
+            ['git', 'fsmonitor--daemon', 'status'],
+            capture_output=True,
+            text=True
+        )
+        fsmonitor_running = result.returncode == 0
+    
+    version = get_git_version()
+    return {
+        "largeRepo": is_large_repo_mode(),
+        "gitVersion": '.'.join(str(part) for part in version) or "unknown",
+        "settings": get_large_repo_git_settings(),
+        "sharedIndexPresent": shared_index,
+        "fsmonitorSupported": fsmonitor_supported,
+        "fsmonitorRunning": fsmonitor_running,
+        "statusLatencyMs": [round(t, 1) for t in measure_status_latency()],
+    }
+
+
+# ============================================================================
+# REMOTE REF CACHE
+# ============================================================================
+
+# Seconds a remote snapshot stays fresh unless remoteCacheTtl is configured
+DEFAULT_REMOTE_CACHE_TTL = 300
+
+# Loaded cache documents: path -> ((mtime_ns, size), data)
+_remote_cache_memo: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+def get_cache_dir() -> str:
+    """Return .rdd-docs/.cache, creating it (self-ignored by git) if needed."""
+    cache_dir = os.path.join(get_repo_root(), ".rdd-docs", ".cache")
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, ".gitignore"), 'w') as f:
+            f.write("# Local RDD cache, never committed\n*\n")
+    return cache_dir
+
+
+def _remote_cache_path() -> str:
+    return os.path.join(get_cache_dir(), "remote-refs.json")
+
+
+def _load_remote_cache() -> Dict[str, Any]:
+    """Load all remote snapshots ({remote: {timestamp, fetchedAt, heads}})."""
+    path = _remote_cache_path()
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _remote_cache_memo.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    _remote_cache_memo[path] = (key, data)
+    return data
+
+
+def _update_remote_cache(change) -> None:
+    """
+    Re-read the cache under the cache folder lock, let `change(data)` modify
+    it and write it atomically (skipped when `change` returns False), so
+    concurrent rdd processes neither lose updates nor see partial files.
+    """
+    path = _remote_cache_path()
+    try:
+        with locked_directory(os.path.dirname(path)):
+            data = dict(_load_remote_cache())
+            if change(data) is False:
+                return
+            write_json_atomic(path, data)
+    except OSError as e:
+        debug_print(f"Could not write remote cache: {e}")
+
+
+def store_remote_snapshot(heads: Dict[str, str], remote: str = "origin") -> None:
+    """Replace the cached branch heads ({branch: oid}) of `remote`."""
+    def change(data: Dict[str, Any]) -> None:
+        data[remote] = {
+            'timestamp': int(time.time()),
+            'fetchedAt': get_timestamp(),
+            'heads': heads,
+        }
+    _update_remote_cache(change)
+
+
+def tracking_refs_cover_remote(remote: str = "origin") -> bool:
+    """
+    Check whether refs/remotes/<remote>/* mirrors every branch of `remote`:
+    remote.<remote>.fetch must map refs/heads/* there (not the case in
+    single-branch or custom-refspec clones) without negative refspecs.
+    """
+    result = run_git(['config', '--get-all', f'remote.{remote}.fetch'], capture_output=True, text=True)
+    refspecs = [line.strip().lstrip('+') for line in result.stdout.splitlines() if line.strip()]
+    if any(refspec.startswith('^') for refspec in refspecs):
+        return False
+    return f'refs/heads/*:refs/remotes/{remote}/*' in refspecs
+
+
+def snapshot_remote_from_tracking_refs(remote: str = "origin") -> None:
+    """
+    Store refs/remotes/<remote>/* as the remote snapshot.
+    Only valid right after a full `git fetch --prune <remote>`. When the fetch
+    refspec does not track every branch, one `git ls-remote --heads` is used.
+    """
+    if not tracking_refs_cover_remote(remote):
+        debug_print(f"Tracking refs of {remote} are partial; refreshing with ls-remote")
+        get_remote_heads(remote, refresh=True)
+        return
+    prefix = f'refs/remotes/{remote}/'
+    reader = get_ref_reader()
+    if reader is not None:
+        refs = reader.list_refs(prefix)
+    else:
+        result = run_git(['for-each-ref', '--format=%(objectname) %(refname)', prefix],
+                         capture_output=True, text=True)
+        refs = dict(reversed(line.split(' ', 1)) for line in result.stdout.splitlines() if ' ' in line)
+    heads = {ref[len(prefix):]: oid for ref, oid in refs.items() if ref != prefix + 'HEAD'}
+    store_remote_snapshot(heads, remote)
+
+
+def get_remote_heads(remote: str = "origin", refresh: bool = False) -> Optional[Dict[str, str]]:
+    """
+    Return {branch: oid} for `remote`, from the cache while it is younger than
+    remoteCacheTtl seconds, otherwise from one `git ls-remote --heads`.
+    Falls back to a stale snapshot when the remote is unreachable; returns
+    None if nothing is known.
+    """
+    entry = _load_remote_cache().get(remote)
+    ttl = get_rdd_config_int('remoteCacheTtl', DEFAULT_REMOTE_CACHE_TTL)
+    if entry and not refresh and time.time() - entry.get('timestamp', 0) < ttl:
+        return entry.get('heads', {})
+    
+    result = run_remote('ls-remote', ['ls-remote', '--heads', remote])
+    if not result.ok:
+        debug_print(f"ls-remote {remote} failed: {result.stderr.strip()}")
+        return entry.get('heads', {}) if entry else None
+    
+    heads = {}
+    for line in result.stdout.splitlines():
+        oid, _, ref = line.partition('\t')
+        if ref.startswith('refs/heads/'):
+            heads[ref[len('refs/heads/'):]] = oid
+    store_remote_snapshot(heads, remote)
+    return heads
+
+
+def remote_branch_exists(branch: str, remote: str = "origin") -> Optional[bool]:
+    """Check a branch on `remote` via the cache; None if the remote state is unknown."""
+    heads = get_remote_heads(remote)
+    return None if heads is None else branch in heads
+
+
+def record_remote_update(branch: str, oid: Optional[str], remote: str = "origin") -> None:
+    """
+    Apply a push (`oid`) or delete (None) we just made to the cached snapshot,
+    so later checks do not need the network.
+    """
+    def change(data: Dict[str, Any]) -> bool:
+        entry = data.get(remote)
+        if not entry:
+            return False
+        heads = dict(entry.get('heads', {}))
+        if oid is None:
+            heads.pop(branch, None)
+        else:
+            heads[branch] = oid
+        data[remote] = dict(entry, heads=heads)
+        return True
+    _update_remote_cache(change)
 
 
 # ============================================================================
@@ -1146,59 +3384,20 @@ def mark_prompt_completed(prompt_id: str, journal_file: str = None) -> bool:
     Returns:
         True on success, False on error
     """
-    import re
-    
-    if not journal_file:
-        journal_file = ".rdd-docs/work-iteration-prompts.md"
-    
-    # Validate prompt ID is provided
-    if not prompt_id:
-        print_error("Prompt ID is required")
-        return False
+    from rdd_api import complete_prompt, RddError, PROMPTS_JOURNAL
     
-    # Check if journal file exists
-    if not os.path.isfile(journal_file):
-        print_error(f"work-iteration-prompts.md not found at: {journal_file}")
-        return False
-    
-    # Read the file
     try:
-        with open(journal_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except Exception as e:
-        print_error(f"Failed to read file: {e}")
+        changed = complete_prompt(prompt_id, journal_file or PROMPTS_JOURNAL)
+    except RddError as e:
+        print_error(str(e))
         return False
     
-    # Check if the prompt exists and is not already completed
-    unchecked_pattern = rf'^\s*-\s*\[\s*\]\s*\[{re.escape(prompt_id)}\]'
-    checked_pattern = rf'^\s*-\s*\[x\]\s*\[{re.escape(prompt_id)}\]'
-    
-    if not re.search(unchecked_pattern, content, re.MULTILINE):
-        if re.search(checked_pattern, content, re.MULTILINE):
-            print_warning(f"Prompt {prompt_id} is already marked as completed")
-            return True
-        else:
-            print_error(f"Prompt {prompt_id} not found in work-iteration-prompts.md")
-            return False
-    
-    # Mark the prompt as completed
-    # This will change "- [ ] [PROMPT_ID]" to "- [x] [PROMPT_ID]"
-    new_content = re.sub(
-        rf'(^\s*-\s*)\[\s*\](\s*\[{re.escape(prompt_id)}\])',
-        r'\1[x]\2',
-        content,
-        flags=re.MULTILINE
-    )
-    
-    # Write back to file
-    try:
-        with open(journal_file, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+    record_result(id=prompt_id, alreadyCompleted=not changed)
+    if changed:
         print_success(f"Marked prompt {prompt_id} as completed")
-        return True
-    except Exception as e:
-        print_error(f"Failed to mark prompt {prompt_id} as completed: {e}")
-        return False
+    else:
+        print_warning(f"Prompt {prompt_id} is already marked as completed")
+    return True
 
 
 def list_prompts(status: str = "all", journal_file: str = None) -> bool:
@@ -1212,66 +3411,37 @@ def list_prompts(status: str = "all", journal_file: str = None) -> bool:
     Returns:
         True on success, False on error
     """
-    import re
+    from rdd_api import read_prompts, RddError, PROMPT_STATUSES, PROMPTS_JOURNAL
     
-    if not journal_file:
-        journal_file = ".rdd-docs/work-iteration-prompts.md"
-    
-    # Validate status parameter
-    if status not in ['unchecked', 'checked', 'all']:
+    if status not in PROMPT_STATUSES:
         print_error(f"Invalid status filter: '{status}'")
         print("Valid options: unchecked, checked, all")
         return False
     
-    # Check if journal file exists
-    if not os.path.isfile(journal_file):
-        print_error(f"work-iteration-prompts.md not found at: {journal_file}")
+    try:
+        # All prompts: the summary counts both states
+        prompts = read_prompts(journal_file or PROMPTS_JOURNAL)
+    except RddError as e:
+        print_error(str(e))
         return False
     
-    # Print header
-    print_banner(f"PROMPTS LIST ({status})")
+    checked_count = sum(1 for p in prompts if p.completed)
+    unchecked_count = len(prompts) - checked_count
+    shown = [p for p in prompts if status == 'all' or p.completed == (status == 'checked')]
     
-    # Read file and filter
-    try:
-        with open(journal_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except Exception as e:
-        print_error(f"Failed to read file: {e}")
-        return False
+    if json_output_enabled():
+        record_result(status=status, prompts=[{'id': p.id, 'title': p.title, 'completed': p.completed}
+                                              for p in shown],
+                      completed=checked_count, pending=unchecked_count, total=len(prompts))
+        return True
     
-    # Patterns for matching prompts
-    unchecked_pattern = re.compile(r'^\s*-\s*\[\s*\]\s*\[([P][0-9]+)\]\s*(.*)$')
-    checked_pattern = re.compile(r'^\s*-\s*\[x\]\s*\[([P][0-9]+)\]\s*(.*)$')
-    
-    total_count = 0
-    checked_count = 0
-    unchecked_count = 0
-    
-    for line in lines:
-        # Try unchecked pattern
-        match = unchecked_pattern.match(line)
-        if match:
-            total_count += 1
-            unchecked_count += 1
-            if status in ['unchecked', 'all']:
-                prompt_id = match.group(1)
-                prompt_title = match.group(2).strip()[:80]
-                print(f"  ☐ [{prompt_id}] {prompt_title}")
-            continue
-        
-        # Try checked pattern
-        match = checked_pattern.match(line)
-        if match:
-            total_count += 1
-            checked_count += 1
-            if status in ['checked', 'all']:
-                prompt_id = match.group(1)
-                prompt_title = match.group(2).strip()[:80]
-                print(f"  ☑ [{prompt_id}] {prompt_title}")
+    print_banner(f"PROMPTS LIST ({status})")
+    for prompt in shown:
+        print(f"  {'☑' if prompt.completed else '☐'} [{prompt.id}] {prompt.title[:80]}")
     
     # Print summary
     print()
-    print_info(f"Summary: {checked_count} completed, {unchecked_count} pending, {total_count} total")
+    print_info(f"Summary: {checked_count} completed, {unchecked_count} pending, {len(prompts)} total")
     
     return True
 
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+rdd_workspace.py
+Workspace domain of the RDD CLI (`rdd.py workspace ...`)
+Workspace initialization, templates, archiving and clearing.
+"""
+
+import os
+import shutil
+from typing import List
+
+from rdd_utils import (
+    print_success, print_error, print_warning, print_info, print_step, print_banner,
+    get_current_branch, ensure_dir, confirm_action, debug_print, record_result
+)
+import rdd_api
+from rdd_api import WORKSPACE_DIR, RddError, ArchiveExists
+
+
+# ============================================================================
+# CONSTANTS
+# ============================================================================
+
+# Constants (WORKSPACE_DIR comes from rdd_api)
+TEMPLATES_DIR = ".rdd/templates"
+
+
+# ============================================================================
+# WORKSPACE OPERATIONS
+# ============================================================================
+
+def init_workspace(workspace_type: str = "change") -> bool:
+    """Initialize workspace with templates based on type (change or fix)."""
+    if workspace_type not in ['change', 'fix']:
+        print_error(f"Invalid workspace type: {workspace_type}")
+        print_info("Valid types: change, fix")
+        return False
+    
+    print_step(f"Initializing workspace for type: {workspace_type}...")
+    
+    # Ensure workspace directory exists
+    ensure_dir(WORKSPACE_DIR)
+    
+    # Copy main template based on type
+    if workspace_type == 'fix':
+        copy_template("fix.md", os.path.join(WORKSPACE_DIR, "fix.md"))
+    
+    # Copy work-iteration-prompts.md template to .rdd-docs/ (not workspace subfolder)
+    template_path = os.path.join(TEMPLATES_DIR, "work-iteration-prompts.md")
+    dest_path = ".rdd-docs/work-iteration-prompts.md"
+    
+    if os.path.isfile(template_path):
+        shutil.copy2(template_path, dest_path)
+        print_success(f"Copied work-iteration-prompts.md to .rdd-docs/")
+    else:
+        print_warning(f"Template not found: {template_path}")
+    
+    record_result(type=workspace_type, workspace=WORKSPACE_DIR)
+    print_success(f"Workspace initialized successfully for {workspace_type}")
+    return True
+
+
+def copy_template(template_name: str, destination: str) -> bool:
+    """Copy template file to destination with validation."""
+    if not template_name or not destination:
+        print_error("Template name and destination are required")
+        return False
+    
+    template_path = os.path.join(TEMPLATES_DIR, template_name)
+    
+    # Validate template exists
+    if not os.path.isfile(template_path):
+        print_error(f"Template not found: {template_path}")
+        return False
+    
+    # Create destination directory if needed
+    dest_dir = os.path.dirname(destination)
+    ensure_dir(dest_dir)
+    
+    # Check if destination already exists
+    if os.path.isfile(destination):
+        print_warning(f"Destination file already exists: {destination}")
+        if not confirm_action("Overwrite existing file?"):
+            print_info("Copy cancelled by user")
+            return False
+    
+    # Copy template
+    shutil.copy2(template_path, destination)
+    print_success(f"Copied template {template_name} to {destination}")
+    return True
+
+
+def archive_workspace(branch_name: str, keep_workspace: bool = False) -> bool:
+    """Archive workspace to branch-specific folder."""
+    try:
+        try:
+            record = rdd_api.archive_workspace(branch_name, keep_workspace)
+        except ArchiveExists as e:
+            print_warning(str(e))
+            if not confirm_action("Overwrite existing archive?"):
+                print_info("Archive cancelled by user")
+                return False
+            record = rdd_api.archive_workspace(branch_name, keep_workspace, overwrite=True)
+    except RddError as e:
+        print_error(str(e))
+        return False
+    
+    record_result(kept=keep_workspace, **record.to_dict())
+    print_success(f"Workspace archived to: {record.archive_dir}")
+    
+    if not keep_workspace:
+        print_success("Workspace cleared")
+        print_info("Workspace directory cleared")
+    else:
+        print_info("Workspace directory kept as requested")
+    
+    return True
+
+
+def clear_workspace() -> bool:
+    """Clear workspace with safety confirmation."""
+    print_warning("This will clear all workspace files.")
+    
+    if os.path.isdir(WORKSPACE_DIR) and os.listdir(WORKSPACE_DIR):
+        print_info("Current workspace contains:")
+        for item in os.listdir(WORKSPACE_DIR):
+            print(f"  - {item}")
+        print()
+    
+    if not confirm_action("Are you sure you want to clear the workspace?"):
+        print_info("Operation cancelled")
+        return False
+    
+    clear_workspace_forced()
+    return True
+
+
+def clear_workspace_forced() -> None:
+    """Clear workspace without confirmation (internal use)."""
+    if not os.path.isdir(WORKSPACE_DIR):
+        debug_print("Workspace directory does not exist")
+        return
+    
+    items = rdd_api.clear_workspace_dir()
+    debug_print(f"Removed all contents from {WORKSPACE_DIR}")
+    record_result(cleared=sorted(items))
+    print_success("Workspace cleared")
+
+
+# ============================================================================
+# HELP
+# ============================================================================
+
+def show_workspace_help() -> None:
+    """Show workspace management help."""
+    print_banner("Workspace Management")
+    print()
+    print("Usage: rdd.py workspace <action> [options]")
+    print()
+    print("Actions:")
+    print("  init <type>        Initialize workspace (type: change|fix)")
+    print("  archive [--keep]   Archive current workspace")
+    print("  clear              Clear workspace with confirmation")
+    print()
+    print("Examples:")
+    print("  rdd.py workspace init change")
+    print("  rdd.py workspace archive --keep")
+    print("  rdd.py workspace clear")
+
+
+# ============================================================================
+# DOMAIN ROUTING
+# ============================================================================
+
+def route_workspace(args: List[str]) -> int:
+    """Route workspace domain commands."""
+    if not args or args[0] in ['--help', '-h']:
+        show_workspace_help()
+        return 0
+    
+    action = args[0]
+    
+    if action == 'init':
+        if len(args) < 2:
+            print_error("Workspace type required (change|fix)")
+            print("Usage: rdd.py workspace init <type>")
+            return 1
+        return 0 if init_workspace(args[1]) else 1
+    
+    elif action == 'archive':
+        keep = '--keep' in args
+        branch_name = get_current_branch()
+        return 0 if archive_workspace(branch_name, keep) else 1
+    
+    elif action == 'clear':
+        return 0 if clear_workspace() else 1
+    
+    else:
+        print_error(f"Unknown workspace action: {action}")
+        print("Use 'rdd.py workspace --help' for usage information")
+        return 1
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+run_benchmarks.py
+Benchmark suite for RDD framework operations
+Times rdd.py startup, complete_iteration, update_from_default_branch,
+interactive_branch_cleanup, list_prompts and archive_workspace against cached synthetic repositories
+(see synthetic_repo.py) and writes JSON results that can be compared across commits.
+
+Usage:
+  python benchmarks/run_benchmarks.py [--profile full|small|tiny] [--repeat N]
+                                      [--only name,...] [--output FILE] [--rebuild]
+                                      [--compare BASE.json [--max-regression PCT]]
+  python benchmarks/run_benchmarks.py --compare BASE.json NEW.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import builtins
+import platform
+import statistics
+import subprocess
+import tempfile
+from contextlib import redirect_stdout, redirect_stderr
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any
+
+BENCHMARKS_DIR = Path(__file__).parent.absolute()
+sys.path.insert(0, str(BENCHMARKS_DIR))
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / ".rdd" / "scripts"))
+
+import synthetic_repo
+from synthetic_repo import DEFAULT_BRANCH, ITERATION_BRANCH
+import rdd_iteration
+import rdd_workspace
+import rdd_utils
+import rdd_trace
+
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+SCHEMA_VERSION = 1
+JOURNAL_FILE = ".rdd-docs/work-iteration-prompts.md"
+RDD_SCRIPT = BENCHMARKS_DIR.parent / ".rdd" / "scripts" / "rdd.py"
+
+
+class Benchmark:
+    """One timed operation and the repository state it starts from."""
+
+    def __init__(self, name: str, run: Callable[[], Any], branch: str = DEFAULT_BRANCH,
+                 answers: Optional[List[str]] = None, mutates: bool = True):
+        self.name = name
+        self.run = run
+        self.branch = branch
+        self.answers = answers or []
+        # Mutating operations get a fresh working copy for every repetition
+        self.mutates = mutates
+
+
+def _startup(*args: str) -> Callable[[], bool]:
+    """Run rdd.py in a fresh interpreter (startup cost included)."""
+    return lambda: subprocess.run([sys.executable, str(RDD_SCRIPT), *args], capture_output=True).returncode == 0
+
+
+BENCHMARKS = [
+    Benchmark('startup_version', _startup('--version'), mutates=False),
+    Benchmark('startup_prompt_list', _startup('prompt', 'list'), branch=ITERATION_BRANCH, mutates=False),
+    Benchmark('list_prompts', lambda: rdd_utils.list_prompts('all', JOURNAL_FILE),
+              branch=ITERATION_BRANCH, mutates=False),
+    Benchmark('archive_workspace', lambda: rdd_workspace.archive_workspace(ITERATION_BRANCH, keep_workspace=True),
+              branch=ITERATION_BRANCH, answers=['y'], mutates=False),
+    Benchmark('update_from_default_branch', rdd_utils.update_from_default_branch,
+              branch=ITERATION_BRANCH),
+    Benchmark('complete_iteration', rdd_iteration.complete_iteration,
+              branch=ITERATION_BRANCH, answers=['y']),
+    Benchmark('interactive_branch_cleanup', lambda: rdd_utils.interactive_branch_cleanup(DEFAULT_BRANCH),
+              answers=['all', 'y', 'y']),
+]
+
+
+def _run_once(benchmark: Benchmark, repo: Path) -> Dict[str, Any]:
+    """Time one run inside `repo`, with prompts answered and output discarded."""
+    answers = list(benchmark.answers)
+    original_input = builtins.input
+    builtins.input = lambda prompt='': answers.pop(0) if answers else ''
+    previous_cwd = os.getcwd()
+    os.chdir(str(repo))
+    rdd_trace.enable_tracing()
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull), redirect_stderr(devnull):
+            started = time.perf_counter()
+            with rdd_utils.repo_context():
+                result = benchmark.run()
+            elapsed = time.perf_counter() - started
+            rdd_utils.close_git_executor()
+    finally:
+        rdd_trace.disable_tracing()
+        builtins.input = original_input
+        os.chdir(previous_cwd)
+    events = rdd_trace.get_trace_events()
+    return {
+        'seconds': elapsed,
+        'ok': result is not False,
+        'processes': len(events),
+        'gitProcesses': sum(1 for e in events if e.name.startswith('git')),
+    }
+
+
+def run_benchmark(benchmark: Benchmark, cached: Path, repeat: int) -> Dict[str, Any]:
+    """Run a benchmark `repeat` times; working copies are prepared outside the timing."""
+    runs = []
+    workdir = None
+    repo = None
+    try:
+        for _ in range(repeat):
+            if repo is None or benchmark.mutates:
+                if workdir is not None:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                workdir = Path(tempfile.mkdtemp(prefix='rdd-bench-'))
+                repo = synthetic_repo.make_working_copy(cached, workdir, benchmark.branch)
+            runs.append(_run_once(benchmark, repo))
+    finally:
+        if workdir is not None:
+            shutil.rmtree(workdir, ignore_errors=True)
+    seconds = [run['seconds'] for run in runs]
+    return {
+        'runs': [round(s, 6) for s in seconds],
+        'median': round(statistics.median(seconds), 6),
+        'min': round(min(seconds), 6),
+        'processes': runs[-1]['processes'],
+        'gitProcesses': runs[-1]['gitProcesses'],
+        'ok': all(run['ok'] for run in runs),
+    }
+
+
+def _framework_commit() -> Dict[str, Any]:
+    root = str(BENCHMARKS_DIR.parent)
+    head = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True, text=True)
+    status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                            cwd=root, capture_output=True, text=True)
+    return {
+        'commit': head.stdout.strip() if head.returncode == 0 else None,
+        'dirty': bool(status.stdout.strip()),
+    }
+
+
+def run_suite(profile: str, repeat: int = 3, only: Optional[List[str]] = None,
+              rebuild: bool = False) -> Dict[str, Any]:
+    """Run the selected benchmarks and return the results document."""
+    selected = [b for b in BENCHMARKS if not only or b.name in only]
+    unknown = set(only or []) - {b.name for b in BENCHMARKS}
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    build_started = time.perf_counter()
+    cached = synthetic_repo.get_cached_repository(profile, rebuild=rebuild)
+    prepare_seconds = time.perf_counter() - build_started
+
+    results = {}
+    for benchmark in selected:
+        print(f"  {benchmark.name} ...", end='', flush=True)
+        results[benchmark.name] = run_benchmark(benchmark, cached, repeat)
+        print(f" {results[benchmark.name]['median'] * 1000:.1f} ms")
+
+    git_version = subprocess.run(['git', 'version'], capture_output=True, text=True).stdout.strip()
+    document = {
+        'schemaVersion': SCHEMA_VERSION,
+        'profile': profile,
+        'parameters': synthetic_repo.PROFILES[profile],
+        'repeat': repeat,
+        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'git': git_version,
+        'python': platform.python_version(),
+        'platform': sys.platform,
+        'repositorySeconds': round(prepare_seconds, 3),
+        'results': results,
+    }
+    document.update(_framework_commit())
+    return document
+
+
+def compare_results(base: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-benchmark comparison of median times and process counts."""
+    rows = []
+    for name, new_result in new['results'].items():
+        base_result = base['results'].get(name)
+        if not base_result:
+            continue
+        change = (new_result['median'] - base_result['median']) / base_result['median'] * 100 \
+            if base_result['median'] else 0.0
+        rows.append({
+            'name': name,
+            'baseMs': base_result['median'] * 1000,
+            'newMs': new_result['median'] * 1000,
+            'changePct': change,
+            'baseProcesses': base_result['processes'],
+            'newProcesses': new_result['processes'],
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    width = max([len('benchmark')] + [len(row['name']) for row in rows])
+    print(f"{'benchmark':<{width}}  {'base ms':>10}  {'new ms':>10}  {'change':>8}  {'processes':>11}")
+    for row in rows:
+        processes = f"{row['baseProcesses']} -> {row['newProcesses']}"
+        print(f"{row['name']:<{width}}  {row['baseMs']:>10.1f}  {row['newMs']:>10.1f}  "
+              f"{row['changePct']:>+7.1f}%  {processes:>11}")
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark RDD operations on synthetic repositories")
+    parser.add_argument('--profile', choices=sorted(synthetic_repo.PROFILES), default='full')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', help="comma-separated benchmark names")
+    parser.add_argument('--output', help="results file (default: benchmarks/results/<profile>-<commit>-<time>.json)")
+    parser.add_argument('--rebuild', action='store_true', help="regenerate the cached repository")
+    parser.add_argument('--compare', nargs='+', metavar='RESULTS',
+                        help="BASE.json to compare this run against, or BASE.json NEW.json to compare two files")
+    parser.add_argument('--max-regression', type=float, metavar='PCT',
+                        help="exit 1 if a median is more than PCT percent slower than the base")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        document = _load(args.compare[1])
+    else:
+        only = [name.strip() for name in args.only.split(',')] if args.only else None
+        print(f"RDD benchmarks (profile: {args.profile}, repeat: {args.repeat})")
+        document = run_suite(args.profile, max(1, args.repeat), only, args.rebuild)
+        output = args.output
+        if not output:
+            RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+            stamp = document['timestamp'].replace(':', '').replace('-', '')
+            output = str(RESULTS_DIR / f"{args.profile}-{(document['commit'] or 'unknown')[:10]}-{stamp}.json")
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+            f.write('\n')
+        print(f"Results written to {output}")
+
+    failed = [name for name, result in document['results'].items() if not result['ok']]
+    if failed:
+        print(f"Operations reported failure: {', '.join(failed)}")
+
+    if args.compare:
+        rows = compare_results(_load(args.compare[0]), document)
+        print()
+        print_comparison(rows)
+        if args.max_regression is not None:
+            regressed = [row['name'] for row in rows if row['changePct'] > args.max_regression]
+            if regressed:
+                print(f"Slower than allowed ({args.max_regression:+.1f}%): {', '.join(regressed)}")
+                return 1
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
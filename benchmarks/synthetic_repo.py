@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+synthetic_repo.py
+Synthetic RDD repositories for benchmarks
+Builds a bare repository with `git fast-import` (many branches, a large tree,
+a long prompts journal, a long requirements.md and many archived iterations),
+caches it under benchmarks/.cache/ and hands out cheap working copies of it
+(`git clone --local` hardlinks the objects).
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+BENCHMARKS_DIR = Path(__file__).parent.absolute()
+REPO_ROOT = BENCHMARKS_DIR.parent
+CACHE_DIR = BENCHMARKS_DIR / ".cache"
+TEMPLATES_DIR = REPO_ROOT / ".rdd" / "templates"
+
+# Bump when the generated layout changes so cached repositories are rebuilt
+GENERATOR_VERSION = 1
+
+PROFILES: Dict[str, Dict[str, int]] = {
+    'full': {'branches': 10000, 'files': 100000, 'prompts': 500, 'requirements': 5000, 'archives': 1000},
+    'small': {'branches': 1000, 'files': 10000, 'prompts': 100, 'requirements': 500, 'archives': 100},
+    'tiny': {'branches': 30, 'files': 200, 'prompts': 20, 'requirements': 50, 'archives': 10},
+}
+
+DEFAULT_BRANCH = 'main'
+ITERATION_BRANCH = 'bench/iteration'
+# Commits on the default branch after the iteration branched off
+MAIN_COMMITS_AHEAD = 10
+MAIN_HISTORY = 60
+FILES_PER_DIR = 1000
+UNMERGED_RATIO = 10  # one branch in ten has a commit of its own
+WORKSPACE_FILES = 20
+
+_EPOCH = 1735689600  # 2025-01-01T00:00:00Z
+
+
+class _FastImportWriter:
+    """Writes a git fast-import stream."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.next_mark = 1
+        self.clock = _EPOCH
+
+    def _data(self, payload: bytes) -> None:
+        self.stream.write(b'data %d\n' % len(payload))
+        self.stream.write(payload)
+        self.stream.write(b'\n')
+
+    def commit(self, ref: str, message: str, parent: Optional[int], files: Dict[str, str]) -> int:
+        mark = self.next_mark
+        self.next_mark += 1
+        self.clock += 60
+        self.stream.write(f'commit {ref}\nmark :{mark}\n'.encode())
+        self.stream.write(f'committer RDD Bench <bench@example.com> {self.clock} +0000\n'.encode())
+        self._data(message.encode())
+        if parent is not None:
+            self.stream.write(f'from :{parent}\n'.encode())
+        for path, content in files.items():
+            self.stream.write(f'M 100644 inline {path}\n'.encode())
+            self._data(content.encode())
+        self.stream.write(b'\n')
+        return mark
+
+    def reset(self, ref: str, mark: int) -> None:
+        self.stream.write(f'reset {ref}\nfrom :{mark}\n\n'.encode())
+
+
+def _source_path(index: int) -> str:
+    return f'services/svc{index // FILES_PER_DIR:03d}/module_{index % FILES_PER_DIR:04d}.py'
+
+
+def _template(name: str) -> str:
+    path = TEMPLATES_DIR / name
+    return path.read_text(encoding='utf-8') if path.is_file() else f'# {name}\n'
+
+
+def prompts_journal(count: int, completed: int) -> str:
+    lines = ['# Work Iteration Prompts', '', '## Prompt Definitions', '']
+    for i in range(1, count + 1):
+        mark = 'x' if i <= completed else ' '
+        lines.append(f' - [{mark}] [P{i:03d}] Implement change number {i} in services/svc{i % 100:03d}')
+        lines.append('')
+    return '\n'.join(lines) + '\n'
+
+
+def requirements_document(rows: int) -> str:
+    lines = ['# Requirements', '', '## Functional Requirements', '']
+    for i in range(1, rows + 1):
+        lines.append(f'- **[FR-{i:04d}] Requirement {i}**: The system shall support behaviour {i}.')
+    return '\n'.join(lines) + '\n'
+
+
+def _base_tree(params: Dict[str, int]) -> Dict[str, str]:
+    files = {_source_path(i): f'VALUE = {i}\n' for i in range(params['files'])}
+    files['README.md'] = '# Synthetic RDD benchmark repository\n'
+    files['.rdd-docs/config.json'] = json.dumps({'defaultBranch': DEFAULT_BRANCH}, indent=2) + '\n'
+    files['.rdd-docs/requirements.md'] = requirements_document(params['requirements'])
+    files['.rdd-docs/tech-spec.md'] = '# Technical Specification\n'
+    for name in ('work-iteration-prompts.md', 'user-story.md'):
+        files[f'.rdd/templates/{name}'] = _template(name)
+    for i in range(params['archives']):
+        archive = f'.rdd-docs/archive/iteration-{i:04d}'
+        files[f'{archive}/work-iteration-prompts.md'] = prompts_journal(5, 5)
+        files[f'{archive}/user-story.md'] = f'# User story {i}\n'
+    return files
+
+
+def write_stream(stream, params: Dict[str, int]) -> None:
+    """
+    Emit the fast-import stream: default-branch history, merged and unmerged
+    branches, and an iteration branch behind the default branch.
+    """
+    writer = _FastImportWriter(stream)
+    files = params['files']
+    main_ref = f'refs/heads/{DEFAULT_BRANCH}'
+
+    history = [writer.commit(main_ref, 'Initial import', None, _base_tree(params))]
+    for i in range(1, MAIN_HISTORY + 1):
+        # Default-branch commits touch the lower half of the first service directory only
+        span = max(1, min(files, FILES_PER_DIR) // 2)
+        touched = {_source_path((i * 7 + k) % span): f'VALUE = {i}_{k}\n' for k in range(5)}
+        history.append(writer.commit(main_ref, f'Main change {i}', history[-1], touched))
+
+    for i in range(params['branches']):
+        ref = f'refs/heads/feature/branch-{i:05d}'
+        base = history[i % (len(history) - MAIN_COMMITS_AHEAD)]
+        if i % UNMERGED_RATIO == 0:
+            path = _source_path(files - 1 - (i % files))
+            writer.commit(ref, f'Unmerged work {i}', base, {path: f'VALUE = "branch {i}"\n'})
+        else:
+            writer.reset(ref, base)
+
+    # The iteration works in the last service directory, away from main's changes
+    fork = history[-1 - MAIN_COMMITS_AHEAD]
+    iteration_files = {
+        '.rdd-docs/work-iteration-prompts.md': prompts_journal(params['prompts'], params['prompts'] // 2),
+        '.rdd-docs/user-story.md': '# User story\n\nAs a benchmark I want realistic data.\n',
+    }
+    for i in range(WORKSPACE_FILES):
+        iteration_files[f'.rdd-docs/workspace/notes-{i:02d}.md'] = f'# Notes {i}\n' + 'text\n' * 50
+    for k in range(5):
+        iteration_files[_source_path(files - 1 - k)] = f'VALUE = "iteration {k}"\n'
+    writer.commit(f'refs/heads/{ITERATION_BRANCH}', 'Iteration work', fork, iteration_files)
+
+
+def cache_key(profile: str) -> str:
+    params = PROFILES[profile]
+    digest = hashlib.sha1(json.dumps([GENERATOR_VERSION, params], sort_keys=True).encode()).hexdigest()[:10]
+    return f'{profile}-{digest}'
+
+
+def build_repository(path: Path, params: Dict[str, int]) -> None:
+    """Create a bare repository at `path` from the synthetic fast-import stream."""
+    subprocess.run(['git', 'init', '--quiet', '--bare', str(path)], check=True)
+    subprocess.run(['git', '--git-dir', str(path), 'symbolic-ref', 'HEAD', f'refs/heads/{DEFAULT_BRANCH}'], check=True)
+    proc = subprocess.Popen(['git', '--git-dir', str(path), 'fast-import', '--quiet'], stdin=subprocess.PIPE)
+    try:
+        write_stream(proc.stdin, params)
+    finally:
+        proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError('git fast-import failed')
+    subprocess.run(['git', '--git-dir', str(path), 'pack-refs', '--all'], check=True)
+
+
+def get_cached_repository(profile: str, rebuild: bool = False) -> Path:
+    """Return the cached bare repository for `profile`, building it if needed."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}' (choose from {', '.join(PROFILES)})")
+    target = CACHE_DIR / cache_key(profile) / 'origin.git'
+    if rebuild and target.parent.exists():
+        shutil.rmtree(target.parent)
+    if (target / 'packed-refs').exists():
+        return target
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Build next to the final location and rename, so an interrupted build is never used
+    staging = Path(tempfile.mkdtemp(prefix='build-', dir=str(CACHE_DIR)))
+    try:
+        build_repository(staging / 'origin.git', PROFILES[profile])
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(str(staging / 'origin.git'), str(target))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+def make_working_copy(cached: Path, workdir: Path, branch: str = DEFAULT_BRANCH) -> Path:
+    """
+    Create `workdir`/origin.git (a private remote) and `workdir`/repo, a clone
+    with every branch also present locally and `branch` checked out.
+    """
+    origin = workdir / 'origin.git'
+    repo = workdir / 'repo'
+    subprocess.run(['git', 'clone', '--quiet', '--bare', '--local', str(cached), str(origin)], check=True)
+    subprocess.run(['git', 'clone', '--quiet', '--local', '--branch', branch, str(origin), str(repo)], check=True)
+    subprocess.run(['git', 'fetch', '--quiet', '--update-head-ok', 'origin', '+refs/heads/*:refs/heads/*'],
+                   cwd=repo, check=True)
+    for key, value in (('user.name', 'RDD Bench'), ('user.email', 'bench@example.com')):
+        subprocess.run(['git', 'config', key, value], cwd=repo, check=True)
+    return repo
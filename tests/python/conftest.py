@@ -39,6 +39,18 @@ def mock_git_repo(temp_dir):
     yield temp_dir
 
 
+@pytest.fixture
+def git_repo_with_remote(mock_git_repo):
+    """Create a mock git repository with a local bare repository as origin"""
+    remote_path = tempfile.mkdtemp()
+    subprocess.run(["git", "init", "--bare", "-b", "main", remote_path], check=True, capture_output=True)
+    subprocess.run(["git", "remote", "add", "origin", remote_path], cwd=mock_git_repo, check=True, capture_output=True)
+    subprocess.run(["git", "push", "-u", "origin", "main"], cwd=mock_git_repo, check=True, capture_output=True)
+    
+    yield mock_git_repo
+    shutil.rmtree(remote_path, ignore_errors=True)
+
+
 @pytest.fixture
 def rdd_workspace(mock_git_repo):
     """Create a mock RDD workspace structure"""
@@ -0,0 +1,82 @@
+"""
+test_benchmarks.py
+Smoke tests for the benchmark suite in benchmarks/
+Runs every benchmark once against the tiny synthetic repository
+"""
+
+import pytest
+import sys
+import subprocess
+from pathlib import Path
+
+# Add benchmarks directory to path to import the suite
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "benchmarks"))
+
+import synthetic_repo
+import run_benchmarks
+
+
+@pytest.fixture
+def bench_cache(tmp_path, monkeypatch):
+    """Keep generated repositories out of benchmarks/.cache during tests."""
+    monkeypatch.setattr(synthetic_repo, 'CACHE_DIR', tmp_path / 'cache')
+    return tmp_path / 'cache'
+
+
+@pytest.mark.requires_git
+@pytest.mark.slow
+class TestSyntheticRepository:
+    """Test fast-import generation and caching"""
+
+    def test_generated_layout(self, bench_cache):
+        repo = synthetic_repo.get_cached_repository('tiny')
+        params = synthetic_repo.PROFILES['tiny']
+        branches = subprocess.run(['git', '--git-dir', str(repo), 'for-each-ref', '--format=%(refname)', 'refs/heads/'],
+                                  capture_output=True, text=True, check=True).stdout.split()
+        assert len(branches) == params['branches'] + 2
+        files = subprocess.run(['git', '--git-dir', str(repo), 'ls-tree', '-r', '--name-only', 'main'],
+                               capture_output=True, text=True, check=True).stdout.splitlines()
+        assert sum(1 for f in files if f.startswith('services/')) == params['files']
+        assert sum(1 for f in files if f.startswith('.rdd-docs/archive/') and f.endswith('/user-story.md')) == params['archives']
+
+    def test_repository_is_cached(self, bench_cache):
+        first = synthetic_repo.get_cached_repository('tiny')
+        marker = first / 'rdd-bench-marker'
+        marker.write_text('kept')
+        assert synthetic_repo.get_cached_repository('tiny') == first
+        assert marker.exists()
+        synthetic_repo.get_cached_repository('tiny', rebuild=True)
+        assert not marker.exists()
+
+
+@pytest.mark.requires_git
+@pytest.mark.slow
+class TestBenchmarkSuite:
+    """Test the benchmark runner end to end"""
+
+    def test_all_benchmarks_succeed(self, bench_cache):
+        document = run_benchmarks.run_suite('tiny', repeat=1)
+        assert set(document['results']) == {b.name for b in run_benchmarks.BENCHMARKS}
+        for name, result in document['results'].items():
+            assert result['ok'], name
+            assert len(result['runs']) == 1
+        assert document['results']['update_from_default_branch']['gitProcesses'] > 0
+
+    def test_main_writes_results_and_compares(self, bench_cache, tmp_path, capsys):
+        output = tmp_path / 'results.json'
+        assert run_benchmarks.main(['--profile', 'tiny', '--repeat', '1', '--only', 'list_prompts',
+                                    '--output', str(output)]) == 0
+        assert run_benchmarks.main(['--compare', str(output), str(output), '--max-regression', '0']) == 0
+        assert 'list_prompts' in capsys.readouterr().out
+
+
+class TestCompareResults:
+    """Test result comparison"""
+
+    def test_change_percentage(self):
+        base = {'results': {'a': {'median': 0.2, 'processes': 5}, 'gone': {'median': 1, 'processes': 1}}}
+        new = {'results': {'a': {'median': 0.3, 'processes': 4}, 'added': {'median': 1, 'processes': 1}}}
+        row, = run_benchmarks.compare_results(base, new)
+        assert row['name'] == 'a'
+        assert row['changePct'] == pytest.approx(50.0)
+        assert (row['baseProcesses'], row['newProcesses']) == (5, 4)
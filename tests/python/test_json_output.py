@@ -0,0 +1,156 @@
+"""
+test_json_output.py
+Unit tests for the output mode of the RDD CLI
+Tests TTY-dependent colors, the structured command result and the global
+`rdd.py --json` flag across domains
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import rdd modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".rdd" / "scripts"))
+
+import rdd
+import rdd_utils
+from rdd_utils import Colors
+
+JOURNAL = "# Work Iteration Prompts\n\n - [ ] [P01] First prompt\n\n - [x] [P02] Second prompt\n"
+
+
+@pytest.fixture
+def json_repo(rdd_workspace):
+    (rdd_workspace / ".rdd-docs" / "work-iteration-prompts.md").write_text(JOURNAL)
+    os.chdir(rdd_workspace)
+    yield rdd_workspace
+    os.chdir(Path(__file__).parent)
+
+
+def git(repo, *args):
+    subprocess.run(["git"] + list(args), cwd=repo, check=True, capture_output=True)
+
+
+def run_json(*argv):
+    """Run `rdd.py --json ...` and return (exit code, raw stdout, parsed document)."""
+    out = io.StringIO()
+    with patch('sys.argv', ['rdd.py', '--json'] + list(argv)), patch('sys.stdout', out):
+        code = rdd.main()
+    return code, out.getvalue(), json.loads(out.getvalue())
+
+
+class TestColors:
+    """Test when ANSI colors are emitted"""
+
+    def test_colors_follow_tty_and_overrides(self):
+        tty, pipe = io.StringIO(), io.StringIO()
+        tty.isatty = lambda: True
+        with patch.dict(os.environ, {}, clear=True):
+            assert rdd_utils.colors_wanted(tty)
+            assert not rdd_utils.colors_wanted(pipe)
+        with patch.dict(os.environ, {'NO_COLOR': '1'}, clear=True):
+            assert not rdd_utils.colors_wanted(tty)
+        with patch.dict(os.environ, {'RDD_COLOR': 'always', 'NO_COLOR': '1'}, clear=True):
+            assert rdd_utils.colors_wanted(pipe)
+
+    def test_configure_colors(self, capsys):
+        try:
+            rdd_utils.configure_colors(False)
+            rdd_utils.print_success("done")
+            assert capsys.readouterr().out == "✓ done\n"
+            rdd_utils.configure_colors(True)
+            assert Colors.GREEN == '\033[0;32m'
+        finally:
+            rdd_utils.configure_colors(False)
+
+
+class TestCommandResult:
+    """Test message and data collection of one command"""
+
+    def test_messages_and_data_are_collected(self, capsys):
+        with rdd_utils.json_output(['prompt', 'list']) as result:
+            rdd_utils.print_banner("Title")
+            rdd_utils.print_error("broken")
+            rdd_utils.print_info("note")
+            rdd_utils.record_result(count=2)
+        assert capsys.readouterr() == ('', '')
+        assert not rdd_utils.json_output_enabled()
+        document = result.to_dict(1, "\033[0;32mplain\033[0m\n")
+        assert document == {
+            'command': ['prompt', 'list'], 'ok': False, 'exitCode': 1, 'data': {'count': 2},
+            'messages': [{'level': 'error', 'text': 'broken'}, {'level': 'info', 'text': 'note'}],
+            'output': 'plain',
+        }
+
+    def test_record_result_outside_json_mode(self):
+        rdd_utils.record_result(ignored=True)
+
+
+@pytest.mark.requires_git
+class TestJsonFlag:
+    """Test `rdd.py --json` end to end"""
+
+    def test_prompt_list(self, json_repo):
+        code, raw, document = run_json('prompt', 'list', '--status=unchecked')
+        assert code == 0 and document['ok']
+        assert '\033' not in raw
+        assert document['data']['prompts'] == [{'id': 'P01', 'title': 'First prompt', 'completed': False}]
+        assert (document['data']['completed'], document['data']['pending']) == (1, 1)
+        assert 'output' not in document
+
+    def test_exit_codes_are_stable(self, json_repo):
+        code, _, document = run_json('prompt', 'mark-completed', 'P99')
+        assert code == 1 and document['exitCode'] == 1 and not document['ok']
+        assert document['messages'] == [{'level': 'error', 'text': 'Prompt P99 not found in work-iteration-prompts.md'}]
+
+        code, _, document = run_json('prompt', 'mark-completed', 'P01')
+        assert code == 0
+        assert document['data'] == {'id': 'P01', 'alreadyCompleted': False}
+
+    def test_config_and_branch_domains(self, json_repo):
+        _, _, document = run_json('config', 'get', 'defaultBranch')
+        assert document['data'] == {'key': 'defaultBranch', 'value': 'main'}
+        _, _, document = run_json('config', 'show')
+        assert document['data']['config']['defaultBranch'] == 'main'
+        # The per-command --json option does not print a second document
+        _, _, document = run_json('branch', 'list', '--json')
+        assert [b['name'] for b in document['data']['branches']] == ['main']
+        assert 'output' not in document
+
+    def test_iteration_list(self, json_repo):
+        for argv in (('iteration', 'list'), ('iteration', 'list', '--json')):
+            code, _, document = run_json(*argv)
+            assert code == 0 and 'output' not in document
+            assert [(w['branch'], w['current']) for w in document['data']['worktrees']] == [('main', True)]
+
+    def test_git_modified_files(self, json_repo):
+        git(json_repo, 'switch', '-c', 'enh-readme')
+        (json_repo / "README.md").write_text("changed")
+        git(json_repo, 'commit', '-qam', 'change')
+        _, _, document = run_json('git', 'modified-files')
+        assert (document['data']['base'], document['data']['head']) == ('main', 'enh-readme')
+        assert document['data']['count'] == 1
+        assert document['data']['files'][0]['path'] == 'README.md'
+
+    def test_git_modified_files_failure(self, json_repo):
+        failure = subprocess.CalledProcessError(128, ['git', 'diff'])
+        with patch('rdd_git.iter_diff_name_status', side_effect=failure):
+            code, _, document = run_json('git', 'modified-files')
+        assert code == 1 and not document['ok']
+        assert document['data']['count'] == 0
+        assert document['messages'][-1]['level'] == 'error'
+
+    def test_interactive_commands_get_no_input(self, json_repo):
+        code, _, document = run_json('workspace', 'clear')
+        assert code == 1
+        assert {'level': 'info', 'text': 'Operation cancelled'} in document['messages']
+
+    def test_requires_a_command(self, json_repo):
+        code, _, document = run_json()
+        assert code == 1
+        assert document['messages'][0]['level'] == 'error'
@@ -0,0 +1,101 @@
+"""
+test_process_budgets.py
+Process-count and wall-time budgets for rdd.py CLI commands
+Each file in tests/python/budgets/ names one command and the most git
+processes, processes overall and milliseconds it may use against the fixture
+repository below. Exceeding a budget fails the build; lower the numbers when
+a change makes a command cheaper.
+"""
+
+import pytest
+import sys
+import os
+import json
+import time
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import rdd modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".rdd" / "scripts"))
+
+import rdd
+import rdd_utils
+import rdd_trace
+
+BUDGETS_DIR = Path(__file__).parent / "budgets"
+BUDGET_FILES = sorted(BUDGETS_DIR.glob("*.json"))
+
+
+def git(repo, *args):
+    subprocess.run(["git"] + list(args), cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def budget_repo(rdd_workspace, git_repo_with_remote):
+    """
+    RDD repository with an origin, two merged branches and a feature branch
+    ('enh-work') that has commits, workspace files and prompts.
+    """
+    repo = rdd_workspace
+    prompts = "# Work Iteration Prompts\n\n## Prompt Definitions\n\n" + "".join(
+        f" - [{'x' if i < 3 else ' '}] [P{i:02d}] Prompt number {i}\n\n" for i in range(1, 9))
+    (repo / ".rdd" / "templates" / "work-iteration-prompts.md").write_text(prompts)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-m", "Add RDD structure")
+    for branch in ("enh-merged-a", "enh-merged-b"):
+        git(repo, "branch", branch)
+    git(repo, "push", "origin", "main", "enh-merged-a", "enh-merged-b")
+    
+    git(repo, "switch", "-c", "enh-work")
+    for i in range(5):
+        (repo / f"module{i}.py").write_text(f"value = {i}\n")
+        git(repo, "add", f"module{i}.py")
+        git(repo, "commit", "-m", f"Add module {i}")
+    (repo / ".rdd-docs" / "work-iteration-prompts.md").write_text(prompts)
+    for name in ("design.md", "notes.md", "questions.md"):
+        (repo / ".rdd-docs" / "workspace" / name).write_text(f"# {name}\n")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-m", "Iteration work in progress")
+    yield repo
+
+
+def run_measured(repo, argv, answers):
+    """Run one CLI command in-process; return (exit code, trace events, wall seconds)."""
+    os.chdir(repo)
+    rdd_utils.close_git_executor()
+    with patch('sys.argv', ['rdd.py'] + argv), \
+            patch('builtins.input', side_effect=list(answers) + [''] * 10):
+        rdd_trace.enable_tracing()
+        started = time.perf_counter()
+        try:
+            code = rdd.main()
+        finally:
+            wall_time = time.perf_counter() - started
+            rdd_utils.close_git_executor()
+            rdd_trace.disable_tracing()
+    return code, rdd_trace.get_trace_events(), wall_time
+
+
+@pytest.mark.requires_git
+@pytest.mark.parametrize("budget_file", BUDGET_FILES, ids=[f.stem for f in BUDGET_FILES])
+def test_command_within_budget(budget_file, budget_repo):
+    budget = json.loads(budget_file.read_text())
+    code, events, wall_time = run_measured(budget_repo, budget["command"], budget.get("answers", []))
+    git_events = [e for e in events if e.name.startswith("git")]
+    measured = (f"{' '.join(budget['command'])}: {len(git_events)} git / {len(events)} processes, "
+                f"{wall_time * 1000:.0f} ms\n" + "\n".join("  " + " ".join(e.argv) for e in events))
+    
+    assert code == budget.get("exitCode", 0), measured
+    assert len(git_events) <= budget["maxGitProcesses"], measured
+    assert len(events) <= budget["maxProcesses"], measured
+    assert wall_time * 1000 <= budget["maxWallTimeMs"], measured
+
+
+def test_budget_files_are_well_formed():
+    assert BUDGET_FILES, "no budget files found"
+    for budget_file in BUDGET_FILES:
+        budget = json.loads(budget_file.read_text())
+        assert isinstance(budget["command"], list) and budget["command"], budget_file.name
+        for key in ("maxGitProcesses", "maxProcesses", "maxWallTimeMs"):
+            assert isinstance(budget[key], int) and budget[key] >= 0, f"{budget_file.name}: {key}"
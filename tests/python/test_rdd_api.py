@@ -0,0 +1,158 @@
+"""
+test_rdd_api.py
+Unit tests for rdd_api.py
+Tests typed results and exceptions of the importable API, and that it
+neither prints nor changes the caller's working directory
+"""
+
+import pytest
+import sys
+import os
+import json
+import subprocess
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import rdd_api
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".rdd" / "scripts"))
+
+import rdd_api
+from rdd_api import Repository
+
+JOURNAL = "# Work Iteration Prompts\n\n - [ ] [P01] First prompt\n\n - [x] [P02] Second prompt\n"
+
+
+def git(repo, *args):
+    subprocess.run(["git"] + list(args), cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def api_repo(rdd_workspace):
+    (rdd_workspace / ".rdd-docs" / "work-iteration-prompts.md").write_text(JOURNAL)
+    # Calls run from an unrelated folder; the API must not depend on the cwd
+    os.chdir(Path(__file__).parent)
+    yield rdd_workspace
+    os.chdir(Path(__file__).parent)
+
+
+class TestPromptFunctions:
+    """Test the journal functions on a plain file"""
+
+    def test_read_and_complete(self, tmp_path):
+        journal = tmp_path / "prompts.md"
+        journal.write_text(JOURNAL)
+        prompts = rdd_api.read_prompts(str(journal))
+        assert [(p.id, p.title, p.completed, p.line) for p in prompts] == [
+            ('P01', 'First prompt', False, 3), ('P02', 'Second prompt', True, 5)]
+        assert [p.id for p in rdd_api.read_prompts(str(journal), 'checked')] == ['P02']
+
+        assert rdd_api.complete_prompt('P01', str(journal)) is True
+        assert rdd_api.complete_prompt('P01', str(journal)) is False
+        assert all(p.completed for p in rdd_api.read_prompts(str(journal)))
+
+    def test_errors(self, tmp_path):
+        journal = tmp_path / "prompts.md"
+        journal.write_text(JOURNAL)
+        with pytest.raises(rdd_api.PromptNotFound):
+            rdd_api.complete_prompt('P99', str(journal))
+        with pytest.raises(rdd_api.InvalidArgument):
+            rdd_api.read_prompts(str(journal), 'done')
+        with pytest.raises(rdd_api.WorkspaceError):
+            rdd_api.read_prompts(str(tmp_path / "missing.md"))
+
+
+@pytest.mark.requires_git
+class TestRepository:
+    """Test Repository against real repositories"""
+
+    def test_not_a_repository(self, temp_dir):
+        with pytest.raises(rdd_api.NotAGitRepository):
+            Repository(str(temp_dir))
+
+    def test_queries_are_silent_and_keep_cwd(self, api_repo, capsys):
+        cwd = os.getcwd()
+        repo = Repository(str(api_repo / ".rdd-docs"))
+        assert repo.root == os.path.realpath(api_repo)
+        assert repo.current_branch() == 'main'
+        assert repo.default_branch() == 'main'
+        assert repo.status().is_clean is False
+        assert [b.name for b in repo.branches()] == ['main']
+        assert [p.id for p in repo.prompts('unchecked')] == ['P01']
+        assert repo.config('defaultBranch') == 'main'
+        assert os.getcwd() == cwd
+        assert capsys.readouterr() == ('', '')
+
+    def test_calls_do_not_touch_process_state(self, api_repo):
+        git(api_repo, 'branch', 'enh-old')
+        (api_repo / ".rdd-docs" / "workspace" / "notes.md").write_text("notes")
+        repo = Repository(str(api_repo))
+        results = {}
+
+        def work():
+            results['branch'] = repo.current_branch()
+            results['default'] = repo.default_branch()
+            results['clean'] = repo.status().is_clean
+            results['config'] = repo.config('defaultBranch')
+            repo.delete_branch('enh-old')
+            results['archive'] = repo.archive_workspace(keep_workspace=True).branch
+            results['archives'] = [r.branch for r in repo.archives()]
+
+        # Another thread holds the session lock: the calls must neither wait
+        # for it nor chdir or redirect the process-wide streams
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            with rdd_api._session_lock:
+                locked.set()
+                release.wait(30)
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        locked.wait(10)
+        try:
+            with patch('os.chdir', side_effect=AssertionError("chdir")), \
+                    patch('rdd_api.redirect_stdout', side_effect=AssertionError("redirect")):
+                worker = threading.Thread(target=work)
+                worker.start()
+                worker.join(timeout=30)
+        finally:
+            release.set()
+            holder.join()
+        assert not worker.is_alive()
+        assert results == {'branch': 'main', 'default': 'main', 'clean': False, 'config': 'main',
+                           'archive': 'main', 'archives': ['main']}
+
+    def test_branch_lifecycle(self, api_repo, capsys):
+        repo = Repository(str(api_repo))
+        with pytest.raises(rdd_api.InvalidArgument, match="Invalid branch name format"):
+            repo.create_branch('Bad Name')
+        branch = repo.create_branch('enh-api')
+        assert isinstance(branch, rdd_api.BranchInfo) and branch.current
+        with pytest.raises(rdd_api.BranchError):
+            repo.create_branch('enh-api')
+        with pytest.raises(rdd_api.BranchError, match="checked out"):
+            repo.delete_branch('enh-api')
+        git(api_repo, 'switch', 'main')
+        repo.delete_branch('enh-api')
+        assert [b.name for b in repo.branches()] == ['main']
+        assert capsys.readouterr() == ('', '')
+
+    def test_archive_workspace(self, api_repo):
+        git(api_repo, 'switch', '-c', 'enh/archive-me')
+        (api_repo / ".rdd-docs" / "workspace" / "notes.md").write_text("notes")
+        repo = Repository(str(api_repo))
+        record = repo.archive_workspace(keep_workspace=True)
+        assert isinstance(record, rdd_api.ArchiveRecord)
+        assert record.archive_dir == os.path.join(repo.root, ".rdd-docs", "archive", "enh-archive-me")
+        assert record.branch == 'enh/archive-me' and len(record.last_commit) == 40
+        metadata = json.loads(Path(record.archive_dir, ".archive-metadata").read_text())
+        assert metadata == record.metadata()
+
+        with pytest.raises(rdd_api.ArchiveExists):
+            repo.archive_workspace()
+        repo.archive_workspace(overwrite=True)
+        assert not os.listdir(api_repo / ".rdd-docs" / "workspace")
+        assert [r.branch for r in repo.archives()] == ['enh/archive-me']
+        with pytest.raises(rdd_api.WorkspaceError, match="empty"):
+            repo.archive_workspace()
@@ -0,0 +1,149 @@
+"""
+test_rdd_batch.py
+Unit tests for rdd_batch.py
+Tests line parsing, one JSON result per command and the shared repository
+snapshot of `rdd.py batch`
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import rdd modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".rdd" / "scripts"))
+
+import rdd
+import rdd_batch
+import rdd_trace
+
+JOURNAL = "# Work Iteration Prompts\n\n - [ ] [P01] First prompt\n\n - [ ] [P02] Second prompt\n"
+
+
+@pytest.fixture
+def batch_repo(rdd_workspace):
+    (rdd_workspace / ".rdd-docs" / "work-iteration-prompts.md").write_text(JOURNAL)
+    os.chdir(rdd_workspace)
+    yield rdd_workspace
+    os.chdir(Path(__file__).parent)
+
+
+def run_main(argv, stdin_text=None):
+    """Run rdd.main() and return (exit code, JSON result lines, stderr)."""
+    out, err = io.StringIO(), io.StringIO()
+    with patch('sys.argv', ['rdd.py'] + argv), patch('sys.stdout', out), patch('sys.stderr', err), \
+            patch('sys.stdin', io.StringIO(stdin_text or '')):
+        code = rdd.main()
+    return code, [json.loads(line) for line in out.getvalue().splitlines()], err.getvalue()
+
+
+class TestParseBatchLine:
+    """Test the accepted line formats"""
+
+    def test_formats(self):
+        assert rdd_batch.parse_batch_line("prompt mark-completed P01\n") == (None, ['prompt', 'mark-completed', 'P01'])
+        assert rdd_batch.parse_batch_line('["config", "get", "defaultBranch"]') == (None, ['config', 'get', 'defaultBranch'])
+        assert rdd_batch.parse_batch_line('{"id": 3, "argv": ["branch", "list"]}') == (3, ['branch', 'list'])
+        assert rdd_batch.parse_batch_line("python .rdd/scripts/rdd.py prompt list") == (None, ['prompt', 'list'])
+        assert rdd_batch.parse_batch_line("branch list 'enh/*'") == (None, ['branch', 'list', 'enh/*'])
+
+    def test_skipped_lines(self):
+        assert rdd_batch.parse_batch_line("   \n") == (None, None)
+        assert rdd_batch.parse_batch_line("# a comment") == (None, None)
+
+    @pytest.mark.parametrize("line", ['{"argv": []}', '[1, 2]', '{not json', 'batch other.txt', 'serve'])
+    def test_invalid_lines(self, line):
+        with pytest.raises(ValueError):
+            rdd_batch.parse_batch_line(line)
+
+
+class TestRunCaptured:
+    """Test output capture of one in-process command"""
+
+    def test_child_output_in_write_order(self):
+        def command(argv):
+            print("before")
+            subprocess.run([sys.executable, "-c",
+                            "import sys; print('child out'); print('child err', file=sys.stderr)"])
+            print("after")
+            print("own err", file=sys.stderr)
+            return 0
+
+        with patch('rdd.dispatch_command', side_effect=command):
+            result = rdd_batch.run_captured(['any'])
+        assert result == {'exitCode': 0, 'stdout': "before\nchild out\nafter\n",
+                          'stderr': "child err\nown err\n"}
+
+    @pytest.mark.requires_git
+    def test_git_compare_graph_under_commit_differences(self, batch_repo, git_repo_with_remote):
+        subprocess.run(["git", "switch", "-q", "-c", "enh-graph"], check=True)
+        subprocess.run(["git", "add", "-A"], check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "Graph commit"], check=True)
+        lines = rdd_batch.run_captured(['git', 'compare'])['stdout'].splitlines()
+        graph = next(i for i, line in enumerate(lines) if line.endswith("Graph commit"))
+        differences = next(i for i, line in enumerate(lines) if "Commit differences" in line)
+        changes = next(i for i, line in enumerate(lines) if "File changes" in line)
+        assert differences < graph < changes
+
+
+@pytest.mark.requires_git
+class TestBatchCommand:
+    """Test `rdd.py batch` against a real repository"""
+
+    def test_results_stream_one_json_line_per_command(self, batch_repo):
+        commands = "\n".join([
+            "# mark two prompts, then list",
+            "prompt mark-completed P01",
+            '{"id": "second", "argv": ["prompt", "mark-completed", "P02"]}',
+            '["prompt", "list", "--status=checked"]',
+            "",
+            "config get defaultBranch",
+        ]) + "\n"
+        code, results, _ = run_main(['batch'], commands)
+        assert code == 0
+        assert [r['line'] for r in results] == [2, 3, 4, 6]
+        assert results[1]['id'] == 'second'
+        assert all(r['exitCode'] == 0 and r['durationMs'] >= 0 for r in results)
+        assert '[P01]' in results[2]['stdout'] and '[P02]' in results[2]['stdout']
+        assert results[3]['stdout'].strip() == 'defaultBranch: main'
+
+    def test_failures_and_exit_code(self, batch_repo, tmp_path):
+        batch_file = tmp_path / "commands.txt"
+        batch_file.write_text("prompt mark-completed P99\n{broken\nprompt mark-completed P01\n")
+        code, results, _ = run_main(['batch', str(batch_file)])
+        assert code == 1
+        assert [r['exitCode'] for r in results] == [1, rdd_batch.EXIT_INVALID_LINE, 0]
+        assert 'P99 not found' in results[0]['stderr']
+        assert results[1]['error'].startswith('Invalid line')
+
+        code, results, _ = run_main(['batch', str(batch_file), '--stop-on-error'])
+        assert code == 1
+        assert len(results) == 1
+
+    def test_commands_get_no_input(self, batch_repo):
+        # The confirmation reads EOF and is declined instead of consuming batch input
+        code, results, _ = run_main(['batch'], "workspace clear\nconfig get defaultBranch\n")
+        assert results[0]['exitCode'] == 1
+        assert 'Operation cancelled' in results[0]['stdout']
+        assert results[1]['exitCode'] == 0
+
+    def test_repository_snapshot_is_shared(self, batch_repo):
+        commands = "git modified-files --porcelain\n" * 4
+        rdd_trace.enable_tracing()
+        try:
+            code, results, _ = run_main(['batch'], commands)
+        finally:
+            rdd_trace.disable_tracing()
+        assert code == 0 and len(results) == 4
+        events = rdd_trace.get_trace_events()
+        toplevel = [e for e in events if e.argv[:3] == ['git', 'rev-parse', '--show-toplevel']]
+        assert len(toplevel) <= 1
+
+    def test_missing_file(self, batch_repo, capsys):
+        with patch('sys.argv', ['rdd.py', 'batch', 'missing.txt']):
+            assert rdd.main() == 1
+        assert 'Cannot read batch file' in capsys.readouterr().err
@@ -0,0 +1,189 @@
+"""
+test_rdd_daemon.py
+Unit tests for rdd_daemon.py
+Tests the JSON-RPC request handling, warm-state staleness checks and the
+client fallback, plus one end-to-end run of `rdd.py serve`
+"""
+
+import pytest
+import sys
+import os
+import json
+import time
+import socket
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import rdd_daemon
+SCRIPTS_DIR = Path(__file__).parent.parent.parent / ".rdd" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import rdd_daemon
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="Unix domain sockets required")
+
+JOURNAL = "# Work Iteration Prompts\n\n - [ ] [P01] First prompt\n\n - [x] [P02] Second prompt\n"
+
+
+def git(repo, *args):
+    subprocess.run(["git"] + list(args), cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def daemon_repo(rdd_workspace):
+    (rdd_workspace / ".rdd-docs" / "work-iteration-prompts.md").write_text(JOURNAL)
+    os.chdir(rdd_workspace)
+    yield Path(os.path.realpath(rdd_workspace))
+    os.chdir(Path(__file__).parent)
+
+
+def run_request(server, argv, cwd=None, **params):
+    request = {'jsonrpc': '2.0', 'id': 7, 'method': 'run',
+               'params': {'argv': argv, 'cwd': str(cwd or server.root), **params}}
+    return server.handle_request(request)
+
+
+class TestSocketLocation:
+    """Test how the client finds the daemon of a worktree"""
+
+    def test_socket_path_is_per_root_and_user(self, tmp_path):
+        with patch.dict(os.environ, {'TMPDIR': str(tmp_path)}):
+            first = rdd_daemon.get_socket_path('/repo/one')
+            assert first == rdd_daemon.get_socket_path('/repo/one')
+            assert first != rdd_daemon.get_socket_path('/repo/two')
+            assert Path(first).parent == tmp_path / f"rdd-{os.getuid()}"
+
+    def test_find_worktree_root_from_subdirectory(self, mock_git_repo):
+        sub = mock_git_repo / "a" / "b"
+        sub.mkdir(parents=True)
+        assert rdd_daemon.find_worktree_root(str(sub)) == os.path.realpath(mock_git_repo)
+
+    def test_client_falls_back_without_daemon(self, daemon_repo, tmp_path):
+        with patch.dict(os.environ, {'TMPDIR': str(tmp_path)}):
+            assert rdd_daemon.run_via_daemon(['prompt', 'list']) is None
+        # Interactive commands are never sent to the daemon
+        assert rdd_daemon.run_via_daemon(['iteration', 'create']) is None
+
+    def test_shared_socket_folder_is_not_trusted(self, tmp_path):
+        shared = tmp_path / f"rdd-{os.getuid()}"
+        shared.mkdir(mode=0o777)
+        os.chmod(shared, 0o777)
+        assert not rdd_daemon._socket_dir_is_private(str(shared))
+        os.chmod(shared, 0o700)
+        assert rdd_daemon._socket_dir_is_private(str(shared))
+
+
+@pytest.mark.requires_git
+class TestDaemonServer:
+    """Test request handling in-process (no socket)"""
+
+    def test_run_captures_output(self, daemon_repo):
+        server = rdd_daemon.DaemonServer(str(daemon_repo), 'unused.sock')
+        response = run_request(server, ['prompt', 'list', '--status=unchecked'])
+        assert response['id'] == 7
+        result = response['result']
+        assert result['exitCode'] == 0
+        assert '[P01] First prompt' in result['stdout']
+        assert '[P02]' not in result['stdout']
+        assert server.requests == 1
+
+    def test_errors(self, daemon_repo):
+        server = rdd_daemon.DaemonServer(str(daemon_repo), 'unused.sock')
+        assert server.handle_request({'method': 'reboot'})['error']['code'] == rdd_daemon.ERROR_METHOD_NOT_FOUND
+        assert server.handle_request([1, 2])['error']['code'] == rdd_daemon.ERROR_INVALID_REQUEST
+        refused = run_request(server, ['iteration', 'create', 'enh-x'])
+        assert refused['error']['code'] == rdd_daemon.ERROR_INVALID_PARAMS
+        other = run_request(server, ['prompt', 'list'], root='/somewhere/else')
+        assert other['error']['code'] == rdd_daemon.ERROR_WRONG_REPOSITORY
+        assert server.requests == 0
+
+    def test_failed_command_reports_exit_code(self, daemon_repo):
+        server = rdd_daemon.DaemonServer(str(daemon_repo), 'unused.sock')
+        result = run_request(server, ['prompt', 'mark-completed', 'P99'])['result']
+        assert result['exitCode'] == 1
+        assert 'P99 not found' in result['stderr']
+
+    def test_warm_context_is_reused_until_files_change(self, daemon_repo):
+        server = rdd_daemon.DaemonServer(str(daemon_repo), 'unused.sock')
+        assert run_request(server, ['config', 'get', 'defaultBranch'])['result']['stdout'].strip() == 'defaultBranch: main'
+        assert 'config' in server.context._values
+        assert not server.refresh()
+
+        config_path = daemon_repo / ".rdd-docs" / "config.json"
+        config_path.write_text(json.dumps({'defaultBranch': 'develop', 'extra': True}))
+        result = run_request(server, ['config', 'get', 'defaultBranch'])['result']
+        assert result['stdout'].strip() == 'defaultBranch: develop'
+
+    def test_head_change_invalidates_current_branch(self, daemon_repo):
+        server = rdd_daemon.DaemonServer(str(daemon_repo), 'unused.sock')
+        assert server.context.current_branch == 'main'
+        git(daemon_repo, 'switch', '-c', 'enh-next')
+        assert server.refresh()
+        assert server.context.current_branch == 'enh-next'
+
+    def test_changed_scripts_stop_the_daemon(self, daemon_repo):
+        server = rdd_daemon.DaemonServer(str(daemon_repo), 'unused.sock')
+        with patch('rdd_daemon._code_stamp', return_value={'rdd.py': (1, 1)}):
+            response = run_request(server, ['prompt', 'list'])
+        assert response['error']['code'] == rdd_daemon.ERROR_STALE_CODE
+        assert server.stopping
+
+
+@contextmanager
+def serving(repo, temp_dir):
+    """Run `rdd.py serve` for `repo`; yields (server process, socket path, rdd(*args) runner)."""
+    env = {**os.environ, 'TMPDIR': str(temp_dir)}
+    rdd_script = str(SCRIPTS_DIR / "rdd.py")
+    with patch.dict(os.environ, {'TMPDIR': str(temp_dir)}):
+        socket_path = rdd_daemon.get_socket_path(str(repo))
+    server = subprocess.Popen([sys.executable, rdd_script, 'serve', '--idle-timeout', '60'],
+                              cwd=repo, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    try:
+        deadline = time.monotonic() + 10
+        while not os.path.exists(socket_path) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert os.path.exists(socket_path)
+
+        def rdd(*args, daemon=True):
+            run_env = env if daemon else {**env, rdd_daemon.DAEMON_ENV_VAR: '0'}
+            return subprocess.run([sys.executable, rdd_script, *args], cwd=repo, env=run_env,
+                                  capture_output=True, text=True, encoding='utf-8')
+
+        yield server, socket_path, rdd
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
+        server.stdout.close()
+
+
+@pytest.mark.requires_git
+class TestServeCommand:
+    """Test `rdd.py serve` and the automatic client end to end"""
+
+    def test_serve_client_and_stop(self, daemon_repo, temp_dir):
+        with serving(daemon_repo, temp_dir) as (server, socket_path, rdd):
+            assert rdd('prompt', 'mark-completed', 'P01').returncode == 0
+            assert '- [x] [P01]' in (daemon_repo / ".rdd-docs" / "work-iteration-prompts.md").read_text()
+            status = json.loads(rdd('serve', 'status', '--json').stdout)
+            assert status['running'] and status['requests'] == 1
+            assert status['pid'] == server.pid
+
+            assert rdd('serve', 'stop').returncode == 0
+            assert server.wait(timeout=10) == 0
+            assert not os.path.exists(socket_path)
+
+    def test_git_compare_matches_local_run(self, daemon_repo, git_repo_with_remote, temp_dir):
+        git(daemon_repo, 'switch', '-c', 'enh-compare')
+        git(daemon_repo, 'add', '-A')
+        git(daemon_repo, 'commit', '-m', 'Compare commit')
+        with serving(daemon_repo, temp_dir) as (server, socket_path, rdd):
+            local = rdd('git', 'compare', daemon=False)
+            forwarded = rdd('git', 'compare')
+            status = json.loads(rdd('serve', 'status', '--json').stdout)
+        assert status['requests'] == 1
+        assert local.returncode == forwarded.returncode == 0
+        assert 'Compare commit' in local.stdout
+        assert (forwarded.stdout, forwarded.stderr) == (local.stdout, local.stderr)
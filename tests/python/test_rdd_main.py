@@ -6,6 +6,7 @@ Tests command routing and CLI interface
 
 import pytest
 import sys
+import json
 from pathlib import Path
 from unittest.mock import Mock, patch, call
 from io import StringIO
@@ -14,6 +15,9 @@ from io import StringIO
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".rdd" / "scripts"))
 
 import rdd
+import rdd_git
+import rdd_ui
+import rdd_utils
 
 
 class TestCLIHelp:
@@ -41,7 +45,7 @@ class TestDomainRouting:
     """Test domain-based command routing"""
     
     @patch('sys.argv', ['rdd.py', 'config', 'show'])
-    @patch('rdd.route_config')
+    @patch('rdd_config.route_config')
     def test_config_show_routing(self, mock_route_config):
         mock_route_config.return_value = 0
         # main() returns the value from route_config, it doesn't sys.exit directly
@@ -50,7 +54,7 @@ class TestDomainRouting:
         mock_route_config.assert_called_once()
     
     @patch('sys.argv', ['rdd.py', 'workspace', 'init'])
-    @patch('rdd.route_workspace')
+    @patch('rdd_workspace.route_workspace')
     def test_workspace_init_routing(self, mock_route_workspace):
         mock_route_workspace.return_value = 0
         result = rdd.main()
@@ -58,6 +62,199 @@ class TestDomainRouting:
         mock_route_workspace.assert_called_once()
 
 
+class TestGitCommands:
+    """Test git domain command options"""
+    
+    @patch('sys.argv', ['rdd.py', 'git', 'modified-files', '--json'])
+    @patch('rdd_git.get_modified_files', return_value=True)
+    def test_modified_files_json_flag(self, mock_modified):
+        assert rdd.main() == 0
+        mock_modified.assert_called_once_with("json")
+    
+    @patch('sys.argv', ['rdd.py', 'git', 'modified-files', '--porcelain'])
+    @patch('rdd_git.get_modified_files', return_value=True)
+    def test_modified_files_porcelain_flag(self, mock_modified):
+        assert rdd.main() == 0
+        mock_modified.assert_called_once_with("porcelain")
+
+
+class TestBranchListOptions:
+    """Test branch list option parsing"""
+    
+    @patch('sys.argv', ['rdd.py', 'branch', 'list', 'enh/*', '--regex', 'x$', '--sort', 'name',
+                        '--limit', '5', '--skip', '10', '--all', '--json'])
+    @patch('rdd_branch.list_branches', return_value=True)
+    def test_all_options(self, mock_list):
+        assert rdd.main() == 0
+        mock_list.assert_called_once_with(filter_str='enh/*', regex='x$', sort='name', limit=5,
+                                          skip=10, include_remotes=True, as_json=True)
+    
+    @patch('sys.argv', ['rdd.py', 'branch', 'list', '--limit', 'many'])
+    @patch('rdd_branch.list_branches', return_value=True)
+    def test_invalid_limit(self, mock_list):
+        assert rdd.main() == 1
+        mock_list.assert_not_called()
+    
+    @patch('sys.argv', ['rdd.py', 'branch', 'list', '--sort', 'size'])
+    @patch('rdd_branch.list_branches', return_value=True)
+    def test_invalid_sort(self, mock_list):
+        assert rdd.main() == 1
+        mock_list.assert_not_called()
+
+
+class TestIterationRouting:
+    """Test iteration domain option parsing"""
+    
+    @patch('sys.argv', ['rdd.py', 'iteration', 'create', 'enh-x', '--worktree'])
+    @patch('rdd_iteration.create_iteration', return_value=True)
+    def test_create_worktree(self, mock_create):
+        assert rdd.main() == 0
+        mock_create.assert_called_once_with('enh-x', use_worktree=True, sparse=None)
+    
+    @patch('sys.argv', ['rdd.py', 'iteration', 'create', '--sparse', 'api', 'enh-x'])
+    @patch('rdd_iteration.create_iteration', return_value=True)
+    def test_create_sparse(self, mock_create):
+        assert rdd.main() == 0
+        mock_create.assert_called_once_with('enh-x', use_worktree=False, sparse='api')
+    
+    @patch('sys.argv', ['rdd.py', 'iteration', 'create', '--detach'])
+    @patch('rdd_iteration.create_iteration', return_value=True)
+    def test_create_unknown_option(self, mock_create):
+        assert rdd.main() == 1
+        mock_create.assert_not_called()
+    
+    @patch('sys.argv', ['rdd.py', 'iteration', 'switch'])
+    def test_switch_requires_name(self):
+        assert rdd.main() == 1
+
+
+@pytest.mark.requires_git
+class TestIterationWorktrees:
+    """Test parallel iterations in git worktrees against a real repository"""
+    
+    def _setup(self, repo, tmp_path):
+        import os
+        import subprocess
+        os.chdir(repo)
+        (repo / ".rdd" / "templates" / "work-iteration-prompts.md").write_text("# Prompts\n")
+        (repo / ".rdd" / "templates" / "user-story.md").write_text("# User story\n")
+        config = json.loads((repo / ".rdd-docs" / "config.json").read_text())
+        config.update({"localOnly": True, "worktreeRoot": str(tmp_path / "wt")})
+        (repo / ".rdd-docs" / "config.json").write_text(json.dumps(config, indent=2))
+        subprocess.run(["git", "add", "-A"], check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "Add RDD structure"], check=True)
+        # The main worktree is busy with another iteration
+        subprocess.run(["git", "switch", "-q", "-c", "enh-busy"], check=True)
+        (repo / ".rdd-docs" / "workspace" / "notes.md").write_text("busy\n")
+        return tmp_path / "wt" / "enh-parallel"
+    
+    def test_create_list_switch_complete(self, rdd_workspace, tmp_path, capsys):
+        import subprocess
+        path = self._setup(rdd_workspace, tmp_path)
+        
+        with patch('sys.argv', ['rdd.py', 'iteration', 'create', 'enh-parallel', '--worktree']):
+            assert rdd.main() == 0
+        assert (path / ".rdd-docs" / "workspace").is_dir()
+        assert (path / ".rdd-docs" / "work-iteration-prompts.md").read_text() == "# Prompts\n"
+        assert rdd_utils.get_current_branch() == "enh-busy"
+        assert (rdd_workspace / ".rdd-docs" / "workspace" / "notes.md").exists()
+        
+        (path / ".rdd-docs" / "workspace" / "design.md").write_text("design\n")
+        capsys.readouterr()
+        with patch('sys.argv', ['rdd.py', 'iteration', 'list', '--json']):
+            assert rdd.main() == 0
+        entries = json.loads(capsys.readouterr().out)["worktrees"]
+        assert [(e["branch"], e["workspaceFiles"], e["current"]) for e in entries] == [
+            ("enh-busy", 1, True), ("enh-parallel", 1, False)]
+        
+        with patch('sys.argv', ['rdd.py', 'iteration', 'switch', 'enh-parallel']):
+            assert rdd.main() == 0
+        assert capsys.readouterr().out.strip() == str(path)
+        
+        with patch('sys.argv', ['rdd.py', 'iteration', 'complete', 'enh-parallel']):
+            assert rdd.main() == 0
+        assert not path.exists()
+        archived = subprocess.run(
+            ["git", "show", "enh-parallel:.rdd-docs/archive/enh-parallel/design.md"],
+            capture_output=True, text=True)
+        assert archived.stdout == "design\n"
+        assert rdd_utils.get_current_branch() == "enh-busy"
+    
+    def test_sparse_iteration_update_and_complete(self, rdd_workspace, tmp_path):
+        import subprocess
+        self._setup(rdd_workspace, tmp_path)
+        for service in ("api", "web"):
+            (rdd_workspace / "services" / service).mkdir(parents=True)
+            (rdd_workspace / "services" / service / "main.py").write_text(f"# {service}\n")
+        subprocess.run(["git", "switch", "-q", "main"], check=True)
+        (rdd_workspace / ".rdd-docs" / "workspace" / "notes.md").unlink()
+        subprocess.run(["git", "add", "-A"], check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "Add services"], check=True)
+        
+        with patch('sys.argv', ['rdd.py', 'iteration', 'create', 'enh-api', '--sparse', 'services/api']):
+            assert rdd.main() == 0
+        assert (rdd_workspace / "services" / "api" / "main.py").exists()
+        assert not (rdd_workspace / "services" / "web").exists()
+        assert (rdd_workspace / ".rdd-docs" / "work-iteration-prompts.md").exists()
+        
+        # The default branch moves on outside the cone
+        subprocess.run(["git", "worktree", "add", "-q", str(tmp_path / "main-wt"), "main"], check=True)
+        subprocess.run(["git", "-C", str(tmp_path / "main-wt"), "sparse-checkout", "disable"], check=True)
+        (tmp_path / "main-wt" / "services" / "web" / "main.py").write_text("# web v2\n")
+        subprocess.run(["git", "-C", str(tmp_path / "main-wt"), "commit", "-qam", "Web v2"], check=True)
+        subprocess.run(["git", "worktree", "remove", str(tmp_path / "main-wt")], check=True)
+        
+        assert rdd_utils.update_from_default_branch() == True
+        assert not (rdd_workspace / "services" / "web").exists()
+        web = subprocess.run(["git", "show", "HEAD:services/web/main.py"], capture_output=True, text=True)
+        assert web.stdout == "# web v2\n"
+        
+        (rdd_workspace / ".rdd-docs" / "workspace").mkdir(exist_ok=True)
+        (rdd_workspace / ".rdd-docs" / "workspace" / "design.md").write_text("design\n")
+        with patch('sys.argv', ['rdd.py', 'iteration', 'complete']):
+            assert rdd.main() == 0
+        assert rdd_utils.get_current_branch() == "main"
+        tracked = subprocess.run(["git", "ls-files", "services/web"], capture_output=True, text=True)
+        assert tracked.stdout.strip() == "services/web/main.py"
+        # The default branch gets its full checkout back
+        assert rdd_utils.is_sparse_checkout() == False
+        assert (rdd_workspace / "services" / "web" / "main.py").read_text() == "# web v2\n"
+    
+    def test_sparse_create_failure_restores_full_checkout(self, rdd_workspace, tmp_path):
+        import subprocess
+        self._setup(rdd_workspace, tmp_path)
+        (rdd_workspace / "services" / "web").mkdir(parents=True)
+        (rdd_workspace / "services" / "web" / "main.py").write_text("# web\n")
+        subprocess.run(["git", "switch", "-q", "main"], check=True)
+        (rdd_workspace / ".rdd-docs" / "workspace" / "notes.md").unlink()
+        subprocess.run(["git", "add", "-A"], check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "Add services"], check=True)
+        
+        with patch('sys.argv', ['rdd.py', 'iteration', 'create', 'enh-api', '--sparse', 'services/api']), \
+                patch('rdd_iteration.create_branch_from_default', return_value=False):
+            assert rdd.main() == 1
+        assert rdd_utils.get_current_branch() == "main"
+        assert rdd_utils.is_sparse_checkout() == False
+        assert (rdd_workspace / "services" / "web" / "main.py").exists()
+    
+    def test_plain_create_still_requires_default_branch(self, rdd_workspace, tmp_path):
+        self._setup(rdd_workspace, tmp_path)
+        with patch('sys.argv', ['rdd.py', 'iteration', 'create', 'enh-other']):
+            assert rdd.main() == 1
+
+
+@pytest.mark.requires_git
+class TestAutoCommit:
+    """Test auto_commit against a real repository"""
+    
+    def test_commit_then_nothing_to_commit(self, rdd_workspace):
+        import os
+        os.chdir(rdd_workspace)
+        # Fixture files are uncommitted
+        assert rdd_git.auto_commit("Add RDD structure") == 0
+        assert rdd_git.auto_commit("Nothing new") == 2
+
+
 class TestChangeCommands:
     """Test change management commands"""
     
@@ -77,7 +274,7 @@ class TestMenuInteraction:
     @patch('builtins.input', return_value='1')
     def test_curses_menu_selection(self, mock_input):
         # Mock input to return '1' (first option = fix)
-        result = rdd.select_change_type_interactive()
+        result = rdd_ui.select_change_type_interactive()
         # First option should return "fix"
         assert result == "fix"
         mock_input.assert_called_once()
@@ -100,7 +297,7 @@ class TestErrorHandling:
     """Test error handling and edge cases"""
     
     @patch('sys.argv', ['rdd.py'])
-    @patch('rdd.main_menu_loop')
+    @patch('rdd_menu.main_menu_loop')
     def test_no_command_shows_help(self, mock_menu_loop):
         # With no arguments, main() launches the interactive menu
         result = rdd.main()
@@ -116,7 +313,7 @@ class TestErrorHandling:
         assert "Unknown domain" in captured.err
     
     @patch('sys.argv', ['rdd.py', 'change', 'invalid_action'])
-    @patch('rdd.route_change', return_value=1)
+    @patch('rdd_change.route_change', return_value=1)
     def test_invalid_action_error(self, mock_route_change):
         result = rdd.main()
         assert result == 1
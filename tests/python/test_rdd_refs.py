@@ -0,0 +1,89 @@
+"""
+test_rdd_refs.py
+Unit tests for rdd_refs.py
+Tests direct reading of HEAD, loose refs and packed-refs against real git repos
+"""
+
+import pytest
+import sys
+import subprocess
+from pathlib import Path
+
+# Add parent directory to path to import rdd_refs
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".rdd" / "scripts"))
+
+import rdd_refs
+
+
+def git(repo, *args):
+    """Run git in repo and return stripped stdout."""
+    result = subprocess.run(["git"] + list(args), cwd=repo, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+@pytest.mark.requires_git
+class TestRefReader:
+    """Test RefReader against answers from git itself"""
+    
+    def test_current_branch(self, mock_git_repo):
+        reader = rdd_refs.open_ref_reader(str(mock_git_repo))
+        assert reader.current_branch() == "main"
+        git(mock_git_repo, "checkout", "-q", "-b", "feature/x")
+        assert reader.current_branch() == "feature/x"
+    
+    def test_detached_head(self, mock_git_repo):
+        git(mock_git_repo, "checkout", "-q", "--detach")
+        reader = rdd_refs.open_ref_reader(str(mock_git_repo))
+        assert reader.current_branch() == ""
+        assert reader.resolve("HEAD") == git(mock_git_repo, "rev-parse", "HEAD")
+    
+    def test_loose_and_packed_refs(self, mock_git_repo):
+        head = git(mock_git_repo, "rev-parse", "HEAD")
+        git(mock_git_repo, "branch", "packed-branch")
+        git(mock_git_repo, "pack-refs", "--all")
+        git(mock_git_repo, "branch", "loose-branch")
+        reader = rdd_refs.open_ref_reader(str(mock_git_repo))
+        assert reader.resolve("refs/heads/packed-branch") == head
+        assert reader.resolve("refs/heads/loose-branch") == head
+        assert reader.ref_exists("refs/heads/missing") == False
+        assert set(reader.list_refs("refs/heads/")) == {
+            "refs/heads/main", "refs/heads/packed-branch", "refs/heads/loose-branch"
+        }
+    
+    def test_packed_refs_cache_revalidates(self, mock_git_repo):
+        git(mock_git_repo, "branch", "to-delete")
+        git(mock_git_repo, "pack-refs", "--all")
+        reader = rdd_refs.open_ref_reader(str(mock_git_repo))
+        assert reader.ref_exists("refs/heads/to-delete") == True
+        git(mock_git_repo, "branch", "-D", "to-delete")
+        assert reader.ref_exists("refs/heads/to-delete") == False
+    
+    def test_linked_worktree(self, mock_git_repo, tmp_path):
+        worktree = tmp_path / "wt"
+        git(mock_git_repo, "worktree", "add", "-q", "-b", "wt-branch", str(worktree))
+        reader = rdd_refs.open_ref_reader(str(worktree / "."))
+        assert reader.current_branch() == "wt-branch"
+        assert reader.ref_exists("refs/heads/main") == True
+    
+    def test_subdirectory_discovery(self, mock_git_repo):
+        sub = mock_git_repo / "a" / "b"
+        sub.mkdir(parents=True)
+        reader = rdd_refs.open_ref_reader(str(sub))
+        assert Path(reader.git_dir).resolve() == (mock_git_repo / ".git").resolve()
+
+
+class TestFallbackDetection:
+    """Test layouts that must be handed back to git"""
+    
+    def test_not_a_repository(self, temp_dir):
+        assert rdd_refs.open_ref_reader(str(temp_dir)) is None
+    
+    def test_git_dir_override(self, mock_git_repo, monkeypatch):
+        monkeypatch.setenv("GIT_DIR", str(mock_git_repo / ".git"))
+        with pytest.raises(rdd_refs.RefReadError):
+            rdd_refs.open_ref_reader(str(mock_git_repo))
+    
+    def test_reftable_layout(self, mock_git_repo):
+        (mock_git_repo / ".git" / "reftable").mkdir()
+        with pytest.raises(rdd_refs.RefReadError):
+            rdd_refs.open_ref_reader(str(mock_git_repo))
@@ -0,0 +1,119 @@
+"""
+test_rdd_trace.py
+Unit tests for rdd_trace.py
+Tests subprocess recording, the summary table and the Chrome trace output
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path to import rdd_trace
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".rdd" / "scripts"))
+
+import rdd_trace
+
+
+@pytest.fixture
+def tracing():
+    """Enable tracing for one test and always restore subprocess.Popen."""
+    rdd_trace.enable_tracing()
+    yield
+    rdd_trace.disable_tracing()
+
+
+class TestCommandName:
+    """Test command labels used to group traced processes"""
+
+    def test_git_subcommand_after_global_options(self):
+        assert rdd_trace.command_name(['git', '-C', '/repo', '-c', 'a=b', '--no-pager', 'status']) == 'git status'
+        assert rdd_trace.command_name(['/usr/bin/git.exe', 'rev-parse', 'HEAD']) == 'git rev-parse'
+
+    def test_other_programs(self):
+        assert rdd_trace.command_name(['python3', '-c', 'pass']) == 'python3'
+        assert rdd_trace.command_name([]) == '?'
+
+    def test_extract_profile_args(self):
+        assert rdd_trace.extract_profile_args(['branch', '--profile', 'list']) == (['branch', 'list'], True, None)
+        assert rdd_trace.extract_profile_args(['--profile=t.json', 'git']) == (['git'], True, 't.json')
+        assert rdd_trace.extract_profile_args(['git', 'compare']) == (['git', 'compare'], False, None)
+
+
+@pytest.mark.requires_git
+class TestTracing:
+    """Test recording of real subprocesses"""
+
+    def test_run_is_recorded(self, mock_git_repo, tracing):
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=mock_git_repo, capture_output=True, text=True)
+        failed = subprocess.run(['git', 'rev-parse', 'missing-ref'], cwd=mock_git_repo, capture_output=True)
+        events = rdd_trace.get_trace_events()
+        assert [e.name for e in events] == ['git rev-parse', 'git rev-parse']
+        assert events[0].argv == ['git', 'rev-parse', 'HEAD']
+        assert events[0].cwd == str(mock_git_repo)
+        assert events[0].returncode == 0
+        assert events[0].output_bytes == len(result.stdout)
+        assert events[1].returncode == failed.returncode != 0
+        assert all(e.end is not None and e.duration >= 0 for e in events)
+
+    def test_popen_stream_is_recorded(self, mock_git_repo, tracing):
+        proc = subprocess.Popen(['git', 'log', '--oneline'], cwd=mock_git_repo, stdout=subprocess.PIPE)
+        proc.stdout.read()
+        proc.stdout.close()
+        proc.wait()
+        event, = rdd_trace.get_trace_events()
+        assert (event.name, event.returncode, event.pid) == ('git log', 0, proc.pid)
+
+    def test_disable_restores_popen(self):
+        original = subprocess.Popen
+        rdd_trace.enable_tracing()
+        assert subprocess.Popen is rdd_trace.TracedPopen
+        rdd_trace.disable_tracing()
+        assert subprocess.Popen is original
+
+    def test_finish_prints_summary_and_writes_trace(self, mock_git_repo, tmp_path):
+        rdd_trace.enable_tracing()
+        for _ in range(3):
+            subprocess.run(['git', 'status', '--porcelain'], cwd=mock_git_repo, capture_output=True)
+        stream = io.StringIO()
+        trace_file = tmp_path / 'trace.json'
+        rdd_trace.finish_tracing(str(trace_file), stream=stream)
+        output = stream.getvalue()
+        assert 'rdd profile: 3 subprocesses' in output
+        assert 'git status' in output
+        trace = json.loads(trace_file.read_text())
+        assert [e['name'] for e in trace['traceEvents']] == ['git status'] * 3
+        assert all(e['ph'] == 'X' and e['dur'] >= 0 for e in trace['traceEvents'])
+        # Sequential processes share one lane
+        assert {e['tid'] for e in trace['traceEvents']} == {0}
+
+    def test_overlapping_processes_get_separate_lanes(self, tracing):
+        procs = [subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(0.2)']) for _ in range(2)]
+        for proc in procs:
+            proc.wait()
+        trace = rdd_trace.to_chrome_trace(rdd_trace.get_trace_events(), 0.0)
+        assert sorted(e['tid'] for e in trace['traceEvents']) == [0, 1]
+
+
+class TestProfileFlag:
+    """Test --profile and RDD_TRACE on the CLI entry point"""
+
+    @patch('sys.argv', ['rdd.py', '--profile', '--help'])
+    def test_profile_flag(self, capsys):
+        import rdd
+        assert rdd.main() == 0
+        captured = capsys.readouterr()
+        assert 'Usage:' in captured.out
+        assert 'rdd profile:' in captured.err
+        assert subprocess.Popen is rdd_trace._original_popen
+
+    @patch('sys.argv', ['rdd.py', '--help'])
+    def test_env_var(self, capsys):
+        import rdd
+        with patch.dict(os.environ, {'RDD_TRACE': '1'}):
+            assert rdd.main() == 0
+        assert 'rdd profile:' in capsys.readouterr().err
@@ -10,6 +10,8 @@ import os
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 import json
+import subprocess
+import time
 
 # Add parent directory to path to import rdd_utils
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / ".rdd" / "scripts"))
@@ -91,8 +93,9 @@ class TestGitFunctions:
         mock_run.return_value = Mock(returncode=1)
         assert rdd_utils.check_git_repo(str(temp_dir), exit_on_error=False) == False
     
+    @patch('rdd_utils.get_ref_reader', return_value=None)
     @patch('subprocess.run')
-    def test_get_current_branch(self, mock_run):
+    def test_get_current_branch(self, mock_run, mock_reader):
         mock_run.return_value = Mock(
             returncode=0,
             stdout="main\n"
@@ -105,24 +108,28 @@ class TestGitFunctions:
         # Config has defaultBranch: "main"
         assert rdd_utils.get_default_branch() == "main"
     
+    @patch('rdd_utils.get_ref_reader', return_value=None)
     @patch('subprocess.run')
-    def test_get_branch_type_fix(self, mock_run):
+    def test_get_branch_type_fix(self, mock_run, mock_reader):
         mock_run.return_value = Mock(returncode=0, stdout="fix/test-bug\n")
         assert rdd_utils.get_branch_type() == "fix"
     
+    @patch('rdd_utils.get_ref_reader', return_value=None)
     @patch('subprocess.run')
-    def test_get_branch_type_enh(self, mock_run):
+    def test_get_branch_type_enh(self, mock_run, mock_reader):
         mock_run.return_value = Mock(returncode=0, stdout="enh/new-feature\n")
         assert rdd_utils.get_branch_type() == "enh"
     
+    @patch('rdd_utils.get_ref_reader', return_value=None)
     @patch('subprocess.run')
-    def test_get_branch_type_main(self, mock_run):
+    def test_get_branch_type_main(self, mock_run, mock_reader):
         mock_run.return_value = Mock(returncode=0, stdout="main\n")
         # main branch should return empty string, not "main"
         assert rdd_utils.get_branch_type() == ""
     
+    @patch('rdd_utils.get_ref_reader', return_value=None)
     @patch('subprocess.run')
-    def test_is_enh_or_fix_branch(self, mock_run):
+    def test_is_enh_or_fix_branch(self, mock_run, mock_reader):
         mock_run.return_value = Mock(returncode=0, stdout="fix/test\n")
         assert rdd_utils.is_enh_or_fix_branch() == True
         
@@ -130,6 +137,754 @@ class TestGitFunctions:
         assert rdd_utils.is_enh_or_fix_branch() == False
 
 
+class TestRepoContext:
+    """Test per-command repository snapshot"""
+    
+    def test_no_context_outside_command(self):
+        assert rdd_utils.get_repo_context() is None
+    
+    @patch('rdd_utils.get_ref_reader', return_value=None)
+    def test_context_caches_git_queries(self, mock_reader):
+        with patch('subprocess.run') as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout="feature-x\n")
+            with rdd_utils.repo_context():
+                assert rdd_utils.get_current_branch() == "feature-x"
+                assert rdd_utils.get_current_branch() == "feature-x"
+            assert mock_run.call_count == 1
+        assert rdd_utils.get_repo_context() is None
+    
+    @patch('rdd_utils.get_ref_reader', return_value=None)
+    def test_invalidate_forces_refresh(self, mock_reader):
+        with patch('subprocess.run') as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout="feature-x\n")
+            with rdd_utils.repo_context():
+                rdd_utils.get_current_branch()
+                mock_run.return_value = Mock(returncode=0, stdout="main\n")
+                rdd_utils.invalidate_repo_context('current_branch')
+                assert rdd_utils.get_current_branch() == "main"
+    
+    def test_context_snapshot_of_real_repo(self, rdd_workspace):
+        os.chdir(rdd_workspace)
+        with rdd_utils.repo_context() as ctx:
+            assert Path(ctx.repo_root).resolve() == rdd_workspace.resolve()
+            assert ctx.current_branch == "main"
+            assert ctx.default_branch == "main"
+            assert ctx.config["defaultBranch"] == "main"
+            assert ctx.remotes == []
+    
+    def test_set_rdd_config_invalidates_context(self, rdd_workspace):
+        os.chdir(rdd_workspace)
+        with rdd_utils.repo_context():
+            assert rdd_utils.get_rdd_config("defaultBranch") == "main"
+            rdd_utils.set_rdd_config("defaultBranch", "dev")
+            assert rdd_utils.get_rdd_config("defaultBranch") == "dev"
+
+
+@pytest.mark.requires_git
+class TestGitExecutor:
+    """Test the git executor and its cat-file coprocess"""
+    
+    def test_ref_exists(self, mock_git_repo):
+        executor = rdd_utils.GitExecutor(str(mock_git_repo))
+        try:
+            assert executor.ref_exists("refs/heads/main") == True
+            assert executor.ref_exists("refs/heads/missing") == False
+        finally:
+            executor.close()
+    
+    def test_rev_parse_matches_git(self, mock_git_repo):
+        expected = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=mock_git_repo,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        executor = rdd_utils.GitExecutor(str(mock_git_repo))
+        try:
+            assert executor.rev_parse("HEAD") == expected
+            assert executor.object_info("HEAD") == (expected, "commit")
+            assert executor.rev_parse("no-such-rev") is None
+        finally:
+            executor.close()
+    
+    def test_coprocess_is_reused_and_sees_new_refs(self, mock_git_repo):
+        executor = rdd_utils.GitExecutor(str(mock_git_repo))
+        try:
+            assert executor.ref_exists("refs/heads/feature") == False
+            pid = executor._batch.pid
+            subprocess.run(["git", "branch", "feature"], cwd=mock_git_repo, check=True)
+            assert executor.ref_exists("refs/heads/feature") == True
+            assert executor._batch.pid == pid
+        finally:
+            executor.close()
+    
+    def test_fallback_without_coprocess(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        executor = rdd_utils.GitExecutor(str(mock_git_repo))
+        executor._batch_disabled = True
+        assert executor.ref_exists("refs/heads/main") == True
+        assert executor.ref_exists("refs/heads/missing") == False
+        assert executor._batch is None
+    
+    def test_shared_executor_follows_cwd(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        first = rdd_utils.get_git_executor()
+        assert rdd_utils.get_git_executor() is first
+        (mock_git_repo / "sub").mkdir()
+        os.chdir(mock_git_repo / "sub")
+        assert rdd_utils.get_git_executor() is not first
+        rdd_utils.close_git_executor()
+
+
+@pytest.mark.requires_git
+class TestDiffStreaming:
+    """Test single-pass name-status diff parsing"""
+    
+    def _branch_with_changes(self, repo):
+        os.chdir(repo)
+        (repo / "old-name.txt").write_text("content that is long enough to be detected as a rename\n" * 5)
+        (repo / "doc").write_text("prefix")
+        (repo / "doc.md").write_text("longer name sharing the prefix")
+        subprocess.run(["git", "add", "-A"], check=True, capture_output=True)
+        subprocess.run(["git", "commit", "-m", "base"], check=True, capture_output=True)
+        subprocess.run(["git", "checkout", "-b", "feature"], check=True, capture_output=True)
+        subprocess.run(["git", "mv", "old-name.txt", "new name.txt"], check=True, capture_output=True)
+        (repo / "doc").unlink()
+        (repo / "doc.md").write_text("changed")
+        (repo / "added.txt").write_text("new")
+        subprocess.run(["git", "add", "-A"], check=True, capture_output=True)
+        subprocess.run(["git", "commit", "-m", "changes"], check=True, capture_output=True)
+    
+    def test_statuses_and_renames(self, mock_git_repo):
+        self._branch_with_changes(mock_git_repo)
+        entries = {e.path: e for e in rdd_utils.iter_diff_name_status("main...HEAD")}
+        assert entries["added.txt"].status == "A"
+        assert entries["doc"].status == "D"
+        assert entries["doc.md"].status == "M"
+        renamed = entries["new name.txt"]
+        assert renamed.status == "R"
+        assert renamed.old_path == "old-name.txt"
+        assert renamed.to_dict()["oldPath"] == "old-name.txt"
+    
+    def test_invalid_range_raises(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        with pytest.raises(subprocess.CalledProcessError):
+            list(rdd_utils.iter_diff_name_status("no-such-branch...HEAD"))
+
+
+class TestWorkingTreeStatus:
+    """Test the single-scan working tree probe"""
+    
+    def test_parse_porcelain_v2(self):
+        output = "\0".join([
+            "# branch.oid 1111111111111111111111111111111111111111",
+            "# branch.head feature",
+            "# branch.upstream origin/feature",
+            "# branch.ab +2 -3",
+            "1 M. N... 100644 100644 100644 aaaa bbbb staged file.txt",
+            "1 .M N... 100644 100644 100644 aaaa aaaa worktree.txt",
+            "2 R. N... 100644 100644 100644 aaaa aaaa R100 new name.txt",
+            "old name.txt",
+            "u UU N... 100644 100644 100644 100644 aaaa bbbb cccc conflict.txt",
+            "? untracked dir/file.txt",
+            "",
+        ])
+        status = rdd_utils.parse_porcelain_v2(output)
+        assert status.branch == "feature"
+        assert status.upstream == "origin/feature"
+        assert (status.ahead, status.behind) == (2, 3)
+        assert status.staged == ["staged file.txt", "new name.txt"]
+        assert status.unstaged == ["worktree.txt"]
+        assert status.conflicted == ["conflict.txt"]
+        assert status.untracked == ["untracked dir/file.txt"]
+        assert status.is_clean == False
+    
+    def test_parse_initial_detached(self):
+        status = rdd_utils.parse_porcelain_v2("# branch.oid (initial)\0# branch.head (detached)\0")
+        assert status.oid is None
+        assert status.branch is None
+        assert status.is_clean == True
+    
+    @pytest.mark.requires_git
+    def test_probe_real_repo(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        assert rdd_utils.get_working_tree_status().is_clean == True
+        assert rdd_utils.check_uncommitted_changes() == True
+        
+        (mock_git_repo / "README.md").write_text("changed")
+        (mock_git_repo / "new.txt").write_text("new")
+        status = rdd_utils.get_working_tree_status()
+        assert status.branch == "main"
+        assert status.unstaged == ["README.md"]
+        assert status.untracked == ["new.txt"]
+        assert rdd_utils.check_uncommitted_changes(status) == False
+
+
+@pytest.mark.requires_git
+class TestLargeRepoMode:
+    """Test large-repository mode settings"""
+    
+    def test_config_bool_parsing(self, rdd_workspace):
+        os.chdir(rdd_workspace)
+        assert rdd_utils.is_large_repo_mode() == False
+        rdd_utils.set_rdd_config("largeRepo", "true")
+        assert rdd_utils.is_large_repo_mode() == True
+        rdd_utils.set_rdd_config("largeRepo", False)
+        assert rdd_utils.is_large_repo_mode() == False
+    
+    def test_apply_settings(self, rdd_workspace):
+        os.chdir(rdd_workspace)
+        assert rdd_utils.apply_large_repo_settings() == True
+        settings = rdd_utils.get_large_repo_git_settings()
+        assert settings["core.untrackedCache"] == "true"
+        assert settings["core.splitIndex"] == "true"
+    
+    @patch('rdd_utils.apply_large_repo_settings')
+    def test_ensure_is_noop_when_disabled(self, mock_apply, rdd_workspace):
+        os.chdir(rdd_workspace)
+        rdd_utils.ensure_large_repo_mode()
+        mock_apply.assert_not_called()
+    
+    @patch('rdd_utils.apply_large_repo_settings')
+    def test_ensure_applies_missing_settings(self, mock_apply, rdd_workspace):
+        os.chdir(rdd_workspace)
+        rdd_utils.set_rdd_config("largeRepo", True)
+        rdd_utils.ensure_large_repo_mode()
+        mock_apply.assert_called_once()
+    
+    def test_report(self, rdd_workspace):
+        os.chdir(rdd_workspace)
+        report = rdd_utils.get_large_repo_report()
+        assert report["largeRepo"] == False
+        assert len(report["statusLatencyMs"]) == 2
+        assert set(report["settings"]) == set(rdd_utils.LARGE_REPO_GIT_SETTINGS)
+
+
+class MergeRepoHelpers:
+    """Helpers building diverged branches in the current repository"""
+
+    def _commit(self, path, content, message):
+        with open(path, 'w') as f:
+            f.write(content)
+        subprocess.run(['git', 'add', path], check=True, capture_output=True)
+        subprocess.run(['git', 'commit', '-m', message], check=True, capture_output=True)
+
+    def _diverge(self, feature_content, main_content):
+        self._commit('shared.txt', 'base\n', 'Base')
+        subprocess.run(['git', 'checkout', '-b', 'feat/x'], check=True, capture_output=True)
+        self._commit('shared.txt', feature_content, 'Feature')
+        subprocess.run(['git', 'checkout', 'main'], check=True, capture_output=True)
+        if main_content is not None:
+            self._commit('other.txt' if main_content == 'other' else 'shared.txt', main_content, 'Main')
+        subprocess.run(['git', 'checkout', 'feat/x'], check=True, capture_output=True)
+
+
+@pytest.mark.requires_git
+class TestMergePreflight(MergeRepoHelpers):
+    """Test in-memory merge prediction"""
+
+    def test_up_to_date(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._diverge('feature\n', None)
+        assert rdd_utils.preflight_merge('main').outcome == rdd_utils.MergePreflight.UP_TO_DATE
+
+    def test_clean_merge(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._diverge('feature\n', 'other')
+        preflight = rdd_utils.preflight_merge('main')
+        assert preflight.outcome == rdd_utils.MergePreflight.CLEAN
+        assert preflight.can_merge
+
+    def test_conflict_reports_paths_without_touching_tree(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._diverge('feature\n', 'main\n')
+        preflight = rdd_utils.preflight_merge('main')
+        assert preflight.outcome == rdd_utils.MergePreflight.CONFLICT
+        assert preflight.conflicts == ['shared.txt']
+        assert not preflight.can_merge
+        assert rdd_utils.get_working_tree_status().is_clean
+
+    @patch('rdd_utils.stash_changes')
+    @patch('rdd_utils.pull_default_branch', return_value=True)
+    def test_update_aborts_before_stash_on_conflict(self, mock_pull, mock_stash, rdd_workspace):
+        os.chdir(rdd_workspace)
+        subprocess.run(['git', 'add', '-A'], check=True, capture_output=True)
+        subprocess.run(['git', 'commit', '-m', 'Workspace'], check=True, capture_output=True)
+        self._diverge('feature\n', 'main\n')
+        assert rdd_utils.update_from_default_branch() == False
+        mock_stash.assert_not_called()
+
+
+@pytest.mark.requires_git
+class TestStashFreeUpdate(MergeRepoHelpers):
+    """Test the merge-tree update strategy"""
+
+    def _head(self, ref='HEAD'):
+        return subprocess.run(['git', 'rev-parse', ref], capture_output=True, text=True).stdout.strip()
+
+    def test_default_strategy(self, rdd_workspace):
+        os.chdir(rdd_workspace)
+        assert rdd_utils.get_update_strategy() == 'stash'
+        rdd_utils.set_rdd_config("updateStrategy", "bogus")
+        assert rdd_utils.get_update_strategy() == 'stash'
+
+    def test_merge_keeps_uncommitted_files(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._diverge('feature\n', 'other')
+        with open('shared.txt', 'w') as f:
+            f.write('local edit\n')
+        with open('scratch.bin', 'w') as f:
+            f.write('generated\n')
+        preflight = rdd_utils.preflight_merge('main')
+        assert rdd_utils.update_without_stash('main', preflight) == True
+        parents = subprocess.run(['git', 'log', '-1', '--format=%P'], capture_output=True, text=True).stdout.split()
+        assert parents[1] == self._head('main')
+        assert open('other.txt').read() == 'other'
+        assert open('shared.txt').read() == 'local edit\n'
+        status = rdd_utils.get_working_tree_status()
+        assert [e[1] for e in status.entries if e[0] != '??'] == ['shared.txt']
+
+    def test_fast_forward(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._commit('shared.txt', 'base\n', 'Base')
+        subprocess.run(['git', 'checkout', '-b', 'feat/x'], check=True, capture_output=True)
+        subprocess.run(['git', 'checkout', 'main'], check=True, capture_output=True)
+        self._commit('other.txt', 'main\n', 'Main')
+        subprocess.run(['git', 'checkout', 'feat/x'], check=True, capture_output=True)
+        preflight = rdd_utils.preflight_merge('main')
+        assert preflight.outcome == rdd_utils.MergePreflight.FAST_FORWARD
+        assert rdd_utils.update_without_stash('main', preflight) == True
+        assert self._head() == self._head('main')
+        assert os.path.exists('other.txt')
+
+    def test_refuses_to_overwrite_local_changes(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._diverge('feature\n', 'other')
+        with open('other.txt', 'w') as f:
+            f.write('untracked in the way\n')
+        head = self._head()
+        preflight = rdd_utils.preflight_merge('main')
+        assert rdd_utils.update_without_stash('main', preflight) == False
+        assert self._head() == head
+        assert open('other.txt').read() == 'untracked in the way\n'
+
+    def test_worktree_fallback(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._diverge('feature\n', 'other')
+        preflight = rdd_utils.MergePreflight(rdd_utils.MergePreflight.UNAVAILABLE)
+        assert rdd_utils.update_without_stash('main', preflight) == True
+        assert os.path.exists('other.txt')
+        worktrees = subprocess.run(['git', 'worktree', 'list'], capture_output=True, text=True).stdout
+        assert len(worktrees.strip().splitlines()) == 1
+
+
+@pytest.mark.requires_git
+class TestBatchedBranchCleanup:
+    """Test batched merged-branch listing and deletion"""
+
+    def _branches(self, *names):
+        for name in names:
+            subprocess.run(['git', 'branch', name], check=True, capture_output=True)
+
+    def test_list_merged_branches(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        self._branches('feat/a', 'fix/b', 'dev')
+        subprocess.run(['git', 'push', '-u', 'origin', 'feat/a'], check=True, capture_output=True)
+        merged = rdd_utils.list_merged_branches('main')
+        assert [b.name for b in merged] == ['feat/a', 'fix/b']
+        assert merged[0].upstream == 'origin/feat/a'
+        assert merged[0].committer_date
+        assert merged[1].upstream == ''
+
+    def test_delete_local_branches_in_one_call(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._branches('feat/a', 'fix/b')
+        with patch('rdd_utils.subprocess.run', wraps=subprocess.run) as spy:
+            result = rdd_utils.delete_local_branches(['feat/a', 'fix/b', 'missing'])
+        assert result == {'feat/a': True, 'fix/b': True, 'missing': True}
+        assert sum(1 for c in spy.call_args_list if c[0][0][:2] == ['git', 'branch']) == 1
+
+    def test_delete_local_branches_invalidates_refs(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._branches('feat/a', 'fix/b')
+        subprocess.run(['git', 'pack-refs', '--all'], check=True, capture_output=True)
+        with rdd_utils.repo_context() as ctx:
+            assert ctx.default_branch == 'main'
+            assert rdd_utils.local_branch_exists('feat/a')
+            with patch('rdd_refs.invalidate_ref_cache') as invalidate:
+                rdd_utils.delete_local_branches(['feat/a'])
+            invalidate.assert_called_once_with()
+            assert 'default_branch' in ctx._values
+        assert not rdd_utils.local_branch_exists('feat/a')
+        assert rdd_utils.local_branch_exists('fix/b')
+
+    def test_parse_push_porcelain(self):
+        output = (
+            "To ../origin.git\n"
+            "-\t:refs/heads/feat/a\t[deleted]\n"
+            "!\t:refs/heads/fix/b\t[remote rejected] (protected)\n"
+            "Done\n"
+        )
+        assert rdd_utils.parse_push_porcelain(output) == {
+            'feat/a': (True, '[deleted]'),
+            'fix/b': (False, '[remote rejected] (protected)'),
+        }
+
+    def test_delete_remote_branches(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        self._branches('feat/a', 'fix/b', 'local-only')
+        subprocess.run(['git', 'push', 'origin', 'feat/a', 'fix/b'], check=True, capture_output=True)
+        report = rdd_utils.delete_remote_branches(['feat/a', 'fix/b', 'local-only'])
+        assert report['feat/a'] == (True, '[deleted]')
+        assert report['fix/b'] == (True, '[deleted]')
+        # Nothing was deleted for a branch the remote does not have
+        assert report['local-only'] == (False, '[not on origin]')
+        remote = subprocess.run(['git', 'ls-remote', '--heads', 'origin'], capture_output=True, text=True).stdout
+        assert 'feat/a' not in remote and 'fix/b' not in remote
+
+
+@pytest.mark.requires_git
+class TestBranchDashboard(MergeRepoHelpers):
+    """Test the for-each-ref branch dashboard"""
+
+    def _setup_branches(self):
+        self._commit('shared.txt', 'base\n', 'Base')
+        subprocess.run(['git', 'checkout', '-b', 'enh/old'], check=True, capture_output=True)
+        self._commit('old.txt', 'old\n', 'Old work')
+        subprocess.run(['git', 'checkout', '-b', 'enh/new', 'main'], check=True, capture_output=True)
+        self._commit('new1.txt', '1\n', 'New work 1')
+        self._commit('new2.txt', '2\n', 'New work 2')
+        subprocess.run(['git', 'commit', '--amend', '--no-edit', '--date=2099-01-01T00:00:00'],
+                       check=True, capture_output=True,
+                       env={**os.environ, 'GIT_COMMITTER_DATE': '2099-01-01T00:00:00'})
+        subprocess.run(['git', 'checkout', 'main'], check=True, capture_output=True)
+        self._commit('main.txt', 'main\n', 'Main work')
+
+    def test_ahead_behind_and_recency(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._setup_branches()
+        page, total = rdd_utils.get_branch_dashboard()
+        assert total == 3
+        assert page[0].name == 'enh/new'
+        by_name = {b.name: b for b in page}
+        assert (by_name['enh/new'].ahead, by_name['enh/new'].behind) == (2, 1)
+        assert (by_name['enh/old'].ahead, by_name['enh/old'].behind) == (1, 1)
+        assert by_name['main'].current
+
+    def test_filters_and_paging(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._setup_branches()
+        assert [b.name for b in rdd_utils.get_branch_dashboard('enh/*', sort='name')[0]] == ['enh/new', 'enh/old']
+        assert [b.name for b in rdd_utils.get_branch_dashboard('old')[0]] == ['enh/old']
+        assert [b.name for b in rdd_utils.get_branch_dashboard(regex='^ma')[0]] == ['main']
+        page, total = rdd_utils.get_branch_dashboard(sort='name', limit=1, skip=1)
+        assert [b.name for b in page] == ['enh/old'] and total == 3
+
+    def test_fallback_only_counts_page(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        self._setup_branches()
+        real_for_each_ref = rdd_utils._for_each_ref_branches
+
+        def without_ahead_behind(refs, base, with_ahead_behind):
+            return None if with_ahead_behind else real_for_each_ref(refs, base, False)
+
+        with patch('rdd_utils._for_each_ref_branches', side_effect=without_ahead_behind), \
+                patch.object(rdd_utils.GitExecutor, 'popen', autospec=True,
+                             side_effect=rdd_utils.GitExecutor.popen) as popen:
+            page, total = rdd_utils.get_branch_dashboard(limit=1)
+        assert total == 3
+        assert (page[0].ahead, page[0].behind) == (2, 1)
+        assert popen.call_count == 1
+
+
+@pytest.mark.requires_git
+class TestRemoteRefCache:
+    """Test the TTL remote-ref cache under .rdd-docs/.cache"""
+
+    def _ls_remote_calls(self, spy):
+        return sum(1 for c in spy.call_args_list if c[0][0] == 'ls-remote')
+
+    def test_one_ls_remote_within_ttl(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        with patch('rdd_utils.run_remote', wraps=rdd_utils.run_remote) as spy:
+            assert rdd_utils.remote_branch_exists('main') == True
+            assert rdd_utils.remote_branch_exists('feat/x') == False
+            assert self._ls_remote_calls(spy) == 1
+        cache_dir = git_repo_with_remote / '.rdd-docs' / '.cache'
+        assert (cache_dir / 'remote-refs.json').is_file()
+        status = subprocess.run(['git', 'status', '--porcelain'], capture_output=True, text=True).stdout
+        assert '.rdd-docs' not in status
+
+    def test_ttl_expiry_refreshes(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        rdd_utils.get_remote_heads()
+        rdd_utils.set_rdd_config('remoteCacheTtl', '0')
+        with patch('rdd_utils.run_remote', wraps=rdd_utils.run_remote) as spy:
+            rdd_utils.get_remote_heads()
+            assert self._ls_remote_calls(spy) == 1
+
+    def test_record_updates_without_network(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        rdd_utils.get_remote_heads()
+        rdd_utils.record_remote_update('feat/x', 'a' * 40)
+        rdd_utils.record_remote_update('main', None)
+        with patch('rdd_utils.run_remote', wraps=rdd_utils.run_remote) as spy:
+            assert rdd_utils.remote_branch_exists('feat/x') == True
+            assert rdd_utils.remote_branch_exists('main') == False
+            assert self._ls_remote_calls(spy) == 0
+
+    def test_stale_snapshot_when_unreachable(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        rdd_utils.get_remote_heads()
+        subprocess.run(['git', 'remote', 'set-url', 'origin', '/nonexistent/repo.git'], check=True)
+        assert 'main' in rdd_utils.get_remote_heads(refresh=True)
+
+    def test_unknown_without_snapshot(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        assert rdd_utils.remote_branch_exists('main') is None
+
+    def test_snapshot_from_tracking_refs(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        subprocess.run(['git', 'fetch', 'origin', '--prune', '--quiet'], check=True)
+        rdd_utils.snapshot_remote_from_tracking_refs()
+        heads = rdd_utils.get_remote_heads()
+        assert list(heads) == ['main']
+
+    def test_single_branch_clone_snapshot_uses_ls_remote(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        subprocess.run(['git', 'push', 'origin', 'main:feat/x'], check=True, capture_output=True)
+        subprocess.run(['git', 'config', 'remote.origin.fetch', '+refs/heads/main:refs/remotes/origin/main'],
+                       check=True)
+        subprocess.run(['git', 'update-ref', '-d', 'refs/remotes/origin/feat/x'], check=True)
+        subprocess.run(['git', 'fetch', 'origin', '--prune', '--quiet'], check=True)
+        assert rdd_utils.tracking_refs_cover_remote() == False
+        rdd_utils.snapshot_remote_from_tracking_refs()
+        assert sorted(rdd_utils.get_remote_heads()) == ['feat/x', 'main']
+
+        # Cleanup really deletes the untracked remote branch
+        assert rdd_utils.delete_remote_branches(['feat/x']) == {'feat/x': (True, '[deleted]')}
+        remote = subprocess.run(['git', 'ls-remote', '--heads', 'origin'], capture_output=True, text=True).stdout
+        assert 'feat/x' not in remote
+
+    def test_stale_cache_miss_is_checked_before_skipping(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        rdd_utils.get_remote_heads()
+        # Pushed by someone else after the snapshot was taken
+        subprocess.run(['git', 'push', 'origin', 'main:feat/y'], check=True, capture_output=True)
+        assert rdd_utils.delete_remote_branches(['feat/y']) == {'feat/y': (True, '[deleted]')}
+
+    def test_parallel_cache_writers_keep_every_update(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        rdd_utils.store_remote_snapshot({}, 'origin')
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]); import rdd_utils\n"
+            "for i in range(20): rdd_utils.record_remote_update(sys.argv[2] + str(i), 'a' * 40)\n"
+        )
+        scripts_dir = str(Path(__file__).parent.parent.parent / ".rdd" / "scripts")
+        writers = [subprocess.Popen([sys.executable, "-c", script, scripts_dir, name]) for name in ("x", "y")]
+        assert all(w.wait(timeout=60) == 0 for w in writers)
+        assert len(rdd_utils.get_remote_heads()) == 40
+        cache_dir = git_repo_with_remote / '.rdd-docs' / '.cache'
+        assert sorted(os.listdir(cache_dir)) == ['.gitignore', 'remote-refs.json']
+
+
+@pytest.mark.requires_git
+@pytest.mark.skipif(os.name == 'nt', reason="proxy script needs a POSIX shell")
+class TestRemoteOperations:
+    """Test timeouts, retries and cancellation of remote git operations"""
+
+    def _proxy(self, repo, body):
+        """Route fetches from origin through a shell script wrapping git-upload-pack."""
+        script = repo / 'proxy.sh'
+        script.write_text('#!/bin/sh\n' + body + '\nexec git-upload-pack "$@"\n')
+        script.chmod(0o755)
+        subprocess.run(['git', 'config', 'remote.origin.uploadpack', str(script)], check=True)
+        return script
+
+    def test_success_single_attempt(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        result = rdd_utils.run_remote('fetch', ['fetch', 'origin'])
+        assert result.ok
+        assert len(result.attempts) == 1
+        assert result.to_dict()['attempts'][0]['durationMs'] >= 0
+
+    def test_timeout_kills_process_group(self, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        pid_file = git_repo_with_remote / 'proxy.pid'
+        self._proxy(git_repo_with_remote, f'echo $$ > {pid_file}\nsleep 30')
+        start = time.monotonic()
+        result = rdd_utils.run_remote('fetch', ['fetch', 'origin'], timeout=1, retries=0)
+        assert time.monotonic() - start < 10
+        assert result.returncode == 124
+        assert result.attempts[0].timed_out
+        pid = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        while self._alive(pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not self._alive(pid)
+
+    def _alive(self, pid):
+        """True if pid is running (orphaned zombies count as dead)."""
+        if os.path.isdir('/proc'):
+            try:
+                with open(f'/proc/{pid}/status') as f:
+                    return '\tZ' not in f.read().split('State:', 1)[1].splitlines()[0]
+            except FileNotFoundError:
+                return False
+        try:
+            os.kill(pid, 0)
+            return True
+        except OSError:
+            return False
+
+    @patch('rdd_utils._backoff_delay', return_value=0)
+    def test_retries_transient_failure(self, mock_delay, git_repo_with_remote):
+        os.chdir(git_repo_with_remote)
+        marker = git_repo_with_remote / 'failed-once'
+        self._proxy(git_repo_with_remote,
+                    f'if [ ! -e {marker} ]; then touch {marker}; '
+                    f'echo "fatal: the remote end hung up unexpectedly" >&2; exit 128; fi')
+        result = rdd_utils.run_remote('fetch', ['fetch', 'origin'], retries=2)
+        assert result.ok
+        assert [a.returncode for a in result.attempts][-1] == 0
+        assert len(result.attempts) == 2
+        mock_delay.assert_called_once()
+
+    def test_permanent_failure_not_retried(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        subprocess.run(['git', 'remote', 'add', 'origin', '/nonexistent/repo.git'], check=True)
+        result = rdd_utils.run_remote('fetch', ['fetch', 'origin'], retries=3)
+        assert not result.ok
+        assert len(result.attempts) == 1
+
+    def test_ctrl_c_cancels_and_kills(self, mock_git_repo):
+        os.chdir(mock_git_repo)
+        proc = Mock(returncode=None)
+        proc.communicate.side_effect = [KeyboardInterrupt(), ("", "")]
+        with patch('rdd_utils._popen_process_group', return_value=proc), \
+                patch('rdd_utils._kill_process_group') as mock_kill:
+            result = rdd_utils.run_remote('push', ['push', 'origin', 'main'], timeout=5, retries=2)
+        assert result.cancelled
+        assert result.returncode == 130
+        assert len(result.attempts) == 1
+        mock_kill.assert_called_once_with(proc)
+
+    def test_per_operation_timeout_config(self, rdd_workspace):
+        os.chdir(rdd_workspace)
+        assert rdd_utils.get_remote_timeout('fetch') == rdd_utils.DEFAULT_REMOTE_TIMEOUT
+        rdd_utils.set_rdd_config('remoteTimeout', '60')
+        rdd_utils.set_rdd_config('lsRemoteTimeout', '5')
+        assert rdd_utils.get_remote_timeout('fetch') == 60
+        assert rdd_utils.get_remote_timeout('ls-remote') == 5
+
+
+class RemoteRepoHelpers:
+    """Helpers publishing commits to origin from a second clone"""
+
+    def _remote_url(self):
+        return subprocess.run(['git', 'remote', 'get-url', 'origin'], capture_output=True, text=True).stdout.strip()
+
+    def _push_from_other_clone(self, tmp_path):
+        other = tmp_path / 'other'
+        subprocess.run(['git', 'clone', '-q', self._remote_url(), str(other)], check=True)
+        subprocess.run(['git', '-C', str(other), '-c', 'user.name=O', '-c', 'user.email=o@x',
+                        'commit', '--allow-empty', '-qm', 'Remote work'], check=True)
+        subprocess.run(['git', '-C', str(other), 'push', '-q', 'origin', 'main'], check=True)
+
+    def _rev(self, ref):
+        return subprocess.run(['git', 'rev-parse', ref], capture_output=True, text=True).stdout.strip()
+
+
+@pytest.mark.requires_git
+class TestFetchStrategy(RemoteRepoHelpers):
+    """Test configurable fetch options and the fetch plan"""
+
+    def test_fetch_options_from_config(self, rdd_workspace):
+        os.chdir(rdd_workspace)
+        assert rdd_utils.get_fetch_options() == []
+        rdd_utils.set_rdd_config('fetchFilter', 'blob:none')
+        rdd_utils.set_rdd_config('fetchDepth', '50')
+        rdd_utils.set_rdd_config('fetchNoTags', 'true')
+        rdd_utils.set_rdd_config('fetchNegotiationTips', 'refs/remotes/origin/main, refs/heads/main')
+        # Depth is ignored in a full clone
+        assert rdd_utils.get_fetch_options() == [
+            '--filter=blob:none', '--no-tags',
+            '--negotiation-tip=refs/remotes/origin/main', '--negotiation-tip=refs/heads/main',
+        ]
+        with patch('rdd_utils.is_shallow_repository', return_value=True):
+            assert '--depth=50' in rdd_utils.get_fetch_options()
+        assert rdd_utils.build_fetch_args(['main'])[-2:] == ['origin', 'main']
+
+    def test_plan_reports_pending_objects(self, git_repo_with_remote, tmp_path):
+        os.chdir(git_repo_with_remote)
+        assert rdd_utils.get_fetch_plan('main')['transfer'] == 'up-to-date'
+        self._push_from_other_clone(tmp_path)
+        plan = rdd_utils.get_fetch_plan('main')
+        assert plan['transfer'] == 'objects'
+        assert plan['remoteOid'] != plan['trackingOid']
+        assert rdd_utils.get_fetch_plan('missing')['transfer'] == 'missing'
+
+    def test_shallow_clone_pull_honors_depth(self, git_repo_with_remote, tmp_path):
+        os.chdir(git_repo_with_remote)
+        shallow = tmp_path / 'shallow'
+        subprocess.run(['git', 'clone', '-q', '--depth', '1', 'file://' + self._remote_url(), str(shallow)],
+                       check=True)
+        self._push_from_other_clone(tmp_path)
+        os.chdir(shallow)
+        (shallow / '.rdd-docs').mkdir()
+        rdd_utils.set_rdd_config('fetchDepth', '5')
+        assert rdd_utils.is_shallow_repository()
+        assert '--depth=5' in rdd_utils.get_fetch_options()
+        assert rdd_utils.pull_from_remote('main').returncode == 0
+        log = subprocess.run(['git', 'log', '--format=%s'], capture_output=True, text=True).stdout
+        assert log.split('\n')[0] == 'Remote work'
+
+
+@pytest.mark.requires_git
+class TestCheckoutFreeBranching(RemoteRepoHelpers):
+    """Test branch creation and return to default without extra checkouts"""
+
+    def test_branch_from_checked_out_default(self, git_repo_with_remote, tmp_path):
+        os.chdir(git_repo_with_remote)
+        self._push_from_other_clone(tmp_path)
+        assert rdd_utils.create_branch_from_default('enh/x', 'main') == True
+        assert rdd_utils.get_current_branch() == 'enh/x'
+        assert self._rev('HEAD') == self._rev('origin/main')
+        assert self._rev('main') == self._rev('origin/main')
+        upstream = subprocess.run(['git', 'config', 'branch.enh/x.merge'], capture_output=True, text=True)
+        assert upstream.stdout == ''
+
+    def test_branch_from_other_branch_fast_forwards_default(self, git_repo_with_remote, tmp_path):
+        os.chdir(git_repo_with_remote)
+        subprocess.run(['git', 'switch', '-q', '-c', 'enh/old'], check=True)
+        self._push_from_other_clone(tmp_path)
+        with patch('rdd_utils.fetch_from_remote', wraps=rdd_utils.fetch_from_remote) as spy:
+            assert rdd_utils.create_branch_from_default('enh/new', 'main') == True
+        assert spy.call_count == 1
+        assert self._rev('HEAD') == self._rev('main') == self._rev('origin/main')
+
+    def test_local_commits_on_default_are_kept(self, git_repo_with_remote, tmp_path):
+        os.chdir(git_repo_with_remote)
+        subprocess.run(['git', 'commit', '-q', '--allow-empty', '-m', 'Local only'], check=True)
+        self._push_from_other_clone(tmp_path)
+        local_main = self._rev('main')
+        assert rdd_utils.create_branch_from_default('enh/x', 'main') == True
+        assert self._rev('HEAD') == local_main
+
+    def test_local_only_mode_skips_network(self, rdd_workspace):
+        os.chdir(rdd_workspace)
+        rdd_utils.set_rdd_config('localOnly', 'true')
+        with patch('rdd_utils.fetch_from_remote') as mock_fetch:
+            assert rdd_utils.create_branch_from_default('enh/x', 'main') == True
+        mock_fetch.assert_not_called()
+
+    def test_return_to_default_fast_forwards(self, git_repo_with_remote, tmp_path):
+        os.chdir(git_repo_with_remote)
+        subprocess.run(['git', 'switch', '-q', '-c', 'enh/x'], check=True)
+        self._push_from_other_clone(tmp_path)
+        assert rdd_utils.return_to_default_branch('main') == True
+        assert rdd_utils.get_current_branch() == 'main'
+        assert self._rev('HEAD') == self._rev('origin/main')
+
+
 class TestTimestampFunctions:
     """Test timestamp utility functions"""
     
@@ -179,6 +934,77 @@ class TestConfigFunctions:
         assert Path(config_path).resolve() == expected.resolve()
 
 
+class TestConfigStore:
+    """Test the cached, atomically written config store"""
+
+    def test_parses_once_until_file_changes(self, tmp_path):
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps({"defaultBranch": "main"}))
+        store = rdd_utils.ConfigStore(str(path))
+        with patch('json.load', wraps=json.load) as load:
+            assert store.get("defaultBranch") == "main"
+            assert store.get("missing", "x") == "x"
+            assert load.call_count == 1
+            path.write_text(json.dumps({"defaultBranch": "develop!"}))
+            assert store.get("defaultBranch") == "develop!"
+            assert load.call_count == 2
+
+    def test_transaction_writes_atomically(self, tmp_path):
+        path = tmp_path / ".rdd-docs" / "config.json"
+        store = rdd_utils.ConfigStore(str(path))
+        assert not store.exists() and store.load() == {}
+        store.update({"a": "1", "b": "2"})
+        assert json.loads(path.read_text()) == {"a": "1", "b": "2"}
+        assert store.load() == {"a": "1", "b": "2"}
+
+        # A failing block leaves the file untouched and no temp files behind
+        with pytest.raises(RuntimeError):
+            with store.transaction() as data:
+                data["a"] = "changed"
+                raise RuntimeError("abort")
+        assert json.loads(path.read_text())["a"] == "1"
+        assert os.listdir(path.parent) == ["config.json"]
+
+    def test_parallel_writers_keep_every_key(self, tmp_path):
+        path = tmp_path / "config.json"
+        path.write_text("{}")
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]); import rdd_utils\n"
+            "store = rdd_utils.ConfigStore(sys.argv[2])\n"
+            "for i in range(20): store.update({sys.argv[3] + str(i): i})\n"
+        )
+        scripts_dir = str(Path(__file__).parent.parent.parent / ".rdd" / "scripts")
+        writers = [subprocess.Popen([sys.executable, "-c", script, scripts_dir, str(path), name])
+                   for name in ("x", "y", "z")]
+        assert all(w.wait(timeout=60) == 0 for w in writers)
+        assert len(json.loads(path.read_text())) == 60
+
+    def test_parallel_set_config_keeps_both_keys(self, tmp_path):
+        # set_config() re-reads the file under the lock: no lost updates
+        path = tmp_path / "change.json"
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]); import rdd_utils\n"
+            "for i in range(20): assert rdd_utils.set_config(sys.argv[3] + str(i), 'v', sys.argv[2])\n"
+        )
+        scripts_dir = str(Path(__file__).parent.parent.parent / ".rdd" / "scripts")
+        writers = [subprocess.Popen([sys.executable, "-c", script, scripts_dir, str(path), name])
+                   for name in ("x", "y")]
+        assert all(w.wait(timeout=60) == 0 for w in writers)
+        data = json.loads(path.read_text())
+        assert len(data) == 40 and data["x19"] == data["y19"] == "v"
+
+    def test_set_several_keys_from_cli(self, rdd_workspace, capsys):
+        import rdd_config
+        os.chdir(rdd_workspace)
+        assert rdd_config.route_config(["set", "localOnly=true", "updateStrategy=merge-tree"]) == 0
+        config = json.loads((rdd_workspace / ".rdd-docs" / "config.json").read_text())
+        assert (config["localOnly"], config["updateStrategy"]) == ("true", "merge-tree")
+        assert config["defaultBranch"] == "main"
+        assert rdd_config.route_config(["set", "updateStrategy=bogus", "a=1"]) == 1
+        assert rdd_config.route_config(["set", "novalue"]) == 1
+        assert "a" not in json.loads((rdd_workspace / ".rdd-docs" / "config.json").read_text())
+
+
 class TestWorkspaceUtilities:
     """Test workspace management utilities"""
     
@@ -236,3 +1062,83 @@ class TestConfirmAction:
     def test_confirm_action_invalid(self, mock_input):
         # Should return False for invalid input
         assert rdd_utils.confirm_action("Test question") == False
+
+
+class TestIterationWorktrees:
+    """Test worktree discovery and management for parallel iterations"""
+
+    def test_parse_worktree_porcelain(self):
+        output = (
+            "worktree /repo\nHEAD aaa\nbranch refs/heads/main\n\n"
+            "worktree /wt/enh-x\nHEAD bbb\nbranch refs/heads/enh/x\nlocked\n\n"
+            "worktree /wt/tmp\nHEAD ccc\ndetached\nprunable gitdir file points to non-existent location\n\n"
+        )
+        main, enh, tmp = rdd_utils.parse_worktree_porcelain(output)
+        assert (main.path, main.branch, main.is_main) == (os.path.normpath('/repo'), 'main', True)
+        assert (enh.branch, enh.locked, enh.is_main) == ('enh/x', True, False)
+        assert tmp.branch is None and tmp.detached and tmp.prunable
+
+    def test_add_find_and_remove(self, mock_git_repo, tmp_path):
+        os.chdir(mock_git_repo)
+        with patch('rdd_utils.get_rdd_config', side_effect=lambda k, d=None: str(tmp_path / 'wt') if k == 'worktreeRoot' else d), \
+                patch('rdd_utils.is_local_only_mode', return_value=True):
+            path = rdd_utils.add_iteration_worktree('enh/x', 'main')
+        assert path == str(tmp_path / 'wt' / 'enh-x')
+        assert rdd_utils.get_current_branch() == 'main'
+        assert rdd_utils.find_worktree('enh/x').path == path
+        assert rdd_utils.find_worktree('enh-x').path == path
+        assert rdd_utils.checked_out_branches() == ['main', 'enh/x']
+        assert rdd_utils.remove_worktree(path) == True
+        assert rdd_utils.find_worktree('enh/x') is None
+        assert rdd_utils.local_branch_exists('enh/x')
+
+    def test_fast_forward_skips_branch_checked_out_elsewhere(self, mock_git_repo, tmp_path):
+        os.chdir(mock_git_repo)
+        subprocess.run(['git', 'branch', 'other'], check=True)
+        subprocess.run(['git', 'worktree', 'add', '-q', str(tmp_path / 'other'), 'other'], check=True)
+        subprocess.run(['git', 'commit', '-q', '--allow-empty', '-m', 'Ahead'], check=True)
+        assert rdd_utils.fast_forward_branch_ref('other', 'main') == False
+
+    def test_in_worktree_scopes_context(self, mock_git_repo, tmp_path):
+        os.chdir(mock_git_repo)
+        subprocess.run(['git', 'worktree', 'add', '-q', '-b', 'enh/y', str(tmp_path / 'y')], check=True)
+        with rdd_utils.repo_context():
+            assert rdd_utils.get_current_branch() == 'main'
+            with rdd_utils.in_worktree(str(tmp_path / 'y')):
+                assert rdd_utils.get_current_branch() == 'enh/y'
+            assert rdd_utils.get_current_branch() == 'main'
+        assert os.getcwd() == str(mock_git_repo)
+
+
+class TestSparseCheckout:
+    """Test sparse-checkout path resolution and sparse iteration worktrees"""
+
+    def test_resolve_profile_and_paths(self):
+        config = {'sparseProfiles': {'api': ['services/api/', 'libs\\common']}}
+        with patch('rdd_utils.get_rdd_config', side_effect=lambda k, d=None: config.get(k, d)):
+            assert rdd_utils.resolve_sparse_paths('api') == [
+                'services/api', 'libs/common', '.rdd', '.rdd-docs', '.github/prompts']
+            assert rdd_utils.resolve_sparse_paths('a, b/c,.rdd')[:2] == ['a', 'b/c']
+            assert rdd_utils.resolve_sparse_paths('../outside') is None
+
+    def test_sparse_worktree(self, mock_git_repo, tmp_path):
+        os.chdir(mock_git_repo)
+        for folder in ('services/api', 'services/web', '.rdd'):
+            (mock_git_repo / folder).mkdir(parents=True)
+            (mock_git_repo / folder / 'f.txt').write_text(folder)
+        subprocess.run(['git', 'add', '-A'], check=True)
+        subprocess.run(['git', 'commit', '-q', '-m', 'Services'], check=True)
+        with patch('rdd_utils.get_rdd_config', side_effect=lambda k, d=None: str(tmp_path / 'wt') if k == 'worktreeRoot' else d), \
+                patch('rdd_utils.is_local_only_mode', return_value=True):
+            paths = rdd_utils.resolve_sparse_paths('services/api')
+            path = rdd_utils.add_iteration_worktree('enh/api', 'main', paths)
+        assert os.path.isfile(os.path.join(path, 'services', 'api', 'f.txt'))
+        assert os.path.isfile(os.path.join(path, '.rdd', 'f.txt'))
+        assert os.path.isfile(os.path.join(path, 'README.md'))
+        assert not os.path.exists(os.path.join(path, 'services', 'web'))
+        assert 'services/api' in rdd_utils.get_sparse_paths(path)
+        status = subprocess.run(['git', '-C', path, 'status', '--porcelain'], capture_output=True, text=True)
+        assert status.stdout == ''
+        # The main worktree stays complete
+        assert rdd_utils.is_sparse_checkout() == False
+        assert (mock_git_repo / 'services' / 'web' / 'f.txt').exists()
@@ -0,0 +1,82 @@
+"""
+test_startup.py
+Startup-time budgets for the rdd.py entry script
+Runs rdd.py in a fresh interpreter, as users do, and checks that `--version`
+and `prompt list` stay under a fixed wall-time budget (best of several runs)
+and that they only import the modules they need.
+"""
+
+import pytest
+import sys
+import time
+import subprocess
+from pathlib import Path
+
+RDD_SCRIPT = Path(__file__).parent.parent.parent / ".rdd" / "scripts" / "rdd.py"
+
+RUNS = 5
+# Best-of-RUNS wall time, interpreter startup included
+STARTUP_BUDGETS_MS = {
+    '--version': 150,
+    'prompt list': 300,
+}
+
+DOMAIN_MODULES = ['rdd_branch', 'rdd_iteration', 'rdd_workspace', 'rdd_change',
+                  'rdd_git', 'rdd_prompt', 'rdd_config', 'rdd_menu', 'rdd_ui']
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    """Directory with a prompts journal, so `prompt list` has work to do."""
+    journal = tmp_path / ".rdd-docs" / "work-iteration-prompts.md"
+    journal.parent.mkdir()
+    journal.write_text("# Work Iteration Prompts\n\n## Prompt Definitions\n\n" + "".join(
+        f" - [{'x' if i < 5 else ' '}] [P{i:02d}] Prompt number {i}\n\n" for i in range(1, 21)))
+    return tmp_path
+
+
+def run_rdd(args, cwd, *interpreter_options):
+    return subprocess.run([sys.executable, *interpreter_options, str(RDD_SCRIPT), *args],
+                          cwd=cwd, capture_output=True, text=True, encoding='utf-8')
+
+
+def imported_modules(args, cwd):
+    """Names of all modules imported while running rdd.py (from -X importtime)."""
+    result = run_rdd(args, cwd, '-X', 'importtime')
+    assert result.returncode == 0, result.stderr
+    return {line.rsplit('|', 1)[1].strip() for line in result.stderr.splitlines()
+            if line.startswith('import time:') and line.count('|') == 2}
+
+
+@pytest.mark.parametrize("command", sorted(STARTUP_BUDGETS_MS))
+def test_startup_within_budget(command, journal_dir):
+    best = None
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        result = run_rdd(command.split(), journal_dir)
+        elapsed = time.perf_counter() - started
+        assert result.returncode == 0, result.stderr
+        best = elapsed if best is None else min(best, elapsed)
+    assert best * 1000 <= STARTUP_BUDGETS_MS[command], f"{command}: best of {RUNS} was {best * 1000:.0f} ms"
+
+
+def test_version_imports_no_git_layer(journal_dir):
+    modules = imported_modules(['--version'], journal_dir)
+    assert 'rdd_utils' not in modules
+    assert 'subprocess' not in modules
+    assert not modules & set(DOMAIN_MODULES)
+
+
+def test_version_reads_about_json_without_git(tmp_path):
+    # Outside any repository the version still comes from .rdd/about.json
+    result = run_rdd(['--version'], tmp_path)
+    assert result.returncode == 0
+    assert 'unknown' not in result.stdout
+    assert result.stdout.startswith('RDD Framework v')
+
+
+def test_prompt_list_loads_only_its_domain(journal_dir):
+    modules = imported_modules(['prompt', 'list'], journal_dir)
+    assert 'rdd_prompt' in modules
+    assert not modules & (set(DOMAIN_MODULES) - {'rdd_prompt'})
+    assert 'rdd_trace' not in modules